@@ -10,6 +10,7 @@ KEY FEATURES:
 - Batch processing with chunked execution and web scraping using Google Serper API
 - AI-powered bio generation using OpenAI GPT-4o-mini with automatic email extraction
 - Excel export functionality and token management for API efficiency
+- Offline batch mode: all rows submitted as one OpenAI Batch API job and merged back by row ID
 - Error handling and fallback mechanisms for robust operation
 
 REQUIREMENTS:
@@ -18,7 +19,7 @@ REQUIREMENTS:
 - Dependencies: streamlit, pandas, openai, requests, beautifulsoup4, tiktoken
 
 INPUT REQUIREMENTS:
-- CSV/XLSX format with required columns: 'Name', 'University' (or 'Affiliation')
+- CSV/XLSX format with required columns: 'Name', 'University' (or 'Affiliation', 'Institution', 'Organisation'; 'First Name' + 'Last Name' for 'Name')
 - Optional columns: 'Bio', 'Email' (will be created if not present)
 
 WORKFLOW:
@@ -35,21 +36,31 @@ for accuracy and ensure compliance with institutional policies for automated res
 """
 
 import streamlit as st
-import pandas as pd
 import openai
 import re
-from io import BytesIO
-from openai import OpenAI
-from duckduckgo_search import DDGS
 import requests
-from bs4 import BeautifulSoup
-import tiktoken
-import http.client
-import json
-import time
-import random
 from urllib.parse import urlparse
 
+from con_research.src.modules.html_text import make_soup
+from con_research.src.modules.readability import extract_main_content
+from con_research.src.modules.llm_client import get_llm_gateway
+from con_research.src.modules.batch_jobs import BatchError, BatchRequest, BatchRunner, get_batch_transport
+from con_research.src.modules.entity_resolution import EntityResolver
+from con_research.src.modules.exporting import render_download
+from con_research.src.modules.ingestion import IngestionError, load_table
+from con_research.src.modules.resources import get_http_session, get_tiktoken_encoding
+from con_research.src.modules.serper_client import SerperError, get_serper_client
+from con_research.src.modules.tracing import format_trace, get_tracer, set_attribute, span, traced
+from con_research.src.modules.task_timer import display_performance_dashboard
+from con_research.src.modules.usage_accounting import Budget, BudgetExceededError, budget_scope, default_run_budget_usd, usage_scope
+from con_research.src.modules.resilience import (
+    CircuitOpenError,
+    RetryPolicy,
+    endpoint_for_url,
+    get_breaker,
+    resilient,
+)
+
 # Configuration management
 try:
     from con_research.config.config_manager import get_config, get_secret, get_config_manager
@@ -91,10 +102,14 @@ except ImportError:
             initial_delay = 1.0
             backoff_factor = 2.0
         
+        class Performance:
+            biogen_chunk_size = 10
+        
         api = API()
         file_upload = FileUpload()
         webdriver = WebDriver()
         retry = Retry()
+        performance = Performance()
     
     config = FallbackConfig()
     
@@ -143,40 +158,41 @@ with st.sidebar:
 openai_api_key = get_secret("openai_api_key")
 serper_api_key = get_secret("serper_api_key")
 
-def retry_api_call(max_retries=None, backoff_factor=None):
+def retry_api_call(max_retries=None, backoff_factor=None, breaker=None, deadline=None):
     """
-    Decorator to retry API calls with exponential backoff.
+    Decorator to retry API calls with decorrelated-jitter backoff.
     Uses configuration-driven defaults with override capability.
     
     Args:
         max_retries (int): Maximum number of retry attempts (uses config default if None)
-        backoff_factor (float): Factor for exponential backoff delay (uses config default if None)
+        backoff_factor (float): Scales the base backoff delay (uses config default if None)
+        breaker (str): Circuit breaker name; once the endpoint keeps failing, calls
+            fail immediately with CircuitOpenError instead of retrying
+        deadline (float): Overall seconds allowed per call, retries included
         
     Returns:
-        function: Decorated function with retry logic
+        function: Decorated function with retry logic (works on sync and async functions)
     """
     # Use configuration defaults if not specified
     if max_retries is None:
         max_retries = config.retry.max_attempts
     if backoff_factor is None:
         backoff_factor = config.retry.backoff_factor
-    
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except (requests.RequestException, openai.APIError, ConnectionError) as e:
-                    if attempt == max_retries:
-                        raise e
-                    delay = config.retry.initial_delay * (backoff_factor ** attempt) + random.uniform(0, 1)
-                    # Cap the delay at max_delay from config
-                    delay = min(delay, getattr(config.retry, 'max_delay', 60.0))
-                    st.warning(f"API call failed (attempt {attempt + 1}/{max_retries + 1}). Retrying in {delay:.2f} seconds...")
-                    time.sleep(delay)
-            return None
-        return wrapper
-    return decorator
+
+    policy = RetryPolicy(
+        max_retries=max_retries,
+        base_delay=config.retry.initial_delay * backoff_factor,
+        # Cap the delay at max_delay from config
+        max_delay=getattr(config.retry, 'max_delay', 60.0),
+        deadline=deadline,
+        # OpenAI calls go through the LLM gateway, which retries them itself
+        retry_on=(requests.RequestException, ConnectionError),
+    )
+
+    def warn_retry(attempt, error, delay):
+        st.warning(f"API call failed (attempt {attempt + 1}/{max_retries + 1}). Retrying in {delay:.2f} seconds...")
+
+    return resilient(policy, breaker=breaker, on_retry=warn_retry)
 
 def validate_file_upload(uploaded_file):
     """
@@ -220,6 +236,7 @@ def validate_file_upload(uploaded_file):
     return True, "File validation passed"
 
 @retry_api_call()  # Use configuration defaults
+@traced("scrape.page")
 def scrape_text_from_url(url, timeout=None):
     """
     Scrapes and extracts plain text content from a given URL using Beautiful Soup.
@@ -239,11 +256,14 @@ def scrape_text_from_url(url, timeout=None):
     Note:
         Uses requests with configurable timeout and handles UTF-8 encoding automatically.
         Removes scripts, styles, and other non-content elements before text extraction.
+        Only the main content block is returned (see readability.extract_main_content),
+        which keeps the enrichment prompt small.
     """
     # Use configuration default if timeout not specified
     if timeout is None:
         timeout = config.webdriver.timeout
     
+    set_attribute("url", url)
     # Validate URL format
     try:
         parsed_url = urlparse(url)
@@ -253,27 +273,40 @@ def scrape_text_from_url(url, timeout=None):
         print(f"URL validation error for {url}: {e}")
         return None
     
+    # One breaker per host: a site that keeps timing out is skipped for a while
+    # instead of costing every remaining researcher a full timeout
+    host_breaker = get_breaker(endpoint_for_url(url), failure_threshold=3, recovery_timeout=120.0)
+    try:
+        host_breaker.before_call()
+    except CircuitOpenError:
+        print(f"Skipping {url}: {parsed_url.hostname} is failing repeatedly")
+        return None
+
     try:
         headers = {
             'User-Agent': config.webdriver.user_agent
         }
-        response = requests.get(url, timeout=timeout, headers=headers)
+        try:
+            # Shared keep-alive session: repeat hosts skip the TCP/TLS handshake
+            response = get_http_session().get(url, timeout=timeout, headers=headers)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            host_breaker.record_failure(e)
+            raise
+        if response.status_code >= 500:
+            host_breaker.record_failure(requests.exceptions.HTTPError(f"HTTP {response.status_code}"))
+        else:
+            host_breaker.record_success()
         response.raise_for_status()  # Check if the request was successful
         response.encoding = 'utf-8'  # Specify the encoding
+        set_attribute("bytes", len(response.content))
         
         try:
-            soup = BeautifulSoup(response.content, 'html.parser')  # You can also try 'lxml' or 'html5lib'
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Extract text from paragraphs and other relevant tags
-            paragraphs = soup.find_all(['p', 'li', 'span', 'div'])
-            text = ' '.join([para.get_text() for para in paragraphs])
+            # Keep only the main article body; each piece of text appears once
+            text = extract_main_content(make_soup(response.content), separator=' ')
         except (ValueError, AttributeError, TypeError) as e:
             print(f"Error parsing {url} with BeautifulSoup: {e}")
             text = response.text  # Fall back to raw text content
+        set_attribute("text_chars", len(text))
         return text
     except requests.exceptions.Timeout:
         print(f"Timeout error fetching {url}")
@@ -324,10 +357,11 @@ def truncate_text(text, max_tokens, encoding_name="cl100k_base"):
         tiktoken.core.UnicodeEncodeError: If text contains unsupported characters
         
     Note:
-        Uses tiktoken library for accurate token counting. Truncation occurs at word boundaries
+        Uses tiktoken library for accurate token counting; the encoding is loaded once per
+        process (resources.py). Truncation occurs at word boundaries
         to maintain readability. Different models may use different encodings.
     """
-    encoding = tiktoken.get_encoding(encoding_name)
+    encoding = get_tiktoken_encoding(encoding_name)
     tokens = encoding.encode(text)
     truncated_tokens = tokens[:max_tokens]
     truncated_text = encoding.decode(truncated_tokens)
@@ -351,7 +385,44 @@ def truncate_text(text, max_tokens, encoding_name="cl100k_base"):
 #     # Format the enriched text into a block of text
 #     enriched_text = re.sub(r'\s+', ' ', enriched_text).strip()
 #     return enriched_text
-@retry_api_call(max_retries=3, backoff_factor=1.0)
+def build_enrichment_query(researcher_full_name, university_affiliation):
+    """Search query used to enrich one researcher's profile."""
+    return f"a professional bio and email for {researcher_full_name}, who is affiliated with {university_affiliation}."
+
+def get_enrichment_search_client():
+    """
+    Returns the shared Serper client for enrichment searches.
+
+    Returns:
+        SerperClient: Pooled, caching client, or None if no API key is configured
+    """
+    if not serper_api_key:
+        return None
+    return get_serper_client(
+        serper_api_key,
+        num_results=config.api.serper_max_results,
+        timeout=config.api.serper_timeout,
+    )
+
+def prefetch_enrichment_searches(researchers):
+    """
+    Runs the enrichment searches for a batch of researchers concurrently.
+
+    Args:
+        researchers (list): (name, university) pairs
+
+    Note:
+        Results land in the client's response cache, so the per-row
+        generate_enriched_text calls that follow return immediately.
+        Failed queries are left to the per-row call, which searches them again.
+    """
+    serper_client = get_enrichment_search_client()
+    if serper_client is None or not researchers:
+        return
+    queries = [build_enrichment_query(name, university) for name, university in researchers]
+    serper_client.search_many(queries, return_exceptions=True)
+
+@traced("bio.enrich")
 def generate_enriched_text(researcher_full_name, university_affiliation):
     """
     Searches for and compiles comprehensive academic information about a researcher using Google Search API.
@@ -361,39 +432,34 @@ def generate_enriched_text(researcher_full_name, university_affiliation):
         university_affiliation (str): Full name of the researcher's institutional affiliation
         
     Returns:
-        str: Compiled research profile containing publication details, academic achievements,
-             research interests, and professional background information
-             
-    Raises:
-        Exception: If Google Search API key is missing or API request fails
-        requests.exceptions.RequestException: If network request to search API fails
+        Optional[str]: Compiled research profile containing publication details, academic achievements,
+             research interests, and professional background information; None when the search is
+             unavailable or still fails after the client's own retries
         
     Dependencies:
         - Requires valid Google Search API key in st.secrets
-        - Uses SERPER_API_KEY for Google search functionality
+        - Uses the shared SerperClient (serper_client.py) for pooled, cached, retried searches
         
     Note:
-        Performs multiple targeted searches combining name and university for comprehensive results.
+        Performs a targeted search combining name and university for comprehensive results.
         Results are concatenated and can be quite lengthy (suitable for subsequent LLM processing).
         Rate-limited by Google Search API quotas.
     """
-    search_query = f"a professional bio and email for {researcher_full_name}, who is affiliated with {university_affiliation}."
-    http_connection = http.client.HTTPSConnection("google.serper.dev")
-    request_payload = json.dumps({
-        "q": search_query
-    })
-    serper_api_key = st.secrets.get("serper_api_key")
-    if not serper_api_key:
+    serper_client = get_enrichment_search_client()
+    if serper_client is None:
         st.error("Serper API key is not configured. Please add 'serper_api_key' to Streamlit secrets.")
         return None
-    request_headers = {
-        'X-API-KEY': serper_api_key,
-        'Content-Type': 'application/json'
-    }
-    http_connection.request("POST", "/search", request_payload, request_headers)
-    api_response = http_connection.getresponse()
-    response_data_raw = api_response.read()
-    parsed_response_data = json.loads(response_data_raw.decode("utf-8"))
+    # Served from the client's cache when the chunk was prefetched
+    search_query = build_enrichment_query(researcher_full_name, university_affiliation)
+    try:
+        parsed_response_data = serper_client.search(search_query)
+    except CircuitOpenError as e:
+        st.warning(f"Web search is temporarily unavailable (retrying in {e.retry_after:.0f}s); continuing without enrichment.")
+        return None
+    except SerperError as e:
+        # The client has already retried; continue without enrichment
+        st.warning(f"Web search failed for {researcher_full_name}; continuing without enrichment. ({e})")
+        return None
 
     compiled_enriched_text = ""
     for search_result in parsed_response_data.get('organic', []):
@@ -408,36 +474,35 @@ def generate_enriched_text(researcher_full_name, university_affiliation):
 
     # Format the enriched text into a block of text
     final_enriched_text = re.sub(r'\s+', ' ', compiled_enriched_text).strip()
+    set_attribute("text_chars", len(final_enriched_text))
     return final_enriched_text
 
-@retry_api_call(max_retries=3, backoff_factor=1.0)
-def generate_bio_with_chatgpt(researcher_full_name, university_affiliation, enriched_text_content):
+def get_llm_gateway_for_app():
     """
-    Generates a comprehensive academic biography using OpenAI GPT-4o-mini with enriched research data.
+    Returns the shared OpenAI gateway (rate limits, adaptive concurrency, priorities).
+
+    Returns:
+        LLMGateway: Gateway for the configured key, or None if no key is configured
+    """
+    if not openai_api_key:
+        return None
+    return get_llm_gateway(openai_api_key)
+
+BIO_MODEL = "gpt-4o-mini-2024-07-18"
+
+def build_bio_prompt(researcher_full_name, university_affiliation, enriched_text_content):
+    """
+    Builds the bio-generation prompt shared by the interactive and offline batch paths.
     
     Args:
-        researcher_full_name (str): Complete name of the researcher for bio personalization
-        university_affiliation (str): Institutional affiliation to include in biography
+        researcher_full_name (str): Complete name of the researcher
+        university_affiliation (str): Institutional affiliation
         enriched_text_content (str): Pre-compiled research information from web searches
         
     Returns:
-        str: Professionally formatted academic biography (typically 200-400 words) including
-             research interests, publications, achievements, and contact information when available
-             
-    Raises:
-        openai.OpenAIError: If API key is invalid or request fails
-        Exception: If response parsing fails or content generation errors occur
-        
-    Dependencies:
-        - Requires valid OpenAI API key in st.secrets["openai_api_key"]
-        - Uses GPT-4o-mini-2024-07-18 model for cost-effective generation
-        
-    Note:
-        Includes specific prompting for academic tone, factual accuracy, and professional formatting.
-        Output includes structured sections for research focus, achievements, and institutional context.
-        Token usage approximately 1000-2000 tokens per request depending on enriched content length.
+        str: Prompt text for the chat completion
     """
-    prompt = (
+    return (
         f"Create a professional biographical profile for {researcher_full_name}, who is affiliated with {university_affiliation}, based on the following information: {enriched_text_content}\n\n"
         "Important guidelines:\n"
         "1. Do NOT assume any titles (like Dr. or Professor) unless explicitly mentioned in the provided information\n"
@@ -453,31 +518,52 @@ def generate_bio_with_chatgpt(researcher_full_name, university_affiliation, enri
         "5. Keep the tone professional but factual, avoiding speculative or honorary language"
     
     )
-    try:
-        # Initialize the OpenAI client
-        openai_key = st.secrets.get("openai_api_key")
-        if not openai_key:
-            st.error("OpenAI API key is not configured. Please add 'openai_api_key' to Streamlit secrets.")
-            return [], ""
-        openai_client = OpenAI(api_key=openai_key)
-
-        # Generate response using the official OpenAI method
-        chat_response = openai_client.chat.completions.create(
-            model="gpt-4o-mini-2024-07-18",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        bio_results = chat_response.choices[0].message.content
 
-        return bio_results
-    except openai.OpenAIError as e:
-        st.error(f"OpenAI API error: {e}")
+def generate_bio_with_chatgpt(researcher_full_name, university_affiliation, enriched_text_content):
+    """
+    Generates a comprehensive academic biography using OpenAI GPT-4o-mini with enriched research data.
+    
+    Args:
+        researcher_full_name (str): Complete name of the researcher for bio personalization
+        university_affiliation (str): Institutional affiliation to include in biography
+        enriched_text_content (str): Pre-compiled research information from web searches
+        
+    Returns:
+        Optional[str]: Professionally formatted academic biography (typically 200-400 words) including
+             research interests, publications, achievements, and contact information when available;
+             None when no API key is configured or the response has no message
+             
+    Raises:
+        openai.OpenAIError: If the request still fails after the gateway's retries
+        BudgetExceededError: If the call would exceed the active spend limit
+        
+    Dependencies:
+        - Requires valid OpenAI API key in st.secrets["openai_api_key"]
+        - Uses GPT-4o-mini-2024-07-18 model for cost-effective generation
+        
+    Note:
+        Includes specific prompting for academic tone, factual accuracy, and professional formatting.
+        Output includes structured sections for research focus, achievements, and institutional context.
+        Token usage approximately 1000-2000 tokens per request depending on enriched content length.
+    """
+    prompt = build_bio_prompt(researcher_full_name, university_affiliation, enriched_text_content)
+    # Shared gateway: keeps concurrent rows inside the account's rate limits
+    llm_gateway = get_llm_gateway_for_app()
+    if llm_gateway is None:
+        st.error("OpenAI API key is not configured. Please add 'openai_api_key' to Streamlit secrets.")
         return None
-    except (KeyError, ValueError) as e:
+
+    # The gateway already retries rate limits and transient errors; anything it raises is
+    # final. BudgetExceededError propagates so the caller stops the run and reports the spend
+    chat_response = llm_gateway.chat_completion(
+        model=BIO_MODEL,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    try:
+        return chat_response.choices[0].message.content
+    except (AttributeError, IndexError) as e:
         st.error(f"Error processing API response: {e}")
         return None
-    except Exception as e:
-        st.error(f"Unexpected error generating bio with ChatGPT: {e}")
-        return None
 
 def extract_email(bio_content):
     """
@@ -497,6 +583,112 @@ def extract_email(bio_content):
     email_match = re.search(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", bio_content)
     return email_match.group() if email_match else "Email not found"
 
+def resolve_researchers(dataset_dataframe):
+    """
+    Groups rows that refer to the same person (spelling variants, titles, accents).
+    
+    Args:
+        dataset_dataframe (pd.DataFrame): Rows with 'Name' and 'University' columns
+        
+    Returns:
+        List[ResolvedEntity]: One entity per real person, with the rows it covers
+    """
+    entity_resolver = EntityResolver()
+    entity_resolver.add_dataframe(dataset_dataframe, "upload", name_column='Name', affiliation_column='University')
+    return entity_resolver.resolve()
+
+def entity_row_labels(resolved_entity, dataset_dataframe):
+    """Returns the DataFrame index labels of the rows merged into an entity."""
+    labels = {str(label): label for label in dataset_dataframe.index}
+    return [labels[member.row_id] for member in resolved_entity.members if member.row_id in labels]
+
+def batch_row_id(row_index):
+    """Returns the Batch API custom_id for a DataFrame row."""
+    return f"row-{row_index}"
+
+def submit_bio_batch(dataset_dataframe, use_local_transport=False, source_name=""):
+    """
+    Prepares a bio prompt for every row and submits them as one offline batch job.
+    
+    Args:
+        dataset_dataframe (pd.DataFrame): Rows with 'Name' and 'University' columns
+        use_local_transport (bool): Submit to the in-process mock instead of OpenAI
+        source_name (str): Uploaded file name, stored with the job
+        
+    Returns:
+        BatchJob: Submitted job; results are merged later with merge_bio_batch_results
+        
+    Raises:
+        BatchError: If the batch cannot be uploaded or created
+        ValueError: If no OpenAI key is configured for a real submission
+        
+    Note:
+        Web enrichment still runs now (concurrently, with searches prefetched);
+        only the LLM calls are deferred to the Batch API. Rows naming the same
+        person are resolved first, so each person costs one request.
+    """
+    # One request per real person; the merge copies each bio to all of that person's rows
+    batch_entities = resolve_researchers(dataset_dataframe)
+    prefetch_enrichment_searches([(entity.name, entity.affiliation) for entity in batch_entities])
+
+    def build_row_request(batch_entity):
+        researcher_name, researcher_university = batch_entity.name, batch_entity.affiliation
+        enriched_research_text = generate_enriched_text(researcher_name, researcher_university)
+        truncated_enriched_text = truncate_text(enriched_research_text or "", 100000)
+        return BatchRequest(
+            # Keyed by the person's first row; the merge re-resolves and fans out
+            custom_id=batch_row_id(entity_row_labels(batch_entity, dataset_dataframe)[0]),
+            body={
+                "model": BIO_MODEL,
+                "messages": [{"role": "user", "content": build_bio_prompt(researcher_name, researcher_university, truncated_enriched_text)}],
+            },
+        )
+
+    llm_gateway = get_llm_gateway_for_app()
+    if llm_gateway is not None:
+        batch_requests = llm_gateway.map(build_row_request, batch_entities)
+    else:
+        batch_requests = [build_row_request(batch_entity) for batch_entity in batch_entities]
+
+    batch_runner = BatchRunner(get_batch_transport(openai_api_key, local=use_local_transport))
+    return batch_runner.submit(
+        batch_requests,
+        metadata={"source": source_name[:64], "transport": "local" if use_local_transport else "openai"},
+    )
+
+def merge_bio_batch_results(dataset_dataframe, batch_results):
+    """
+    Writes finished batch completions back into the Bio and Email columns by row ID.
+    
+    Args:
+        dataset_dataframe (pd.DataFrame): The uploaded dataset (same rows as at submission)
+        batch_results (Dict[str, BatchResult]): Results keyed by custom_id
+        
+    Returns:
+        tuple: (merged_rows: int, failed_rows: Dict[str, str] of custom_id → error)
+        
+    Note:
+        Each request covered one person; its bio is copied to every row that
+        resolves to that person (resolution is deterministic for the same file).
+    """
+    merged_rows = 0
+    failed_rows = {}
+    for batch_entity in resolve_researchers(dataset_dataframe):
+        member_rows = entity_row_labels(batch_entity, dataset_dataframe)
+        custom_id = batch_row_id(member_rows[0])
+        batch_result = batch_results.get(custom_id)
+        if batch_result is None:
+            failed_rows[custom_id] = "Missing from batch output"
+        elif not batch_result.ok:
+            failed_rows[custom_id] = batch_result.error or "Empty completion"
+        else:
+            extracted_email = extract_email(batch_result.content)
+            for row_index in member_rows:
+                dataset_dataframe.at[row_index, 'Bio'] = batch_result.content
+                dataset_dataframe.at[row_index, 'Email'] = extracted_email
+            merged_rows += len(member_rows)
+    return merged_rows, failed_rows
+
 # App Title
 st.title("BioGen - Automated Bio Generator")
 
@@ -510,23 +702,24 @@ if uploaded_dataset:
         st.stop()
     else:
         st.success(validation_message)
-    # Load File
-    if uploaded_dataset.name.endswith(".csv"):
-        dataset_dataframe = pd.read_csv(uploaded_dataset)
-    else:
-        dataset_dataframe = pd.read_excel(uploaded_dataset)
+    # Load File (streamed; only the columns BioGen uses, headers normalised)
+    required_columns = ['Name', 'University']
+    try:
+        ingest_result = load_table(uploaded_dataset, required=required_columns, optional=('Bio', 'Email', 'Location'))
+    except IngestionError as e:
+        st.error(f"Could not read the uploaded file: {e}")
+        st.stop()
+    dataset_dataframe = ingest_result.dataframe
 
     st.write("### File Preview:")
     st.write(dataset_dataframe.head())
 
-    # If 'University' column is missing but 'Affiliation' exists, rename it
-    if 'University' not in dataset_dataframe.columns and 'Affiliation' in dataset_dataframe.columns:
-        dataset_dataframe.rename(columns={'Affiliation': 'University'}, inplace=True)
-        st.info("'Affiliation' column found and renamed to 'University' for processing.")
+    if ingest_result.renamed:
+        renamed_headers = ", ".join(f"'{original}' → '{canonical}'" for original, canonical in ingest_result.renamed.items())
+        st.info(f"Columns renamed for processing: {renamed_headers}")
 
     # Check if required columns are present
-    required_columns = ['Name', 'University']
-    if all(col in dataset_dataframe.columns for col in required_columns):
+    if ingest_result.ok:
         st.success("File contains the required columns for processing.")
 
         # Add a placeholder for the Bio column if not already present
@@ -536,7 +729,7 @@ if uploaded_dataset:
             dataset_dataframe['Email'] = ""
 
         # Specify Chunk Size
-        default_chunk_size = min(10, len(dataset_dataframe))
+        default_chunk_size = min(config.performance.biogen_chunk_size, len(dataset_dataframe))
         processing_chunk_size = st.number_input("Number of rows per chunk", min_value=1, max_value=len(dataset_dataframe), value=default_chunk_size)
 
         total_chunks = (len(dataset_dataframe) + processing_chunk_size - 1) // processing_chunk_size
@@ -548,43 +741,165 @@ if uploaded_dataset:
         st.write("### Current Chunk:")
         st.write(current_chunk_data)
 
-        if st.button("Generate Bios for Current Chunk"):
-            # Iterate through each row in the chunk
-            for data_index, data_row in current_chunk_data.iterrows():
-                researcher_name = data_row['Name']
-                researcher_university = data_row['University']
-
-                # Generate enriched text using DDGS
-                enriched_research_text = generate_enriched_text(researcher_name, researcher_university)
-
-                # Truncate enriched text to fit within token limit
-                max_token_limit = 100000  # Adjust this value based on your model's token limit
-                truncated_enriched_text = truncate_text(enriched_research_text, max_token_limit)
-
-                # Generate bio using ChatGPT
-                generated_bio_content = generate_bio_with_chatgpt(researcher_name, researcher_university, truncated_enriched_text)
-                if generated_bio_content:
-                    dataset_dataframe.at[data_index, 'Bio'] = generated_bio_content  # Update the bio column
+        # Calls that would take the chunk past this estimated spend are refused before they are sent
+        chunk_spend_limit = st.number_input(
+            "Spend limit for this chunk (USD, 0 for no limit)",
+            min_value=0.0, value=float(default_run_budget_usd() or 0.0), step=0.05, format="%.2f",
+        )
 
+        if st.button("Generate Bios for Current Chunk"):
+            chunk_budget = Budget(limit_usd=chunk_spend_limit or None, name=f"chunk {selected_chunk_index}")
+            # One trace per chunk: searches, page fetches and LLM calls nest under each person's span;
+            # token usage is attributed to the same chunk (the trace ID doubles as the job ID)
+            with span("bio.chunk", chunk_index=int(selected_chunk_index), rows=len(current_chunk_data)) as chunk_span, \
+                    usage_scope(page="BioGen", job=chunk_span.trace_id, chunk=int(selected_chunk_index)), \
+                    budget_scope(chunk_budget):
+                # Run the chunk's searches concurrently up front; rows then hit the cache
+                with span("search.prefetch"):
+                    prefetch_enrichment_searches(list(zip(current_chunk_data['Name'], current_chunk_data['University'])))
+
+                # Spelling variants of the same person are enriched once and share the bio
+                chunk_entities = resolve_researchers(current_chunk_data)
+
+                def generate_row_bio(chunk_entity):
+                    researcher_name = chunk_entity.name
+                    researcher_university = chunk_entity.affiliation
+
+                    with span("bio.generate", name=researcher_name, university=researcher_university, rows=len(chunk_entity.members)), \
+                            usage_scope(row=entity_row_labels(chunk_entity, current_chunk_data)[0]):
+                        # Generate enriched text using the (prefetched) Serper search
+                        enriched_research_text = generate_enriched_text(researcher_name, researcher_university)
+
+                        # Truncate enriched text to fit within token limit
+                        max_token_limit = 100000  # Adjust this value based on your model's token limit
+                        truncated_enriched_text = truncate_text(enriched_research_text or "", max_token_limit)
+
+                        # Generate bio using ChatGPT
+                        return generate_bio_with_chatgpt(researcher_name, researcher_university, truncated_enriched_text)
+
+                # Rows run concurrently; the LLM gateway decides how many calls are in flight
+                llm_gateway = get_llm_gateway_for_app()
+                if len(chunk_entities) < len(current_chunk_data):
+                    st.info(f"{len(current_chunk_data)} rows resolve to {len(chunk_entities)} people; each person is researched once.")
+                if llm_gateway is not None:
+                    generated_bios = llm_gateway.map(generate_row_bio, chunk_entities, return_exceptions=True)
+                else:
+                    generated_bios = [generate_row_bio(chunk_entity) for chunk_entity in chunk_entities]
+
+            refused_rows = [
+                entity_row_labels(chunk_entity, current_chunk_data)[0]
+                for chunk_entity, generated_bio_content in zip(chunk_entities, generated_bios)
+                if isinstance(generated_bio_content, BudgetExceededError)
+            ]
+            if refused_rows:
+                st.warning(
+                    f"Spend limit of ${chunk_spend_limit:.2f} reached: {len(refused_rows)} rows were not sent "
+                    f"(first: row {refused_rows[0]}). Raise the limit to finish this chunk."
+                )
+            st.caption(f"LLM spend for this chunk: ${chunk_budget.spent_usd:.4f} ({chunk_budget.tokens:,} tokens, {chunk_budget.requests} calls)")
+
+            for chunk_entity, generated_bio_content in zip(chunk_entities, generated_bios):
+                member_rows = entity_row_labels(chunk_entity, current_chunk_data)
+                if isinstance(generated_bio_content, BudgetExceededError):
+                    continue
+                if isinstance(generated_bio_content, Exception):
+                    st.error(f"Failed to generate bio for row {member_rows[0]}: {generated_bio_content}")
+                    continue
+                if generated_bio_content and isinstance(generated_bio_content, str):
                     # Extract email from the bio content
                     extracted_email = extract_email(generated_bio_content)
-                    dataset_dataframe.at[data_index, 'Email'] = extracted_email
-
-            # Display Updated Chunk
-            updated_chunk_display = dataset_dataframe.iloc[selected_chunk_index * processing_chunk_size:(selected_chunk_index + 1) * processing_chunk_size]
+                    for data_index in member_rows:
+                        dataset_dataframe.at[data_index, 'Bio'] = generated_bio_content  # Update the bio column
+                        dataset_dataframe.at[data_index, 'Email'] = extracted_email
+
+            # Generated bios are paid for: keep them across reruns (downloads rerun the script)
+            st.session_state['biogen_chunk_results'] = {
+                'file': uploaded_dataset.name,
+                'chunk_index': int(selected_chunk_index),
+                'data': dataset_dataframe.iloc[selected_chunk_index * processing_chunk_size:(selected_chunk_index + 1) * processing_chunk_size].copy(),
+                'trace': format_trace(get_tracer().last_trace("bio.chunk"), min_duration=0.01),
+            }
+
+        # Display Updated Chunk
+        chunk_results = st.session_state.get('biogen_chunk_results')
+        if chunk_results and chunk_results['file'] == uploaded_dataset.name and chunk_results['chunk_index'] == selected_chunk_index:
             st.write("### Updated Chunk with Bios:")
-            st.write(updated_chunk_display)
-
-            # Download Option
-            excel_output = BytesIO()
-            updated_chunk_display.to_excel(excel_output, index=False, engine='openpyxl')
-            excel_output.seek(0)
-            st.download_button(
-                label="Download Current Chunk as an Excel Sheet",
-                data=excel_output,
-                file_name=f"chunk_{selected_chunk_index}_bios.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            st.write(chunk_results['data'])
+
+            # Download Option (built once per chunk version, then served from cache)
+            render_download(
+                chunk_results['data'],
+                label="Download Current Chunk",
+                file_stem=f"chunk_{selected_chunk_index}_bios",
+                key="download-chunk",
             )
+
+            # Where the time went: searches, page fetches and LLM calls per person
+            with st.expander("Trace of this chunk", expanded=False):
+                st.code(chunk_results['trace'] or "No spans recorded.", language=None)
         st.info("Use the Chunk Index to process the next set of rows.")
+
+        # Offline mode: every row in one Batch API job, merged back by row ID
+        with st.expander("Offline Batch Mode (OpenAI Batch API)", expanded=False):
+            st.write(
+                "Generate bios for **all rows** as a single offline job. Completions arrive "
+                "within 24 hours at the Batch API's discounted price and do not use the "
+                "interactive rate limits. Keep this page's file uploaded to merge the results."
+            )
+            use_local_transport = st.checkbox("Dry run with the local mock transport (no OpenAI calls)")
+
+            if st.button("Prepare and Submit Batch for All Rows"):
+                try:
+                    with st.spinner(f"Preparing {len(dataset_dataframe)} prompts..."):
+                        bio_batch_job = submit_bio_batch(dataset_dataframe, use_local_transport, uploaded_dataset.name)
+                    st.session_state['biogen_batch_job_id'] = bio_batch_job.job_id
+                    st.session_state['biogen_batch_local'] = use_local_transport
+                    st.success(f"Submitted job {bio_batch_job.job_id} ({bio_batch_job.total_requests} requests in {len(bio_batch_job.batch_ids)} batch(es)).")
+                except (BatchError, ValueError) as e:
+                    st.error(f"Batch submission failed: {e}")
+
+            bio_batch_job_id = st.session_state.get('biogen_batch_job_id')
+            if bio_batch_job_id:
+                st.caption(f"Current job: {bio_batch_job_id}")
+                if st.button("Check Batch Status and Merge Results"):
+                    try:
+                        batch_runner = BatchRunner(get_batch_transport(openai_api_key, local=st.session_state.get('biogen_batch_local', False)))
+                        bio_batch_job = batch_runner.load_job(bio_batch_job_id)
+                        if bio_batch_job is None:
+                            st.error(f"Batch job {bio_batch_job_id} was not found.")
+                        else:
+                            # Single non-blocking status check; click again later if still running
+                            batch_objects = batch_runner.poll(bio_batch_job)
+                            batch_progress = batch_runner.progress(batch_objects)
+                            st.write(f"Status: {', '.join(sorted(set(bio_batch_job.statuses.values())))} — "
+                                     f"{batch_progress['completed']}/{batch_progress['total']} completed, {batch_progress['failed']} failed")
+                            if bio_batch_job.done:
+                                merged_rows, failed_rows = merge_bio_batch_results(
+                                    dataset_dataframe, batch_runner.results(bio_batch_job, batch_objects)
+                                )
+                                st.success(f"Merged {merged_rows} bios into the dataset.")
+                                if failed_rows:
+                                    st.warning(f"{len(failed_rows)} rows have no bio: {dict(list(failed_rows.items())[:10])}")
+                                # Kept across reruns so the download survives its own click
+                                st.session_state['biogen_batch_results'] = {'job_id': bio_batch_job_id, 'data': dataset_dataframe}
+                            else:
+                                st.info("The batch is still running. Check again later.")
+                    except (BatchError, ValueError) as e:
+                        st.error(f"Could not check the batch: {e}")
+                    except openai.OpenAIError as e:
+                        st.error(f"OpenAI API error: {e}")
+
+                batch_results = st.session_state.get('biogen_batch_results')
+                if batch_results and batch_results['job_id'] == bio_batch_job_id:
+                    st.write(batch_results['data'])
+                    render_download(
+                        batch_results['data'],
+                        label="Download All Rows",
+                        file_stem="batch_bios",
+                        key="download-batch",
+                    )
     else:
         st.error(f"Uploaded file must contain the following columns: {required_columns}")
+
+# Tail latencies, throughput and token spend of everything this session ran
+display_performance_dashboard()
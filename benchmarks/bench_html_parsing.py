@@ -0,0 +1,136 @@
+"""
+HTML parsing micro-benchmark
+============================
+
+Compares the previous page-level text extraction helpers (BeautifulSoup with
+'html.parser' and one find_all pass per concern) against
+con_research.src.modules.html_text on the saved fixture pages in
+benchmarks/fixtures/html.
+
+For each fixture and extraction profile it reports the best-of-N time per
+implementation and whether the output is identical to the legacy helper.
+
+Usage:
+    python benchmarks/bench_html_parsing.py [--repeat 20]
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from con_research.src.modules.html_text import (  # noqa: E402
+    BOILERPLATE_CLASS_PATTERN,
+    BOILERPLATE_TAGS,
+    SCRIPT_STYLE_TAGS,
+    available_backends,
+    html_to_text,
+)
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+# --- Legacy implementations, copied verbatim from the pages -----------------
+
+def legacy_readable_text(content: str) -> str:
+    """Web_Scraper.get_readable_text / ReadingListScraper.extract_text."""
+    soup = BeautifulSoup(content, 'html.parser')
+    for script in soup(['script', 'style']):
+        script.decompose()
+    text = soup.get_text(separator='\n', strip=True)
+    return re.sub(r'\n\s*\n', '\n\n', text)
+
+
+def legacy_course_text(content: str) -> str:
+    """CourseScraper.extract_text."""
+    soup = BeautifulSoup(content, 'html.parser')
+    for element in soup(['nav', 'footer', 'header', 'aside', 'script', 'style']):
+        element.decompose()
+    for element in soup.find_all(attrs={'class': re.compile(r'navigation|menu|footer|sidebar|banner', re.I)}):
+        element.decompose()
+    text = soup.get_text(separator='\n', strip=True)
+    return re.sub(r'\n\s*\n', '\n\n', text)
+
+
+def legacy_page_text(content: str) -> str:
+    """ContentScraper._scrape_text_from_url."""
+    soup = BeautifulSoup(content, "html.parser")
+    return soup.get_text(separator=" ", strip=True)
+
+
+# --- Profiles: legacy helper and the equivalent html_to_text call -----------
+
+PROFILES = {
+    "readable": (
+        legacy_readable_text,
+        lambda html, backend: html_to_text(html, separator='\n', strip_tags=SCRIPT_STYLE_TAGS, backend=backend),
+    ),
+    "course": (
+        legacy_course_text,
+        lambda html, backend: html_to_text(
+            html, separator='\n', strip_tags=BOILERPLATE_TAGS,
+            class_pattern=BOILERPLATE_CLASS_PATTERN, backend=backend,
+        ),
+    ),
+    "page": (
+        legacy_page_text,
+        lambda html, backend: html_to_text(
+            html, separator=" ", strip_tags=(), collapse_blank_lines=False, backend=backend,
+        ),
+    ),
+}
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall time of ``repeat`` single calls, in milliseconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    fixtures = sorted(FIXTURE_DIR.glob("*.html"))
+    if not fixtures:
+        print(f"❌ No fixtures found in {FIXTURE_DIR}")
+        return 1
+
+    backends = available_backends()
+    print(f"📊 HTML parsing benchmark — backends: {', '.join(backends)}; best of {args.repeat}\n")
+    header = f"{'fixture':<24}{'profile':<10}{'legacy ms':>10}" + "".join(f"{b + ' ms':>16}" for b in backends)
+    print(header + "  identical")
+    print("-" * (len(header) + 11))
+
+    mismatches = 0
+    for path in fixtures:
+        html = path.read_text(encoding="utf-8")
+        for profile, (legacy, current) in PROFILES.items():
+            expected = legacy(html)
+            row = f"{path.stem:<24}{profile:<10}{best_time(lambda: legacy(html), args.repeat):>10.2f}"
+            same = []
+            for backend in backends:
+                elapsed = best_time(lambda: current(html, backend), args.repeat)
+                row += f"{elapsed:>16.2f}"
+                if current(html, backend) == expected:
+                    same.append(backend)
+                else:
+                    mismatches += 1
+            print(f"{row}  {', '.join(same) or 'none'}")
+
+    print()
+    if mismatches:
+        print(f"⚠️  {mismatches} backend/profile combinations differ from the legacy output")
+        return 1
+    print("✅ All backends match the legacy output")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Main-content extraction benchmark
+=================================
+
+Measures how much text (and how many prompt tokens) each fixture page in
+benchmarks/fixtures/html contributes to an LLM prompt with the previous
+extraction — the text of every p/li/span/div joined, as BioGen's
+scrape_text_from_url did — and with readability.extract_main_content.
+
+Tokens are counted with tiktoken (cl100k_base) when installed, otherwise
+estimated as characters / 4.
+
+Usage:
+    python benchmarks/bench_main_content.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from con_research.src.modules.readability import extract_main_content  # noqa: E402
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_ENCODING.encode(text))
+except ImportError:
+    def count_tokens(text: str) -> int:
+        return len(text) // 4
+
+
+def legacy_scrape_text(content: str) -> str:
+    """Previous BioGen.scrape_text_from_url body extraction."""
+    soup = BeautifulSoup(content, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.decompose()
+    paragraphs = soup.find_all(['p', 'li', 'span', 'div'])
+    return ' '.join([para.get_text() for para in paragraphs])
+
+
+def main() -> int:
+    fixtures = sorted(FIXTURE_DIR.glob("*.html"))
+    if not fixtures:
+        print(f"❌ No fixtures found in {FIXTURE_DIR}")
+        return 1
+
+    print(f"📊 Prompt size per page ({'tiktoken' if 'tiktoken' in sys.modules else 'estimated'} tokens)\n")
+    print(f"{'fixture':<24}{'legacy tokens':>15}{'main tokens':>13}{'reduction':>11}{'extract ms':>12}")
+    print("-" * 75)
+    total_legacy = total_main = 0
+    for path in fixtures:
+        html = path.read_text(encoding="utf-8")
+        legacy_tokens = count_tokens(legacy_scrape_text(html))
+        start = time.perf_counter()
+        main_text = extract_main_content(html, separator=" ")
+        elapsed = (time.perf_counter() - start) * 1000
+        main_tokens = count_tokens(main_text)
+        total_legacy += legacy_tokens
+        total_main += main_tokens
+        print(f"{path.stem:<24}{legacy_tokens:>15,}{main_tokens:>13,}{1 - main_tokens / legacy_tokens:>11.0%}{elapsed:>12.1f}")
+
+    print("-" * 75)
+    print(f"{'total':<24}{total_legacy:>15,}{total_main:>13,}{1 - total_main / total_legacy:>11.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+"""
+Offline pipeline benchmark
+==========================
+
+Runs the application's pipelines end to end against local stub services
+(benchmarks/stubs.py) and recorded fixtures, so performance changes can be
+measured without API keys, network access or spend.
+
+Scenarios (each composes the same modules its page uses):
+- biogen:  Serper prefetch + per-row search, page fetch through the shared
+           HTTP session, main-content extraction, one chat completion per row
+- pdf:     text extraction of fixtures/pdf/participant_list.pdf, structured
+           extraction and correction per page (skipped when neither
+           pymupdf4llm nor pypdf/PyPDF2 is installed)
+- scraper: LinkCrawler over a stub conference programme, text extraction and
+           one structured extraction per session page
+- search:  DuckDuckGo searches through the search cache, cold then warm
+
+Each scenario runs in a fresh subprocess, so the reported peak RSS is its
+own, and reports rows/sec, p50/p95 row latency and peak RSS. The stub's LLM
+latency is configurable; the LLM gateway uses the current ``performance``
+configuration, so config changes show up in the numbers.
+
+Usage:
+    python benchmarks/bench_pipelines.py [scenario ...] [--rows 50] [--llm-latency 0.05]
+    python benchmarks/bench_pipelines.py --save benchmarks/baseline.json
+    python benchmarks/bench_pipelines.py --baseline benchmarks/baseline.json --tolerance 0.2
+
+With ``--baseline`` the exit status is 1 when any scenario is slower (rows/sec
+or p95) or larger (peak RSS) than the baseline by more than the tolerance.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from stubs import FIXTURE_DIR, FixtureDDGS, StubConfig, StubServer  # noqa: E402
+
+SCENARIOS = ("biogen", "pdf", "scraper", "search")
+BENCH_API_KEY = "sk-bench-offline"
+BENCH_MODEL = "gpt-4o-mini-2024-07-18"
+PDF_FIXTURE = FIXTURE_DIR / "pdf" / "participant_list.pdf"
+RESULT_PREFIX = "BENCH_RESULT "
+
+
+class ScenarioSkipped(Exception):
+    """Raised by a scenario whose optional dependency is not installed."""
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, None where unavailable."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def timed(func: Callable[[Any], Any]) -> Callable[[Any], float]:
+    """Wraps a per-row function so it returns its own latency in seconds."""
+    def run(item: Any) -> float:
+        start = time.perf_counter()
+        func(item)
+        return time.perf_counter() - start
+    return run
+
+
+# --- Scenarios (run in the worker process) ------------------------------------
+
+
+def scenario_biogen(rows: int, stub_url: str) -> List[float]:
+    """Enrichment search, page scraping and bio generation, as BioGen runs them."""
+    from con_research.src.modules.html_text import make_soup
+    from con_research.src.modules.llm_client import get_llm_gateway
+    from con_research.src.modules.readability import extract_main_content
+    from con_research.src.modules.resources import get_http_session
+    from con_research.src.modules.serper_client import SerperClient, get_serper_client
+
+    gateway = get_llm_gateway(BENCH_API_KEY)
+    serper = get_serper_client(BENCH_API_KEY, num_results=3, search_url=f"{stub_url}/search")
+    session = get_http_session()
+    researchers = [(f"Researcher {i}", f"University of Example {i % 7}") for i in range(rows)]
+
+    def query(researcher: Any) -> str:
+        name, university = researcher
+        return f"a professional bio and email for {name}, who is affiliated with {university}."
+
+    def generate(researcher: Any) -> None:
+        name, university = researcher
+        response = serper.search(query(researcher))
+        texts = []
+        for result in SerperClient.organic_results(response):
+            page = session.get(result["link"], timeout=15)
+            page.raise_for_status()
+            texts.append(f"{result['snippet']} {extract_main_content(make_soup(page.content), separator=' ')}")
+        # BioGen truncates to a token budget; characters / 4 stands in for tiktoken here
+        enriched = " ".join(" ".join(texts).split())[:400_000]
+        gateway.chat_completion(
+            model=BENCH_MODEL,
+            messages=[{
+                "role": "user",
+                "content": f"Create a professional biographical profile for {name}, who is affiliated with "
+                           f"{university}, based on the following information: {enriched}",
+            }],
+        )
+
+    start = time.perf_counter()
+    serper.search_many([query(r) for r in researchers], return_exceptions=True)
+    prefetch = time.perf_counter() - start
+    # The prefetch is shared by the whole batch; spread it over the rows
+    return [latency + prefetch / rows for latency in gateway.map(timed(generate), researchers)]
+
+
+def _pdf_page_texts(path: Path) -> List[str]:
+    """Per-page text with the best installed PDF library."""
+    try:
+        import pymupdf4llm
+        import fitz
+    except ImportError:
+        pass
+    else:
+        with fitz.open(str(path)) as document:
+            page_count = document.page_count
+        return [pymupdf4llm.to_markdown(str(path), pages=[number]) for number in range(page_count)]
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        try:
+            from PyPDF2 import PdfReader
+        except ImportError:
+            raise ScenarioSkipped("needs pymupdf4llm, pypdf or PyPDF2") from None
+    return [page.extract_text() or "" for page in PdfReader(str(path)).pages]
+
+
+def scenario_pdf(rows: int, stub_url: str) -> List[float]:
+    """PDF text extraction, then structured extraction and correction per page."""
+    from pydantic import BaseModel, Field
+
+    from con_research.src.modules.llm_client import get_llm_gateway
+
+    # Same response models as pages/5_PDF_Extractor.py
+    class ExtractedInfo(BaseModel):
+        name: str = Field(..., description="The name of the individual.")
+        university: str = Field(..., description="The name of the university.")
+        location: Optional[str] = Field(None, description="The country location of the university.")
+
+    class ExtractionResponse(BaseModel):
+        extracted_info: List[ExtractedInfo]
+
+    class CorrectionResponse(BaseModel):
+        corrected_info: List[ExtractedInfo]
+
+    gateway = get_llm_gateway(BENCH_API_KEY)
+    start = time.perf_counter()
+    page_texts = _pdf_page_texts(PDF_FIXTURE)
+    extraction = (time.perf_counter() - start) / len(page_texts)
+    # One row per page; the fixture's pages are cycled to reach the row count
+    pages = [page_texts[i % len(page_texts)] for i in range(rows)]
+
+    def process(text: str) -> None:
+        response = gateway.parse(
+            model=BENCH_MODEL,
+            messages=[
+                {"role": "system", "content": "Extract names, universities, and locations from the provided text."},
+                {"role": "user", "content": text},
+            ],
+            response_format=ExtractionResponse,
+        )
+        extracted = [item.model_dump() for item in response.choices[0].message.parsed.extracted_info]
+        gateway.parse(
+            model=BENCH_MODEL,
+            messages=[
+                {"role": "system", "content": "You are a corrector. Correct and clean the extracted information based on the original text."},
+                {"role": "user", "content": f"EXTRACTED DATA:\n{extracted}\n\nSOURCE TEXT:\n{text}"},
+            ],
+            response_format=CorrectionResponse,
+        )
+
+    return [latency + extraction for latency in gateway.map(timed(process), pages)]
+
+
+def scenario_scraper(rows: int, stub_url: str) -> List[float]:
+    """Crawl of a conference programme with one structured extraction per session page."""
+    from pydantic import BaseModel
+
+    from con_research.config.config_manager import get_performance_config
+    from con_research.src.modules.crawler import ConcurrentFetcher, LinkCrawler
+    from con_research.src.modules.html_text import html_to_text
+    from con_research.src.modules.llm_client import get_llm_gateway
+
+    class Presenter(BaseModel):
+        name: str
+        affiliation: str
+
+    class SessionPresenters(BaseModel):
+        presenters: List[Presenter]
+
+    settings = get_performance_config()
+    gateway = get_llm_gateway(BENCH_API_KEY)
+    latencies = []
+    with ConcurrentFetcher(max_workers=settings.crawler_max_workers, per_host_limit=settings.crawler_per_host_limit) as fetcher:
+        crawler = LinkCrawler(fetcher, target_patterns=r"session_\d+\.html$", max_depth=1, max_pages=rows + 1)
+        pages = [
+            page for page in crawler.crawl(f"{stub_url}/browse", parse_target=lambda soup, url: html_to_text(str(soup)))
+            if page.ok
+        ]
+
+    def extract(page: Any) -> None:
+        gateway.parse(
+            model=BENCH_MODEL,
+            messages=[
+                {"role": "system", "content": "Extract the presenters and their affiliations from this session page."},
+                {"role": "user", "content": page.data},
+            ],
+            response_format=SessionPresenters,
+        )
+
+    for page, latency in zip(pages, gateway.map(timed(extract), pages)):
+        latencies.append(page.elapsed + latency)
+    return latencies
+
+
+def scenario_search(rows: int, stub_url: str) -> List[float]:
+    """DuckDuckGo searches through the search cache: every query cold, then warm."""
+    from con_research.src.modules.search_cache import ddgs_text_search
+
+    ddgs = FixtureDDGS(latency=float(os.environ.get("BENCH_SEARCH_LATENCY", "0.02")))
+    queries = [f"comparative politics lecturer {i}" for i in range(rows)]
+    latencies = []
+    for _ in range(2):
+        for query in queries:
+            start = time.perf_counter()
+            ddgs_text_search(query, max_results=5, ddgs=ddgs)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+SCENARIO_FUNCTIONS: Dict[str, Callable[[int, str], List[float]]] = {
+    "biogen": scenario_biogen,
+    "pdf": scenario_pdf,
+    "scraper": scenario_scraper,
+    "search": scenario_search,
+}
+
+
+def run_worker(scenario: str, rows: int, stub_url: str) -> Dict[str, Any]:
+    """Runs one scenario in this process and summarises it."""
+    result: Dict[str, Any] = {"scenario": scenario}
+    start = time.perf_counter()
+    try:
+        latencies = SCENARIO_FUNCTIONS[scenario](rows, stub_url)
+    except ScenarioSkipped as e:
+        result["skipped"] = str(e)
+        return result
+    elapsed = time.perf_counter() - start
+    rss = peak_rss_mb()
+    result.update({
+        "rows": len(latencies),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "peak_rss_mb": round(rss, 1) if rss is not None else None,
+    })
+    return result
+
+
+# --- Orchestration (parent process) -------------------------------------------
+
+
+def run_scenario(scenario: str, args: argparse.Namespace, stub: StubServer) -> Dict[str, Any]:
+    """Runs a scenario in a fresh interpreter with isolated caches."""
+    with tempfile.TemporaryDirectory(prefix="bench-cache-") as cache_dir:
+        env = dict(os.environ)
+        env.update({
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")])),
+            "CONFERENCE_RESEARCH_CACHE_DIR": cache_dir,
+            "CONFERENCE_RESEARCH_CONFIG_WATCH_INTERVAL": "0",
+            "OPENAI_BASE_URL": stub.openai_base_url,
+            "BENCH_SEARCH_LATENCY": str(args.search_latency),
+        })
+        env.pop("CONFERENCE_RESEARCH_METRICS_PORT", None)
+        command = [sys.executable, str(Path(__file__).resolve()), "--worker", scenario,
+                   "--rows", str(args.rows), "--stub-url", stub.base_url]
+        completed = subprocess.run(command, env=env, capture_output=True, text=True, timeout=args.timeout)
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    error = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+    return {"scenario": scenario, "error": f"exit {completed.returncode}: {error}"}
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Lists regressions against a saved baseline.
+
+    Args:
+        results (List[Dict[str, Any]]): Current scenario results
+        baseline (Dict[str, Any]): Results saved with ``--save``, keyed by scenario
+        tolerance (float): Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        List[str]: One message per regressed metric
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result["scenario"])
+        if not base or "rows_per_sec" not in result or "rows_per_sec" not in base:
+            continue
+        name = result["scenario"]
+        if result["rows_per_sec"] < base["rows_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['rows_per_sec']} rows/s vs {base['rows_per_sec']} baseline")
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']} ms vs {base['p95_ms']} ms baseline")
+        if result.get("peak_rss_mb") and base.get("peak_rss_mb") and result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak RSS {result['peak_rss_mb']} MB vs {base['peak_rss_mb']} MB baseline")
+    return regressions
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'scenario':<10}{'rows':>6}{'seconds':>9}{'rows/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'peak RSS MB':>13}")
+    print("-" * 65)
+    for result in results:
+        name = result["scenario"]
+        if "skipped" in result:
+            print(f"{name:<10}  skipped: {result['skipped']}")
+        elif "error" in result:
+            print(f"{name:<10}  ❌ {result['error']}")
+        else:
+            rss = f"{result['peak_rss_mb']:.1f}" if result.get("peak_rss_mb") is not None else "n/a"
+            print(f"{name:<10}{result['rows']:>6}{result['seconds']:>9.2f}{result['rows_per_sec']:>9.1f}"
+                  f"{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{rss:>13}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmarks against local stub services.")
+    parser.add_argument("scenarios", nargs="*", metavar="scenario", help=f"One of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--rows", type=int, default=50, help="Rows (researchers, pages, queries) per scenario")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Stub chat completion latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.02, help="Extra random LLM latency, up to this many seconds")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of completions answered with a 429")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="Stub Serper/DDGS latency in seconds")
+    parser.add_argument("--http-latency", type=float, default=0.01, help="Stub page fetch latency in seconds")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds allowed per scenario")
+    parser.add_argument("--save", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (default 0.2)")
+    parser.add_argument("--worker", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--stub-url", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.scenarios) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    if args.rows < 1:
+        parser.error("--rows must be at least 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.worker:
+        print(RESULT_PREFIX + json.dumps(run_worker(args.worker, args.rows, args.stub_url)))
+        return 0
+
+    scenarios = args.scenarios or list(SCENARIOS)
+    config = StubConfig(
+        llm_latency=args.llm_latency,
+        llm_jitter=args.llm_jitter,
+        llm_rate_limit_rate=args.rate_limit_rate,
+        search_latency=args.search_latency,
+        http_latency=args.http_latency,
+    )
+    print(f"📊 Pipeline benchmark: {args.rows} rows, LLM latency {args.llm_latency * 1000:.0f} ms "
+          f"(+{args.llm_jitter * 1000:.0f} ms jitter)\n")
+    with StubServer(config, session_pages=max(args.rows, 40)) as stub:
+        results = [run_scenario(scenario, args, stub) for scenario in scenarios]
+    print_table(results)
+
+    if args.save:
+        args.save.write_text(json.dumps({r["scenario"]: r for r in results}, indent=2) + "\n", encoding="utf-8")
+        print(f"\n💾 Results saved to {args.save}")
+    failed = any("error" in result for result in results)
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print(f"\n❌ Regressions beyond {args.tolerance:.0%} of {args.baseline}:")
+            for message in regressions:
+                print(f"   - {message}")
+            return 1
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Benchmark stub services
+=======================
+
+Local stand-ins for the external services the pipelines call, so the
+benchmarks in this directory run offline and repeatably. One
+``ThreadingHTTPServer`` serves an OpenAI-compatible chat endpoint, a
+Serper-compatible search endpoint and the recorded HTML fixtures; a fixture
+DDGS client replays recorded DuckDuckGo results.
+
+Features:
+- ``POST /v1/chat/completions``: OpenAI-shaped completions with usage and
+  ``x-ratelimit-*`` headers; structured-output requests (``json_schema``
+  response formats) get a document generated from the schema, so
+  ``parse()`` validates
+- ``POST /search``: the recorded Serper response, with result links pointing
+  back at this server
+- ``GET /pages/<fixture>.html``: recorded pages from fixtures/html
+- ``GET /browse`` and ``GET /session_<n>.html``: a small conference
+  programme for the crawler scenario
+- Configurable latency and jitter per service, plus an optional share of
+  429 responses to exercise the LLM gateway's backoff
+
+Dependencies:
+- Standard library only
+"""
+
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+HTML_DIR = FIXTURE_DIR / "html"
+SEARCH_DIR = FIXTURE_DIR / "search"
+
+# Reported in x-ratelimit-* headers; high enough that the gateway's own
+# configured budget, not the stub, is what limits throughput
+STUB_RATE_LIMIT_REQUESTS = 100_000
+STUB_RATE_LIMIT_TOKENS = 100_000_000
+
+STUB_COMPLETION_TEXT = (
+    "Jane Doe is a Senior Lecturer in Comparative Politics at the University of Example. "
+    "Her research focuses on party systems, electoral behaviour and democratic backsliding in Europe. "
+    "She teaches undergraduate modules on comparative politics and research methods. "
+    "Email: jane.doe@example.ac.uk"
+)
+
+
+def _substitute(value: Any, replacements: Dict[str, str]) -> Any:
+    """Replaces ``{placeholder}`` markers in every string of a JSON document."""
+    if isinstance(value, str):
+        for marker, replacement in replacements.items():
+            value = value.replace("{" + marker + "}", replacement)
+        return value
+    if isinstance(value, list):
+        return [_substitute(item, replacements) for item in value]
+    if isinstance(value, dict):
+        return {key: _substitute(item, replacements) for key, item in value.items()}
+    return value
+
+
+def sample_from_schema(schema: Dict[str, Any], definitions: Optional[Dict[str, Any]] = None,
+                       array_items: int = 3, index: int = 0) -> Any:
+    """
+    Builds a document that validates against a (strict) JSON schema.
+
+    Covers what ``openai``'s ``to_strict_json_schema`` emits for pydantic
+    models: objects, arrays, ``$ref``/``$defs``, ``anyOf`` and scalars.
+
+    Args:
+        schema (Dict[str, Any]): JSON schema node
+        definitions (Dict[str, Any], optional): ``$defs`` of the root schema
+        array_items (int): Number of items generated per array
+        index (int): Position of the value in its parent array, to vary strings
+
+    Returns:
+        Any: Sample value
+    """
+    definitions = definitions if definitions is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return sample_from_schema(definitions[schema["$ref"].rsplit("/", 1)[-1]], definitions, array_items, index)
+    if "anyOf" in schema:
+        return sample_from_schema(schema["anyOf"][0], definitions, array_items, index)
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        return {
+            name: sample_from_schema(prop, definitions, array_items, index)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [sample_from_schema(schema.get("items", {}), definitions, array_items, i) for i in range(array_items)]
+    if kind == "integer":
+        return index + 1
+    if kind == "number":
+        return float(index + 1)
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    title = schema.get("title") or schema.get("description") or "value"
+    return f"Sample {title.split('.')[0].lower()} {index + 1}"
+
+
+class StubConfig:
+    """
+    Latency and failure settings of the stub services.
+
+    Attributes:
+        llm_latency (float): Seconds each chat completion takes
+        llm_jitter (float): Extra uniform random delay (0..jitter seconds)
+        llm_rate_limit_rate (float): Share of completions answered with a 429
+        search_latency (float): Seconds each Serper search takes
+        http_latency (float): Seconds each page fetch takes
+        completion_tokens (int): Completion tokens reported in usage
+    """
+
+    def __init__(self, llm_latency: float = 0.05, llm_jitter: float = 0.02, llm_rate_limit_rate: float = 0.0,
+                 search_latency: float = 0.02, http_latency: float = 0.01, completion_tokens: int = 120):
+        self.llm_latency = llm_latency
+        self.llm_jitter = llm_jitter
+        self.llm_rate_limit_rate = llm_rate_limit_rate
+        self.search_latency = search_latency
+        self.http_latency = http_latency
+        self.completion_tokens = completion_tokens
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, as the real services allow
+    server: "StubServer"
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def do_POST(self) -> None:
+        path = self.path.split("?", 1)[0]
+        payload = self._read_json()
+        if path.endswith("/chat/completions"):
+            self._chat_completion(payload)
+        elif path == "/search":
+            self._search(payload)
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown endpoint {path}"}})
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        config = self.server.config
+        time.sleep(config.http_latency)
+        if path == "/browse":
+            links = "\n".join(
+                f'<li><a href="/session_{i}.html">Panel {i}: Comparative Politics</a></li>'
+                for i in range(1, self.server.session_pages + 1)
+            )
+            body = f"<html><head><title>Programme</title></head><body><h1>Programme</h1><ul>{links}</ul></body></html>"
+            self._send(200, body.encode("utf-8"), "text/html; charset=utf-8")
+            return
+        if re.fullmatch(r"/session_\d+\.html", path):
+            self._send(200, self.server.page("conference_session.html"), "text/html; charset=utf-8")
+            return
+        match = re.fullmatch(r"/pages/([\w.-]+\.html)", path)
+        if match and (HTML_DIR / match.group(1)).is_file():
+            self._send(200, self.server.page(match.group(1)), "text/html; charset=utf-8")
+            return
+        self._send(404, b"Not found", "text/plain")
+
+    def _chat_completion(self, payload: Dict[str, Any]) -> None:
+        config = self.server.config
+        time.sleep(config.llm_latency + random.uniform(0, config.llm_jitter))
+        if config.llm_rate_limit_rate and random.random() < config.llm_rate_limit_rate:
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached (stub)", "type": "requests", "code": "rate_limit_exceeded"}},
+                {"retry-after-ms": "50"},
+            )
+            return
+
+        response_format = payload.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            content = json.dumps(sample_from_schema(response_format["json_schema"]["schema"]))
+        else:
+            content = STUB_COMPLETION_TEXT
+        prompt_chars = sum(len(str(message.get("content", ""))) for message in payload.get("messages", []))
+        prompt_tokens = max(1, prompt_chars // 4)
+        completion = {
+            "id": f"chatcmpl-stub-{self.server.next_id()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content, "refusal": None},
+                "logprobs": None,
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": config.completion_tokens,
+                "total_tokens": prompt_tokens + config.completion_tokens,
+            },
+        }
+        headers = {
+            "x-ratelimit-limit-requests": str(STUB_RATE_LIMIT_REQUESTS),
+            "x-ratelimit-remaining-requests": str(STUB_RATE_LIMIT_REQUESTS - 1),
+            "x-ratelimit-limit-tokens": str(STUB_RATE_LIMIT_TOKENS),
+            "x-ratelimit-remaining-tokens": str(STUB_RATE_LIMIT_TOKENS - prompt_tokens),
+        }
+        self._send_json(200, completion, headers)
+
+    def _search(self, payload: Dict[str, Any]) -> None:
+        time.sleep(self.server.config.search_latency)
+        response = _substitute(self.server.serper_fixture, {"query": str(payload.get("q", "")), "base_url": self.server.base_url})
+        self._send_json(200, response)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    The stub services on one local port, served from a daemon thread.
+
+    Example:
+        >>> with StubServer(StubConfig(llm_latency=0.2)) as stub:
+        ...     os.environ["OPENAI_BASE_URL"] = stub.openai_base_url
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0,
+                 session_pages: int = 40):
+        """
+        Binds the server (port 0 picks a free one); call ``start`` to serve.
+
+        Args:
+            config (StubConfig, optional): Latency settings
+            host (str): Bind address
+            port (int): Bind port
+            session_pages (int): Session pages linked from ``/browse``
+        """
+        super().__init__((host, port), _StubHandler)
+        self.config = config or StubConfig()
+        self.session_pages = session_pages
+        self.serper_fixture = json.loads((SEARCH_DIR / "serper.json").read_text(encoding="utf-8"))
+        self._pages: Dict[str, bytes] = {}
+        self._ids = itertools.count(1)
+        self._ids_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    @property
+    def search_url(self) -> str:
+        return f"{self.base_url}/search"
+
+    def page(self, name: str) -> bytes:
+        if name not in self._pages:
+            self._pages[name] = (HTML_DIR / name).read_bytes()
+        return self._pages[name]
+
+    def next_id(self) -> int:
+        with self._ids_lock:
+            return next(self._ids)
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="bench-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+class FixtureDDGS:
+    """
+    DDGS stand-in replaying the recorded results in fixtures/search/ddgs.json.
+
+    Attributes:
+        latency (float): Seconds each ``text`` call takes
+        calls (int): Number of searches served
+    """
+
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.calls = 0
+        self._results: List[Dict[str, Any]] = json.loads((SEARCH_DIR / "ddgs.json").read_text(encoding="utf-8"))
+
+    def text(self, query: str, max_results: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+        time.sleep(self.latency)
+        self.calls += 1
+        return [dict(result) for result in self._results[:max_results or len(self._results)]]
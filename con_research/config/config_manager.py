@@ -1,14 +1,29 @@
 """
 Configuration management system for Conference Research application.
 Provides centralized, environment-aware configuration with validation.
+
+Dotted keys are served from a flat lookup table rebuilt on every load, and
+the YAML files can be watched so edits are re-validated and swapped in
+atomically; subscribers are told which keys changed.
 """
 import os
+import threading
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from pydantic import BaseSettings, validator, Field
+from typing import Callable, Dict, Any, Iterable, Optional, List, Tuple
+from pydantic import BaseModel, validator, Field
 from enum import Enum
 
+try:
+    from pydantic_settings import BaseSettings
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        from pydantic import BaseSettings  # pydantic < 2
+    except ImportError:
+        # Without pydantic-settings the YAML files are still validated, but
+        # CONFERENCE_RESEARCH_* environment overrides are not read
+        BaseSettings = BaseModel
+
 
 class Environment(str, Enum):
     """Supported application environments."""
@@ -109,6 +124,66 @@ class LoggingConfig(BaseSettings):
         env_prefix = "CONFERENCE_RESEARCH_LOG_"
 
 
+class PerformanceConfig(BaseSettings):
+    """Throughput and resource settings for the hot paths.
+    
+    Values marked "live" are applied to running components when the YAML
+    files change; the others take effect for components created afterwards.
+    """
+    
+    # LLM gateway (live)
+    llm_rpm: int = Field(default=500, ge=1, le=100_000, description="OpenAI requests per minute until headers report the limit")
+    llm_tpm: int = Field(default=200_000, ge=1000, le=100_000_000, description="OpenAI tokens per minute until headers report the limit")
+    llm_initial_concurrency: int = Field(default=4, ge=1, le=256, description="LLM calls in flight at start")
+    llm_max_concurrency: int = Field(default=32, ge=1, le=256, description="Upper bound for the adaptive LLM concurrency")
+    
+    # Search
+    search_cache_ttl_hours: float = Field(default=24.0, ge=0.0, le=24 * 90, description="Default search cache lifetime (live)")
+    serper_max_concurrency: int = Field(default=8, ge=1, le=64, description="Serper queries in flight at once")
+    ddgs_max_results: int = Field(default=3, ge=1, le=25, description="DuckDuckGo results per Deep Research query")
+    ddgs_request_interval: float = Field(default=2.0, ge=0.0, le=30.0, description="Pause after each live DuckDuckGo request in seconds")
+    course_search_max_results: int = Field(default=5, ge=1, le=25, description="DuckDuckGo results when locating course pages")
+    
+    # HTTP and crawling
+    http_pool_connections: int = Field(default=16, ge=1, le=256, description="Hosts kept in the shared HTTP session pool")
+    http_pool_maxsize: int = Field(default=32, ge=1, le=512, description="Keep-alive connections per host in the shared session")
+    crawler_max_workers: int = Field(default=16, ge=1, le=128, description="Pages fetched at once by the crawler")
+    crawler_per_host_limit: int = Field(default=8, ge=1, le=64, description="Concurrent crawler requests per host")
+    
+    # Browsers (live)
+    driver_pool_size: int = Field(default=2, ge=0, le=16, description="Idle WebDrivers kept per pool")
+    driver_idle_timeout: float = Field(default=600.0, ge=0.0, le=86_400.0, description="Seconds before an idle WebDriver is quit")
+    
+    # Caches and batches
+    export_cache_mb: int = Field(default=128, ge=0, le=8192, description="Memory for cached export files (live)")
+    bio_batch_size: int = Field(default=8, ge=1, le=20, description="People per structured bio request")
+    biogen_chunk_size: int = Field(default=10, ge=1, le=10_000, description="Default rows per BioGen chunk")
+    
+    # RAG
+    rag_chunk_size: int = Field(default=1000, ge=100, le=20_000, description="Characters per RAG text chunk")
+    rag_chunk_overlap: int = Field(default=100, ge=0, le=5000, description="Characters shared by neighbouring RAG chunks")
+    rag_top_k: int = Field(default=3, ge=1, le=50, description="Chunks retrieved per RAG question")
+    
+    @validator('llm_max_concurrency')
+    def validate_llm_concurrency(cls, v, values):
+        """The adaptive limit must be able to reach its starting value."""
+        initial = values.get('llm_initial_concurrency')
+        if initial is not None and v < initial:
+            raise ValueError(f"llm_max_concurrency ({v}) must be at least llm_initial_concurrency ({initial})")
+        return v
+    
+    @validator('rag_chunk_overlap')
+    def validate_rag_overlap(cls, v, values):
+        """Overlap must be smaller than the chunk itself."""
+        chunk_size = values.get('rag_chunk_size')
+        if chunk_size is not None and v >= chunk_size:
+            raise ValueError(f"rag_chunk_overlap ({v}) must be smaller than rag_chunk_size ({chunk_size})")
+        return v
+    
+    class Config:
+        env_prefix = "CONFERENCE_RESEARCH_PERF_"
+
+
 class AppConfig(BaseSettings):
     """Main application configuration."""
     
@@ -121,6 +196,7 @@ class AppConfig(BaseSettings):
     webdriver: WebDriverConfig = Field(default_factory=WebDriverConfig)
     retry: RetryConfig = Field(default_factory=RetryConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
+    performance: PerformanceConfig = Field(default_factory=PerformanceConfig)
     
     # Feature flags
     enable_caching: bool = Field(default=False, description="Enable response caching")
@@ -138,6 +214,34 @@ class AppConfig(BaseSettings):
         return v
 
 
+# Seconds between checks of the YAML files; 0 disables hot reload
+CONFIG_WATCH_ENV_VAR = "CONFERENCE_RESEARCH_CONFIG_WATCH_INTERVAL"
+DEFAULT_WATCH_INTERVAL = 5.0
+
+# Called with the new configuration and {dotted key: (old value, new value)}
+ConfigCallback = Callable[[AppConfig, Dict[str, Tuple[Any, Any]]], None]
+
+
+def _field_names(model: BaseModel) -> Iterable[str]:
+    """Field names of a pydantic model (v2 ``model_fields`` or v1 ``__fields__``)."""
+    fields = getattr(type(model), "model_fields", None)
+    if fields is None:  # pragma: no cover - pydantic < 2
+        fields = type(model).__fields__
+    return fields.keys()
+
+
+def _flatten(model: BaseModel, prefix: str = "") -> Dict[str, Any]:
+    """Flattens a configuration model into {dotted key: value}, sections included."""
+    flat: Dict[str, Any] = {}
+    for name in _field_names(model):
+        key = f"{prefix}{name}"
+        value = getattr(model, name)
+        flat[key] = value
+        if isinstance(value, BaseModel):
+            flat.update(_flatten(value, prefix=f"{key}."))
+    return flat
+
+
 class ConfigManager:
     """Centralized configuration management."""
     
@@ -151,8 +255,14 @@ class ConfigManager:
         self.environment = self._detect_environment(environment)
         # Use repository-level config directory by default (e.g., /workspace/config)
         self.config_dir = config_dir or Path(__file__).resolve().parents[2] / "config"
-        self._config = None
+        # (config, flat lookup table) swapped as one reference so readers never see a mix
+        self._snapshot: Optional[Tuple[AppConfig, Dict[str, Any]]] = None
+        self._loaded_files: Optional[Tuple] = None
         self._secrets = None
+        self._lock = threading.RLock()
+        self._subscribers: List[Tuple[ConfigCallback, Tuple[str, ...]]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
     
     def _detect_environment(self, override: Optional[str] = None) -> Environment:
         """Detect current environment."""
@@ -171,16 +281,41 @@ class ConfigManager:
         # Default to development
         return Environment.DEVELOPMENT
     
-    def _load_yaml_config(self, filename: str) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
+    def _config_files(self) -> List[Path]:
+        """YAML files that make up the configuration, in merge order."""
+        return [self.config_dir / "base.yaml", self.config_dir / f"{self.environment.value}.yaml"]
+    
+    def _file_state(self) -> Tuple:
+        """Modification time and size of each configuration file (None if missing)."""
+        state = []
+        for path in self._config_files():
+            try:
+                stat = path.stat()
+                state.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                state.append(None)
+        return tuple(state)
+    
+    def _load_yaml_config(self, filename: str, strict: bool = False) -> Dict[str, Any]:
+        """Load configuration from YAML file.
+        
+        Args:
+            filename: File name inside the configuration directory
+            strict: Raise on unreadable or invalid YAML instead of returning {}
+        """
         config_path = self.config_dir / filename
         if not config_path.exists():
             return {}
         
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+                data = yaml.safe_load(f) or {}
+            if not isinstance(data, dict):
+                raise ValueError("top level must be a mapping")
+            return data
         except Exception as e:
+            if strict:
+                raise ValueError(f"Failed to load config from {config_path}: {e}") from e
             print(f"Warning: Failed to load config from {config_path}: {e}")
             return {}
     
@@ -196,45 +331,174 @@ class ConfigManager:
         
         return result
     
-    def load_config(self) -> AppConfig:
-        """Load and validate configuration from all sources."""
-        if self._config is not None:
-            return self._config
-        
+    def _build_config(self, strict: bool = False) -> AppConfig:
+        """Read, merge and validate base.yaml and the environment's YAML file."""
         # Load base configuration
-        base_config = self._load_yaml_config("base.yaml")
+        base_config = self._load_yaml_config("base.yaml", strict=strict)
         
         # Load environment-specific configuration
-        env_config = self._load_yaml_config(f"{self.environment.value}.yaml")
+        env_config = self._load_yaml_config(f"{self.environment.value}.yaml", strict=strict)
         
-        # Merge configurations (environment overrides base)
-        merged_config = self._merge_configs(base_config, env_config)
+        # Merge configurations (environment overrides base), then apply
+        # environment variables and validate
+        return AppConfig(**self._merge_configs(base_config, env_config))
+    
+    def _install(self, config: AppConfig, file_state: Tuple) -> Dict[str, Tuple[Any, Any]]:
+        """Swaps in a validated configuration and returns the leaf keys that changed."""
+        flat = _flatten(config)
+        previous = self._snapshot[1] if self._snapshot is not None else {}
+        changed = {
+            key: (previous.get(key), value)
+            for key, value in flat.items()
+            if not isinstance(value, BaseModel) and key in previous and previous[key] != value
+        }
+        self._snapshot = (config, flat)
+        self._loaded_files = file_state
+        return changed
+    
+    def load_config(self) -> AppConfig:
+        """Load and validate configuration from all sources."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot[0]
         
-        # Load from environment variables and validate
-        try:
-            self._config = AppConfig(**merged_config)
-        except Exception as e:
-            print(f"Configuration validation failed: {e}")
-            # Fall back to defaults
-            self._config = AppConfig()
+        with self._lock:
+            if self._snapshot is None:
+                file_state = self._file_state()
+                try:
+                    config = self._build_config()
+                except Exception as e:
+                    print(f"Configuration validation failed: {e}")
+                    # Fall back to defaults
+                    config = AppConfig()
+                self._install(config, file_state)
+            return self._snapshot[0]
+    
+    def reload(self, force: bool = False) -> bool:
+        """Re-read and re-validate the YAML files, notifying subscribers of changes.
+        
+        An invalid file (bad YAML or a value failing validation) is rejected
+        and the previous configuration stays in effect.
         
-        return self._config
+        Args:
+            force: Reload even if the files look unchanged
+            
+        Returns:
+            True if any configuration value changed
+        """
+        with self._lock:
+            if self._snapshot is None:
+                self.load_config()
+                return False
+            file_state = self._file_state()
+            if not force and file_state == self._loaded_files:
+                return False
+            try:
+                config = self._build_config(strict=True)
+            except Exception as e:
+                print(f"Warning: Configuration reload rejected, keeping previous settings: {e}")
+                # Do not retry the same broken files on every check
+                self._loaded_files = file_state
+                return False
+            changed = self._install(config, file_state)
+            if changed:
+                # Notified under the lock so subscribers see changes in order
+                self._notify(config, changed)
+            return bool(changed)
     
-    def get(self, key: str, default: Any = None) -> Any:
-        """Get configuration value by dot notation key."""
-        config = self.load_config()
+    def _notify(self, config: AppConfig, changed: Dict[str, Tuple[Any, Any]]) -> None:
+        for callback, prefixes in list(self._subscribers):
+            relevant = {
+                key: values for key, values in changed.items()
+                if not prefixes or any(key == prefix or key.startswith(f"{prefix}.") for prefix in prefixes)
+            }
+            if not relevant:
+                continue
+            try:
+                callback(config, relevant)
+            except Exception as e:
+                print(f"Warning: Configuration subscriber {callback!r} failed: {e}")
+    
+    def subscribe(self, callback: ConfigCallback, keys: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """Register a callback for configuration changes.
         
-        # Handle nested keys like 'api.openai_model'
-        keys = key.split('.')
-        value = config
+        Args:
+            callback: Called with the new AppConfig and {dotted key: (old, new)}
+            keys: Dotted keys or section prefixes (e.g. ``"retry"``) to watch;
+                every change is reported when omitted
+                
+        Returns:
+            Function that removes the subscription
+            
+        Note:
+            Subscribing the same callback with the same keys again is a no-op,
+            so components can subscribe each time they are created.
+        """
+        entry = (callback, tuple(keys or ()))
+        with self._lock:
+            if entry not in self._subscribers:
+                self._subscribers.append(entry)
         
-        for k in keys:
-            if hasattr(value, k):
-                value = getattr(value, k)
-            else:
-                return default
+        def unsubscribe() -> None:
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        
+        return unsubscribe
+    
+    def start_watching(self, interval: float = DEFAULT_WATCH_INTERVAL) -> bool:
+        """Start a daemon thread that reloads the YAML files when they change.
+        
+        A change is applied once the files have stayed the same for one full
+        interval, so a half-written file is never loaded.
         
-        return value
+        Args:
+            interval: Seconds between checks
+            
+        Returns:
+            True if a watcher was started, False if one is already running
+        """
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return False
+            self.load_config()
+            self._stop_watching.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name="config-watcher", daemon=True
+            )
+            self._watcher.start()
+            return True
+    
+    def stop_watching(self) -> None:
+        """Stop the file watcher, if running."""
+        self._stop_watching.set()
+        watcher = self._watcher
+        if watcher is not None and watcher is not threading.current_thread():
+            watcher.join()
+        self._watcher = None
+    
+    def _watch(self, interval: float) -> None:
+        pending = None
+        while not self._stop_watching.wait(interval):
+            try:
+                file_state = self._file_state()
+                if file_state == self._loaded_files:
+                    pending = None
+                elif file_state == pending:
+                    self.reload()
+                else:
+                    # Changed since the last check; wait until writes settle
+                    pending = file_state
+            except Exception as e:
+                print(f"Warning: Configuration watcher error: {e}")
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get configuration value by dot notation key (e.g. 'api.openai_model')."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.load_config()
+            snapshot = self._snapshot
+        return snapshot[1].get(key, default)
     
     def get_secret(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """Get secret value from environment or secrets management."""
@@ -278,14 +542,41 @@ class ConfigManager:
 
 # Global configuration manager instance
 _config_manager: Optional[ConfigManager] = None
+_config_manager_lock = threading.Lock()
+
+
+def _watch_interval(environment: Environment) -> float:
+    """Hot-reload interval from CONFERENCE_RESEARCH_CONFIG_WATCH_INTERVAL (off for tests)."""
+    try:
+        return float(os.environ[CONFIG_WATCH_ENV_VAR])
+    except (KeyError, ValueError):
+        return 0.0 if environment == Environment.TESTING else DEFAULT_WATCH_INTERVAL
 
 
 def get_config_manager() -> ConfigManager:
-    """Get the global configuration manager instance."""
+    """Get the global configuration manager instance.
+    
+    Created once per process (thread-safe); the configuration is loaded and,
+    unless disabled, the YAML file watcher is started on first use.
+    """
     global _config_manager
-    if _config_manager is None:
-        _config_manager = ConfigManager()
-    return _config_manager
+    manager = _config_manager
+    if manager is not None:
+        return manager
+    with _config_manager_lock:
+        if _config_manager is None:
+            manager = ConfigManager()
+            manager.load_config()
+            interval = _watch_interval(manager.environment)
+            if interval > 0:
+                manager.start_watching(interval)
+            _config_manager = manager
+        return _config_manager
+
+
+def subscribe(callback: ConfigCallback, keys: Optional[Iterable[str]] = None) -> Callable[[], None]:
+    """Register a change callback on the global configuration manager."""
+    return get_config_manager().subscribe(callback, keys)
 
 
 def get_config() -> AppConfig:
@@ -293,6 +584,11 @@ def get_config() -> AppConfig:
     return get_config_manager().load_config()
 
 
+def get_performance_config() -> PerformanceConfig:
+    """Get the current performance settings (reflects hot reloads)."""
+    return get_config().performance
+
+
 def get_secret(key: str, default: Optional[str] = None) -> Optional[str]:
     """Get a secret value."""
     return get_config_manager().get_secret(key, default)
@@ -0,0 +1,73 @@
+"""
+Async Utilities
+===============
+
+Bridges the synchronous Streamlit script thread and asyncio-based clients.
+A single event loop runs in a daemon thread for the life of the process, so
+async clients (and their connection pools) created on it survive Streamlit
+reruns instead of being rebuilt by ``asyncio.run`` on every call.
+
+Features:
+- Lazily started, process-wide background event loop
+- ``run_sync`` to execute a coroutine on that loop from any thread
+- Safe to call from inside a running loop (the work still runs on the background loop)
+- Context variables (e.g. the current tracing span) carry over to the loop thread
+
+Dependencies:
+- asyncio and threading from the standard library
+"""
+
+import asyncio
+import contextvars
+import threading
+from typing import Any, Awaitable, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the shared background event loop, starting it on first use.
+
+    Returns:
+        asyncio.AbstractEventLoop: Loop running forever in a daemon thread
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="async-background-loop", daemon=True)
+            thread.start()
+            _loop = loop
+        return _loop
+
+
+async def _run_in_context(coroutine: Awaitable[Any], context: contextvars.Context) -> Any:
+    # Tasks on the loop thread start from that thread's context; restore the caller's
+    for variable, value in context.items():
+        variable.set(value)
+    return await coroutine
+
+
+def run_sync(coroutine: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    Runs a coroutine on the background loop and waits for its result.
+
+    Args:
+        coroutine (Awaitable): Coroutine to execute
+        timeout (float, optional): Seconds to wait before giving up
+
+    Returns:
+        Any: The coroutine's return value
+
+    Raises:
+        concurrent.futures.TimeoutError: If ``timeout`` elapses (the coroutine is cancelled)
+        Exception: Whatever the coroutine raises
+    """
+    future = asyncio.run_coroutine_threadsafe(_run_in_context(coroutine, contextvars.copy_context()), get_background_loop())
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
@@ -0,0 +1,584 @@
+"""
+Batch Jobs Module
+=================
+
+Offline bulk LLM runs through the OpenAI Batch API. Prompts for a whole
+attendee list are written to a JSONL batch file, submitted once, polled, and
+the completions are merged back by row ID. Batch requests are billed at a
+discount and do not count against the interactive rate limits, which suits
+nightly runs over thousands of rows where latency does not matter.
+
+Features:
+- ``BatchRequest`` → JSONL input files in the Batch API format (``custom_id`` per row)
+- Pluggable transports: ``OpenAIBatchTransport`` for the real API and
+  ``LocalBatchTransport``, an in-process mock for tests and dry runs
+- ``BatchRunner`` to submit (sharding above the per-batch request limit),
+  poll without blocking, wait, and collect results keyed by ``custom_id``
+- Job records persisted under the cache directory so polling survives
+  Streamlit reruns and restarts
+
+Dependencies:
+- openai (only for ``OpenAIBatchTransport``)
+- con_research.src.modules.local_store for the job directory
+"""
+
+import json
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from con_research.src.modules.local_store import atomic_write_json, get_cache_dir, read_json
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+# Batch API limits per input file
+MAX_REQUESTS_PER_BATCH = 50000
+MAX_BATCH_FILE_BYTES = 200 * 1024 * 1024
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class BatchError(Exception):
+    """Raised when a batch cannot be submitted or its results cannot be read."""
+
+
+@dataclass
+class BatchRequest:
+    """
+    One request line of a batch input file.
+
+    Attributes:
+        custom_id (str): Caller's identifier (e.g. the DataFrame row ID), echoed in the output
+        body (Dict[str, Any]): Request body, e.g. ``{"model": ..., "messages": [...]}``
+        method (str): HTTP method of the request
+        url (str): API endpoint the request targets
+    """
+    custom_id: str
+    body: Dict[str, Any]
+    method: str = "POST"
+    url: str = CHAT_COMPLETIONS_ENDPOINT
+
+    def to_jsonl(self) -> str:
+        return json.dumps(
+            {"custom_id": self.custom_id, "method": self.method, "url": self.url, "body": self.body},
+            ensure_ascii=False,
+        )
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one request of a finished batch.
+
+    Attributes:
+        custom_id (str): Identifier of the request
+        content (str, optional): Assistant message content, if the request succeeded
+        status_code (int, optional): HTTP status of the individual request
+        error (str, optional): Error description for failed or missing requests
+        usage (Dict[str, int]): Token usage reported for the request
+    """
+    custom_id: str
+    content: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    usage: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.content is not None
+
+
+def write_batch_file(requests: Iterable[BatchRequest], path: Path) -> int:
+    """
+    Writes batch requests as a JSONL input file.
+
+    Args:
+        requests (Iterable[BatchRequest]): Requests; ``custom_id`` values must be unique
+        path (Path): Destination file
+
+    Returns:
+        int: Number of requests written
+
+    Raises:
+        ValueError: If a ``custom_id`` is repeated
+    """
+    seen = set()
+    count = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        for request in requests:
+            if request.custom_id in seen:
+                raise ValueError(f"Duplicate custom_id in batch: {request.custom_id}")
+            seen.add(request.custom_id)
+            handle.write(request.to_jsonl() + "\n")
+            count += 1
+    return count
+
+
+def parse_batch_output(text: str) -> Dict[str, BatchResult]:
+    """
+    Parses a Batch API output (or error) file.
+
+    Args:
+        text (str): JSONL content of the file
+
+    Returns:
+        Dict[str, BatchResult]: Results keyed by ``custom_id``
+    """
+    results: Dict[str, BatchResult] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = str(record.get("custom_id"))
+        result = BatchResult(custom_id=custom_id)
+        response = record.get("response") or {}
+        error = record.get("error")
+        result.status_code = response.get("status_code")
+        body = response.get("body") or {}
+        if error:
+            result.error = error.get("message") if isinstance(error, dict) else str(error)
+        elif result.status_code and result.status_code >= 400:
+            body_error = body.get("error") or {}
+            result.error = body_error.get("message") or f"HTTP {result.status_code}"
+        else:
+            choices = body.get("choices") or []
+            if choices:
+                result.content = (choices[0].get("message") or {}).get("content")
+            else:
+                result.error = "Response contained no choices"
+            result.usage = {k: v for k, v in (body.get("usage") or {}).items() if isinstance(v, int)}
+        results[custom_id] = result
+    return results
+
+
+class BatchTransport(ABC):
+    """
+    Interface between ``BatchRunner`` and a Batch API implementation.
+
+    Batch objects are plain dictionaries with at least ``id``, ``status``,
+    ``output_file_id``, ``error_file_id`` and ``request_counts``, matching the
+    shape returned by the OpenAI API.
+    """
+
+    @abstractmethod
+    def upload_file(self, path: Path) -> str:
+        """Upload a JSONL input file and return its file ID."""
+
+    @abstractmethod
+    def create_batch(self, input_file_id: str, endpoint: str, metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Start a batch over an uploaded file."""
+
+    @abstractmethod
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Return the current state of a batch."""
+
+    @abstractmethod
+    def download_file(self, file_id: str) -> str:
+        """Return the text content of an output or error file."""
+
+    @abstractmethod
+    def cancel_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Request cancellation of a running batch."""
+
+
+class OpenAIBatchTransport(BatchTransport):
+    """Transport backed by the OpenAI Files and Batches APIs."""
+
+    def __init__(self, client: Any):
+        """
+        Args:
+            client (openai.OpenAI): Configured OpenAI client
+        """
+        self.client = client
+
+    @staticmethod
+    def _as_dict(batch: Any) -> Dict[str, Any]:
+        return batch.model_dump() if hasattr(batch, "model_dump") else dict(batch)
+
+    def upload_file(self, path: Path) -> str:
+        with open(path, "rb") as handle:
+            return self.client.files.create(file=handle, purpose="batch").id
+
+    def create_batch(self, input_file_id: str, endpoint: str, metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        batch = self.client.batches.create(
+            input_file_id=input_file_id,
+            endpoint=endpoint,
+            completion_window=COMPLETION_WINDOW,
+            metadata=metadata or None,
+        )
+        return self._as_dict(batch)
+
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        return self._as_dict(self.client.batches.retrieve(batch_id))
+
+    def download_file(self, file_id: str) -> str:
+        return self.client.files.content(file_id).text
+
+    def cancel_batch(self, batch_id: str) -> Dict[str, Any]:
+        return self._as_dict(self.client.batches.cancel(batch_id))
+
+
+def echo_responder(body: Dict[str, Any]) -> str:
+    """Default ``LocalBatchTransport`` responder: echoes the last user message."""
+    messages = body.get("messages") or [{}]
+    return f"[mock completion] {str(messages[-1].get('content', ''))[:200]}"
+
+
+class LocalBatchTransport(BatchTransport):
+    """
+    In-process Batch API mock: no network, deterministic, thread-safe.
+
+    A batch moves validating → in_progress → completed over ``polls_to_complete``
+    calls to ``retrieve_batch``. Each request is answered by ``responder``;
+    exceptions it raises become per-request errors in the error file.
+
+    Example:
+        >>> transport = LocalBatchTransport(responder=lambda body: "Bio text")
+        >>> runner = BatchRunner(transport, work_dir=tmp_path)
+    """
+
+    def __init__(self, responder: Callable[[Dict[str, Any]], str] = echo_responder, polls_to_complete: int = 2):
+        """
+        Args:
+            responder (Callable[[Dict], str]): Produces the completion text for a request body
+            polls_to_complete (int): Status checks before a batch reports completion
+        """
+        self.responder = responder
+        self.polls_to_complete = polls_to_complete
+        self._files: Dict[str, str] = {}
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._polls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}-local-{uuid.uuid4().hex[:12]}"
+
+    def upload_file(self, path: Path) -> str:
+        file_id = self._new_id("file")
+        with self._lock:
+            self._files[file_id] = Path(path).read_text(encoding="utf-8")
+        return file_id
+
+    def create_batch(self, input_file_id: str, endpoint: str, metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        with self._lock:
+            if input_file_id not in self._files:
+                raise BatchError(f"Unknown input file: {input_file_id}")
+            total = sum(1 for line in self._files[input_file_id].splitlines() if line.strip())
+            batch = {
+                "id": self._new_id("batch"),
+                "status": "validating",
+                "endpoint": endpoint,
+                "input_file_id": input_file_id,
+                "output_file_id": None,
+                "error_file_id": None,
+                "created_at": int(time.time()),
+                "metadata": dict(metadata or {}),
+                "request_counts": {"total": total, "completed": 0, "failed": 0},
+            }
+            self._batches[batch["id"]] = batch
+            self._polls[batch["id"]] = 0
+            return dict(batch)
+
+    def _complete(self, batch: Dict[str, Any]) -> None:
+        outputs: List[str] = []
+        errors: List[str] = []
+        for line in self._files[batch["input_file_id"]].splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            record: Dict[str, Any] = {"id": self._new_id("req"), "custom_id": request["custom_id"]}
+            try:
+                content = self.responder(request["body"])
+            except Exception as e:
+                record.update(response=None, error={"code": "mock_error", "message": str(e)})
+                errors.append(json.dumps(record))
+                continue
+            record["error"] = None
+            record["response"] = {
+                "status_code": 200,
+                "request_id": record["id"],
+                "body": {
+                    "object": "chat.completion",
+                    "model": request["body"].get("model"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                },
+            }
+            outputs.append(json.dumps(record, ensure_ascii=False))
+        if outputs:
+            batch["output_file_id"] = self._new_id("file")
+            self._files[batch["output_file_id"]] = "\n".join(outputs) + "\n"
+        if errors:
+            batch["error_file_id"] = self._new_id("file")
+            self._files[batch["error_file_id"]] = "\n".join(errors) + "\n"
+        batch["request_counts"].update(completed=len(outputs), failed=len(errors))
+        batch["status"] = "completed"
+
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                raise BatchError(f"Unknown batch: {batch_id}")
+            if batch["status"] not in TERMINAL_STATUSES:
+                self._polls[batch_id] += 1
+                if self._polls[batch_id] >= self.polls_to_complete:
+                    self._complete(batch)
+                else:
+                    batch["status"] = "in_progress"
+            return json.loads(json.dumps(batch))
+
+    def download_file(self, file_id: str) -> str:
+        with self._lock:
+            if file_id not in self._files:
+                raise BatchError(f"Unknown file: {file_id}")
+            return self._files[file_id]
+
+    def cancel_batch(self, batch_id: str) -> Dict[str, Any]:
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                raise BatchError(f"Unknown batch: {batch_id}")
+            if batch["status"] not in TERMINAL_STATUSES:
+                batch["status"] = "cancelled"
+            return dict(batch)
+
+
+@dataclass
+class BatchJob:
+    """
+    Persisted record of a submitted job (one or more batches).
+
+    Attributes:
+        job_id (str): Local identifier of the job
+        batch_ids (List[str]): Batch API IDs, one per input shard
+        total_requests (int): Requests submitted across all shards
+        created_at (float): Submission time (epoch seconds)
+        statuses (Dict[str, str]): Last known status per batch
+        metadata (Dict[str, str]): Caller metadata (source file, model, ...)
+    """
+    job_id: str
+    batch_ids: List[str]
+    total_requests: int
+    created_at: float
+    statuses: Dict[str, str] = field(default_factory=dict)
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return bool(self.batch_ids) and all(self.statuses.get(b) in TERMINAL_STATUSES for b in self.batch_ids)
+
+
+class BatchRunner:
+    """
+    Submits batch jobs through a transport and collects their results.
+
+    Example:
+        >>> runner = BatchRunner(OpenAIBatchTransport(OpenAI(api_key=key)))
+        >>> job = runner.submit([BatchRequest("row-1", {"model": "gpt-4o-mini", "messages": [...]})])
+        >>> runner.poll(job)            # non-blocking status refresh
+        >>> results = runner.wait(job)  # or block until every shard finishes
+    """
+
+    def __init__(
+        self,
+        transport: BatchTransport,
+        work_dir: Optional[Path] = None,
+        max_requests_per_batch: int = MAX_REQUESTS_PER_BATCH,
+        max_file_bytes: int = MAX_BATCH_FILE_BYTES,
+    ):
+        """
+        Args:
+            transport (BatchTransport): Batch API implementation
+            work_dir (Path, optional): Where input files and job records live
+                (defaults to the "batches" cache directory)
+            max_requests_per_batch (int): Shard size limit in requests
+            max_file_bytes (int): Shard size limit in bytes
+        """
+        self.transport = transport
+        self.work_dir = Path(work_dir) if work_dir else get_cache_dir("batches")
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.max_requests_per_batch = max_requests_per_batch
+        self.max_file_bytes = max_file_bytes
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.work_dir / f"{job_id}.json"
+
+    def _save(self, job: BatchJob) -> None:
+        atomic_write_json(self._job_path(job.job_id), asdict(job))
+
+    def load_job(self, job_id: str) -> Optional[BatchJob]:
+        """Load a job record saved by ``submit``; None if it does not exist."""
+        data = read_json(self._job_path(job_id))
+        return BatchJob(**data) if data else None
+
+    def _shards(self, requests: Sequence[BatchRequest]) -> List[List[BatchRequest]]:
+        shards: List[List[BatchRequest]] = [[]]
+        size = 0
+        for request in requests:
+            line_size = len(request.to_jsonl().encode("utf-8")) + 1
+            current = shards[-1]
+            if current and (len(current) >= self.max_requests_per_batch or size + line_size > self.max_file_bytes):
+                shards.append([])
+                size = 0
+            shards[-1].append(request)
+            size += line_size
+        return [shard for shard in shards if shard]
+
+    def submit(self, requests: Sequence[BatchRequest], metadata: Optional[Dict[str, str]] = None) -> BatchJob:
+        """
+        Writes, uploads and starts the batches for a set of requests.
+
+        Args:
+            requests (Sequence[BatchRequest]): Requests with unique ``custom_id`` values
+            metadata (Dict[str, str], optional): Stored with the job and sent with each batch
+
+        Returns:
+            BatchJob: Saved job record
+
+        Raises:
+            ValueError: If there are no requests or ``custom_id`` values repeat
+            BatchError: If the transport rejects the upload or batch
+        """
+        if not requests:
+            raise ValueError("A batch needs at least one request")
+        job_id = f"job-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        job = BatchJob(job_id=job_id, batch_ids=[], total_requests=len(requests), created_at=time.time(), metadata=dict(metadata or {}))
+        seen = set()
+        for request in requests:
+            if request.custom_id in seen:
+                raise ValueError(f"Duplicate custom_id in batch: {request.custom_id}")
+            seen.add(request.custom_id)
+
+        for index, shard in enumerate(self._shards(requests)):
+            input_path = self.work_dir / f"{job_id}-{index:03d}.jsonl"
+            write_batch_file(shard, input_path)
+            try:
+                file_id = self.transport.upload_file(input_path)
+                batch = self.transport.create_batch(file_id, shard[0].url, {**job.metadata, "job_id": job_id})
+            except BatchError:
+                raise
+            except Exception as e:
+                raise BatchError(f"Failed to submit batch shard {index} of {job_id}: {e}") from e
+            job.batch_ids.append(batch["id"])
+            job.statuses[batch["id"]] = batch.get("status", "validating")
+            self._save(job)
+        return job
+
+    def poll(self, job: BatchJob) -> Dict[str, Dict[str, Any]]:
+        """
+        Refreshes the status of every unfinished batch of a job (non-blocking).
+
+        Args:
+            job (BatchJob): Job to refresh; its ``statuses`` are updated and saved
+
+        Returns:
+            Dict[str, Dict]: Latest batch objects keyed by batch ID
+        """
+        batches = {}
+        for batch_id in job.batch_ids:
+            batch = self.transport.retrieve_batch(batch_id)
+            job.statuses[batch_id] = batch.get("status", "unknown")
+            batches[batch_id] = batch
+        self._save(job)
+        return batches
+
+    def progress(self, batches: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Sum ``request_counts`` over the batches returned by ``poll``."""
+        totals = {"total": 0, "completed": 0, "failed": 0}
+        for batch in batches.values():
+            for key in totals:
+                totals[key] += int((batch.get("request_counts") or {}).get(key) or 0)
+        return totals
+
+    def results(self, job: BatchJob, batches: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, BatchResult]:
+        """
+        Downloads and merges the output and error files of a finished job.
+
+        Args:
+            job (BatchJob): Job whose batches have all reached a terminal status
+            batches (Dict, optional): Batch objects from ``poll`` (fetched if omitted)
+
+        Returns:
+            Dict[str, BatchResult]: Results keyed by ``custom_id``
+
+        Raises:
+            BatchError: If the job is not finished yet
+        """
+        batches = batches or {batch_id: self.transport.retrieve_batch(batch_id) for batch_id in job.batch_ids}
+        unfinished = [b for b, batch in batches.items() if batch.get("status") not in TERMINAL_STATUSES]
+        if unfinished:
+            raise BatchError(f"Job {job.job_id} still has running batches: {', '.join(unfinished)}")
+        merged: Dict[str, BatchResult] = {}
+        for batch in batches.values():
+            for key in ("output_file_id", "error_file_id"):
+                if batch.get(key):
+                    merged.update(parse_batch_output(self.transport.download_file(batch[key])))
+        return merged
+
+    def wait(
+        self,
+        job: BatchJob,
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+        on_status: Optional[Callable[[Dict[str, int]], None]] = None,
+    ) -> Dict[str, BatchResult]:
+        """
+        Blocks until every batch of a job finishes, then returns its results.
+
+        Args:
+            job (BatchJob): Submitted job
+            poll_interval (float): Seconds between status checks
+            timeout (float, optional): Give up after this many seconds
+            on_status (Callable, optional): Called with the progress totals after each poll
+
+        Returns:
+            Dict[str, BatchResult]: Results keyed by ``custom_id``
+
+        Raises:
+            TimeoutError: If ``timeout`` elapses first
+        """
+        started = time.monotonic()
+        while True:
+            batches = self.poll(job)
+            if on_status is not None:
+                on_status(self.progress(batches))
+            if job.done:
+                return self.results(job, batches)
+            if timeout is not None and time.monotonic() - started >= timeout:
+                raise TimeoutError(f"Batch job {job.job_id} did not finish within {timeout}s")
+            time.sleep(poll_interval)
+
+
+_local_transport: Optional[LocalBatchTransport] = None
+_local_transport_lock = threading.Lock()
+
+
+def get_batch_transport(api_key: Optional[str] = None, local: bool = False) -> BatchTransport:
+    """
+    Returns the transport for offline runs.
+
+    Args:
+        api_key (str, optional): OpenAI API key for the real Batch API
+        local (bool): Use the process-wide ``LocalBatchTransport`` (no network)
+
+    Returns:
+        BatchTransport: Transport instance
+
+    Raises:
+        ValueError: If the real API is requested without a key
+    """
+    global _local_transport
+    if local:
+        with _local_transport_lock:
+            if _local_transport is None:
+                _local_transport = LocalBatchTransport()
+            return _local_transport
+    if not api_key:
+        raise ValueError("An OpenAI API key is required for the Batch API")
+    from con_research.src.modules.resources import get_openai_client
+    return OpenAIBatchTransport(get_openai_client(api_key))
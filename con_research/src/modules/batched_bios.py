@@ -0,0 +1,200 @@
+"""
+Batched Bio Generation
+======================
+
+Packs several people into one structured-output LLM request instead of
+sending one request per row. Each request carries a list of
+``(row_id, name, university)`` records and returns a list of bios keyed by
+the same row IDs, so a file of hundreds of researchers needs tens of calls
+rather than hundreds, and the fixed instruction prompt is paid once per group.
+
+Features:
+- Pydantic response schema (``BatchedBioResponse``) used as ``response_format``
+- Groups of ``batch_size`` people run concurrently through the shared LLM gateway
+- Partial-failure handling: IDs missing from a response, or from a failed or
+  truncated request, are retried in smaller groups over several rounds
+- Unknown or duplicate row IDs in a response are ignored
+- A refused call (``BudgetExceededError``) stops the run instead of being retried
+- Progress callback for Streamlit progress bars
+
+Dependencies:
+- pydantic for the response schema
+- con_research.src.modules.llm_client for the gateway
+- con_research.src.modules.usage_accounting for spend limits
+"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from con_research.src.modules.llm_client import LLMGateway, Priority
+from con_research.src.modules.usage_accounting import BudgetExceededError
+
+# Structured outputs need gpt-4o-mini or later; the one-row-per-request path still uses gpt-3.5-turbo
+DEFAULT_BATCHED_MODEL = "gpt-4o-mini-2024-07-18"
+DEFAULT_BATCH_SIZE = 8
+# Completion budget per person in a group (a 100-200 word bio plus JSON overhead)
+TOKENS_PER_PERSON = 450
+
+DEFAULT_INSTRUCTIONS = (
+    "For each person in the JSON list, write a professional bio covering their research interests, "
+    "teaching interests, any paper titles they may have published, and contact information such as email. "
+    "Return exactly one entry per person, copying its row_id unchanged. Do not merge people or invent row IDs."
+)
+
+
+class PersonBio(BaseModel):
+    row_id: str = Field(..., description="The row_id of the person, copied unchanged from the input.")
+    bio: str = Field(..., description="Professional bio of the person.")
+
+
+class BatchedBioResponse(BaseModel):
+    bios: List[PersonBio]
+
+
+@dataclass
+class PersonRecord:
+    """
+    One person to describe.
+
+    Attributes:
+        row_id (str): Stable identifier used to merge the bio back (e.g. the DataFrame index)
+        name (str): Full name
+        university (str): Affiliation
+    """
+    row_id: str
+    name: str
+    university: str
+
+
+@dataclass
+class BatchedBioResult:
+    """
+    Outcome of ``generate_bios_batched``.
+
+    Attributes:
+        bios (Dict[str, PersonBio]): Generated bios keyed by row ID
+        missing (Dict[str, str]): Row IDs that never came back, with the last error seen
+        requests (int): LLM requests issued, retries included
+    """
+    bios: Dict[str, PersonBio] = field(default_factory=dict)
+    missing: Dict[str, str] = field(default_factory=dict)
+    requests: int = 0
+
+
+def chunk_records(records: Sequence[PersonRecord], batch_size: int) -> List[List[PersonRecord]]:
+    """Split records into groups of at most ``batch_size``."""
+    size = max(1, batch_size)
+    return [list(records[i:i + size]) for i in range(0, len(records), size)]
+
+
+def build_batch_messages(group: Sequence[PersonRecord], instructions: str = DEFAULT_INSTRUCTIONS) -> List[Dict[str, str]]:
+    """
+    Builds the chat messages for one group of people.
+
+    Args:
+        group (Sequence[PersonRecord]): People in the request
+        instructions (str): System instructions describing the bio to write
+
+    Returns:
+        List[Dict[str, str]]: System and user messages
+    """
+    people = [{"row_id": r.row_id, "name": r.name, "university": r.university} for r in group]
+    return [
+        {"role": "system", "content": instructions},
+        {"role": "user", "content": json.dumps(people, ensure_ascii=False)},
+    ]
+
+
+def generate_bios_batched(
+    llm_gateway: LLMGateway,
+    records: Sequence[PersonRecord],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    model: str = DEFAULT_BATCHED_MODEL,
+    instructions: str = DEFAULT_INSTRUCTIONS,
+    max_rounds: int = 3,
+    priority: Priority = Priority.BATCH,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> BatchedBioResult:
+    """
+    Generates bios for many people with one structured-output request per group.
+
+    Groups run concurrently through the gateway. After each round, row IDs that
+    are missing (request failed, response truncated, or entry omitted) are
+    regrouped at half the previous size and retried, up to ``max_rounds``.
+
+    Args:
+        llm_gateway (LLMGateway): Shared gateway (rate limits, concurrency, retries)
+        records (Sequence[PersonRecord]): People to describe; row IDs must be unique
+        batch_size (int): People per request in the first round
+        model (str): Model supporting structured outputs
+        instructions (str): System instructions for the bios
+        max_rounds (int): Rounds of retries for missing row IDs
+        priority (Priority): Gateway scheduling priority
+        on_progress (Callable[[int, int], None], optional): Called as
+            ``on_progress(done, total)`` from worker threads after each request
+
+    Returns:
+        BatchedBioResult: Bios keyed by row ID, plus any row IDs still missing
+
+    Raises:
+        ValueError: If row IDs repeat
+        BudgetExceededError: If the active spend limit refused a request; no
+            further rounds are sent
+    """
+    by_id = {record.row_id: record for record in records}
+    if len(by_id) != len(records):
+        raise ValueError("Row IDs must be unique")
+
+    result = BatchedBioResult()
+    last_error: Dict[str, str] = {}
+    progress_lock = threading.Lock()
+    pending = list(records)
+    size = batch_size
+
+    def run_group(group: List[PersonRecord]) -> Dict[str, PersonBio]:
+        response = llm_gateway.parse(
+            priority=priority,
+            model=model,
+            messages=build_batch_messages(group, instructions),
+            response_format=BatchedBioResponse,
+            max_tokens=TOKENS_PER_PERSON * len(group) + 200,
+        )
+        parsed = response.choices[0].message.parsed
+        wanted = {record.row_id for record in group}
+        found: Dict[str, PersonBio] = {}
+        for bio in (parsed.bios if parsed else []):
+            # Ignore IDs the model invented or repeated
+            if bio.row_id in wanted and bio.row_id not in found and bio.bio.strip():
+                found[bio.row_id] = bio
+        with progress_lock:
+            result.bios.update(found)
+            if on_progress is not None:
+                on_progress(len(result.bios), len(records))
+        return found
+
+    for _ in range(max(1, max_rounds)):
+        if not pending:
+            break
+        groups = chunk_records(pending, size)
+        outcomes = llm_gateway.map(run_group, groups, return_exceptions=True)
+        result.requests += len(groups)
+        refused = next((outcome for outcome in outcomes if isinstance(outcome, BudgetExceededError)), None)
+        if refused is not None:
+            # Not a per-row failure: retrying in smaller groups would only be refused again
+            raise refused
+        for group, outcome in zip(groups, outcomes):
+            for record in group:
+                if isinstance(outcome, Exception):
+                    last_error[record.row_id] = f"{type(outcome).__name__}: {outcome}"
+                elif record.row_id not in outcome:
+                    last_error[record.row_id] = "Omitted from the model response"
+        pending = [record for record in pending if record.row_id not in result.bios]
+        # Smaller groups are less likely to be truncated or to drop people
+        size = max(1, size // 2)
+
+    result.missing = {record.row_id: last_error.get(record.row_id, "Not attempted") for record in pending}
+    return result
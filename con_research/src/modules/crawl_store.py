@@ -0,0 +1,224 @@
+"""
+Crawl Fingerprint Store
+=======================
+
+Persistent per-URL fingerprints that make conference re-crawls incremental.
+Each page keeps its ETag, Last-Modified and content hash together with the
+records parsed from it, so unchanged pages are answered by a conditional GET
+(304) or a matching hash and never parsed again.
+
+Features:
+- Conditional request headers (If-None-Match / If-Modified-Since) per URL
+- Content hashing that ignores whitespace-only changes
+- Stored parsed records and outgoing links per page
+- Added/removed diff of records between two crawls
+
+Dependencies:
+- con_research.src.modules.local_store for the cache directory and atomic writes
+"""
+
+import hashlib
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from con_research.src.modules.local_store import atomic_write_json, get_cache_dir, read_json, stable_key
+
+STORE_VERSION = 1
+
+
+def content_hash(text: str) -> str:
+    """Return a SHA-256 hash of the text with whitespace runs collapsed."""
+    normalized = re.sub(r"\s+", " ", text or "").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PageFingerprint:
+    """
+    Validators and parsed output recorded for one URL.
+
+    Attributes:
+        url (str): Normalised page URL
+        etag (Optional[str]): ETag response header from the last full download
+        last_modified (Optional[str]): Last-Modified response header
+        content_hash (str): Hash of the page content (see ``content_hash``)
+        fetched_at (float): Unix timestamp of the last successful check
+        records (List[Dict[str, Any]]): Rows parsed from the page
+        links (List[str]): Outgoing links collected from the page, if any
+    """
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: str = ""
+    fetched_at: float = 0.0
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    links: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RecordDiff:
+    """
+    Difference between the records of two crawls.
+
+    Attributes:
+        added (List[Dict[str, Any]]): Records present now but not before
+        removed (List[Dict[str, Any]]): Records present before but not now
+        unchanged_count (int): Number of records present in both crawls
+    """
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged_count: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+def _record_key(record: Dict[str, Any], key_fields: Sequence[str]) -> Tuple[str, ...]:
+    """Case- and whitespace-insensitive identity of a record."""
+    return tuple(re.sub(r"\s+", " ", str(record.get(f, "") or "")).strip().casefold() for f in key_fields)
+
+
+def diff_records(
+    previous: Iterable[Dict[str, Any]],
+    current: Iterable[Dict[str, Any]],
+    key_fields: Sequence[str] = ("Name", "Affiliation"),
+) -> RecordDiff:
+    """
+    Compares two record sets by their key fields.
+
+    Args:
+        previous (Iterable[Dict]): Records from the earlier crawl
+        current (Iterable[Dict]): Records from the latest crawl
+        key_fields (Sequence[str]): Fields identifying a record; page-specific
+            fields such as 'Session Page' are deliberately left out so a
+            presenter moving between sessions is not reported as a change
+
+    Returns:
+        RecordDiff: Added and removed records (first occurrence of each key)
+    """
+    previous_by_key: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+    for record in previous:
+        previous_by_key.setdefault(_record_key(record, key_fields), record)
+    current_by_key: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+    for record in current:
+        current_by_key.setdefault(_record_key(record, key_fields), record)
+
+    return RecordDiff(
+        added=[r for k, r in current_by_key.items() if k not in previous_by_key],
+        removed=[r for k, r in previous_by_key.items() if k not in current_by_key],
+        unchanged_count=sum(1 for k in current_by_key if k in previous_by_key),
+    )
+
+
+class FingerprintStore:
+    """
+    JSON-backed store of PageFingerprint entries for one crawl source.
+
+    Reads are safe from worker threads; writes are expected from the thread
+    driving the crawl and only hit disk on ``save()``.
+
+    Attributes:
+        path (Path): JSON file holding the store
+    """
+
+    def __init__(self, path: Path):
+        """
+        Load an existing store file, or start empty.
+
+        Args:
+            path (Path): Location of the JSON file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._pages: Dict[str, PageFingerprint] = {}
+        raw = read_json(self.path, default={}) or {}
+        if raw.get("version") == STORE_VERSION:
+            for url, entry in raw.get("pages", {}).items():
+                try:
+                    self._pages[url] = PageFingerprint(**entry)
+                except TypeError:
+                    continue
+
+    @classmethod
+    def for_source(cls, source: str, namespace: str = "crawl") -> "FingerprintStore":
+        """
+        Opens the store for a crawl source such as a conference browse URL.
+
+        Args:
+            source (str): Identifier of the crawl (usually its start URL)
+            namespace (str): Cache sub-directory
+
+        Returns:
+            FingerprintStore: Store persisted under the application cache directory
+        """
+        return cls(get_cache_dir(namespace) / f"{stable_key(source)}.json")
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, url: str) -> Optional[PageFingerprint]:
+        """Return the fingerprint for a URL, if one is stored."""
+        with self._lock:
+            return self._pages.get(url)
+
+    def put(self, fingerprint: PageFingerprint) -> None:
+        """Insert or replace the fingerprint for ``fingerprint.url``."""
+        with self._lock:
+            self._pages[fingerprint.url] = fingerprint
+
+    def touch(self, url: str) -> None:
+        """Record that a stored page was re-validated without changes."""
+        with self._lock:
+            if url in self._pages:
+                self._pages[url].fetched_at = time.time()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Builds conditional request headers for a URL.
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since headers, empty
+            when nothing is stored for the URL
+        """
+        fingerprint = self.get(url)
+        headers: Dict[str, str] = {}
+        if fingerprint is not None:
+            if fingerprint.etag:
+                headers["If-None-Match"] = fingerprint.etag
+            if fingerprint.last_modified:
+                headers["If-Modified-Since"] = fingerprint.last_modified
+        return headers
+
+    def all_records(self, urls: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Return the stored records of the given URLs (all pages by default)."""
+        with self._lock:
+            pages = self._pages.values() if urls is None else [self._pages[u] for u in urls if u in self._pages]
+            return [record for page in pages for record in page.records]
+
+    def prune(self, keep_urls: Iterable[str]) -> int:
+        """
+        Drops pages that were not seen in the latest complete crawl.
+
+        Returns:
+            int: Number of entries removed
+        """
+        keep = set(keep_urls)
+        with self._lock:
+            stale = [url for url in self._pages if url not in keep]
+            for url in stale:
+                del self._pages[url]
+        return len(stale)
+
+    def save(self) -> None:
+        """Persist the store atomically."""
+        with self._lock:
+            payload = {
+                "version": STORE_VERSION,
+                "pages": {url: asdict(page) for url, page in self._pages.items()},
+            }
+        atomic_write_json(self.path, payload)
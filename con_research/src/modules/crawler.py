@@ -0,0 +1,728 @@
+"""
+Concurrent Page Crawler Module
+==============================
+
+Pooled, concurrent HTTP fetching for the conference scrapers of the Conference
+Research Application. Replaces one-connection-per-request ``requests.get`` loops
+with a shared ``requests.Session`` and a bounded worker pool.
+
+Features:
+- Connection pooling through a single ``requests.Session`` per crawler
+- Global worker limit plus a per-host concurrency limit to stay polite
+- Retry with decorrelated-jitter backoff for transient network errors, 429 and 5xx,
+  bounded by an optional per-URL deadline
+- Per-host circuit breakers: once a host keeps failing, its remaining URLs are
+  rejected immediately instead of each waiting out timeouts and retries
+- Results are parsed in the worker threads and yielded as soon as they arrive
+- Breadth-first, budgeted link crawler (max depth, max pages, URL patterns)
+- URL normalisation, robots.txt cache and a Bloom filter visited set
+- Incremental re-crawls with conditional GETs against a FingerprintStore
+
+Dependencies:
+- requests for HTTP transport and connection pooling
+- beautifulsoup4 for link extraction during crawls
+- concurrent.futures for the worker pool
+- con_research.src.modules.resilience for retry policy and circuit breakers
+- con_research.src.modules.tracing for per-fetch spans
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Sequence, Union
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from con_research.src.modules.crawl_store import FingerprintStore, PageFingerprint, content_hash
+from con_research.src.modules.resilience import CircuitBreaker, RetryPolicy, endpoint_for_url, get_breaker
+from con_research.src.modules.html_text import make_soup
+from con_research.src.modules.tracing import Span, bind_context, span
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+HeadersSpec = Union[Dict[str, str], Callable[[str], Dict[str, str]], None]
+
+# Status codes worth retrying: throttling and transient server failures
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Query parameters that never change page content and only fragment the visited set
+TRACKING_QUERY_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ref"})
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
+    """
+    Canonicalises a URL so that trivially different spellings share one key.
+
+    Args:
+        url (str): Absolute or relative URL
+        base_url (str, optional): Page the URL was found on, used to resolve relative links
+
+    Returns:
+        Optional[str]: Normalised absolute URL, or None for non-http(s) links
+            (mailto:, javascript:, tel:, ...) and malformed ones (bad port or
+            IPv6 host)
+
+    Note:
+        Lowercases scheme and host, drops default ports, fragments and tracking
+        parameters (utm_*, fbclid, ...), sorts the query string and collapses
+        an empty path to "/".
+    """
+    try:
+        if base_url:
+            url = urljoin(base_url, url.strip())
+        parsed = urlparse(url.strip())
+        scheme = parsed.scheme.lower()
+        if scheme not in DEFAULT_PORTS or not parsed.hostname:
+            return None
+        # Raises ValueError for ports such as ":abc" or ":99999"
+        port = parsed.port
+    except ValueError:
+        # One malformed href must not abort link extraction for the whole page
+        return None
+
+    host = parsed.hostname.lower()
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parsed.path or "/")
+    query_pairs = [
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_QUERY_PARAMS
+    ]
+    query = urlencode(sorted(query_pairs))
+    return urlunparse((scheme, netloc, path, "", query, ""))
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set used as the crawler's visited set.
+
+    Memory stays constant regardless of how many URLs are seen; membership
+    tests may return false positives at roughly ``error_rate`` but never
+    false negatives, so a URL is never fetched twice.
+
+    Attributes:
+        capacity (int): Expected number of distinct items
+        error_rate (float): Target false-positive probability at capacity
+        num_bits (int): Size of the bit array
+        num_hashes (int): Number of hash functions per item
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        """
+        Size the bit array for the requested capacity and error rate.
+
+        Raises:
+            ValueError: If capacity < 1 or error_rate is not in (0, 1)
+        """
+        if capacity < 1 or not (0 < error_rate < 1):
+            raise ValueError("capacity must be >= 1 and error_rate must be in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str) -> Iterator[int]:
+        """Derive bit positions with double hashing over one blake2b digest."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> bool:
+        """
+        Adds an item to the filter.
+
+        Returns:
+            bool: True if the item was (probably) new, False if already present
+        """
+        is_new = False
+        for position in self._positions(item):
+            byte_index, mask = position >> 3, 1 << (position & 7)
+            if not self._bits[byte_index] & mask:
+                self._bits[byte_index] |= mask
+                is_new = True
+        if is_new:
+            self._count += 1
+        return is_new
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class RobotsCache:
+    """
+    Per-origin cache of parsed robots.txt files.
+
+    Attributes:
+        user_agent (str): Agent name checked against robots rules
+        timeout (float): Timeout for robots.txt requests in seconds
+    """
+
+    def __init__(self, session: requests.Session, user_agent: str = "*", timeout: float = 10.0):
+        self.session = session
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._parsers: Dict[str, RobotFileParser] = {}
+        self._lock = threading.Lock()
+
+    def _parser_for(self, url: str) -> RobotFileParser:
+        """Fetch (once) and return the robots parser for the URL's origin."""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            parser = self._parsers.get(origin)
+        if parser is not None:
+            return parser
+
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            response = self.session.get(parser.url, timeout=self.timeout)
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(response.text.splitlines())
+        except requests.RequestException:
+            # Unreachable robots.txt: behave like a missing file
+            parser.allow_all = True
+
+        with self._lock:
+            self._parsers.setdefault(origin, parser)
+            return self._parsers[origin]
+
+    def allowed(self, url: str) -> bool:
+        """Return True if robots.txt permits fetching the URL."""
+        return self._parser_for(url).can_fetch(self.user_agent, url)
+
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of fetching (and optionally parsing) a single URL.
+
+    Attributes:
+        url (str): The URL that was requested
+        data (Any): Output of the parse callback, or the response when no parser is given
+        error (Optional[Exception]): Exception raised while fetching or parsing, if any
+        status_code (Optional[int]): Final HTTP status code, None if no response arrived
+        elapsed (float): Wall-clock seconds spent on the URL including retries
+        depth (int): Link distance from the crawl start page (0 outside crawls)
+        reused (bool): True when ``data`` came from a fingerprint store because
+            the page was unchanged (304 or identical content hash)
+    """
+    url: str
+    data: Any = None
+    error: Optional[Exception] = None
+    status_code: Optional[int] = None
+    elapsed: float = 0.0
+    depth: int = 0
+    reused: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True when the URL was fetched and parsed without error."""
+        return self.error is None
+
+
+class ConcurrentFetcher:
+    """
+    Thread-pooled HTTP fetcher with connection reuse, per-host limits and retries.
+
+    Attributes:
+        max_workers (int): Maximum number of URLs fetched at the same time
+        per_host_limit (int): Maximum concurrent requests against a single host
+        timeout (float): Per-request timeout in seconds
+        max_retries (int): Retry attempts after the first failed request
+        backoff_factor (float): Base delay in seconds for the jittered backoff
+        retry_policy (RetryPolicy): Backoff, cap and deadline applied to each URL
+        session (requests.Session): Shared session holding the connection pool
+
+    Example:
+        with ConcurrentFetcher(max_workers=16, per_host_limit=8) as fetcher:
+            for result in fetcher.fetch_all(urls, parse=lambda r: r.text):
+                print(result.url, result.ok)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        per_host_limit: int = 8,
+        timeout: float = 15.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        deadline: Optional[float] = None,
+        breaker_threshold: int = 5,
+        breaker_recovery: float = 60.0,
+        user_agent: str = DEFAULT_USER_AGENT,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Initialize the fetcher and its pooled session.
+
+        Args:
+            max_workers (int): Size of the worker pool
+            per_host_limit (int): Concurrent request cap per host name
+            timeout (float): Request timeout in seconds
+            max_retries (int): Number of retries for transient failures
+            backoff_factor (float): Base delay for the jittered backoff
+            max_backoff (float): Upper bound for a single backoff delay
+            deadline (float, optional): Overall seconds allowed per URL, retries included
+            breaker_threshold (int): Consecutive failures that open a host's breaker
+            breaker_recovery (float): Seconds before an open host is probed again
+            user_agent (str): User-Agent header sent with every request
+            session (requests.Session, optional): Existing session to reuse
+
+        Raises:
+            ValueError: If max_workers or per_host_limit is smaller than 1
+        """
+        if max_workers < 1 or per_host_limit < 1:
+            raise ValueError("max_workers and per_host_limit must be at least 1")
+
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries, base_delay=backoff_factor, max_delay=max_backoff, deadline=deadline
+        )
+        self.breaker_threshold = breaker_threshold
+        self.breaker_recovery = breaker_recovery
+
+        self._owns_session = session is None
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.setdefault("User-Agent", user_agent)
+
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+
+    def __enter__(self) -> "ConcurrentFetcher":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying session if this fetcher created it."""
+        if self._owns_session:
+            self.session.close()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Return the semaphore limiting concurrency for the URL's host."""
+        host = urlparse(url).netloc.lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+            return slot
+
+    def _host_breaker(self, url: str) -> CircuitBreaker:
+        """Return the shared circuit breaker for the URL's host."""
+        return get_breaker(
+            endpoint_for_url(url), failure_threshold=self.breaker_threshold, recovery_timeout=self.breaker_recovery
+        )
+
+    def _backoff_delay(self, backoff: float, response: Optional[requests.Response] = None) -> float:
+        """Compute the delay before the next attempt, honouring Retry-After."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return backoff
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Fetches a single URL with per-host limiting and retry on transient failures.
+
+        Args:
+            url (str): Absolute http(s) URL to fetch
+            headers (Dict[str, str], optional): Extra request headers
+
+        Returns:
+            requests.Response: The final response (status already checked)
+
+        Raises:
+            requests.HTTPError: If the final response has a 4xx/5xx status
+            requests.RequestException: If every attempt failed at the network level
+            CircuitOpenError: If the host's breaker is open
+        """
+        with span("http.fetch", url=url) as fetch_span:
+            response = self._fetch_with_retries(url, headers, fetch_span)
+            fetch_span.set_attributes({"http.status_code": response.status_code, "bytes": len(response.content)})
+            return response
+
+    def _fetch_with_retries(self, url: str, headers: Optional[Dict[str, str]], fetch_span: Span) -> requests.Response:
+        slot = self._host_slot(url)
+        breaker = self._host_breaker(url)
+        deadline = self.retry_policy.start_deadline()
+        delays = self.retry_policy.backoff()
+        for attempt in range(self.max_retries + 1):
+            breaker.before_call()
+            response = None
+            try:
+                with slot:
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                breaker.record_failure(e)
+                delay = self._backoff_delay(next(delays))
+                if attempt == self.max_retries or not deadline.allows(delay):
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    breaker.record_success()
+                    response.raise_for_status()
+                    return response
+                breaker.record_failure(requests.HTTPError(f"HTTP {response.status_code}", response=response))
+                delay = self._backoff_delay(next(delays), response)
+                if attempt == self.max_retries or not deadline.allows(delay):
+                    response.raise_for_status()
+                    return response
+            fetch_span.add_event("retry", {"attempt": attempt + 1, "delay_s": round(delay, 3)})
+            breaker.record_retry()
+            # Sleep outside the host slot so other workers can use the connection
+            time.sleep(delay)
+        raise requests.RequestException(f"Exhausted retries for {url}")
+
+    def _fetch_and_parse(
+        self,
+        url: str,
+        parse: Optional[Callable[[requests.Response], Any]],
+        headers: HeadersSpec,
+    ) -> FetchResult:
+        """Worker body: fetch, parse and wrap the outcome without raising."""
+        started = time.perf_counter()
+        result = FetchResult(url=url)
+        try:
+            request_headers = headers(url) if callable(headers) else headers
+            response = self.fetch(url, headers=request_headers)
+            result.status_code = response.status_code
+            result.data = parse(response) if parse else response
+        except requests.HTTPError as e:
+            result.status_code = e.response.status_code if e.response is not None else None
+            result.error = e
+        except Exception as e:
+            result.error = e
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def fetch_all(
+        self,
+        urls: Iterable[str],
+        parse: Optional[Callable[[requests.Response], Any]] = None,
+        headers: HeadersSpec = None,
+    ) -> Iterator[FetchResult]:
+        """
+        Fetches many URLs concurrently and yields results in completion order.
+
+        Args:
+            urls (Iterable[str]): URLs to fetch; duplicates are fetched once
+            parse (Callable, optional): Called with each response inside the worker
+                thread; its return value becomes ``FetchResult.data``
+            headers (Dict[str, str] or Callable[[str], Dict[str, str]], optional):
+                Extra headers for every request, or a function returning the
+                headers for a given URL (used for conditional requests)
+
+        Yields:
+            FetchResult: One result per unique URL, as soon as it is ready
+
+        Note:
+            Errors are captured on the result rather than raised so that one
+            broken page never aborts the whole crawl.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_urls))) as executor:
+            futures = [
+                executor.submit(bind_context(self._fetch_and_parse), url, parse, headers)
+                for url in unique_urls
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+PatternSpec = Union[str, Pattern[str], Sequence[Union[str, Pattern[str]]], None]
+
+
+def _compile_patterns(patterns: PatternSpec) -> List[Pattern[str]]:
+    """Accept a regex, a list of regexes or None and return compiled patterns."""
+    if patterns is None:
+        return []
+    if isinstance(patterns, (str, re.Pattern)):
+        patterns = [patterns]
+    return [re.compile(p) if isinstance(p, str) else p for p in patterns if p]
+
+
+@dataclass
+class CrawlStats:
+    """Running counters for a LinkCrawler run."""
+    pages_fetched: int = 0
+    targets_parsed: int = 0
+    errors: int = 0
+    skipped_robots: int = 0
+    skipped_budget: int = 0
+    max_depth_reached: int = 0
+    queued: int = 0
+    pages_unchanged: int = 0
+
+
+class PageOutcome(NamedTuple):
+    """Worker-side result of processing one crawled page."""
+    data: Any
+    links: List[str]
+    fingerprint: Optional[PageFingerprint] = None
+    reused: bool = False
+
+
+class LinkCrawler:
+    r"""
+    Breadth-first, budgeted crawler for multi-level conference programmes.
+
+    Starting from one page, links matching ``follow_patterns`` are explored
+    level by level (day → track → session ...) and every page whose URL
+    matches ``target_patterns`` is handed to a parse callback. Each level is
+    fetched concurrently through a ConcurrentFetcher.
+
+    Attributes:
+        fetcher (ConcurrentFetcher): Pooled fetcher used for every request
+        target_patterns (List[Pattern]): URL regexes of pages to parse
+        follow_patterns (List[Pattern]): URL regexes of pages whose links are explored
+        max_depth (int): Maximum link distance from the start page
+        max_pages (int): Maximum number of pages fetched in one crawl
+        same_host (bool): Restrict the crawl to the start page's host
+        stats (CrawlStats): Counters for the current/last crawl
+        fetched_urls (List[str]): Pages successfully fetched in the current/last crawl
+
+    Example:
+        with ConcurrentFetcher() as fetcher:
+            crawler = LinkCrawler(fetcher, target_patterns=r"session_.*\.html$",
+                                  follow_patterns=r"(day|track)_", max_depth=3)
+            for page in crawler.crawl(start_url, parse_target=parse_presenters):
+                rows.extend(page.data or [])
+    """
+
+    def __init__(
+        self,
+        fetcher: ConcurrentFetcher,
+        target_patterns: PatternSpec,
+        follow_patterns: PatternSpec = None,
+        max_depth: int = 2,
+        max_pages: int = 500,
+        same_host: bool = True,
+        respect_robots: bool = True,
+        bloom_capacity: int = 100_000,
+    ):
+        """
+        Configure the crawl scope and budget.
+
+        Args:
+            fetcher (ConcurrentFetcher): Fetcher providing session, pooling and retries
+            target_patterns: Regex (or list) matched with ``re.search`` against
+                normalised URLs of pages to parse
+            follow_patterns: Regex (or list) of pages whose links are followed;
+                the start page is always followed
+            max_depth (int): Maximum link depth, where the start page is depth 0
+            max_pages (int): Hard cap on pages fetched, including the start page
+            same_host (bool): Ignore links to other hosts
+            respect_robots (bool): Skip URLs disallowed by robots.txt
+            bloom_capacity (int): Expected number of distinct URLs seen
+
+        Raises:
+            ValueError: If max_depth < 0, max_pages < 1 or no target pattern is given
+        """
+        if max_depth < 0 or max_pages < 1:
+            raise ValueError("max_depth must be >= 0 and max_pages must be >= 1")
+        self.fetcher = fetcher
+        self.target_patterns = _compile_patterns(target_patterns)
+        if not self.target_patterns:
+            raise ValueError("At least one target pattern is required")
+        self.follow_patterns = _compile_patterns(follow_patterns)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.same_host = same_host
+        self.robots = RobotsCache(fetcher.session) if respect_robots else None
+        self.bloom_capacity = bloom_capacity
+        self.stats = CrawlStats()
+        self.fetched_urls: List[str] = []
+
+    def is_target(self, url: str) -> bool:
+        """Return True if the URL matches a target pattern."""
+        return any(p.search(url) for p in self.target_patterns)
+
+    def should_follow(self, url: str) -> bool:
+        """Return True if links on the URL's page should be explored."""
+        return any(p.search(url) for p in self.follow_patterns)
+
+    def _process_page(
+        self,
+        response: requests.Response,
+        depth: int,
+        parse_target: Callable[[BeautifulSoup, str], Any],
+        store: Optional[FingerprintStore],
+    ) -> PageOutcome:
+        """Worker-side parse: run the target parser and collect outgoing links."""
+        requested_url = response.history[0].url if response.history else response.url
+        url = normalize_url(requested_url) or requested_url
+        target = self.is_target(url)
+        follow = depth == 0 or self.should_follow(url)
+        explore = follow and depth < self.max_depth
+        if not (target or follow):
+            return PageOutcome(None, [])
+
+        previous = store.get(url) if store is not None else None
+        if previous is not None:
+            if response.status_code == 304:
+                return PageOutcome(previous.records if target else None, previous.links, reused=True)
+            page_hash = content_hash(response.text)
+            if page_hash == previous.content_hash:
+                return PageOutcome(previous.records if target else None, previous.links, reused=True)
+        else:
+            page_hash = content_hash(response.text) if store is not None else ""
+
+        soup = make_soup(response.text)
+        data = parse_target(soup, url) if target else None
+        links: List[str] = []
+        if explore:
+            for anchor in soup.find_all("a", href=True):
+                link = normalize_url(anchor["href"], base_url=response.url)
+                if link:
+                    links.append(link)
+
+        fingerprint = None
+        if store is not None:
+            fingerprint = PageFingerprint(
+                url=url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                content_hash=page_hash,
+                fetched_at=time.time(),
+                records=list(data or []) if target else [],
+                links=links,
+            )
+        return PageOutcome(data, links, fingerprint=fingerprint)
+
+    def _admit(self, url: str, depth: int, start_host: str, visited: BloomFilter) -> bool:
+        """Decide whether a link discovered at ``depth`` enters the next frontier."""
+        if self.same_host and urlparse(url).netloc != start_host:
+            return False
+        # Follow-only pages are useless once their links can no longer be explored
+        useful_hub = self.should_follow(url) and depth < self.max_depth
+        if not (self.is_target(url) or useful_hub):
+            return False
+        if not visited.add(url):
+            return False
+        if self.robots is not None and not self.robots.allowed(url):
+            self.stats.skipped_robots += 1
+            return False
+        return True
+
+    def crawl(
+        self,
+        start_url: str,
+        parse_target: Callable[[BeautifulSoup, str], Any],
+        store: Optional[FingerprintStore] = None,
+    ) -> Iterator[FetchResult]:
+        """
+        Crawls breadth-first from ``start_url`` and yields parsed target pages.
+
+        Args:
+            start_url (str): Programme/browse page to start from
+            parse_target (Callable[[BeautifulSoup, str], Any]): Called in the
+                worker thread for each target page with its soup and URL; must
+                return a list of records when a store is used
+            store (FingerprintStore, optional): Enables incremental re-crawls.
+                Known pages are requested conditionally and, when unchanged
+                (304 or same content hash), their stored records and links are
+                reused without parsing. New fingerprints are written to the
+                store; call ``store.save()`` afterwards to persist them.
+
+        Yields:
+            FetchResult: One result per target page (``data`` holds the parser
+            output); failed target fetches are yielded with ``error`` set
+
+        Raises:
+            ValueError: If start_url is not an http(s) URL
+        """
+        start = normalize_url(start_url)
+        if start is None:
+            raise ValueError(f"Invalid start URL: {start_url}")
+
+        self.stats = CrawlStats()
+        self.fetched_urls = []
+        if self.robots is not None and not self.robots.allowed(start):
+            self.stats.skipped_robots += 1
+            return
+        visited = BloomFilter(capacity=self.bloom_capacity)
+        visited.add(start)
+        start_host = urlparse(start).netloc
+        frontier = [start]
+        depth = 0
+
+        while frontier and self.stats.pages_fetched < self.max_pages:
+            remaining_budget = self.max_pages - self.stats.pages_fetched
+            if len(frontier) > remaining_budget:
+                self.stats.skipped_budget += len(frontier) - remaining_budget
+                frontier = frontier[:remaining_budget]
+            self.stats.queued = len(frontier)
+            self.stats.max_depth_reached = depth
+
+            next_frontier: List[str] = []
+            parse = partial(self._process_page, depth=depth, parse_target=parse_target, store=store)
+            headers = store.conditional_headers if store is not None else None
+            for result in self.fetcher.fetch_all(frontier, parse=parse, headers=headers):
+                self.stats.pages_fetched += 1
+                self.stats.queued -= 1
+                result.depth = depth
+                if not result.ok:
+                    self.stats.errors += 1
+                    if self.is_target(result.url):
+                        yield result
+                    continue
+
+                self.fetched_urls.append(result.url)
+                outcome = result.data
+                if outcome.reused:
+                    self.stats.pages_unchanged += 1
+                    store.touch(result.url)
+                elif outcome.fingerprint is not None:
+                    store.put(outcome.fingerprint)
+                for link in outcome.links:
+                    if self._admit(link, depth + 1, start_host, visited):
+                        next_frontier.append(link)
+                if self.is_target(result.url):
+                    self.stats.targets_parsed += 1
+                    result.data = outcome.data
+                    result.reused = outcome.reused
+                    yield result
+
+            frontier = next_frontier
+            depth += 1
@@ -0,0 +1,565 @@
+"""
+Entity Resolution Module
+========================
+
+Cross-file deduplication of researcher tables. PDF Extractor, Web_Scraper,
+Dynamic MultiPage and BioGen all produce Name/Affiliation rows, and the same
+person shows up with spelling variants ("J. García-Pérez, Univ. of Oxford" /
+"Jose Garcia Perez, University of Oxford"). Resolving them to one canonical
+record first means each real person is enriched once.
+
+Features:
+- Blocking keys (surname initial + affiliation token) so only plausible pairs are compared
+- Vectorised trigram cosine similarity per block (numpy matrix products)
+- Union-find clustering in which every pair of rows in a cluster must match
+  (given names exactly or as initials, distinctive affiliation words), so
+  near-misses cannot chain different people together
+- Rows without an affiliation join a cluster only when the match is unambiguous
+- Canonical records merged from the most complete members, with provenance
+  (source and row of every contributing row)
+- ``collapse_duplicates`` to deduplicate a table in place of ``drop_duplicates``
+- ``broadcast`` helper to copy per-person results (bios, emails) back to every row
+
+Dependencies:
+- numpy for the similarity matrices
+- pandas for table input/output
+- con_research.src.modules.people_index for name/affiliation normalisation
+"""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from con_research.src.modules.people_index import (
+    AFFILIATION_COLUMNS,
+    NAME_COLUMNS,
+    normalize_affiliation,
+    normalize_name,
+    trigrams,
+)
+
+# Affiliation words too common to identify an institution on their own
+GENERIC_AFFILIATION_TOKENS = frozenset({
+    "university", "college", "institute", "school", "department", "faculty", "centre", "center",
+    "national", "research", "sciences", "science", "technology", "hospital", "london", "state",
+})
+# Removed before affiliations are compared: "University of Oxford" and
+# "Oxford University" match, "Tsinghua University" and "Peking University" do not
+AFFILIATION_COMPARISON_STOPWORDS = frozenset({"university"})
+# Blocks larger than this are split by first-name initial to keep matrices small
+MAX_BLOCK_SIZE = 2000
+
+
+class DisjointSet:
+    """Union-find with path compression and union by size."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int) -> int:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+    def groups(self) -> Dict[int, List[int]]:
+        clusters: Dict[int, List[int]] = defaultdict(list)
+        for item in range(len(self.parent)):
+            clusters[self.find(item)].append(item)
+        return clusters
+
+
+@dataclass
+class Provenance:
+    """Where one row of a resolved entity came from."""
+    source: str
+    row_id: str
+    name: str
+    affiliation: str
+
+
+@dataclass
+class ResolvedEntity:
+    """
+    One real person after deduplication.
+
+    Attributes:
+        entity_id (str): Stable identifier within the resolution run ("E0001", ...)
+        name (str): Canonical name (the fullest spelling among the members)
+        affiliation (str): Canonical affiliation (likewise)
+        record (Dict[str, Any]): Merged non-identity fields (email, bio, ...), first
+            non-empty value per column taken from the most complete member onwards
+        members (List[Provenance]): Every input row resolved to this person
+    """
+    entity_id: str
+    name: str
+    affiliation: str
+    record: Dict[str, Any] = field(default_factory=dict)
+    members: List[Provenance] = field(default_factory=list)
+
+
+@dataclass
+class _Row:
+    source: str
+    row_id: str
+    name: str
+    affiliation: str
+    name_key: str
+    affiliation_key: str
+    record: Dict[str, Any]
+    identity_columns: Tuple[str, ...] = ()
+    name_grams: Set[str] = field(default_factory=set)
+    affiliation_grams: Set[str] = field(default_factory=set)
+
+
+def _is_blank(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value)) or (isinstance(value, str) and not value.strip())
+
+
+def _pick_column(columns: Iterable[str], candidates: Sequence[str]) -> Optional[str]:
+    lowered = {str(column).lower(): column for column in columns}
+    for candidate in candidates:
+        if candidate.lower() in lowered:
+            return lowered[candidate.lower()]
+    return None
+
+
+def blocking_keys(name_key: str, affiliation_key: str) -> List[str]:
+    """
+    Blocking keys for a normalised name/affiliation pair.
+
+    One key per distinctive affiliation token, prefixed with the surname
+    initial, plus a name-only key (surname and first-name initials) so rows
+    whose affiliation is missing or written differently still meet.
+
+    Example:
+        >>> blocking_keys("jose garcia perez", "university oxford")
+        ['p|oxford', 'p|~j']
+    """
+    words = name_key.split()
+    if not words:
+        return []
+    surname_initial = words[-1][0]
+    tokens = [t for t in affiliation_key.split() if t not in GENERIC_AFFILIATION_TOKENS and len(t) > 2]
+    return [f"{surname_initial}|{token}" for token in sorted(set(tokens))] + [f"{surname_initial}|~{words[0][0]}"]
+
+
+def _trigram_matrix(keys: Sequence[str]) -> np.ndarray:
+    """L2-normalised trigram incidence matrix (rows = keys)."""
+    vocabulary: Dict[str, int] = {}
+    rows: List[List[int]] = []
+    for key in keys:
+        rows.append([vocabulary.setdefault(gram, len(vocabulary)) for gram in trigrams(key)])
+    matrix = np.zeros((len(keys), max(1, len(vocabulary))), dtype=np.float32)
+    for index, columns in enumerate(rows):
+        if columns:
+            matrix[index, columns] = 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def comparison_affiliation(affiliation_key: str) -> str:
+    """
+    Distinctive part of a normalised affiliation, used for similarity.
+
+    Example:
+        >>> comparison_affiliation("university oxford")
+        'oxford'
+    """
+    tokens = [t for t in affiliation_key.split() if t not in AFFILIATION_COMPARISON_STOPWORDS]
+    return " ".join(tokens) if tokens else affiliation_key
+
+
+def given_names_compatible(key_a: str, key_b: str) -> bool:
+    """
+    Given names must be the same word, or one must be an initial of the other.
+
+    "j garcia" ~ "jose garcia", but not "daniel lee" ~ "danielle lee" or
+    "maria garcia" ~ "mario garcia".
+    """
+    words_a, words_b = key_a.split(), key_b.split()
+    if not words_a or not words_b:
+        return False
+    given_a, given_b = words_a[0], words_b[0]
+    if given_a == given_b:
+        return True
+    if len(given_a) == 1 or len(given_b) == 1:
+        return given_a[0] == given_b[0]
+    return False
+
+
+def _cosine(grams_a: Set[str], grams_b: Set[str]) -> float:
+    """Trigram cosine, the same measure as the block similarity matrices."""
+    if not grams_a or not grams_b:
+        return 0.0
+    return len(grams_a & grams_b) / math.sqrt(len(grams_a) * len(grams_b))
+
+
+class EntityResolver:
+    """
+    Resolves rows from several tables to real people.
+
+    Example:
+        >>> resolver = EntityResolver()
+        >>> resolver.add_dataframe(pdf_df, "programme.pdf")
+        >>> resolver.add_dataframe(scraped_df, "conference site")
+        >>> entities = resolver.resolve()
+        >>> canonical_df = resolver.to_dataframe(entities)
+    """
+
+    def __init__(self, name_threshold: float = 0.8, affiliation_threshold: float = 0.5):
+        """
+        Args:
+            name_threshold (float): Minimum trigram cosine between names to link two rows
+            affiliation_threshold (float): Minimum cosine between the distinctive
+                affiliation words; a row with an empty affiliation is linked on the
+                name alone, and only when it matches exactly one affiliated person
+        """
+        self.name_threshold = name_threshold
+        self.affiliation_threshold = affiliation_threshold
+        self._rows: List[_Row] = []
+
+    def add_records(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        source: str,
+        name_column: Optional[str] = None,
+        affiliation_column: Optional[str] = None,
+    ) -> int:
+        """
+        Adds rows (dictionaries) from one source.
+
+        Args:
+            records (Iterable[Mapping]): Rows; the row ID is the position in the iterable
+            source (str): Source label kept in the provenance
+            name_column (str, optional): Name field (auto-detected: Name, name, Full Name)
+            affiliation_column (str, optional): Affiliation field (auto-detected:
+                University, Affiliation, Institution, any case)
+
+        Returns:
+            int: Rows added (rows without a name are skipped)
+        """
+        return self._add(list(enumerate(records)), source, name_column, affiliation_column)
+
+    def add_dataframe(
+        self,
+        dataframe: pd.DataFrame,
+        source: str,
+        name_column: Optional[str] = None,
+        affiliation_column: Optional[str] = None,
+    ) -> int:
+        """Adds the rows of a DataFrame; row IDs are the DataFrame index labels."""
+        records = dataframe.to_dict(orient="records")
+        return self._add(list(zip(dataframe.index, records)), source, name_column, affiliation_column)
+
+    def _add(self, rows: List[Tuple[Any, Mapping[str, Any]]], source: str, name_column: Optional[str], affiliation_column: Optional[str]) -> int:
+        if not rows:
+            return 0
+        columns = list(rows[0][1].keys())
+        name_column = name_column or _pick_column(columns, NAME_COLUMNS + ("Full Name",))
+        affiliation_column = affiliation_column or _pick_column(columns, AFFILIATION_COLUMNS)
+        if name_column is None:
+            raise ValueError(f"No name column found in {source}; expected one of {list(NAME_COLUMNS)}")
+        added = 0
+        for row_id, record in rows:
+            name = record.get(name_column)
+            if _is_blank(name):
+                continue
+            affiliation = record.get(affiliation_column) if affiliation_column else ""
+            affiliation = "" if _is_blank(affiliation) else str(affiliation)
+            name_key = normalize_name(name)
+            affiliation_key = normalize_affiliation(affiliation)
+            self._rows.append(_Row(
+                source=source,
+                row_id=str(row_id),
+                name=str(name).strip(),
+                affiliation=affiliation.strip(),
+                name_key=name_key,
+                affiliation_key=affiliation_key,
+                record=dict(record),
+                identity_columns=tuple(c for c in (name_column, affiliation_column) if c),
+                name_grams=trigrams(name_key),
+                affiliation_grams=trigrams(comparison_affiliation(affiliation_key)),
+            ))
+            added += 1
+        return added
+
+    def _blocks(self) -> List[List[int]]:
+        blocks: Dict[str, List[int]] = defaultdict(list)
+        for index, row in enumerate(self._rows):
+            for key in blocking_keys(row.name_key, row.affiliation_key):
+                blocks[key].append(index)
+        result: List[List[int]] = []
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            if len(members) <= MAX_BLOCK_SIZE:
+                result.append(members)
+                continue
+            by_initial: Dict[str, List[int]] = defaultdict(list)
+            for index in members:
+                by_initial[self._rows[index].name_key[:1]].append(index)
+            result.extend(group for group in by_initial.values() if len(group) > 1)
+        return result
+
+    def _candidate_pairs(self, members: List[int]) -> List[Tuple[float, int, int]]:
+        """Pairs of a block whose names and (present) affiliations are similar enough."""
+        rows = [self._rows[index] for index in members]
+        names = _trigram_matrix([row.name_key for row in rows])
+        affiliations = _trigram_matrix([comparison_affiliation(row.affiliation_key) for row in rows])
+        name_similarity = names @ names.T
+        affiliation_similarity = affiliations @ affiliations.T
+        has_affiliation = np.array([bool(row.affiliation_key) for row in rows])
+        # An empty affiliation neither confirms nor contradicts a match
+        affiliation_ok = (affiliation_similarity >= self.affiliation_threshold) | ~(has_affiliation[:, None] & has_affiliation[None, :])
+        candidates = np.argwhere(np.triu((name_similarity >= self.name_threshold) & affiliation_ok, k=1))
+        return [
+            (float(name_similarity[i, j]), members[i], members[j])
+            for i, j in candidates
+            if given_names_compatible(rows[i].name_key, rows[j].name_key)
+        ]
+
+    def _compatible(self, a: _Row, b: _Row) -> bool:
+        """True if two rows can be the same person."""
+        if a.name_key == b.name_key and a.affiliation_key == b.affiliation_key:
+            return True
+        if not given_names_compatible(a.name_key, b.name_key):
+            return False
+        if _cosine(a.name_grams, b.name_grams) < self.name_threshold:
+            return False
+        if a.affiliation_key and b.affiliation_key:
+            return _cosine(a.affiliation_grams, b.affiliation_grams) >= self.affiliation_threshold
+        return True
+
+    def _merge(self, a: int, b: int, clusters: DisjointSet, members_of: Dict[int, List[int]]) -> bool:
+        """
+        Unions the clusters of two rows if every cross pair is compatible.
+
+        Checking the whole clusters, not just the linked pair, keeps chains
+        such as A~B~C from merging A and C when A and C contradict each other.
+        """
+        root_a, root_b = clusters.find(a), clusters.find(b)
+        if root_a == root_b:
+            return True
+        group_a, group_b = members_of[root_a], members_of[root_b]
+        for i in group_a:
+            for j in group_b:
+                if not self._compatible(self._rows[i], self._rows[j]):
+                    return False
+        root = clusters.union(root_a, root_b)
+        members_of[root] = group_a + group_b
+        members_of.pop(root_b if root == root_a else root_a, None)
+        return True
+
+    @staticmethod
+    def _completeness(row: _Row) -> Tuple[int, int]:
+        filled = sum(1 for value in row.record.values() if not _is_blank(value))
+        return filled, len(row.name)
+
+    def resolve(self) -> List[ResolvedEntity]:
+        """
+        Clusters every added row into entities.
+
+        Returns:
+            List[ResolvedEntity]: One entity per real person, in first-seen order
+        """
+        clusters = DisjointSet(len(self._rows))
+        members_of: Dict[int, List[int]] = {index: [index] for index in range(len(self._rows))}
+        # Exact key matches are linked without any similarity computation
+        exact: Dict[Tuple[str, str], int] = {}
+        for index, row in enumerate(self._rows):
+            key = (row.name_key, row.affiliation_key)
+            if key in exact:
+                self._merge(exact[key], index, clusters, members_of)
+            else:
+                exact[key] = index
+
+        pairs = set()
+        for members in self._blocks():
+            pairs.update(self._candidate_pairs(members))
+        # Strongest matches first, so a borderline pair cannot claim a row early
+        ordered = sorted(pairs, key=lambda pair: (-pair[0], pair[1], pair[2]))
+        blank_links: Dict[int, List[int]] = defaultdict(list)
+        for _, i, j in ordered:
+            has_i, has_j = bool(self._rows[i].affiliation_key), bool(self._rows[j].affiliation_key)
+            if has_i == has_j:
+                self._merge(i, j, clusters, members_of)
+            else:
+                blank, affiliated = (j, i) if has_i else (i, j)
+                blank_links[blank].append(affiliated)
+
+        # A row without an affiliation is not evidence that two people are one:
+        # it joins an affiliated person only if it matches exactly one of them
+        for blank, partners in blank_links.items():
+            roots = {clusters.find(partner) for partner in partners}
+            if len(roots) == 1:
+                self._merge(blank, partners[0], clusters, members_of)
+
+        entities: List[ResolvedEntity] = []
+        for number, member_indexes in enumerate(sorted(clusters.groups().values(), key=min), start=1):
+            members = sorted((self._rows[i] for i in member_indexes), key=self._completeness, reverse=True)
+            # The fullest spelling wins: "Jose Garcia Perez" over "J. Garcia-Perez"
+            best_name = max(members, key=lambda m: len(m.name_key))
+            best_affiliation = max(members, key=lambda m: len(m.affiliation_key))
+            record: Dict[str, Any] = {}
+            for member in members:
+                for column, value in member.record.items():
+                    if column in member.identity_columns:
+                        continue
+                    if column not in record or _is_blank(record[column]):
+                        record[column] = value
+            entities.append(ResolvedEntity(
+                entity_id=f"E{number:04d}",
+                name=best_name.name,
+                affiliation=best_affiliation.affiliation,
+                record=record,
+                members=[Provenance(m.source, m.row_id, m.name, m.affiliation) for m in sorted(members, key=lambda m: (m.source, m.row_id))],
+            ))
+        return entities
+
+    @staticmethod
+    def to_dataframe(entities: Sequence[ResolvedEntity]) -> pd.DataFrame:
+        """
+        Canonical table: merged record fields plus entity ID and provenance columns.
+
+        Args:
+            entities (Sequence[ResolvedEntity]): Output of ``resolve``
+
+        Returns:
+            pd.DataFrame: One row per entity with 'Entity ID', 'Name', 'Affiliation',
+                the merged fields, 'Duplicates' and 'Sources' columns
+        """
+        rows = []
+        for entity in entities:
+            rows.append({
+                "Entity ID": entity.entity_id,
+                "Name": entity.name,
+                "Affiliation": entity.affiliation,
+                **{k: v for k, v in entity.record.items() if k not in ("Name", "Affiliation")},
+                "Duplicates": len(entity.members),
+                "Sources": "; ".join(f"{m.source}#{m.row_id}" for m in entity.members),
+            })
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def row_mapping(entities: Sequence[ResolvedEntity]) -> Dict[Tuple[str, str], str]:
+        """Map of (source, row_id) → entity_id for every resolved row."""
+        return {(m.source, m.row_id): entity.entity_id for entity in entities for m in entity.members}
+
+
+def deduplicate_dataframe(
+    dataframe: pd.DataFrame,
+    source: str = "input",
+    name_threshold: float = 0.8,
+    affiliation_threshold: float = 0.5,
+) -> Tuple[pd.DataFrame, List[ResolvedEntity]]:
+    """
+    Deduplicates a single table.
+
+    Args:
+        dataframe (pd.DataFrame): Rows with name and (optionally) affiliation columns
+        source (str): Source label for the provenance
+        name_threshold (float): See ``EntityResolver``
+        affiliation_threshold (float): See ``EntityResolver``
+
+    Returns:
+        Tuple[pd.DataFrame, List[ResolvedEntity]]: Canonical table and the entities
+    """
+    resolver = EntityResolver(name_threshold, affiliation_threshold)
+    resolver.add_dataframe(dataframe, source)
+    entities = resolver.resolve()
+    return EntityResolver.to_dataframe(entities), entities
+
+
+def collapse_duplicates(
+    dataframe: pd.DataFrame,
+    source: str = "input",
+    name_threshold: float = 0.8,
+    affiliation_threshold: float = 0.5,
+) -> pd.DataFrame:
+    """
+    Deduplicates a table while keeping its own columns.
+
+    Each entity keeps the row of its first occurrence, with the canonical name
+    and affiliation written into the table's name/affiliation columns and blank
+    cells filled from the duplicates.
+
+    Args:
+        dataframe (pd.DataFrame): Rows with name and (optionally) affiliation columns
+        source (str): Source label for the provenance
+        name_threshold (float): See ``EntityResolver``
+        affiliation_threshold (float): See ``EntityResolver``
+
+    Returns:
+        pd.DataFrame: One row per person, same columns (plus 'Duplicates')
+    """
+    if dataframe.empty:
+        return dataframe
+    resolver = EntityResolver(name_threshold, affiliation_threshold)
+    resolver.add_dataframe(dataframe, source)
+    name_column = _pick_column(dataframe.columns, NAME_COLUMNS + ("Full Name",))
+    affiliation_column = _pick_column(dataframe.columns, AFFILIATION_COLUMNS)
+    labels = {str(label): label for label in dataframe.index}
+    rows = []
+    for entity in resolver.resolve():
+        first = min(entity.members, key=lambda m: dataframe.index.get_loc(labels[m.row_id]))
+        row = dataframe.loc[labels[first.row_id]].to_dict()
+        for column, value in entity.record.items():
+            if column in row and _is_blank(row[column]) and not _is_blank(value):
+                row[column] = value
+        row[name_column] = entity.name
+        if affiliation_column:
+            row[affiliation_column] = entity.affiliation
+        row["Duplicates"] = len(entity.members)
+        rows.append(row)
+    return pd.DataFrame(rows, columns=list(dataframe.columns) + ["Duplicates"])
+
+
+def broadcast(
+    entities: Sequence[ResolvedEntity],
+    values: Mapping[str, Any],
+    dataframe: pd.DataFrame,
+    column: str,
+    source: str = "input",
+) -> int:
+    """
+    Copies one value per entity (e.g. a generated bio) to every row of that entity.
+
+    Args:
+        entities (Sequence[ResolvedEntity]): Entities from the resolution run
+        values (Mapping[str, Any]): Value per entity_id
+        dataframe (pd.DataFrame): Table whose rows were resolved (index labels as row IDs)
+        column (str): Column to write
+        source (str): Source label the table was added under
+
+    Returns:
+        int: Rows written
+    """
+    labels = {str(label): label for label in dataframe.index}
+    written = 0
+    for entity in entities:
+        if entity.entity_id not in values:
+            continue
+        for member in entity.members:
+            if member.source == source and member.row_id in labels:
+                dataframe.at[labels[member.row_id], column] = values[entity.entity_id]
+                written += 1
+    return written
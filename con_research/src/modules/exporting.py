@@ -0,0 +1,410 @@
+"""
+DataFrame Export Module
+=======================
+
+Shared exporter behind every "Download" button. Pages used to rebuild an
+openpyxl workbook in a BytesIO on every Streamlit rerun that showed a
+download button; this module writes XLSX with xlsxwriter in constant-memory
+mode (rows streamed to disk as they are written), offers CSV and Parquet
+alternatives, and caches the exported bytes per DataFrame version so a
+rerun with unchanged data costs a hash, not an export.
+
+Features:
+- XLSX via xlsxwriter ``constant_memory``: NaN written as blank cells, text
+  never interpreted as formulas or URLs, cells clipped to Excel's limit
+- CSV (UTF-8) and Parquet (pyarrow, optional) alternatives
+- Content fingerprint (``pd.util.hash_pandas_object``) as the cache key
+- Byte-bounded, thread-safe LRU of exported files shared by all sessions
+- ``render_download`` Streamlit helper: one download button per format, with
+  no stateful format picker
+
+Dependencies:
+- pandas for DataFrames and hashing
+- xlsxwriter for XLSX output
+- pyarrow (optional) for Parquet output
+- streamlit (only for ``render_download``)
+- con_research.config.config_manager for the cache size (``performance`` section)
+"""
+
+import datetime
+import hashlib
+import io
+import math
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from con_research.config.config_manager import get_performance_config, subscribe
+
+try:
+    import pyarrow  # noqa: F401
+    _PARQUET_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    _PARQUET_AVAILABLE = False
+
+# Excel rejects longer cell strings
+EXCEL_MAX_CELL_CHARS = 32767
+EXCEL_MAX_ROWS = 1_048_576
+WRITE_CHUNK_ROWS = 5000
+DEFAULT_CACHE_BYTES = 128 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    """
+    A downloadable file format.
+
+    Attributes:
+        key (str): Format identifier ("xlsx", "csv", "parquet")
+        label (str): Format name shown on the download button
+        extension (str): File extension without the dot
+        mime (str): MIME type for the download
+    """
+    key: str
+    label: str
+    extension: str
+    mime: str
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "xlsx": ExportFormat("xlsx", "Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ExportFormat("csv", "CSV", "csv", "text/csv"),
+    "parquet": ExportFormat("parquet", "Parquet", "parquet", "application/vnd.apache.parquet"),
+}
+
+
+class ExportError(Exception):
+    """Raised when a DataFrame cannot be exported in the requested format."""
+
+
+def available_formats(formats: Sequence[str] = ("xlsx", "csv", "parquet")) -> Tuple[str, ...]:
+    """Filter ``formats`` to those this installation can write (Parquet needs pyarrow)."""
+    return tuple(f for f in formats if f in EXPORT_FORMATS and (f != "parquet" or _PARQUET_AVAILABLE))
+
+
+def dataframe_fingerprint(dataframe: pd.DataFrame) -> str:
+    """
+    Returns a content hash of a DataFrame (values, index, column names and dtypes).
+
+    Hashing is vectorised and far cheaper than exporting, so it is used as the
+    cache key on every rerun.
+
+    Args:
+        dataframe (pd.DataFrame): Table to fingerprint
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(c), str(t)) for c, t in dataframe.dtypes.items()]).encode("utf-8"))
+    try:
+        digest.update(pd.util.hash_pandas_object(dataframe, index=True).to_numpy().tobytes())
+    except TypeError:
+        # Unhashable cells (lists, dicts): fall back to the text form
+        digest.update(dataframe.to_csv().encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _excel_value(value):
+    """Converts a cell to something xlsxwriter writes natively; None becomes a blank cell."""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, (str, int, bool)):
+        return value[:EXCEL_MAX_CELL_CHARS] if isinstance(value, str) else value
+    if isinstance(value, pd.Timestamp):
+        return value.tz_localize(None).to_pydatetime() if value.tzinfo else value.to_pydatetime()
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.replace(tzinfo=None) if isinstance(value, datetime.datetime) else value
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, "item"):
+        # numpy scalars
+        return _excel_value(value.item())
+    return str(value)[:EXCEL_MAX_CELL_CHARS]
+
+
+def _column_writer(worksheet, column: pd.Series):
+    """Picks the xlsxwriter method and a chunk converter (NA → None) for a column's dtype."""
+    dtype = column.dtype
+
+    def blanks(values: pd.Series) -> pd.Series:
+        return values.astype(object).where(values.notna(), None)
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return worksheet.write_boolean, lambda values: blanks(values).tolist()
+    if pd.api.types.is_numeric_dtype(dtype):
+        def numbers(values: pd.Series):
+            finite = values.astype("float64")
+            return finite.where(finite.abs() != math.inf).astype(object).where(finite.notna(), None).tolist()
+        return worksheet.write_number, numbers
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        def datetimes(values: pd.Series):
+            if getattr(values.dt, "tz", None) is not None:
+                values = values.dt.tz_localize(None)
+            return [None if value is pd.NaT else value.to_pydatetime() for value in values.astype(object).where(values.notna(), pd.NaT)]
+        return worksheet.write_datetime, datetimes
+    # Series (not dtype) checks infer the values, so object columns mixing ints and text fall through
+    if pd.api.types.is_string_dtype(column) or isinstance(dtype, pd.CategoricalDtype) and pd.api.types.is_string_dtype(dtype.categories):
+        return worksheet.write_string, lambda values: [None if value is None else value[:EXCEL_MAX_CELL_CHARS] for value in blanks(values.astype(object))]
+    # Mixed object columns: per-cell conversion
+    return worksheet.write, lambda values: [_excel_value(value) for value in values.tolist()]
+
+
+def to_xlsx_bytes(dataframe: pd.DataFrame, sheet_name: str = "Sheet1") -> bytes:
+    """
+    Writes a DataFrame to XLSX with xlsxwriter in constant-memory mode.
+
+    Args:
+        dataframe (pd.DataFrame): Table to export (the index is not written)
+        sheet_name (str): Worksheet name (truncated to Excel's 31 characters)
+
+    Returns:
+        bytes: The XLSX file
+
+    Raises:
+        ExportError: If the table exceeds Excel's row limit
+    """
+    import xlsxwriter
+
+    if len(dataframe) + 1 > EXCEL_MAX_ROWS:
+        raise ExportError(f"{len(dataframe)} rows exceed Excel's limit; export as CSV or Parquet instead")
+
+    output = io.BytesIO()
+    with tempfile.TemporaryDirectory(prefix="xlsx-export-") as temp_dir:
+        workbook = xlsxwriter.Workbook(output, {
+            "constant_memory": True,
+            "tmpdir": temp_dir,
+            # Scraped text such as "=SUM(...)" or long URLs stays plain text
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            "remove_timezone": True,
+        })
+        worksheet = workbook.add_worksheet(sheet_name[:31] or "Sheet1")
+        header_format = workbook.add_format({"bold": True})
+
+        columns = [str(column) for column in dataframe.columns]
+        # Column widths must be set before rows are streamed; size them from a sample
+        sample = dataframe.head(100)
+        for position, column in enumerate(columns):
+            lengths = sample.iloc[:, position].astype(str).str.len() if len(sample) else pd.Series(dtype=int)
+            width = max([len(column), *(lengths.tolist() or [0])])
+            worksheet.set_column(position, position, min(60, width + 2))
+        worksheet.write_row(0, 0, columns, header_format)
+
+        # Convert per column, then write row by row (constant_memory flushes each finished row)
+        writers = [_column_writer(worksheet, dataframe.iloc[:, position]) for position in range(len(columns))]
+        for start in range(0, len(dataframe), WRITE_CHUNK_ROWS):
+            stop = min(start + WRITE_CHUNK_ROWS, len(dataframe))
+            converted = [convert(dataframe.iloc[start:stop, position]) for position, (_, convert) in enumerate(writers)]
+            for offset, row in enumerate(zip(*converted)):
+                row_number = start + offset + 1
+                for position, value in enumerate(row):
+                    if value is not None:
+                        writers[position][0](row_number, position, value)
+        workbook.close()
+    return output.getvalue()
+
+
+def to_csv_bytes(dataframe: pd.DataFrame) -> bytes:
+    """Writes a DataFrame to UTF-8 CSV without the index."""
+    return dataframe.to_csv(index=False).encode("utf-8")
+
+
+def to_parquet_bytes(dataframe: pd.DataFrame) -> bytes:
+    """
+    Writes a DataFrame to Parquet with pyarrow.
+
+    Mixed-type object columns (common in scraped tables) are written as strings.
+
+    Raises:
+        ExportError: If pyarrow is not installed
+    """
+    if not _PARQUET_AVAILABLE:
+        raise ExportError("Parquet export requires pyarrow (pip install pyarrow)")
+    table = dataframe.copy()
+    table.columns = [str(column) for column in table.columns]
+    for column in table.columns:
+        if table[column].dtype == object and pd.api.types.infer_dtype(table[column], skipna=True) not in ("string", "empty"):
+            table[column] = table[column].map(lambda value: None if value is None or (isinstance(value, float) and math.isnan(value)) else str(value))
+    output = io.BytesIO()
+    table.to_parquet(output, index=False, engine="pyarrow")
+    return output.getvalue()
+
+
+_WRITERS = {"xlsx": to_xlsx_bytes, "csv": to_csv_bytes, "parquet": to_parquet_bytes}
+
+
+class ExportCache:
+    """
+    Thread-safe LRU of exported files, bounded by total size in bytes.
+
+    Args:
+        max_bytes (int): Evict least recently used exports beyond this total
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: Tuple[str, str, str], data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def resize(self, max_bytes: int) -> None:
+        """Changes the size bound, evicting least recently used exports if it shrank."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, cached bytes, hits and misses."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+_export_cache: Optional[ExportCache] = None
+_export_cache_lock = threading.Lock()
+
+
+def get_export_cache() -> ExportCache:
+    """
+    Returns the process-wide export cache.
+
+    Sized by ``performance.export_cache_mb``, resized when the configuration
+    is reloaded.
+
+    Returns:
+        ExportCache: Shared cache instance
+    """
+    global _export_cache
+    if _export_cache is not None:
+        return _export_cache
+    # Read outside the cache lock; the reload callback takes that lock
+    max_bytes = get_performance_config().export_cache_mb * 1024 * 1024
+    subscribe(_apply_performance_config, keys=["performance.export_cache_mb"])
+    with _export_cache_lock:
+        if _export_cache is None:
+            _export_cache = ExportCache(max_bytes)
+        return _export_cache
+
+
+def _apply_performance_config(config: Any, changed: Dict[str, Any]) -> None:
+    """Config subscriber: resizes the live export cache."""
+    with _export_cache_lock:
+        cache = _export_cache
+    if cache is not None:
+        cache.resize(config.performance.export_cache_mb * 1024 * 1024)
+
+
+def export_dataframe(dataframe: pd.DataFrame, file_format: str = "xlsx", sheet_name: str = "Sheet1") -> bytes:
+    """
+    Exports a DataFrame, reusing the cached file when the content is unchanged.
+
+    Args:
+        dataframe (pd.DataFrame): Table to export
+        file_format (str): "xlsx", "csv" or "parquet"
+        sheet_name (str): Worksheet name for XLSX
+
+    Returns:
+        bytes: File contents
+
+    Raises:
+        ExportError: If the format is unknown or cannot be written here
+    """
+    if file_format not in _WRITERS:
+        raise ExportError(f"Unknown export format: {file_format}")
+    cache = get_export_cache()
+    key = (dataframe_fingerprint(dataframe), file_format, sheet_name if file_format == "xlsx" else "")
+    data = cache.get(key)
+    if data is None:
+        writer = _WRITERS[file_format]
+        data = writer(dataframe, sheet_name) if file_format == "xlsx" else writer(dataframe)
+        cache.put(key, data)
+    return data
+
+
+def render_download(
+    dataframe: pd.DataFrame,
+    label: str,
+    file_stem: str,
+    formats: Sequence[str] = ("xlsx", "csv", "parquet"),
+    key: Optional[str] = None,
+    sheet_name: str = "Sheet1",
+) -> None:
+    """
+    Renders one download button per export format for a DataFrame.
+
+    There is deliberately no format picker: changing a widget reruns the
+    script, so pages keep their results in ``st.session_state`` and render
+    the downloads outside ``st.button`` branches.
+    Each file is built once per DataFrame version and format; later reruns
+    serve the cached bytes.
+
+    Args:
+        dataframe (pd.DataFrame): Table to offer
+        label (str): Download button label (the format name is appended when
+            several formats are offered)
+        file_stem (str): File name without extension
+        formats (Sequence[str]): Offered formats, in button order
+        key (str, optional): Streamlit widget key prefix (required when the same
+            label appears more than once on a page)
+        sheet_name (str): Worksheet name for XLSX
+    """
+    import streamlit as st
+
+    offered = available_formats(formats) or ("csv",)
+    columns = st.columns(len(offered)) if len(offered) > 1 else [st]
+    for column, file_format in zip(columns, offered):
+        export_format = EXPORT_FORMATS[file_format]
+        try:
+            data = export_dataframe(dataframe, file_format, sheet_name)
+        except ExportError as e:
+            column.warning(str(e))
+            continue
+        column.download_button(
+            label=f"{label} ({export_format.label})" if len(offered) > 1 else label,
+            data=data,
+            file_name=f"{file_stem}.{export_format.extension}",
+            mime=export_format.mime,
+            key=f"{key or file_stem}-{file_format}",
+        )
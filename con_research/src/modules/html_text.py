@@ -0,0 +1,208 @@
+"""
+HTML-to-Text Module
+===================
+
+Shared HTML parsing and text extraction for every scraper in the Conference
+Research Application. Picks the fastest parser backend that is installed and
+removes boilerplate in a single pass over the tree, while keeping the output
+contract of the original ``soup.get_text(separator, strip=True)`` helpers.
+
+Features:
+- Backend selection: selectolax (lexbor) → lxml → Python's html.parser
+- ``make_soup`` for BeautifulSoup consumers, using lxml when available
+- Single-pass boilerplate stripping by tag name and class/id pattern
+- ``html_to_text`` with the same output as the legacy page helpers
+
+Dependencies:
+- beautifulsoup4 (required)
+- lxml (recommended, listed in the core dependencies)
+- selectolax (optional, ``pip install -e .[fast-html]``) for the fastest text path
+"""
+
+import re
+from typing import Iterable, List, Optional, Pattern, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    _LXML_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the installation
+    _LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    _SELECTOLAX_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the installation
+    LexborHTMLParser = None
+    _SELECTOLAX_AVAILABLE = False
+
+# Tags whose content is never readable page text
+SCRIPT_STYLE_TAGS = ("script", "style")
+# Layout chrome removed before extracting course or article content
+BOILERPLATE_TAGS = ("nav", "footer", "header", "aside", "script", "style")
+# Class names that mark navigation and layout chrome
+BOILERPLATE_CLASS_PATTERN = re.compile(r"navigation|menu|footer|sidebar|banner", re.I)
+
+# BeautifulSoup's get_text never returns the strings inside these tags
+_NON_TEXT_TAGS = ("script", "style", "template")
+
+_BLANK_LINES = re.compile(r"\n\s*\n")
+# Internal separator for the selectolax path; never appears in real page text
+_PART_SEPARATOR = "\x00"
+
+Markup = Union[str, bytes]
+
+
+def available_backends() -> List[str]:
+    """Return the installed text backends, fastest first."""
+    backends = []
+    if _SELECTOLAX_AVAILABLE:
+        backends.append("selectolax")
+    if _LXML_AVAILABLE:
+        backends.append("lxml")
+    backends.append("html.parser")
+    return backends
+
+
+def default_backend() -> str:
+    """Return the fastest installed text backend."""
+    return available_backends()[0]
+
+
+def soup_features() -> str:
+    """Return the fastest BeautifulSoup tree builder that is installed."""
+    return "lxml" if _LXML_AVAILABLE else "html.parser"
+
+
+def make_soup(markup: Markup, features: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parses HTML into a BeautifulSoup tree with the fastest available builder.
+
+    Args:
+        markup (str | bytes): HTML document; bytes are decoded by BeautifulSoup's
+            encoding detection
+        features (str, optional): Explicit tree builder ("lxml", "html.parser")
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    return BeautifulSoup(markup, features or soup_features())
+
+
+def strip_boilerplate(
+    soup: BeautifulSoup,
+    tags: Iterable[str] = BOILERPLATE_TAGS,
+    class_pattern: Optional[Pattern[str]] = None,
+) -> BeautifulSoup:
+    """
+    Removes boilerplate elements from a soup in one pass over the tree.
+
+    Args:
+        soup (BeautifulSoup): Parsed document, modified in place
+        tags (Iterable[str]): Tag names to remove with their content
+        class_pattern (Pattern, optional): Elements whose class attribute matches
+            this regex are removed as well
+
+    Returns:
+        BeautifulSoup: The same soup, for chaining
+
+    Note:
+        Replaces the previous "one find_all per concern" approach: every element
+        is visited once, and descendants of removed elements are skipped.
+    """
+    tag_names = frozenset(tags)
+    if not tag_names and class_pattern is None:
+        return soup
+
+    def is_boilerplate(element) -> bool:
+        if element.name in tag_names:
+            return True
+        if class_pattern is None:
+            return False
+        classes = element.get("class")
+        return bool(classes) and class_pattern.search(" ".join(classes)) is not None
+
+    for element in soup.find_all(is_boilerplate):
+        # Matches nested inside an already-removed element are gone with it
+        if not element.decomposed:
+            element.decompose()
+    return soup
+
+
+def _text_with_selectolax(
+    markup: Markup,
+    separator: str,
+    tags: Iterable[str],
+    class_pattern: Optional[Pattern[str]],
+) -> str:
+    """Extract stripped text parts with selectolax, matching BeautifulSoup's get_text."""
+    tree = LexborHTMLParser(markup)
+    tree.strip_tags(list(dict.fromkeys([*tags, *_NON_TEXT_TAGS])))
+    if class_pattern is not None:
+        matched = [
+            node for node in tree.css("[class]")
+            if class_pattern.search(node.attributes.get("class") or "")
+        ]
+        # Remove outermost matches only; their descendants go with them
+        matched_ids = {node.mem_id for node in matched}
+        for node in matched:
+            parent = node.parent
+            nested = False
+            while parent is not None:
+                if parent.mem_id in matched_ids:
+                    nested = True
+                    break
+                parent = parent.parent
+            if not nested:
+                node.decompose()
+    if tree.root is None:
+        return ""
+    raw = tree.root.text(separator=_PART_SEPARATOR, strip=True)
+    return separator.join(part for part in raw.split(_PART_SEPARATOR) if part)
+
+
+def html_to_text(
+    markup: Markup,
+    separator: str = "\n",
+    strip_tags: Iterable[str] = SCRIPT_STYLE_TAGS,
+    class_pattern: Optional[Pattern[str]] = None,
+    collapse_blank_lines: bool = True,
+    backend: Optional[str] = None,
+) -> str:
+    """
+    Converts an HTML document to readable text.
+
+    Output contract: equivalent to parsing with BeautifulSoup, decomposing
+    ``strip_tags`` (and class-matched elements), then
+    ``get_text(separator=separator, strip=True)`` and, when enabled,
+    collapsing blank-line runs to a single empty line.
+
+    Args:
+        markup (str | bytes): HTML document
+        separator (str): String placed between text fragments
+        strip_tags (Iterable[str]): Tag names removed before extraction
+        class_pattern (Pattern, optional): Class regex of elements to remove
+        collapse_blank_lines (bool): Replace ``\\n\\s*\\n`` runs with ``\\n\\n``
+        backend (str, optional): "selectolax", "lxml" or "html.parser";
+            defaults to the fastest installed backend
+
+    Returns:
+        str: Extracted text
+
+    Raises:
+        ValueError: If an unknown or uninstalled backend is requested
+    """
+    backend = backend or default_backend()
+    if backend not in available_backends():
+        raise ValueError(f"HTML backend '{backend}' is not available: {available_backends()}")
+
+    if backend == "selectolax":
+        text = _text_with_selectolax(markup, separator, strip_tags, class_pattern)
+    else:
+        soup = strip_boilerplate(make_soup(markup, features=backend), strip_tags, class_pattern)
+        text = soup.get_text(separator=separator, strip=True)
+
+    if collapse_blank_lines:
+        text = _BLANK_LINES.sub("\n\n", text)
+    return text
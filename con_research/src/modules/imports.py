@@ -1,32 +1,82 @@
-import os
-import re
-import pandas as pd
-from langchain_openai import ChatOpenAI
-import requests
-from bs4 import BeautifulSoup
-from io import BytesIO, StringIO
-import urllib.request
-from pdfminer.converter import TextConverter
-from pdfminer.layout import LAParams
-from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
-from pdfminer.pdfpage import PDFPage
+"""
+Shared Imports Module
+=====================
+
+Names the older tool modules used to pull in with ``from imports import *``.
+Standard-library names are imported directly; every third-party SDK is
+loaded on first attribute access (PEP 562 module ``__getattr__``), so
+importing this module no longer pays for LangChain, Groq, Gemini, Selenium,
+pdfminer and pandas up front.
+
+Features:
+- Cheap standard-library names bound at import time
+- Heavy optional SDKs resolved lazily and cached in the module namespace
+- A missing optional SDK only fails when its name is actually used
+
+Note:
+    Prefer explicit imports in new code. ``from ... import *`` still works but
+    resolves every name in ``__all__``, i.e. loads every SDK.
+
+Dependencies:
+- importlib for deferred loading
+"""
+
+import base64
 import getpass
-from typing import Optional, Type, Any
-from pydantic import BaseModel, Field
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+import importlib
+import io
 import json
+import os
+import re
 import sys
 import time
-from langchain.prompts import PromptTemplate
-from langchain.llms import OpenAI
-import streamlit as st
-import base64
-from langchain_groq import ChatGroq
-import google.generativeai as genai
-import io
-import base64
+import urllib.request
+from io import BytesIO, StringIO
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+# Public name → (module, attribute); attribute None binds the module itself
+_LAZY_IMPORTS: Dict[str, Tuple[str, Optional[str]]] = {
+    "pd": ("pandas", None),
+    "requests": ("requests", None),
+    "BeautifulSoup": ("bs4", "BeautifulSoup"),
+    "TextConverter": ("pdfminer.converter", "TextConverter"),
+    "LAParams": ("pdfminer.layout", "LAParams"),
+    "PDFResourceManager": ("pdfminer.pdfinterp", "PDFResourceManager"),
+    "PDFPageInterpreter": ("pdfminer.pdfinterp", "PDFPageInterpreter"),
+    "PDFPage": ("pdfminer.pdfpage", "PDFPage"),
+    "BaseModel": ("pydantic", "BaseModel"),
+    "Field": ("pydantic", "Field"),
+    "webdriver": ("selenium.webdriver", None),
+    "By": ("selenium.webdriver.common.by", "By"),
+    "Options": ("selenium.webdriver.firefox.options", "Options"),
+    "ChatOpenAI": ("langchain_openai", "ChatOpenAI"),
+    "ChatPromptTemplate": ("langchain_core.prompts", "ChatPromptTemplate"),
+    "StrOutputParser": ("langchain_core.output_parsers", "StrOutputParser"),
+    "PromptTemplate": ("langchain.prompts", "PromptTemplate"),
+    "OpenAI": ("langchain.llms", "OpenAI"),
+    "st": ("streamlit", None),
+    "ChatGroq": ("langchain_groq", "ChatGroq"),
+    "genai": ("google.generativeai", None),
+}
+
+__all__ = [
+    "base64", "getpass", "io", "json", "os", "re", "sys", "time", "urllib",
+    "BytesIO", "StringIO", "Any", "Optional", "Type",
+    *_LAZY_IMPORTS,
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Imports a heavy SDK on first use and caches it as a module attribute."""
+    target = _LAZY_IMPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = target
+    module = importlib.import_module(module_name)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -0,0 +1,460 @@
+"""
+Spreadsheet Ingestion Module
+============================
+
+Shared loader for the CSV/XLSX files uploaded to BioGen, Desktop Research and
+RAG. Registration-system exports can run to hundreds of thousands of rows and
+dozens of columns, of which the app needs two or three; this module streams
+the file, keeps only the wanted columns with compact dtypes, and maps the
+many spellings of "Name" and "University" to one schema in one place.
+
+Features:
+- Schema sniffing: file type, CSV encoding and delimiter, header row (title
+  rows above the header are skipped), header → canonical column mapping
+- Header normalisation with aliases ("Affiliation", "Institution",
+  "Organisation" → "University"; "Full Name", "Delegate" → "Name"), and
+  "First Name" + "Last Name" combined into "Name" when there is no name column
+- Streaming readers: openpyxl ``read_only`` for XLSX, chunked ``read_csv`` for CSV
+- Only the requested columns are loaded; low-cardinality text columns
+  (affiliations, countries) are stored as ``category``
+- ``iter_table_chunks`` for consumers that never need the whole table in memory
+
+Dependencies:
+- pandas for chunked CSV reading and DataFrames
+- openpyxl for streaming XLSX reading
+"""
+
+import codecs
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+CHUNK_SIZE = 20000
+HEADER_SCAN_ROWS = 15
+# Columns whose share of distinct values is below this are stored as category
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Canonical column → accepted header spellings (compared after normalize_header)
+HEADER_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "Name": ("name", "full name", "fullname", "attendee name", "participant name", "delegate name",
+             "delegate", "participant", "attendee", "speaker", "presenter", "author"),
+    "University": ("university", "affiliation", "institution", "organisation", "organization",
+                   "company", "employer", "university affiliation", "institution name", "organisation name"),
+    "Email": ("email", "e mail", "email address", "e mail address", "mail"),
+    "Bio": ("bio", "biography", "profile", "about"),
+    "First Name": ("first name", "firstname", "given name", "forename"),
+    "Last Name": ("last name", "lastname", "surname", "family name"),
+    "Location": ("location", "country", "city"),
+}
+_ALIAS_LOOKUP = {alias: canonical for canonical, aliases in HEADER_ALIASES.items() for alias in aliases}
+
+PathOrFile = Union[str, IO[bytes], Any]
+
+
+class IngestionError(ValueError):
+    """Raised when an upload cannot be read or lacks required columns."""
+
+
+def normalize_header(header: Any) -> str:
+    """
+    Returns the comparison form of a column header.
+
+    Example:
+        >>> normalize_header("  E-Mail_Address ")
+        'e mail address'
+    """
+    text = re.sub(r"[^0-9a-z]+", " ", str(header or "").casefold())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def canonical_column(header: Any) -> Optional[str]:
+    """Return the canonical column a header maps to, or None if unknown."""
+    return _ALIAS_LOOKUP.get(normalize_header(header))
+
+
+@dataclass
+class SpreadsheetSchema:
+    """
+    What ``sniff_schema`` learned about a file.
+
+    Attributes:
+        file_type (str): "csv" or "xlsx"
+        headers (List[str]): Header cells as written in the file
+        mapping (Dict[str, str]): Original header → canonical column, for recognised headers
+        header_row (int): Zero-based row index of the header
+        encoding (str, optional): CSV text encoding
+        delimiter (str, optional): CSV delimiter
+        sheet_name (str, optional): XLSX worksheet read
+    """
+    file_type: str
+    headers: List[str]
+    mapping: Dict[str, str] = field(default_factory=dict)
+    header_row: int = 0
+    encoding: Optional[str] = None
+    delimiter: Optional[str] = None
+    sheet_name: Optional[str] = None
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names after normalisation (canonical where recognised, original otherwise)."""
+        return [self.mapping.get(header, header) for header in self.headers]
+
+    def has(self, column: str) -> bool:
+        """True if the canonical column can be produced (including derived Name)."""
+        present = set(self.mapping.values())
+        if column == "Name" and {"First Name", "Last Name"} <= present:
+            return True
+        return column in present
+
+
+def _read_bytes(source: PathOrFile) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as handle:
+            return handle.read()
+    if isinstance(source, bytes):
+        return source
+    if hasattr(source, "seek"):
+        source.seek(0)
+    data = source.read()
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return data
+
+
+def _file_type(source: PathOrFile, data: bytes) -> str:
+    name = str(getattr(source, "name", source if isinstance(source, str) else "")).lower()
+    if name.endswith((".xlsx", ".xlsm")) or data[:2] == b"PK":
+        return "xlsx"
+    if name.endswith((".csv", ".txt", ".tsv")) or not name:
+        return "csv"
+    raise IngestionError(f"Unsupported file type: {name}")
+
+
+def _decode_sample(data: bytes, size: int = 65536) -> Tuple[str, str]:
+    """Pick an encoding (UTF-8 with or without BOM, else cp1252) and decode a sample."""
+    sample = data[:size]
+    for encoding in ("utf-8-sig", "cp1252", "latin-1"):
+        try:
+            # An incremental decoder tolerates a multi-byte character cut at the sample edge
+            text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding, text
+        except UnicodeDecodeError:
+            continue
+    return "latin-1", sample.decode("latin-1")
+
+
+def _pick_header_row(rows: Sequence[Sequence[Any]]) -> int:
+    """Index of the most header-like row among the first rows of a sheet."""
+    best_index, best_score = 0, -1
+    for index, row in enumerate(rows[:HEADER_SCAN_ROWS]):
+        cells = [cell for cell in row if cell not in (None, "")]
+        if not cells:
+            continue
+        recognised = sum(1 for cell in cells if canonical_column(cell))
+        text_cells = sum(1 for cell in cells if isinstance(cell, str))
+        # Known aliases dominate; otherwise prefer wide rows made of text
+        score = recognised * 100 + (text_cells if text_cells == len(cells) else 0) + len(cells)
+        if score > best_score:
+            best_index, best_score = index, score
+    return best_index
+
+
+def _build_mapping(headers: Sequence[str]) -> Dict[str, str]:
+    mapping: Dict[str, str] = {}
+    taken = set()
+    for header in headers:
+        canonical = canonical_column(header)
+        # First occurrence wins ("Affiliation" and "Organisation" both present)
+        if canonical and canonical not in taken:
+            mapping[header] = canonical
+            taken.add(canonical)
+    return mapping
+
+
+def _dedupe_headers(headers: Sequence[Any]) -> List[str]:
+    seen: Dict[str, int] = {}
+    result = []
+    for position, header in enumerate(headers):
+        text = str(header).strip() if header not in (None, "") else f"Column {position + 1}"
+        if text in seen:
+            seen[text] += 1
+            text = f"{text}.{seen[text]}"
+        else:
+            seen[text] = 0
+        result.append(text)
+    return result
+
+
+def _sniff_delimiter(lines: Sequence[str]) -> str:
+    """Delimiter splitting the most lines into the same number (>1) of fields; title lines are outvoted."""
+    best, best_votes = ",", 0
+    for delimiter in (",", ";", "\t", "|"):
+        counts = [len(row) for row in csv.reader(lines, delimiter=delimiter) if len(row) > 1]
+        if not counts:
+            continue
+        width = max(set(counts), key=counts.count)
+        votes = counts.count(width) * width
+        if votes > best_votes:
+            best, best_votes = delimiter, votes
+    return best
+
+
+class _OpenedUpload:
+    """An upload with its schema sniffed and, for XLSX, the workbook kept open for streaming."""
+
+    def __init__(self, source: PathOrFile, sheet_name: Optional[str] = None):
+        self.data = _read_bytes(source)
+        if not self.data:
+            raise IngestionError("The uploaded file is empty")
+        self.workbook = None
+        self.worksheet = None
+        if _file_type(source, self.data) == "csv":
+            encoding, text = _decode_sample(self.data)
+            lines = text.splitlines()[: HEADER_SCAN_ROWS + 5]
+            delimiter = _sniff_delimiter(lines)
+            rows = list(csv.reader(lines, delimiter=delimiter))
+            header_row = _pick_header_row(rows)
+            headers = _dedupe_headers(rows[header_row] if rows else [])
+            self.schema = SpreadsheetSchema("csv", headers, _build_mapping(headers), header_row, encoding, delimiter)
+            return
+
+        from openpyxl import load_workbook
+        try:
+            # Loading parses the shared-string table, so it is done once per upload
+            self.workbook = load_workbook(io.BytesIO(self.data), read_only=True, data_only=True)
+            self.worksheet = self.workbook[sheet_name] if sheet_name else self.workbook.worksheets[0]
+        except Exception as e:
+            self.close()
+            raise IngestionError(f"Could not open workbook: {e}") from e
+        rows = [list(row) for row in self.worksheet.iter_rows(max_row=HEADER_SCAN_ROWS, values_only=True)]
+        header_row = _pick_header_row(rows)
+        header_cells = list(rows[header_row]) if rows else []
+        # Trailing empty header cells are formatting, not columns
+        while header_cells and header_cells[-1] in (None, ""):
+            header_cells.pop()
+        headers = _dedupe_headers(header_cells)
+        self.schema = SpreadsheetSchema("xlsx", headers, _build_mapping(headers), header_row, sheet_name=self.worksheet.title)
+
+    def close(self) -> None:
+        if self.workbook is not None:
+            self.workbook.close()
+            self.workbook = None
+
+    def __enter__(self) -> "_OpenedUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def sniff_schema(source: PathOrFile, sheet_name: Optional[str] = None) -> SpreadsheetSchema:
+    """
+    Inspects the first rows of an upload without loading it.
+
+    Args:
+        source (str | file-like): Path, bytes or uploaded file (Streamlit UploadedFile)
+        sheet_name (str, optional): XLSX worksheet (defaults to the first)
+
+    Returns:
+        SpreadsheetSchema: File type, header row and column mapping
+
+    Raises:
+        IngestionError: If the file is empty, unsupported or not a valid workbook
+    """
+    with _OpenedUpload(source, sheet_name) as upload:
+        return upload.schema
+
+
+def _wanted_headers(schema: SpreadsheetSchema, columns: Optional[Sequence[str]]) -> List[str]:
+    """Original headers to read for the requested canonical/original column names."""
+    if columns is None:
+        return list(schema.headers)
+    reverse = {canonical: header for header, canonical in schema.mapping.items()}
+    wanted: List[str] = []
+    for column in columns:
+        if column in reverse:
+            wanted.append(reverse[column])
+        elif column in schema.headers:
+            wanted.append(column)
+        elif column == "Name" and {"First Name", "Last Name"} <= set(reverse):
+            wanted.extend([reverse["First Name"], reverse["Last Name"]])
+    return list(dict.fromkeys(wanted))
+
+
+def _finish_chunk(chunk: pd.DataFrame, schema: SpreadsheetSchema, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+    chunk = chunk.rename(columns=schema.mapping)
+    if "Name" not in chunk.columns and {"First Name", "Last Name"} <= set(chunk.columns):
+        first = chunk["First Name"].fillna("").astype(str).str.strip()
+        last = chunk["Last Name"].fillna("").astype(str).str.strip()
+        full_name = (first + " " + last).str.strip()
+        chunk.insert(0, "Name", full_name.mask(full_name == ""))
+        if columns is not None:
+            chunk = chunk.drop(columns=[c for c in ("First Name", "Last Name") if c not in columns])
+    chunk = chunk.dropna(how="all")
+    for column in chunk.columns:
+        if pd.api.types.is_string_dtype(chunk[column]):
+            # Missing cells stay NaN (not pd.NA) so existing isna/float checks keep working
+            stripped = chunk[column].str.strip()
+            chunk[column] = stripped.mask(stripped == "")
+    if columns is not None:
+        chunk = chunk[[c for c in columns if c in chunk.columns]]
+    return chunk
+
+
+def _stream_chunks(upload: _OpenedUpload, columns: Optional[Sequence[str]], chunk_size: int) -> Iterator[pd.DataFrame]:
+    schema = upload.schema
+    wanted = _wanted_headers(schema, columns)
+    if not wanted:
+        return
+
+    if schema.file_type == "csv":
+        try:
+            reader = pd.read_csv(
+                io.BytesIO(upload.data),
+                sep=schema.delimiter or ",",
+                encoding=schema.encoding,
+                skiprows=schema.header_row + 1,
+                header=None,
+                names=schema.headers,
+                usecols=wanted,
+                dtype=str,
+                keep_default_na=False,
+                na_values=[""],
+                chunksize=chunk_size,
+                on_bad_lines="warn",
+            )
+            for chunk in reader:
+                yield _finish_chunk(chunk, schema, columns)
+        except (pd.errors.ParserError, UnicodeDecodeError, ValueError) as e:
+            raise IngestionError(f"Could not read CSV: {e}") from e
+        return
+
+    positions = [schema.headers.index(header) for header in wanted]
+    buffer: List[List[Any]] = []
+    start = 0
+    for row in upload.worksheet.iter_rows(min_row=schema.header_row + 2, values_only=True):
+        buffer.append([row[p] if p < len(row) else None for p in positions])
+        if len(buffer) >= chunk_size:
+            yield _finish_chunk(pd.DataFrame(buffer, columns=wanted, index=range(start, start + len(buffer))), schema, columns)
+            start += len(buffer)
+            buffer = []
+    if buffer:
+        yield _finish_chunk(pd.DataFrame(buffer, columns=wanted, index=range(start, start + len(buffer))), schema, columns)
+
+
+def iter_table_chunks(
+    source: PathOrFile,
+    columns: Optional[Sequence[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+    sheet_name: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams an upload as DataFrame chunks with normalised headers.
+
+    Args:
+        source (str | file-like): Path, bytes or uploaded file
+        columns (Sequence[str], optional): Canonical (or original) columns to load;
+            all columns when omitted
+        chunk_size (int): Rows per chunk
+        sheet_name (str, optional): XLSX worksheet (defaults to the first)
+
+    Yields:
+        pd.DataFrame: Chunks with canonical headers; the index continues across chunks
+
+    Raises:
+        IngestionError: If the file cannot be parsed
+    """
+    with _OpenedUpload(source, sheet_name) as upload:
+        yield from _stream_chunks(upload, columns, chunk_size)
+
+
+def compact_dtypes(dataframe: pd.DataFrame, exclude: Sequence[str] = ("Name", "Bio", "Email")) -> pd.DataFrame:
+    """
+    Converts repetitive text columns (affiliations, countries) to ``category``.
+
+    Args:
+        dataframe (pd.DataFrame): Table to convert in place
+        exclude (Sequence[str]): Columns left as plain text (unique or edited later)
+
+    Returns:
+        pd.DataFrame: The same DataFrame
+    """
+    for column in dataframe.columns:
+        if column in exclude or not pd.api.types.is_string_dtype(dataframe[column]) or len(dataframe) < 50:
+            continue
+        if dataframe[column].nunique(dropna=True) <= CATEGORY_MAX_UNIQUE_RATIO * len(dataframe):
+            dataframe[column] = dataframe[column].astype("category")
+    return dataframe
+
+
+@dataclass
+class IngestResult:
+    """
+    Outcome of ``load_table``.
+
+    Attributes:
+        dataframe (pd.DataFrame): Loaded rows with canonical headers
+        schema (SpreadsheetSchema): Sniffed schema
+        renamed (Dict[str, str]): Original → canonical headers that were renamed
+        missing (List[str]): Required columns the file does not provide
+    """
+    dataframe: pd.DataFrame
+    schema: SpreadsheetSchema
+    renamed: Dict[str, str] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing
+
+
+def load_table(
+    source: PathOrFile,
+    required: Sequence[str] = ("Name", "University"),
+    optional: Sequence[str] = (),
+    all_columns: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    max_rows: Optional[int] = None,
+) -> IngestResult:
+    """
+    Loads an upload with normalised headers and only the columns the caller needs.
+
+    Args:
+        source (str | file-like): Path, bytes or uploaded file
+        required (Sequence[str]): Canonical columns that must be present
+        optional (Sequence[str]): Canonical columns loaded when present
+        all_columns (bool): Load every column (headers still normalised)
+        chunk_size (int): Rows per streamed chunk
+        max_rows (int, optional): Stop after this many rows
+
+    Returns:
+        IngestResult: Table, schema, renamed headers and missing required columns
+            (the table is empty when required columns are missing)
+
+    Raises:
+        IngestionError: If the file is empty, unsupported or unreadable
+    """
+    with _OpenedUpload(source) as upload:
+        schema = upload.schema
+        missing = [column for column in required if not schema.has(column)]
+        renamed = {header: canonical for header, canonical in schema.mapping.items() if header != canonical}
+        if missing:
+            return IngestResult(pd.DataFrame(columns=schema.columns), schema, renamed, missing)
+
+        columns = None if all_columns else list(dict.fromkeys([*required, *(c for c in optional if schema.has(c))]))
+        chunks: List[pd.DataFrame] = []
+        loaded = 0
+        for chunk in _stream_chunks(upload, columns, chunk_size):
+            if max_rows is not None and loaded + len(chunk) > max_rows:
+                chunk = chunk.iloc[: max_rows - loaded]
+            chunks.append(chunk)
+            loaded += len(chunk)
+            if max_rows is not None and loaded >= max_rows:
+                break
+    dataframe = pd.concat(chunks) if chunks else pd.DataFrame(columns=columns or schema.columns)
+    dataframe = compact_dtypes(dataframe.reset_index(drop=True))
+    return IngestResult(dataframe, schema, renamed, [])
@@ -0,0 +1,581 @@
+"""
+LLM Gateway Module
+==================
+
+Shared, rate-aware wrapper around the OpenAI client. Every page sends its
+chat completions through one gateway per API key, which keeps the account
+inside its requests-per-minute and tokens-per-minute limits, adapts how many
+calls run at once, and serves interactive requests before batch work.
+
+Features:
+- RPM and TPM token buckets, re-synchronised from the ``x-ratelimit-*``
+  response headers so the account's real limits are learned at runtime
+- AIMD concurrency control: +1 slot per window of successes, halved on 429
+- Global pause on 429 (honouring Retry-After) so workers do not pile on
+- Retries with decorrelated jitter and an "openai" circuit breaker (resilience.py)
+- Priority queue (heapq) in front of the buckets: INTERACTIVE > NORMAL > BATCH
+- Token estimates from tiktoken, corrected with the reported usage
+- ``map`` helper to fan a batch out over threads with Streamlit context attached
+- One ``llm.chat`` tracing span per call (model, queue wait, tokens, retries)
+- Usage accounting: each call reserves its worst-case cost against the active
+  budgets before queueing and books the reported usage (usage_accounting.py)
+
+Dependencies:
+- openai (>=1.30) for the client and raw-response access
+- tiktoken (optional, loaded on first use) for prompt token estimates
+- con_research.src.modules.resources for the shared client and encoding
+- con_research.config.config_manager for default limits (applied live on reload)
+"""
+
+import functools
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import openai
+from openai import OpenAI
+
+from con_research.config.config_manager import get_performance_config, subscribe
+from con_research.src.modules.resilience import CircuitBreaker, RetryPolicy, get_breaker
+from con_research.src.modules.resources import get_openai_client, get_tiktoken_encoding
+from con_research.src.modules.tracing import Span, bind_context, span
+from con_research.src.modules.usage_accounting import get_usage_ledger
+
+
+DEFAULT_RPM = 500
+DEFAULT_TPM = 200_000
+# Completion budget assumed when a request sets no max_tokens
+DEFAULT_COMPLETION_TOKENS = 512
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError)
+
+
+class Priority(IntEnum):
+    """Scheduling priority; lower values are admitted first."""
+    INTERACTIVE = 0
+    NORMAL = 10
+    BATCH = 20
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parses OpenAI reset durations such as "1s", "6m0s", "20ms" or "1h2m3.5s".
+
+    Returns:
+        Optional[float]: Seconds, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    total = 0.0
+    number = ""
+    i = 0
+    matched = False
+    while i < len(value):
+        char = value[i]
+        if char.isdigit() or char == ".":
+            number += char
+            i += 1
+            continue
+        unit = "ms" if value.startswith("ms", i) else char
+        i += len(unit)
+        if not number:
+            return None
+        scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}.get(unit)
+        if scale is None:
+            return None
+        total += float(number) * scale
+        number = ""
+        matched = True
+    if number:
+        # Bare number: plain seconds
+        total += float(number)
+        matched = True
+    return total if matched else None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding() -> Any:
+    """
+    cl100k_base encoding, loaded on the first estimate instead of at import.
+
+    Loading parses (and on a cold machine downloads) the BPE table, which
+    would otherwise delay every page that merely imports the gateway.
+    """
+    try:
+        return get_tiktoken_encoding("cl100k_base")
+    except Exception:  # pragma: no cover - tiktoken missing or offline
+        return None
+
+
+def estimate_tokens(messages: Sequence[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+    """
+    Estimates the tokens a chat request will consume against the TPM limit.
+
+    Args:
+        messages (Sequence[Dict]): Chat messages
+        max_tokens (int, optional): Completion limit set on the request
+
+    Returns:
+        int: Prompt tokens (tiktoken, or characters / 4) plus the completion budget
+    """
+    encoding = _get_encoding()
+    prompt_tokens = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if not isinstance(content, str):
+            content = str(content)
+        prompt_tokens += 4 + (len(encoding.encode(content)) if encoding else len(content) // 4)
+    return prompt_tokens + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """
+    Continuously refilling budget of ``capacity`` units per minute.
+
+    Not thread-safe on its own; the gateway guards it with its condition lock.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if available now)."""
+        self._refill()
+        # A single request larger than the bucket is admitted once it is full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60.0 / self.capacity
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def sync(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """Adopt the server's view of the limit and what is left of it."""
+        self._refill()
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+
+
+class LLMGateway:
+    """
+    Rate-limited, adaptively concurrent front door to one OpenAI account.
+
+    Attributes:
+        client (OpenAI): Underlying client
+        concurrency_limit (float): Current AIMD limit on calls in flight
+    """
+
+    def __init__(
+        self,
+        client: OpenAI,
+        rpm: int = DEFAULT_RPM,
+        tpm: int = DEFAULT_TPM,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 32,
+        decrease_factor: float = 0.5,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Args:
+            client (OpenAI): Configured OpenAI client
+            rpm (int): Requests per minute budget until headers report the real limit
+            tpm (int): Tokens per minute budget until headers report the real limit
+            initial_concurrency (int): Calls allowed in flight at start
+            min_concurrency (int): Lower bound for the AIMD limit
+            max_concurrency (int): Upper bound for the AIMD limit
+            decrease_factor (float): Multiplier applied to the limit on a 429
+            retry_policy (RetryPolicy, optional): Retries for rate-limit, timeout,
+                connection and 5xx errors (decorrelated jitter, optional deadline)
+            breaker (CircuitBreaker, optional): Endpoint breaker (defaults to the
+                shared "openai" breaker); 429s do not trip it, outages do
+        """
+        self.client = client
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.concurrency_limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.decrease_factor = decrease_factor
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=5, base_delay=1.0, max_delay=60.0, retry_on=RETRYABLE_ERRORS)
+        self.breaker = breaker or get_breaker("openai")
+
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._cond = threading.Condition()
+        self._waiting: List[tuple] = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._counters = {"requests": 0, "rate_limited": 0, "retries": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def configure(self, rpm: Optional[int] = None, tpm: Optional[int] = None, max_concurrency: Optional[int] = None) -> None:
+        """
+        Applies new limits to a running gateway, e.g. after a configuration reload.
+
+        Args:
+            rpm (int, optional): New requests-per-minute budget
+            tpm (int, optional): New tokens-per-minute budget
+            max_concurrency (int, optional): New upper bound for the AIMD limit
+        """
+        with self._cond:
+            for bucket, capacity in ((self._requests, rpm), (self._tokens, tpm)):
+                if capacity:
+                    bucket.sync(capacity, None)
+                    bucket.level = min(bucket.level, bucket.capacity)
+            if max_concurrency:
+                self.max_concurrency = max(int(max_concurrency), self.min_concurrency)
+                self.concurrency_limit = min(self.concurrency_limit, float(self.max_concurrency))
+            self._cond.notify_all()
+
+    # --- admission -----------------------------------------------------------
+
+    def _acquire(self, priority: int, tokens: int) -> None:
+        """Block until this request is first in the queue and all budgets allow it."""
+        with self._cond:
+            ticket = (int(priority), next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    if self._waiting[0] == ticket and self._in_flight < int(self.concurrency_limit):
+                        wait = max(
+                            self._paused_until - time.monotonic(),
+                            self._requests.wait_time(1),
+                            self._tokens.wait_time(tokens),
+                        )
+                        if wait <= 0:
+                            self._requests.consume(1)
+                            self._tokens.consume(tokens)
+                            self._in_flight += 1
+                            return
+                        self._cond.wait(timeout=wait)
+                    else:
+                        self._cond.wait(timeout=1.0)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def _release(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if actual_tokens is not None:
+                # Refund (or charge) the difference between the estimate and real usage
+                self._tokens.level += estimated_tokens - actual_tokens
+            self._cond.notify_all()
+
+    def _on_success(self, headers: Any) -> None:
+        with self._cond:
+            # Additive increase: roughly +1 slot per window of successful calls
+            self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1.0 / max(self.concurrency_limit, 1.0))
+            self._sync_headers(headers)
+            self._cond.notify_all()
+
+    def _on_rate_limited(self, headers: Any, delay: float) -> None:
+        with self._cond:
+            self._counters["rate_limited"] += 1
+            # Multiplicative decrease, and everyone waits out the server's pause
+            self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease_factor)
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._sync_headers(headers)
+
+    def _sync_headers(self, headers: Any) -> None:
+        if not headers:
+            return
+
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        self._requests.sync(number("x-ratelimit-limit-requests"), number("x-ratelimit-remaining-requests"))
+        self._tokens.sync(number("x-ratelimit-limit-tokens"), number("x-ratelimit-remaining-tokens"))
+
+    def _retry_delay(self, error: Exception, backoff: float) -> float:
+        """Server-requested delay when present, otherwise the policy's jittered backoff."""
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        for name in ("retry-after-ms", "retry-after"):
+            value = headers.get(name)
+            if value:
+                try:
+                    seconds = float(value) / (1000.0 if name.endswith("-ms") else 1.0)
+                    return min(seconds, self.retry_policy.max_delay)
+                except ValueError:
+                    pass
+        reset = max(
+            parse_reset_duration(headers.get("x-ratelimit-reset-requests")) or 0.0,
+            parse_reset_duration(headers.get("x-ratelimit-reset-tokens")) or 0.0,
+        )
+        return min(max(reset, backoff), self.retry_policy.max_delay)
+
+    # --- calls ---------------------------------------------------------------
+
+    def _call(self, raw_method: Callable[..., Any], priority: int, kwargs: Dict[str, Any]) -> Any:
+        with span("llm.chat", model=kwargs.get("model"), priority=int(priority)) as call_span:
+            completion_budget = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or DEFAULT_COMPLETION_TOKENS
+            estimated = estimate_tokens(kwargs.get("messages", []), completion_budget)
+            call_span.set_attribute("tokens.estimated", estimated)
+            # Refused here (BudgetExceededError) before the call takes a rate-limit slot
+            reservation = get_usage_ledger().reserve(kwargs.get("model") or "", estimated - completion_budget, completion_budget)
+            try:
+                completion = self._call_with_retries(raw_method, priority, kwargs, estimated, call_span)
+            except BaseException:
+                reservation.release()
+                raise
+            usage = getattr(completion, "usage", None)
+            if usage is None:
+                reservation.release()
+            else:
+                entry = reservation.settle(usage.prompt_tokens, usage.completion_tokens, model=getattr(completion, "model", None))
+                call_span.set_attribute("cost_usd", round(entry.cost_usd, 6))
+            return completion
+
+    def _call_with_retries(self, raw_method: Callable[..., Any], priority: int, kwargs: Dict[str, Any], estimated: int, call_span: Span) -> Any:
+        policy = self.retry_policy
+        deadline = policy.start_deadline()
+        backoff = policy.backoff()
+        for attempt in range(policy.max_retries + 1):
+            # An open breaker fails fast instead of queueing behind the rate limiter
+            self.breaker.before_call()
+            queued_at = time.perf_counter()
+            self._acquire(priority, estimated)
+            call_span.set_attribute("queue_wait_s", round(call_span.attributes.get("queue_wait_s", 0.0) + time.perf_counter() - queued_at, 4))
+            actual: Optional[int] = None
+            try:
+                raw = raw_method(**kwargs)
+                completion = raw.parse()
+                usage = getattr(completion, "usage", None)
+                if usage is not None:
+                    actual = usage.total_tokens
+                    call_span.set_attributes({
+                        "tokens.prompt": usage.prompt_tokens,
+                        "tokens.completion": usage.completion_tokens,
+                        "attempts": attempt + 1,
+                    })
+                    with self._cond:
+                        self._counters["requests"] += 1
+                        self._counters["prompt_tokens"] += usage.prompt_tokens
+                        self._counters["completion_tokens"] += usage.completion_tokens
+                self._on_success(raw.headers)
+                self.breaker.record_success()
+                return completion
+            except policy.retry_on as e:
+                rate_limited = isinstance(e, openai.RateLimitError)
+                if rate_limited:
+                    # The account is throttled, not the endpoint down: AIMD handles it
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure(e)
+                delay = self._retry_delay(e, next(backoff))
+                if attempt == policy.max_retries or not deadline.allows(delay):
+                    with self._cond:
+                        self._counters["errors"] += 1
+                    raise
+                if rate_limited:
+                    self._on_rate_limited(getattr(getattr(e, "response", None), "headers", None), delay)
+                call_span.add_event("retry", {"error": type(e).__name__, "delay_s": round(delay, 3)})
+                self.breaker.record_retry()
+                with self._cond:
+                    self._counters["retries"] += 1
+            except Exception:
+                self.breaker.record_success()
+                with self._cond:
+                    self._counters["errors"] += 1
+                raise
+            finally:
+                self._release(estimated, actual)
+            time.sleep(delay)
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def chat_completion(self, priority: int = Priority.NORMAL, **kwargs: Any) -> Any:
+        """
+        Runs ``client.chat.completions.create`` under the gateway's limits.
+
+        Args:
+            priority (int): Scheduling priority (see ``Priority``)
+            **kwargs: Arguments for ``chat.completions.create`` (model, messages, ...)
+
+        Returns:
+            ChatCompletion: The parsed completion
+
+        Raises:
+            openai.OpenAIError: If the call fails after all retries
+            BudgetExceededError: If an active budget cannot cover the call
+        """
+        return self._call(self.client.chat.completions.with_raw_response.create, priority, kwargs)
+
+    def parse(self, priority: int = Priority.NORMAL, **kwargs: Any) -> Any:
+        """
+        Runs ``client.beta.chat.completions.parse`` (structured output) under the gateway's limits.
+
+        Args:
+            priority (int): Scheduling priority (see ``Priority``)
+            **kwargs: Arguments for ``parse`` (model, messages, response_format, ...)
+
+        Returns:
+            ParsedChatCompletion: Completion with ``message.parsed`` populated
+        """
+        return self._call(self.client.beta.chat.completions.with_raw_response.parse, priority, kwargs)
+
+    def map(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+        max_workers: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Applies ``func`` to every item on worker threads, preserving order.
+
+        The gateway, not the thread count, decides how many LLM calls run at
+        once; ``max_workers`` only bounds the threads waiting on it.
+
+        Args:
+            func (Callable): Function making gateway calls for one item
+            items (Iterable): Work items
+            max_workers (int, optional): Thread count (defaults to ``max_concurrency``)
+            return_exceptions (bool): Put exceptions in the result list instead of raising
+
+        Returns:
+            List[Any]: Results aligned with ``items``
+        """
+        items = list(items)
+        if not items:
+            return []
+        context = _get_streamlit_context()
+
+        def run(item: Any) -> Any:
+            _attach_streamlit_context(context)
+            try:
+                return func(item)
+            except Exception as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        workers = max(1, min(max_workers or self.max_concurrency, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Each task runs in a copy of the caller's context, so its spans nest under the caller's
+            futures = [executor.submit(bind_context(run), item) for item in items]
+            return [future.result() for future in futures]
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of limits, budgets and counters for dashboards."""
+        with self._cond:
+            return {
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "in_flight": self._in_flight,
+                "queued": len(self._waiting),
+                "rpm_limit": self._requests.capacity,
+                "tpm_limit": self._tokens.capacity,
+                "rpm_available": round(max(self._requests.level, 0.0), 1),
+                "tpm_available": round(max(self._tokens.level, 0.0), 1),
+                **self._counters,
+            }
+
+
+def _get_streamlit_context() -> Any:
+    """Return the current Streamlit script context, if running under Streamlit."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        try:
+            return get_script_run_ctx(suppress_warning=True)
+        except TypeError:
+            return get_script_run_ctx()
+    except Exception:
+        return None
+
+
+def _attach_streamlit_context(context: Any) -> None:
+    """Let worker threads call st.* functions (warnings, errors) for the session."""
+    if context is None:
+        return
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx
+        add_script_run_ctx(threading.current_thread(), context)
+    except Exception:
+        pass
+
+
+_gateways: Dict[str, LLMGateway] = {}
+_gateways_lock = threading.Lock()
+
+
+def get_llm_gateway(api_key: str, **kwargs: Any) -> LLMGateway:
+    """
+    Returns the process-wide gateway for an OpenAI API key.
+
+    All pages and sessions using the same key share one gateway, because
+    the rate limits belong to the account, not to a page.
+
+    Rate and concurrency limits default to the ``performance`` configuration
+    and follow it when the YAML files are edited.
+
+    Args:
+        api_key (str): OpenAI API key
+        **kwargs: LLMGateway options, applied only when the gateway is created
+
+    Returns:
+        LLMGateway: Shared gateway
+    """
+    with _gateways_lock:
+        gateway = _gateways.get(api_key)
+    if gateway is not None:
+        return gateway
+
+    # Configuration is read outside the gateway lock: reload callbacks take
+    # that lock while the configuration manager holds its own
+    settings = get_performance_config()
+    subscribe(
+        _apply_performance_config,
+        keys=["performance.llm_rpm", "performance.llm_tpm", "performance.llm_max_concurrency"],
+    )
+    with _gateways_lock:
+        gateway = _gateways.get(api_key)
+        if gateway is None:
+            options = {
+                "rpm": settings.llm_rpm,
+                "tpm": settings.llm_tpm,
+                "initial_concurrency": settings.llm_initial_concurrency,
+                "max_concurrency": settings.llm_max_concurrency,
+            }
+            options.update(kwargs)
+            # The gateway owns retries, so the client must not retry 429s on its own
+            gateway = LLMGateway(get_openai_client(api_key, max_retries=0), **options)
+            _gateways[api_key] = gateway
+        return gateway
+
+
+def _apply_performance_config(config: Any, changed: Dict[str, Any]) -> None:
+    """Config subscriber: pushes reloaded LLM limits into every live gateway."""
+    settings = config.performance
+    with _gateways_lock:
+        gateways = list(_gateways.values())
+    for gateway in gateways:
+        gateway.configure(rpm=settings.llm_rpm, tpm=settings.llm_tpm, max_concurrency=settings.llm_max_concurrency)
+
+
+def gateway_stats() -> List[Dict[str, Any]]:
+    """
+    Stats of every gateway created so far, in creation order.
+
+    Returns:
+        List[Dict[str, Any]]: ``LLMGateway.stats()`` per gateway (API keys are not included)
+    """
+    with _gateways_lock:
+        gateways = list(_gateways.values())
+    return [gateway.stats() for gateway in gateways]
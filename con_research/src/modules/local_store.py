@@ -0,0 +1,95 @@
+"""
+Local Storage Helpers
+=====================
+
+Small helpers for the on-disk caches kept by the Conference Research
+Application (crawl fingerprints, search results, indexes).
+
+Features:
+- Single cache root, overridable with ``CONFERENCE_RESEARCH_CACHE_DIR``
+- Atomic JSON writes so a crash never leaves a half-written cache file
+- Stable short keys for naming cache files after URLs or queries
+
+Dependencies:
+- json, os, hashlib and pathlib from the standard library
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR_ENV_VAR = "CONFERENCE_RESEARCH_CACHE_DIR"
+
+
+def get_cache_dir(namespace: str = "") -> Path:
+    """
+    Returns (and creates) the cache directory for a namespace.
+
+    Args:
+        namespace (str): Sub-directory name such as "crawl" or "search"
+
+    Returns:
+        Path: Existing directory path
+
+    Note:
+        Defaults to ``~/.cache/conference_research``; set the
+        ``CONFERENCE_RESEARCH_CACHE_DIR`` environment variable to relocate it
+        (e.g. onto a mounted volume in Docker).
+    """
+    root = os.getenv(CACHE_DIR_ENV_VAR) or Path.home() / ".cache" / "conference_research"
+    path = Path(root) / namespace if namespace else Path(root)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def stable_key(value: str, length: int = 16) -> str:
+    """Return a short, filesystem-safe hex digest for an arbitrary string."""
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:length]
+
+
+def read_json(path: Path, default: Any = None) -> Any:
+    """
+    Reads a JSON file, returning ``default`` if it is missing or corrupt.
+
+    Args:
+        path (Path): File to read
+        default (Any): Value returned when the file cannot be loaded
+
+    Returns:
+        Any: Decoded JSON content or ``default``
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def atomic_write_json(path: Path, data: Any) -> None:
+    """
+    Writes JSON to ``path`` atomically via a temporary file and rename.
+
+    Args:
+        path (Path): Destination file
+        data (Any): JSON-serialisable content
+
+    Raises:
+        OSError: If the directory is not writable
+        TypeError: If data is not JSON-serialisable
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,423 @@
+"""
+Performance Metrics Module
+==========================
+
+Process-wide latency, throughput, error and token metrics for the pipeline.
+Averages hide the slow tail that hurts batch runs, so every operation keeps
+an HDR-style log-linear histogram from which p50/p90/p99 are read at ~1%
+precision, in constant memory regardless of how many calls were made.
+
+Features:
+- ``LatencyHistogram``: log-linear buckets (HdrHistogram layout, 2 significant
+  digits), sparse counts, mergeable, percentile queries
+- Per-operation totals plus one-minute windows (last two hours) for
+  throughput, error rate and latency-percentile time series
+- Per-model request, token and estimated cost counters, booked by the
+  usage ledger (``usage_accounting``) so each completion is counted once
+- Fed automatically by finished tracing spans (``record_span``), so every
+  ``llm.chat``, ``search.*``, ``http.fetch`` and tracked task is measured
+- ``timeseries`` and ``summary`` rows ready for ``st.line_chart`` / ``st.dataframe``
+- Labelled counters and gauges (cache hits, HTTP status classes, live WebDrivers)
+  for the Prometheus endpoint (``metrics_server``); setting
+  ``CONFERENCE_RESEARCH_METRICS_PORT`` starts it with the first registry use
+
+Dependencies:
+- Standard library only
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+WINDOW_SECONDS = 60
+MAX_WINDOWS = 120
+# Latency values are stored as integer microseconds
+_UNITS_PER_SECOND = 1_000_000
+METRICS_PORT_ENV_VAR = "CONFERENCE_RESEARCH_METRICS_PORT"
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# USD per million tokens (input, output); used when a call reports no cost
+DEFAULT_PRICES_PER_MILLION: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-ada-002": (0.10, 0.0),
+}
+
+
+def price_for_model(model: str, prices: Optional[Dict[str, Tuple[float, float]]] = None) -> Optional[Tuple[float, float]]:
+    """
+    Looks up (input, output) USD per million tokens for a model name.
+
+    Dated snapshots ("gpt-4o-mini-2024-07-18") match their base name; the
+    longest matching prefix wins so "gpt-4o-mini" is not priced as "gpt-4o".
+    """
+    table = prices or DEFAULT_PRICES_PER_MILLION
+    if model in table:
+        return table[model]
+    matches = [name for name in table if model.startswith(name)]
+    return table[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int,
+                  prices: Optional[Dict[str, Tuple[float, float]]] = None) -> float:
+    """Estimated USD cost of a call (0.0 for unknown models)."""
+    price = price_for_model(model or "", prices)
+    if price is None:
+        return 0.0
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations with HdrHistogram's bucket layout.
+
+    Values below ``2 * sub_bucket_half`` microseconds are recorded exactly;
+    above that, each power of two is split into ``sub_bucket_half`` linear
+    buckets, bounding the relative error by 1/``sub_bucket_half``.
+
+    Args:
+        significant_digits (int): Decimal precision to preserve (1-3)
+    """
+
+    def __init__(self, significant_digits: int = 2):
+        # Smallest power of two covering 2 * 10^digits distinct values
+        self._sub_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._half = 1 << (self._sub_bits - 1)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, units: int) -> int:
+        exponent = max(0, units.bit_length() - self._sub_bits)
+        return exponent * self._half + (units >> exponent)
+
+    def _upper_bound(self, index: int) -> int:
+        exponent = 0 if index < 2 * self._half else index // self._half - 1
+        sub = index - exponent * self._half
+        return ((sub + 1) << exponent) - 1
+
+    def record(self, seconds: float) -> None:
+        units = max(0, int(seconds * _UNITS_PER_SECOND))
+        index = self._index(units)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Duration in seconds at or below which ``percent`` of recordings fall.
+
+        Returns the upper edge of the matching bucket (capped at the observed
+        maximum), or 0.0 for an empty histogram.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index) / _UNITS_PER_SECOND, self.max)
+        return self.max
+
+    def count_at_or_below(self, seconds: float) -> int:
+        """Recordings whose bucket lies entirely at or below ``seconds`` (cumulative bucket count)."""
+        limit = int(seconds * _UNITS_PER_SECOND)
+        return sum(count for index, count in self.counts.items() if self._upper_bound(index) <= limit)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class _Window:
+    """One minute of activity for one operation."""
+    start: int
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+
+
+@dataclass
+class ModelUsage:
+    """
+    Token and cost counters for one model.
+
+    Attributes:
+        requests (int): Calls that reported usage
+        prompt_tokens (int): Input tokens
+        completion_tokens (int): Output tokens
+        cost_usd (float): Estimated spend
+    """
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of per-operation latency histograms and per-model usage.
+
+    Args:
+        window_seconds (int): Width of a time-series window
+        max_windows (int): Windows kept per operation
+    """
+
+    def __init__(self, window_seconds: int = WINDOW_SECONDS, max_windows: int = MAX_WINDOWS):
+        self.window_seconds = window_seconds
+        self.max_windows = max_windows
+        self._totals: Dict[str, LatencyHistogram] = {}
+        self._errors: Dict[str, int] = {}
+        self._windows: Dict[str, "OrderedDict[int, _Window]"] = {}
+        self._models: Dict[str, ModelUsage] = {}
+        self._counters: Dict[Tuple[str, LabelSet], float] = {}
+        self._gauges: Dict[Tuple[str, LabelSet], float] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def observe(self, operation: str, seconds: float, error: bool = False, at: Optional[float] = None) -> None:
+        """
+        Records one completed operation.
+
+        Args:
+            operation (str): Operation name (span name), e.g. "llm.chat"
+            seconds (float): Duration
+            error (bool): Whether the operation failed
+            at (float, optional): Completion time (epoch seconds), defaults to now
+        """
+        window_start = int((at or time.time()) // self.window_seconds * self.window_seconds)
+        with self._lock:
+            self._totals.setdefault(operation, LatencyHistogram()).record(seconds)
+            windows = self._windows.setdefault(operation, OrderedDict())
+            window = windows.get(window_start)
+            if window is None:
+                window = windows[window_start] = _Window(window_start)
+                while len(windows) > self.max_windows:
+                    windows.popitem(last=False)
+            window.histogram.record(seconds)
+            if error:
+                window.errors += 1
+                self._errors[operation] = self._errors.get(operation, 0) + 1
+
+    def record_usage(self, model: str, prompt_tokens: int, completion_tokens: int, cost_usd: Optional[float] = None) -> None:
+        """
+        Adds one call's token usage to the model's counters.
+
+        Args:
+            model (str): Model name as sent to the API
+            prompt_tokens (int): Input tokens reported by the API
+            completion_tokens (int): Output tokens reported by the API
+            cost_usd (float, optional): Known cost; estimated from the price table otherwise
+        """
+        cost = estimate_cost(model, prompt_tokens, completion_tokens) if cost_usd is None else cost_usd
+        with self._lock:
+            usage = self._models.setdefault(model or "unknown", ModelUsage())
+            usage.requests += 1
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            usage.cost_usd += cost
+
+    def increment(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        """Adds ``amount`` to a monotonically increasing counter, e.g. ``increment("search.cache", result="hit")``."""
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def add_gauge(self, name: str, delta: float, **labels: Any) -> None:
+        """Moves a gauge up or down, e.g. live WebDriver instances."""
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0.0) + delta
+
+    def counters(self) -> Dict[Tuple[str, LabelSet], float]:
+        """Copy of all counters keyed by (name, sorted label pairs)."""
+        with self._lock:
+            return dict(self._counters)
+
+    def gauges(self) -> Dict[Tuple[str, LabelSet], float]:
+        """Copy of all gauges keyed by (name, sorted label pairs)."""
+        with self._lock:
+            return dict(self._gauges)
+
+    def errors(self, operation: str) -> int:
+        with self._lock:
+            return self._errors.get(operation, 0)
+
+    def operations(self) -> List[str]:
+        with self._lock:
+            return list(self._totals)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        One row per operation: count, error rate, mean and tail latencies.
+
+        Returns:
+            List[Dict[str, Any]]: Rows sorted by total time spent, largest first
+        """
+        with self._lock:
+            rows = [
+                {
+                    "operation": operation,
+                    "count": histogram.count,
+                    "errors": self._errors.get(operation, 0),
+                    "error_rate": self._errors.get(operation, 0) / histogram.count if histogram.count else 0.0,
+                    "mean_s": histogram.mean,
+                    "p50_s": histogram.percentile(50),
+                    "p90_s": histogram.percentile(90),
+                    "p99_s": histogram.percentile(99),
+                    "max_s": histogram.max or 0.0,
+                    "total_s": histogram.total,
+                }
+                for operation, histogram in self._totals.items()
+            ]
+        return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+    def timeseries(self, operations: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Per-window rows for charts: throughput, error rate and latency percentiles.
+
+        Args:
+            operations (List[str], optional): Restrict to these operations
+
+        Returns:
+            List[Dict[str, Any]]: Rows with window_start (epoch seconds), operation,
+                requests_per_min, error_rate, p50_s, p90_s, p99_s
+        """
+        per_minute = 60.0 / self.window_seconds
+        with self._lock:
+            rows = []
+            for operation, windows in self._windows.items():
+                if operations and operation not in operations:
+                    continue
+                for window in windows.values():
+                    histogram = window.histogram
+                    rows.append({
+                        "window_start": window.start,
+                        "operation": operation,
+                        "requests_per_min": histogram.count * per_minute,
+                        "error_rate": window.errors / histogram.count if histogram.count else 0.0,
+                        "p50_s": histogram.percentile(50),
+                        "p90_s": histogram.percentile(90),
+                        "p99_s": histogram.percentile(99),
+                    })
+        return sorted(rows, key=lambda row: (row["window_start"], row["operation"]))
+
+    def model_usage(self) -> Dict[str, ModelUsage]:
+        """Copy of the per-model token and cost counters."""
+        with self._lock:
+            return {model: ModelUsage(**vars(usage)) for model, usage in self._models.items()}
+
+    def histogram(self, operation: str) -> Optional[LatencyHistogram]:
+        """Copy of an operation's all-time histogram."""
+        with self._lock:
+            source = self._totals.get(operation)
+            if source is None:
+                return None
+            copy = LatencyHistogram()
+            copy.merge(source)
+            return copy
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+            self._errors.clear()
+            self._windows.clear()
+            self._models.clear()
+            self._counters.clear()
+            # Gauges describe live state (open drivers), so they survive a reset
+            self.started_at = time.time()
+
+
+_metrics: Optional[MetricsRegistry] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Returns the process-wide metrics registry.
+
+    Returns:
+        MetricsRegistry: Shared registry instance
+    """
+    global _metrics
+    with _metrics_lock:
+        if _metrics is not None:
+            return _metrics
+        _metrics = MetricsRegistry()
+    if os.environ.get(METRICS_PORT_ENV_VAR):
+        # Imported here: the server module renders this registry
+        from con_research.src.modules.metrics_server import start_metrics_server
+        start_metrics_server()
+    return _metrics
+
+
+def track_webdriver(driver: Any) -> Any:
+    """
+    Counts a Selenium WebDriver as live until its ``quit`` is first called.
+
+    Scrapers quit drivers from both ``__exit__`` and ``__del__``; only the
+    first call moves the ``webdriver_active`` gauge.
+
+    Args:
+        driver: WebDriver instance (None is passed through)
+
+    Returns:
+        The same driver, with ``quit`` wrapped
+    """
+    if driver is None:
+        return None
+    registry = get_metrics()
+    registry.increment("webdriver_started")
+    registry.add_gauge("webdriver_active", 1)
+    original_quit = driver.quit
+    released = threading.Event()
+
+    def quit() -> None:
+        if not released.is_set():
+            released.set()
+            registry.add_gauge("webdriver_active", -1)
+        original_quit()
+
+    driver.quit = quit
+    return driver
+
+
+def record_span(name: str, seconds: float, error: bool, attributes: Dict[str, Any]) -> None:
+    """
+    Feeds one finished tracing span into the registry.
+
+    Token usage is not read from span attributes; the usage ledger books it
+    when the completion arrives, including calls made outside any span.
+    Cache outcomes (``cache.hit``) and HTTP status classes
+    (``http.status_code``) become labelled counters.
+    """
+    registry = get_metrics()
+    registry.observe(name, seconds, error=error)
+    if "cache.hit" in attributes:
+        registry.increment("cache_lookups", operation=name, result="hit" if attributes["cache.hit"] else "miss")
+    status_code = attributes.get("http.status_code")
+    if status_code:
+        registry.increment("http_responses", operation=name, status_class=f"{int(status_code) // 100}xx")
@@ -0,0 +1,244 @@
+"""
+Metrics Endpoint Module
+=======================
+
+Optional Prometheus-compatible HTTP endpoint for the running application.
+The in-page dashboard only shows one session; this endpoint exposes the
+process-wide numbers so a local Prometheus (or ``curl``) can scrape real load
+for capacity planning.
+
+Features:
+- Text exposition format 0.0.4 at ``/metrics``, served by a daemon thread
+  (``ThreadingHTTPServer``) so it never blocks Streamlit script runs
+- Histograms per operation (``llm.chat``, ``http.fetch``, ``search.*``, tracked
+  tasks) from the span-fed metrics registry, with error counters
+- LLM requests, tokens and estimated cost per model
+- Cache lookups (search, export), HTTP status classes and live WebDrivers
+- Gateway queue depth, in-flight calls, concurrency limit and 429s
+- Circuit breaker state and counters
+- Enabled by ``CONFERENCE_RESEARCH_METRICS_PORT`` (bind address from
+  ``CONFERENCE_RESEARCH_METRICS_HOST``, default loopback only: the endpoint
+  has no authentication)
+
+Dependencies:
+- Standard library only
+- con_research.src.modules.metrics for the registry being rendered
+"""
+
+import logging
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from con_research.src.modules.metrics import METRICS_PORT_ENV_VAR, MetricsRegistry, get_metrics
+
+logger = logging.getLogger(__name__)
+
+METRICS_HOST_ENV_VAR = "CONFERENCE_RESEARCH_METRICS_HOST"
+DEFAULT_METRICS_HOST = "127.0.0.1"
+METRIC_PREFIX = "conference_research_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Histogram bucket edges in seconds: cache hits and fast parses up to slow LLM calls and page loads
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _metric_name(name: str) -> str:
+    """Prometheus-safe metric name with the application prefix."""
+    safe = "".join(char if char.isalnum() or char == "_" else "_" for char in name)
+    return METRIC_PREFIX + safe
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Iterable[Tuple[str, Any]]) -> str:
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Exposition:
+    """Collects samples grouped by metric family, emitting HELP/TYPE once per family."""
+
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def add(self, name: str, kind: str, help_text: str, value: float, labels: Iterable[Tuple[str, Any]] = (),
+            suffix: str = "") -> None:
+        family = _metric_name(name)
+        _, _, samples = self._families.setdefault(family, (kind, help_text, []))
+        samples.append(f"{family}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+    def render(self) -> str:
+        lines = []
+        for family, (kind, help_text, samples) in self._families.items():
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def _collect_registry(out: _Exposition, registry: MetricsRegistry) -> None:
+    for operation in registry.operations():
+        histogram = registry.histogram(operation)
+        if histogram is None:
+            continue
+        labels = [("operation", operation)]
+        for edge in LATENCY_BUCKETS:
+            out.add("operation_duration_seconds", "histogram", "Duration of instrumented operations.",
+                    histogram.count_at_or_below(edge), labels + [("le", _format_value(edge))], suffix="_bucket")
+        out.add("operation_duration_seconds", "histogram", "Duration of instrumented operations.",
+                histogram.count, labels + [("le", "+Inf")], suffix="_bucket")
+        out.add("operation_duration_seconds", "histogram", "Duration of instrumented operations.",
+                histogram.total, labels, suffix="_sum")
+        out.add("operation_duration_seconds", "histogram", "Duration of instrumented operations.",
+                histogram.count, labels, suffix="_count")
+    for operation in registry.operations():
+        out.add("operation_errors_total", "counter", "Instrumented operations that ended in an error.",
+                registry.errors(operation), [("operation", operation)])
+
+    for model, usage in registry.model_usage().items():
+        out.add("llm_requests_total", "counter", "LLM completions with reported usage.", usage.requests, [("model", model)])
+        out.add("llm_tokens_total", "counter", "LLM tokens by direction.", usage.prompt_tokens, [("model", model), ("type", "prompt")])
+        out.add("llm_tokens_total", "counter", "LLM tokens by direction.", usage.completion_tokens, [("model", model), ("type", "completion")])
+        out.add("llm_cost_usd_total", "counter", "Estimated LLM spend in USD.", usage.cost_usd, [("model", model)])
+
+    for (name, labels), value in sorted(registry.counters().items()):
+        out.add(f"{name}_total", "counter", f"Count of {name.replace('_', ' ')}.", value, labels)
+    for (name, labels), value in sorted(registry.gauges().items()):
+        out.add(name, "gauge", f"Current {name.replace('.', ' ').replace('_', ' ')}.", value, labels)
+    out.add("metrics_start_time_seconds", "gauge", "When the metrics registry started (epoch seconds).", registry.started_at)
+
+
+def _collect_components(out: _Exposition) -> None:
+    """Stats of shared components, read only if their module is already loaded."""
+    llm_client = sys.modules.get("con_research.src.modules.llm_client")
+    if llm_client is not None:
+        for index, stats in enumerate(llm_client.gateway_stats()):
+            labels = [("gateway", index)]
+            out.add("llm_gateway_queued", "gauge", "Calls waiting for admission.", stats["queued"], labels)
+            out.add("llm_gateway_in_flight", "gauge", "Calls currently running.", stats["in_flight"], labels)
+            out.add("llm_gateway_concurrency_limit", "gauge", "Current AIMD concurrency limit.", stats["concurrency_limit"], labels)
+            out.add("llm_gateway_tpm_available", "gauge", "Tokens left in the per-minute bucket.", stats["tpm_available"], labels)
+            out.add("llm_gateway_rate_limited_total", "counter", "429 responses received.", stats["rate_limited"], labels)
+            out.add("llm_gateway_retries_total", "counter", "Retried calls.", stats["retries"], labels)
+            out.add("llm_gateway_errors_total", "counter", "Calls that failed after retries.", stats["errors"], labels)
+
+    search_cache = sys.modules.get("con_research.src.modules.search_cache")
+    if search_cache is not None:
+        stats = search_cache.get_search_cache().stats()
+        out.add("search_cache_hits_total", "counter", "Search results served from cache.", stats["hits"])
+        out.add("search_cache_misses_total", "counter", "Searches sent to the provider.", stats["misses"])
+        out.add("search_cache_entries", "gauge", "Stored search results.", stats["entries"])
+
+    exporting = sys.modules.get("con_research.src.modules.exporting")
+    if exporting is not None:
+        stats = exporting.get_export_cache().stats()
+        out.add("export_cache_hits_total", "counter", "Downloads served from the export cache.", stats["hits"])
+        out.add("export_cache_misses_total", "counter", "Export files built.", stats["misses"])
+        out.add("export_cache_bytes", "gauge", "Bytes held by the export cache.", stats["bytes"])
+
+    resilience = sys.modules.get("con_research.src.modules.resilience")
+    if resilience is not None:
+        for endpoint, snapshot in resilience.breaker_snapshot().items():
+            labels = [("endpoint", endpoint)]
+            for state in resilience.CircuitState:
+                out.add("circuit_breaker_state", "gauge", "1 for the breaker's current state.",
+                        1 if snapshot["state"] == state.value else 0, labels + [("state", state.value)])
+            for counter in ("calls", "failures", "rejections", "retries", "times_opened"):
+                out.add(f"circuit_breaker_{counter}_total", "counter", f"Breaker {counter.replace('_', ' ')}.",
+                        snapshot[counter], labels)
+
+
+def render_prometheus(registry: Optional[MetricsRegistry] = None) -> str:
+    """
+    Renders every metric in the Prometheus text exposition format.
+
+    Args:
+        registry (MetricsRegistry, optional): Registry to render (defaults to the shared one)
+
+    Returns:
+        str: Exposition text, one HELP/TYPE header per metric family
+    """
+    out = _Exposition()
+    _collect_registry(out, registry or get_metrics())
+    try:
+        _collect_components(out)
+    except Exception as e:  # A broken component must not take down the scrape
+        logger.warning("Metrics collection failed for a component: %s", e)
+    return out.render()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Scrapes every few seconds would flood the Streamlit log
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[int]:
+    """
+    Starts the metrics endpoint on a daemon thread (once per process).
+
+    Streamlit re-runs page scripts constantly, so repeated calls return the
+    running server's port instead of binding again.
+
+    Args:
+        port (int, optional): Port to bind (defaults to ``CONFERENCE_RESEARCH_METRICS_PORT``; 0 picks a free one)
+        host (str, optional): Address to bind (defaults to ``CONFERENCE_RESEARCH_METRICS_HOST`` or 127.0.0.1)
+
+    Returns:
+        Optional[int]: Bound port, or None if no port is configured or binding failed
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server.server_address[1]
+        if port is None:
+            try:
+                port = int(os.environ.get(METRICS_PORT_ENV_VAR, ""))
+            except ValueError:
+                return None
+        host = host or os.environ.get(METRICS_HOST_ENV_VAR, DEFAULT_METRICS_HOST)
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            logger.warning("Metrics endpoint not started on %s:%s: %s", host, port, e)
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        _server = server
+        logger.info("Metrics endpoint listening on %s:%s/metrics", host, server.server_address[1])
+        return server.server_address[1]
+
+
+def stop_metrics_server() -> None:
+    """Shuts the endpoint down (mainly for scripts and benchmarks)."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
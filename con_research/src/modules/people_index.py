@@ -0,0 +1,458 @@
+"""
+People Index
+============
+
+Local search index over the attendee and researcher lists that users upload
+(CSV/XLSX). Looking up one person becomes an indexed query that answers in
+milliseconds, with no LLM call.
+
+Features:
+- Normalised name and affiliation keys (accents, case, titles such as "Dr"/"Prof",
+  punctuation and common affiliation abbreviations)
+- Fuzzy name/affiliation matching: trigram candidates from an inverted index,
+  scored with Dice similarity or RapidFuzz when it is installed
+- Inverted index over Bio text with TF-IDF ranking for keyword queries
+- Re-indexing a file replaces its rows; unchanged files are skipped by content hash
+- Searches can be restricted to a set of source files
+
+Note:
+    Uploaded rows are personal data. Pages keep one in-memory index per
+    Streamlit session; the process-wide ``get_people_index`` is shared by
+    every user of the process and only writes to disk when
+    ``CONFERENCE_RESEARCH_PEOPLE_INDEX_PERSIST`` is enabled.
+
+Dependencies:
+- sqlite3 from the standard library
+- pandas for the uploaded DataFrames
+- rapidfuzz (optional) for token-aware fuzzy scoring
+- con_research.src.modules.local_store for the optional on-disk location
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+import pandas as pd
+
+from con_research.src.modules.local_store import get_cache_dir
+
+try:
+    from rapidfuzz import fuzz as _rapidfuzz
+except ImportError:  # pragma: no cover - optional dependency
+    _rapidfuzz = None
+
+NAME_COLUMNS = ("Name", "Full Name", "name")
+AFFILIATION_COLUMNS = ("University", "Affiliation", "Institution", "university", "affiliation")
+BIO_COLUMNS = ("Bio", "bio", "Biography")
+PEOPLE_INDEX_PERSIST_ENV_VAR = "CONFERENCE_RESEARCH_PEOPLE_INDEX_PERSIST"
+
+_HONORIFICS = frozenset({"dr", "prof", "professor", "mr", "mrs", "ms", "miss", "mx", "sir", "dame", "phd", "dphil"})
+_AFFILIATION_ABBREVIATIONS = {"univ": "university", "uni": "university", "inst": "institute", "coll": "college", "dept": "department"}
+_AFFILIATION_STOPWORDS = frozenset({"the", "of", "at", "and", "for"})
+_BIO_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have he her his in is it its of on or she that the their they this to was were with".split()
+)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _fold(text: Any) -> str:
+    """Lowercase ASCII-folded text (accents removed), or "" for missing values."""
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def normalize_name(name: Any) -> str:
+    """
+    Returns the matching key of a person's name.
+
+    Example:
+        >>> normalize_name("Prof. José  García-Pérez")
+        'jose garcia perez'
+    """
+    words = _WORD.findall(_fold(name))
+    return " ".join(word for word in words if word not in _HONORIFICS)
+
+
+def normalize_affiliation(affiliation: Any) -> str:
+    """
+    Returns the matching key of an affiliation.
+
+    Example:
+        >>> normalize_affiliation("The Univ. of Oxford")
+        'university oxford'
+    """
+    words = _WORD.findall(_fold(affiliation).replace("&", " and "))
+    words = [_AFFILIATION_ABBREVIATIONS.get(word, word) for word in words]
+    return " ".join(word for word in words if word not in _AFFILIATION_STOPWORDS)
+
+
+def trigrams(key: str) -> Set[str]:
+    """Character trigrams of a normalised key, padded at word boundaries."""
+    grams: Set[str] = set()
+    for word in key.split():
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def bio_terms(text: Any) -> List[str]:
+    """Index terms of a bio (lowercased, accents folded, stopwords removed)."""
+    return [word for word in _WORD.findall(_fold(text)) if len(word) > 1 and word not in _BIO_STOPWORDS]
+
+
+def similarity(query_key: str, candidate_key: str) -> float:
+    """
+    Fuzzy similarity in [0, 1] between two normalised keys.
+
+    Uses RapidFuzz's token-set ratio when available (robust to word order and
+    middle names), otherwise the Dice coefficient of the trigram sets. Partial
+    queries ("garcia" for "Jose Garcia Perez") are scored by how much of the
+    query the candidate covers, slightly discounted.
+    """
+    if not query_key or not candidate_key:
+        return 0.0
+    if _rapidfuzz is not None:
+        return _rapidfuzz.token_set_ratio(query_key, candidate_key) / 100.0
+    query_grams, candidate_grams = trigrams(query_key), trigrams(candidate_key)
+    shared = len(query_grams & candidate_grams)
+    dice = 2 * shared / (len(query_grams) + len(candidate_grams))
+    return max(dice, 0.9 * shared / len(query_grams))
+
+
+def _pick_column(columns: Iterable[str], candidates: Iterable[str]) -> Optional[str]:
+    present = list(columns)
+    for candidate in candidates:
+        if candidate in present:
+            return candidate
+    return None
+
+
+@dataclass
+class PersonMatch:
+    """
+    One search hit.
+
+    Attributes:
+        source (str): File the row came from
+        row_id (str): Row index within that file
+        name (str): Name as uploaded
+        affiliation (str): Affiliation as uploaded
+        score (float): Relevance in [0, 1] for name/affiliation queries, TF-IDF otherwise
+        record (Dict[str, Any]): The full uploaded row
+    """
+    source: str
+    row_id: str
+    name: str
+    affiliation: str
+    score: float
+    record: Dict[str, Any] = field(default_factory=dict)
+
+
+class PeopleIndex:
+    """
+    SQLite-backed people index, safe to share between threads.
+
+    Example:
+        >>> index = get_people_index()
+        >>> index.add_dataframe(df, "attendees_2025.xlsx")
+        >>> index.search(name="jane doe", affiliation="oxford")
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): SQLite database file (":memory:" for a throwaway index)
+        """
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sources (
+                source TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                rows INTEGER NOT NULL,
+                indexed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS people (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                row_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                affiliation TEXT NOT NULL,
+                name_key TEXT NOT NULL,
+                affiliation_key TEXT NOT NULL,
+                record TEXT NOT NULL,
+                bio_length INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS people_source ON people (source);
+            CREATE INDEX IF NOT EXISTS people_name_key ON people (name_key);
+            CREATE TABLE IF NOT EXISTS grams (
+                field TEXT NOT NULL,
+                gram TEXT NOT NULL,
+                person_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS grams_lookup ON grams (field, gram);
+            CREATE INDEX IF NOT EXISTS grams_person ON grams (person_id);
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT NOT NULL,
+                person_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS terms_lookup ON terms (term);
+            CREATE INDEX IF NOT EXISTS terms_person ON terms (person_id);
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(dataframe: pd.DataFrame) -> str:
+        """Stable hash of a DataFrame's contents, used to skip unchanged files."""
+        digest = hashlib.sha256(",".join(map(str, dataframe.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(dataframe.astype(str), index=True).values.tobytes())
+        return digest.hexdigest()
+
+    def _remove_source(self, source: str) -> None:
+        ids = "SELECT id FROM people WHERE source = ?"
+        self._conn.execute(f"DELETE FROM grams WHERE person_id IN ({ids})", (source,))
+        self._conn.execute(f"DELETE FROM terms WHERE person_id IN ({ids})", (source,))
+        self._conn.execute("DELETE FROM people WHERE source = ?", (source,))
+        self._conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+
+    def add_dataframe(self, dataframe: pd.DataFrame, source: str, force: bool = False) -> int:
+        """
+        Indexes (or re-indexes) the rows of an uploaded file.
+
+        Args:
+            dataframe (pd.DataFrame): Rows with a name column and optionally
+                affiliation and bio columns (see NAME_COLUMNS, AFFILIATION_COLUMNS, BIO_COLUMNS)
+            source (str): File name; rows previously indexed under it are replaced
+            force (bool): Re-index even if the content hash is unchanged
+
+        Returns:
+            int: Rows indexed (0 when the file was already up to date)
+
+        Raises:
+            ValueError: If the DataFrame has no recognised name column
+        """
+        name_column = _pick_column(dataframe.columns, NAME_COLUMNS)
+        if name_column is None:
+            raise ValueError(f"No name column found; expected one of {list(NAME_COLUMNS)}")
+        affiliation_column = _pick_column(dataframe.columns, AFFILIATION_COLUMNS)
+        bio_column = _pick_column(dataframe.columns, BIO_COLUMNS)
+
+        content_hash = self.content_hash(dataframe)
+        with self._lock:
+            row = self._conn.execute("SELECT content_hash FROM sources WHERE source = ?", (source,)).fetchone()
+            if row is not None and row[0] == content_hash and not force:
+                return 0
+            self._remove_source(source)
+
+            records = json.loads(dataframe.to_json(orient="records", date_format="iso", default_handler=str))
+            indexed = 0
+            for row_id, record in zip(dataframe.index, records):
+                name = record.get(name_column)
+                if not name:
+                    continue
+                affiliation = record.get(affiliation_column) if affiliation_column else ""
+                name_key = normalize_name(name)
+                affiliation_key = normalize_affiliation(affiliation)
+                terms = Counter(bio_terms(record.get(bio_column))) if bio_column else Counter()
+                cursor = self._conn.execute(
+                    "INSERT INTO people (source, row_id, name, affiliation, name_key, affiliation_key, record, bio_length) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (source, str(row_id), str(name), str(affiliation or ""), name_key, affiliation_key,
+                     json.dumps(record, ensure_ascii=False), sum(terms.values())),
+                )
+                person_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO grams (field, gram, person_id) VALUES (?, ?, ?)",
+                    [("name", gram, person_id) for gram in trigrams(name_key)]
+                    + [("affiliation", gram, person_id) for gram in trigrams(affiliation_key)],
+                )
+                self._conn.executemany(
+                    "INSERT INTO terms (term, person_id, tf) VALUES (?, ?, ?)",
+                    [(term, person_id, count) for term, count in terms.items()],
+                )
+                indexed += 1
+            self._conn.execute(
+                "INSERT INTO sources (source, content_hash, rows, indexed_at) VALUES (?, ?, ?, ?)",
+                (source, content_hash, indexed, time.time()),
+            )
+            self._conn.commit()
+        return indexed
+
+    def _gram_candidates(self, field_name: str, key: str, limit: int) -> Dict[int, int]:
+        """Person IDs sharing trigrams with ``key``, with the shared-gram count (best first)."""
+        grams = sorted(trigrams(key))
+        if not grams:
+            return {}
+        placeholders = ",".join("?" * len(grams))
+        rows = self._conn.execute(
+            f"SELECT person_id, COUNT(*) AS shared FROM grams WHERE field = ? AND gram IN ({placeholders}) "
+            "GROUP BY person_id ORDER BY shared DESC LIMIT ?",
+            (field_name, *grams, limit),
+        ).fetchall()
+        return dict(rows)
+
+    def _load(self, person_ids: Iterable[int], sources: Optional[Sequence[str]] = None) -> Dict[int, tuple]:
+        ids = list(person_ids)
+        if not ids or (sources is not None and not sources):
+            return {}
+        query = (
+            "SELECT id, source, row_id, name, affiliation, name_key, affiliation_key, record FROM people "
+            f"WHERE id IN ({','.join('?' * len(ids))})"
+        )
+        params: List[Any] = list(ids)
+        if sources is not None:
+            query += f" AND source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        rows = self._conn.execute(query, params).fetchall()
+        return {row[0]: row for row in rows}
+
+    def _text_scores(self, text: str) -> Dict[int, float]:
+        """TF-IDF scores of people whose bio contains every query term."""
+        terms = list(dict.fromkeys(bio_terms(text)))
+        if not terms:
+            return {}
+        total = self._conn.execute("SELECT COUNT(*) FROM people").fetchone()[0] or 1
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            postings = self._conn.execute("SELECT person_id, tf FROM terms WHERE term = ?", (term,)).fetchall()
+            idf = math.log(1 + total / (1 + len(postings)))
+            term_scores = {person_id: (1 + math.log(tf)) * idf for person_id, tf in postings}
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {pid: score + term_scores[pid] for pid, score in scores.items() if pid in term_scores}
+            if not scores:
+                return {}
+        return scores or {}
+
+    def search(
+        self,
+        name: Optional[str] = None,
+        affiliation: Optional[str] = None,
+        text: Optional[str] = None,
+        limit: int = 20,
+        min_score: float = 0.6,
+        sources: Optional[Sequence[str]] = None,
+    ) -> List[PersonMatch]:
+        """
+        Finds people by fuzzy name and/or affiliation, and/or bio keywords.
+
+        Args:
+            name (str, optional): Person's name (any order, titles and accents ignored)
+            affiliation (str, optional): Affiliation; filters and boosts name matches,
+                or is searched on its own when no name is given
+            text (str, optional): Keywords that must all appear in the bio
+            limit (int): Maximum results
+            min_score (float): Minimum fuzzy score for name/affiliation matches
+            sources (Sequence[str], optional): Only return rows from these files
+                (e.g. the caller's current uploads); all files when None
+
+        Returns:
+            List[PersonMatch]: Best matches first
+        """
+        name_key = normalize_name(name) if name else ""
+        affiliation_key = normalize_affiliation(affiliation) if affiliation else ""
+        candidate_limit = max(200, limit * 20)
+
+        with self._lock:
+            text_scores = self._text_scores(text) if text and bio_terms(text) else None
+            if text_scores is not None and not text_scores:
+                return []
+            if name_key:
+                candidates = set(self._gram_candidates("name", name_key, candidate_limit))
+            elif affiliation_key:
+                candidates = set(self._gram_candidates("affiliation", affiliation_key, candidate_limit))
+            elif text_scores is not None:
+                candidates = set(text_scores)
+            else:
+                return []
+            if text_scores is not None:
+                candidates &= set(text_scores)
+            rows = self._load(candidates, sources)
+
+        matches: List[PersonMatch] = []
+        for person_id, (_, source, row_id, person_name, person_affiliation, p_name_key, p_aff_key, record) in rows.items():
+            if name_key:
+                score = similarity(name_key, p_name_key)
+                if affiliation_key:
+                    affiliation_score = similarity(affiliation_key, p_aff_key)
+                    if affiliation_score < min_score:
+                        continue
+                    score = 0.75 * score + 0.25 * affiliation_score
+            elif affiliation_key:
+                score = similarity(affiliation_key, p_aff_key)
+            else:
+                score = text_scores[person_id]
+            if (name_key or affiliation_key) and score < min_score:
+                continue
+            matches.append(PersonMatch(source, row_id, person_name, person_affiliation, round(score, 4), json.loads(record)))
+
+        matches.sort(key=lambda match: match.score, reverse=True)
+        return matches[:limit]
+
+    def sources(self) -> List[Dict[str, Any]]:
+        """Indexed files with their row counts and indexing times."""
+        with self._lock:
+            rows = self._conn.execute("SELECT source, rows, indexed_at FROM sources ORDER BY indexed_at DESC").fetchall()
+        return [{"source": s, "rows": r, "indexed_at": t} for s, r, t in rows]
+
+    def remove_source(self, source: str) -> None:
+        """Drop every row indexed from a file."""
+        with self._lock:
+            self._remove_source(source)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove everything from the index."""
+        with self._lock:
+            for table in ("grams", "terms", "people", "sources"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Number of indexed files and people."""
+        with self._lock:
+            people = self._conn.execute("SELECT COUNT(*) FROM people").fetchone()[0]
+            sources = self._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+        return {"sources": sources, "people": people}
+
+
+_people_index: Optional[PeopleIndex] = None
+_people_index_lock = threading.Lock()
+
+
+def get_people_index() -> PeopleIndex:
+    """
+    Returns the process-wide people index.
+
+    The index is shared by every session of the process, so pages serving
+    several users should keep their own ``PeopleIndex(":memory:")`` instead.
+    It is kept in memory unless ``CONFERENCE_RESEARCH_PEOPLE_INDEX_PERSIST``
+    is set (e.g. "1" for a single-user desktop install), in which case it is
+    stored under the application cache directory.
+
+    Returns:
+        PeopleIndex: Shared index instance
+    """
+    global _people_index
+    with _people_index_lock:
+        if _people_index is None:
+            persist = os.getenv(PEOPLE_INDEX_PERSIST_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+            path = str(get_cache_dir("people") / "people_index.sqlite3") if persist else ":memory:"
+            _people_index = PeopleIndex(path)
+        return _people_index
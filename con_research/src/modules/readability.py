@@ -0,0 +1,228 @@
+"""
+Main-Content Extraction Module
+==============================
+
+Readability-style extraction of the article body of a web page, used to keep
+LLM prompts small. Pages are scored block by block on text length, commas and
+link density; the best-scoring container (plus related siblings) is returned
+as compact text with each piece of text emitted exactly once.
+
+Features:
+- Text attributed to its nearest block element, so nested divs never repeat it
+- Candidate scoring by text and link density, propagated to parent/grandparent
+- Class/id hints for content ("article", "course", "profile") and chrome ("nav", "share")
+- Per-block link-density filter for menus and link farms left inside the body
+- Falls back to the whole de-duplicated body when no clear article exists
+
+Dependencies:
+- beautifulsoup4 (lxml used when installed, via html_text)
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+from con_research.src.modules.html_text import BOILERPLATE_CLASS_PATTERN, BOILERPLATE_TAGS, make_soup, strip_boilerplate
+
+# Elements that never contain readable article text
+NON_CONTENT_TAGS = BOILERPLATE_TAGS + ("form", "noscript", "iframe", "svg", "button", "select", "template")
+
+# Elements that start a new line of text; inline text is attributed to the nearest one
+BLOCK_TAGS = frozenset({
+    "address", "article", "blockquote", "body", "caption", "dd", "details", "div", "dl", "dt",
+    "figcaption", "figure", "h1", "h2", "h3", "h4", "h5", "h6", "li", "main", "ol", "p", "pre",
+    "section", "summary", "table", "td", "th", "tr", "ul",
+})
+
+POSITIVE_HINTS = re.compile(
+    r"article|body|content|entry|main|page|post|text|blog|story|abstract|biography|bio|profile"
+    r"|course|module|programme|program|session|panel|paper|presenter|speaker|faculty|staff",
+    re.I,
+)
+NEGATIVE_HINTS = re.compile(
+    r"comment|meta|footer|footnote|nav|menu|sidebar|sponsor|share|social|widget|cookie|banner"
+    r"|promo|related|breadcrumb|pagination|popup|modal|login|subscribe|newsletter|advert|\bad\b",
+    re.I,
+)
+
+TAG_WEIGHTS = {
+    "article": 10, "main": 10, "div": 5, "section": 3, "td": 3, "pre": 3, "blockquote": 3,
+    "form": -3, "ol": -3, "ul": -3, "dl": -3, "li": -3, "th": -5,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5,
+}
+
+# Blocks shorter than this do not contribute to candidate scores
+MIN_SCORING_CHARS = 25
+# Candidates re-ranked with their link density
+TOP_CANDIDATES = 5
+
+
+def _class_weight(element: Tag) -> int:
+    """Score adjustment from an element's class and id attributes."""
+    hint = " ".join(element.get("class") or []) + " " + (element.get("id") or "")
+    if not hint.strip():
+        return 0
+    weight = 0
+    if POSITIVE_HINTS.search(hint):
+        weight += 25
+    if NEGATIVE_HINTS.search(hint):
+        weight -= 25
+    return weight
+
+
+def _is_navigation_link(anchor: Tag) -> bool:
+    """Links to other pages count towards link density; mailto/tel contacts do not."""
+    return not (anchor.get("href") or "").lower().startswith(("mailto:", "tel:"))
+
+
+def _collect_blocks(root: Tag) -> List[Tuple[Tag, str, float]]:
+    """
+    Groups every visible string under ``root`` by its nearest block ancestor.
+
+    Returns:
+        List[Tuple[Tag, str, float]]: (block element, block text, link density)
+        in document order; each string belongs to exactly one block
+    """
+    blocks: Dict[int, List] = {}
+    for node in root.descendants:
+        if type(node) is not NavigableString:
+            continue
+        text = node.strip()
+        if not text:
+            continue
+        in_link = False
+        block = node.parent
+        while block is not None and block.name not in BLOCK_TAGS:
+            if block.name == "a" and _is_navigation_link(block):
+                in_link = True
+            block = block.parent
+        if block is None:
+            block = root
+        entry = blocks.setdefault(id(block), [block, [], 0])
+        entry[1].append(text)
+        if in_link:
+            entry[2] += len(text)
+
+    collected = []
+    for block, parts, link_chars in blocks.values():
+        text = " ".join(parts)
+        collected.append((block, text, link_chars / len(text) if text else 0.0))
+    return collected
+
+
+def _score_candidates(blocks: List[Tuple[Tag, str, float]]) -> Dict[int, List]:
+    """Readability scoring: each substantial block feeds its parent and grandparent."""
+    candidates: Dict[int, List] = {}
+
+    def candidate(element: Tag) -> List:
+        if id(element) not in candidates:
+            base = TAG_WEIGHTS.get(element.name, 0) + _class_weight(element)
+            candidates[id(element)] = [element, float(base)]
+        return candidates[id(element)]
+
+    for block, text, link_density in blocks:
+        if len(text) < MIN_SCORING_CHARS:
+            continue
+        score = (1 + text.count(",") + min(len(text) // 100, 3)) * (1 - link_density)
+        # Text sitting directly in a container also counts for the container itself
+        targets = [block] if block.name in ("div", "section", "article", "main", "td") else []
+        parent = block.parent
+        if isinstance(parent, Tag):
+            targets.append(parent)
+            if isinstance(parent.parent, Tag):
+                candidate(parent.parent)[1] += score / 2
+        for target in targets:
+            candidate(target)[1] += score
+    return candidates
+
+
+def _link_density(element: Tag) -> float:
+    """Share of an element's text that sits inside links."""
+    text_length = len(element.get_text(strip=True))
+    if not text_length:
+        return 0.0
+    link_length = sum(len(a.get_text(strip=True)) for a in element.find_all("a") if _is_navigation_link(a))
+    return min(link_length / text_length, 1.0)
+
+
+def _is_within(element: Tag, containers: List[Tag]) -> bool:
+    """True if ``element`` is one of ``containers`` or a descendant of one."""
+    container_ids = {id(c) for c in containers}
+    node: Optional[Tag] = element
+    while node is not None:
+        if id(node) in container_ids:
+            return True
+        node = node.parent
+    return False
+
+
+def _render(blocks: List[Tuple[Tag, str, float]], max_link_density: float, separator: str) -> str:
+    """Join block texts, dropping link-heavy blocks and verbatim repeats."""
+    seen = set()
+    lines = []
+    for _, text, link_density in blocks:
+        if link_density > max_link_density or text in seen:
+            continue
+        seen.add(text)
+        lines.append(text)
+    return separator.join(lines)
+
+
+def extract_main_content(
+    html: Union[str, bytes, BeautifulSoup],
+    separator: str = "\n",
+    max_link_density: float = 0.5,
+    min_text_length: int = 250,
+) -> str:
+    """
+    Extracts the main article body of a page as compact text.
+
+    Args:
+        html (str | bytes | BeautifulSoup): Page markup or an already parsed
+            soup (which is modified in place)
+        separator (str): String placed between text blocks
+        max_link_density (float): Blocks whose share of link text exceeds
+            this are dropped (menus, tag clouds); use 1.0 to keep link lists
+            such as course indexes
+        min_text_length (int): If the best candidate yields less text than
+            this, the whole de-duplicated body is returned instead
+
+    Returns:
+        str: Main content text, empty if the page has no visible text
+
+    Note:
+        The scoring follows the classic Readability heuristic: paragraphs
+        score by length and commas, discounted by link density, and feed
+        their parent (full score) and grandparent (half score). Siblings of
+        the winner scoring at least a fifth of it are kept, since article
+        bodies are often split across adjacent containers.
+    """
+    soup = html if isinstance(html, BeautifulSoup) else make_soup(html)
+    strip_boilerplate(soup, tags=NON_CONTENT_TAGS, class_pattern=BOILERPLATE_CLASS_PATTERN)
+    root = soup.body or soup
+
+    blocks = _collect_blocks(root)
+    if not blocks:
+        return ""
+
+    candidates = _score_candidates(blocks)
+    if candidates:
+        # Link density is only worth computing for the strongest candidates
+        strongest = sorted(candidates.values(), key=lambda item: item[1], reverse=True)[:TOP_CANDIDATES]
+        scored = [(element, score * (1 - _link_density(element))) for element, score in strongest]
+        top, top_score = max(scored, key=lambda item: item[1])
+        if top_score > 0:
+            containers = [top]
+            if top.parent is not None:
+                threshold = max(10.0, top_score * 0.2)
+                containers.extend(
+                    element for element, score in scored
+                    if element is not top and element.parent is top.parent and score >= threshold
+                )
+            main_text = _render([b for b in blocks if _is_within(b[0], containers)], max_link_density, separator)
+            if len(main_text) >= min_text_length:
+                return main_text
+
+    return _render(blocks, max_link_density, separator)
+
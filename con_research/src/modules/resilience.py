@@ -0,0 +1,419 @@
+"""
+Resilience Module
+=================
+
+Retry and circuit-breaker primitives shared by every external call in the
+Conference Research Application: OpenAI, Serper, DuckDuckGo and page fetches.
+
+Features:
+- ``RetryPolicy`` with decorrelated-jitter backoff and an overall per-call deadline
+- Per-endpoint ``CircuitBreaker`` (closed → open → half-open) so a failing host
+  is rejected immediately instead of tying up workers in retries
+- Per-breaker metrics (calls, failures, rejections, retries, state changes)
+- ``call`` / ``acall`` helpers and a ``resilient`` decorator that works on both
+  plain and ``async def`` functions (asyncio.sleep for the latter)
+- Timeouts always count as endpoint failures; cancellation and interrupts
+  propagate without judging the endpoint
+
+Dependencies:
+- Standard library only
+"""
+
+import asyncio
+import functools
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Type, Union
+from urllib.parse import urlparse
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a call is rejected because its endpoint's breaker is open.
+
+    Attributes:
+        endpoint (str): Breaker name
+        retry_after (float): Seconds until the breaker lets a probe call through
+    """
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"Circuit for '{endpoint}' is open; retry in {retry_after:.1f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class Deadline:
+    """Wall-clock budget for one logical call, including all of its retries."""
+
+    def __init__(self, seconds: Optional[float]):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None for an unbounded call."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def allows(self, delay: float) -> bool:
+        """True if sleeping ``delay`` seconds still leaves time for another attempt."""
+        remaining = self.remaining()
+        return remaining is None or delay < remaining
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How often and how long to retry a failing call.
+
+    Attributes:
+        max_retries (int): Retries after the first attempt
+        base_delay (float): Smallest backoff delay in seconds
+        max_delay (float): Largest single backoff delay in seconds
+        deadline (Optional[float]): Overall seconds for the call including retries
+        retry_on (Tuple[Type[BaseException], ...]): Exceptions that trigger a retry
+            and count as endpoint failures; anything else propagates at once
+    """
+    max_retries: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    deadline: Optional[float] = None
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+
+    def backoff(self) -> Iterator[float]:
+        """
+        Yields successive delays using decorrelated jitter.
+
+        Each delay is drawn uniformly from [base, 3 × previous delay] and
+        capped at ``max_delay``, which spreads retries from many workers
+        apart better than exponential backoff with additive jitter.
+        """
+        delay = self.base_delay
+        while True:
+            delay = min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, delay * 3)))
+            yield delay
+
+    def start_deadline(self) -> Deadline:
+        return Deadline(self.deadline)
+
+
+@dataclass
+class BreakerMetrics:
+    """Counters exposed for dashboards and metrics exporters."""
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    rejections: int = 0
+    retries: int = 0
+    times_opened: int = 0
+    consecutive_failures: int = 0
+    last_error: str = ""
+    last_state_change: float = field(default_factory=time.time)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one endpoint.
+
+    CLOSED lets every call through. After ``failure_threshold`` consecutive
+    failures it turns OPEN and rejects calls for ``recovery_timeout`` seconds.
+    It then turns HALF_OPEN and admits up to ``half_open_max_calls`` probe
+    calls: a success closes it again, a failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.metrics = BreakerMetrics()
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state != self._state:
+            self._state = state
+            self.metrics.last_state_change = time.time()
+            if state == CircuitState.OPEN:
+                self._opened_at = time.monotonic()
+                self.metrics.times_opened += 1
+            if state != CircuitState.HALF_OPEN:
+                self._half_open_in_flight = 0
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._set_state(CircuitState.HALF_OPEN)
+            return self._state
+
+    def before_call(self) -> None:
+        """
+        Admits a call or rejects it.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with its probe slots taken
+        """
+        state = self.state
+        with self._lock:
+            self.metrics.calls += 1
+            if state == CircuitState.CLOSED:
+                return
+            if state == CircuitState.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return
+            self.metrics.rejections += 1
+            retry_after = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.metrics.successes += 1
+            self.metrics.consecutive_failures = 0
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.metrics.failures += 1
+            self.metrics.consecutive_failures += 1
+            if error is not None:
+                self.metrics.last_error = f"{type(error).__name__}: {error}"[:300]
+            if self._state == CircuitState.HALF_OPEN or self.metrics.consecutive_failures >= self.failure_threshold:
+                self._set_state(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """Frees an admitted call's probe slot without recording an outcome (cancelled calls)."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN and self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.metrics.retries += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.metrics.consecutive_failures = 0
+            self._set_state(CircuitState.CLOSED)
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {"name": self.name, "state": state.value, **asdict(self.metrics)}
+
+
+class BreakerRegistry:
+    """Process-wide map of endpoint name → CircuitBreaker."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, **options: Any) -> CircuitBreaker:
+        """Return the breaker for ``name``; ``options`` apply only on creation."""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **options)
+                self._breakers[name] = breaker
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+_registry = BreakerRegistry()
+
+
+def get_breaker(name: str, **options: Any) -> CircuitBreaker:
+    """Return the shared breaker for an endpoint (see ``BreakerRegistry.get``)."""
+    return _registry.get(name, **options)
+
+
+def breaker_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Metrics and state of every breaker created so far."""
+    return _registry.snapshot()
+
+
+def endpoint_for_url(url: str) -> str:
+    """Breaker name for an HTTP URL: one breaker per host."""
+    return f"http:{(urlparse(url).hostname or '').lower()}"
+
+
+# asyncio.TimeoutError only became an alias of TimeoutError in Python 3.11
+TIMEOUT_ERRORS: Tuple[Type[BaseException], ...] = (TimeoutError, asyncio.TimeoutError)
+
+BreakerSpec = Union[str, CircuitBreaker, None]
+RetryCallback = Callable[[int, BaseException, float], None]
+
+
+def _resolve_breaker(breaker: BreakerSpec) -> Optional[CircuitBreaker]:
+    if breaker is None or isinstance(breaker, CircuitBreaker):
+        return breaker
+    return get_breaker(breaker)
+
+
+def call(
+    func: Callable[..., Any],
+    *args: Any,
+    policy: Optional[RetryPolicy] = None,
+    breaker: BreakerSpec = None,
+    on_retry: Optional[RetryCallback] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Calls ``func`` with retries, a deadline and an optional circuit breaker.
+
+    Args:
+        func (Callable): Function to call
+        *args: Positional arguments for ``func``
+        policy (RetryPolicy, optional): Retry settings (defaults to ``RetryPolicy()``)
+        breaker (str | CircuitBreaker, optional): Endpoint breaker or its name
+        on_retry (Callable, optional): Called as ``on_retry(attempt, error, delay)``
+            before each backoff sleep
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        Any: Return value of ``func``
+
+    Raises:
+        CircuitOpenError: If the breaker rejects the call
+        Exception: The last error once retries or the deadline are exhausted;
+            errors outside ``policy.retry_on`` propagate at once (timeouts are
+            still recorded as failures, other errors as successes)
+    """
+    policy = policy or RetryPolicy()
+    circuit = _resolve_breaker(breaker)
+    deadline = policy.start_deadline()
+    delays = policy.backoff()
+    attempt = 0
+    while True:
+        if circuit is not None:
+            circuit.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except policy.retry_on as e:
+            if circuit is not None:
+                circuit.record_failure(e)
+            delay = next(delays)
+            if attempt >= policy.max_retries or not deadline.allows(delay):
+                raise
+            if circuit is not None:
+                circuit.record_retry()
+            if on_retry is not None:
+                on_retry(attempt, e, delay)
+            time.sleep(delay)
+            attempt += 1
+            continue
+        except TIMEOUT_ERRORS as e:
+            # Not retried under this policy, but a timeout still says the endpoint is unhealthy
+            if circuit is not None:
+                circuit.record_failure(e)
+            raise
+        except Exception:
+            # The endpoint answered; the error is the caller's problem
+            if circuit is not None:
+                circuit.record_success()
+            raise
+        except BaseException:
+            # Interrupted (KeyboardInterrupt, SystemExit): nothing is known about the endpoint
+            if circuit is not None:
+                circuit.release()
+            raise
+        if circuit is not None:
+            circuit.record_success()
+        return result
+
+
+async def acall(
+    func: Callable[..., Any],
+    *args: Any,
+    policy: Optional[RetryPolicy] = None,
+    breaker: BreakerSpec = None,
+    on_retry: Optional[RetryCallback] = None,
+    **kwargs: Any,
+) -> Any:
+    """Async counterpart of ``call`` for coroutine functions; sleeps with asyncio."""
+    policy = policy or RetryPolicy()
+    circuit = _resolve_breaker(breaker)
+    deadline = policy.start_deadline()
+    delays = policy.backoff()
+    attempt = 0
+    while True:
+        if circuit is not None:
+            circuit.before_call()
+        try:
+            remaining = deadline.remaining()
+            if remaining is None:
+                result = await func(*args, **kwargs)
+            else:
+                result = await asyncio.wait_for(func(*args, **kwargs), timeout=remaining)
+        except policy.retry_on as e:
+            if circuit is not None:
+                circuit.record_failure(e)
+            delay = next(delays)
+            if attempt >= policy.max_retries or not deadline.allows(delay):
+                raise
+            if circuit is not None:
+                circuit.record_retry()
+            if on_retry is not None:
+                on_retry(attempt, e, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        except TIMEOUT_ERRORS as e:
+            # Includes the deadline expiring inside wait_for
+            if circuit is not None:
+                circuit.record_failure(e)
+            raise
+        except Exception:
+            if circuit is not None:
+                circuit.record_success()
+            raise
+        except BaseException:
+            # Cancelled (CancelledError) or interrupted: nothing is known about the endpoint
+            if circuit is not None:
+                circuit.release()
+            raise
+        if circuit is not None:
+            circuit.record_success()
+        return result
+
+
+def resilient(
+    policy: Optional[RetryPolicy] = None,
+    breaker: BreakerSpec = None,
+    on_retry: Optional[RetryCallback] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator applying ``call`` (or ``acall`` for ``async def`` functions).
+
+    Example:
+        @resilient(RetryPolicy(max_retries=3, deadline=30), breaker="serper")
+        async def search(query): ...
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await acall(func, *args, policy=policy, breaker=breaker, on_retry=on_retry, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return call(func, *args, policy=policy, breaker=breaker, on_retry=on_retry, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,421 @@
+"""
+Shared Resources Module
+=======================
+
+Process-wide cached clients for the Conference Research Application. Pages
+used to build a new OpenAI client, tiktoken encoder, DDGS instance, HTTP
+connection and Chrome driver on every Streamlit rerun; this module hands out
+one cached instance per process (or per thread where the object is not
+thread-safe) and tears everything down when the process exits.
+
+Features:
+- OpenAI clients cached per API key and client options
+- tiktoken encodings loaded once per encoding name
+- DDGS search clients, one per thread
+- A pooled ``requests.Session`` with a sized connection pool
+- WebDriver pools: drivers are reset and reused across reruns instead of
+  launching Chrome for every scrape, with idle expiry and a size cap
+- ``close_all_resources`` registered with ``atexit``
+
+Note:
+    The caches are plain module-level singletons (the same dict + lock
+    pattern as the LLM gateway and the search cache) rather than
+    ``st.cache_resource``, so worker threads, batch jobs and scripts share
+    them without a Streamlit script context.
+
+Dependencies:
+- requests for the shared HTTP session
+- openai, tiktoken, ddgs / duckduckgo_search (optional, loaded on first use)
+- con_research.config.config_manager for pool sizes (``performance`` section)
+- con_research.src.modules.metrics for pool gauges
+"""
+
+import atexit
+import contextlib
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from con_research.config.config_manager import get_performance_config, subscribe
+from con_research.src.modules.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Used when a pool is built directly; the shared ones are sized from the
+# ``performance`` configuration
+DEFAULT_DRIVER_POOL_SIZE = 2
+# Idle Chrome processes hold hundreds of MB; drop ones unused for this long
+DEFAULT_DRIVER_IDLE_TIMEOUT = 600.0
+
+
+_openai_clients: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Any] = {}
+_openai_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: str, **kwargs: Any) -> Any:
+    """
+    Returns the process-wide OpenAI client for an API key.
+
+    The client holds an HTTP connection pool, so sharing it keeps TLS
+    connections warm across reruns and sessions.
+
+    Args:
+        api_key (str): OpenAI API key
+        **kwargs: Extra ``OpenAI`` options (e.g. ``max_retries``); each distinct
+            combination gets its own client
+
+    Returns:
+        openai.OpenAI: Shared client
+
+    Raises:
+        ValueError: If no API key is given
+    """
+    if not api_key:
+        raise ValueError("An OpenAI API key is required")
+    key = (api_key, tuple(sorted(kwargs.items())))
+    with _openai_clients_lock:
+        client = _openai_clients.get(key)
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, **kwargs)
+            _openai_clients[key] = client
+        return client
+
+
+@functools.lru_cache(maxsize=None)
+def get_tiktoken_encoding(name: str = "cl100k_base") -> Any:
+    """
+    Returns a tiktoken encoding, loading its BPE table only once.
+
+    Args:
+        name (str): Encoding name
+
+    Returns:
+        tiktoken.Encoding: Cached encoding
+    """
+    import tiktoken
+    return tiktoken.get_encoding(name)
+
+
+_ddgs_local = threading.local()
+
+
+def get_ddgs() -> Any:
+    """
+    Returns this thread's DuckDuckGo search client.
+
+    DDGS keeps an HTTP client with per-instance state, so instances are
+    cached per thread rather than shared between concurrent searches.
+
+    Returns:
+        DDGS: Client from ``ddgs``, or from ``duckduckgo_search`` when only
+        the older package is installed
+    """
+    client = getattr(_ddgs_local, "client", None)
+    if client is None:
+        try:
+            from ddgs import DDGS
+        except ImportError:  # pragma: no cover - optional dependency
+            from duckduckgo_search import DDGS
+        client = DDGS()
+        _ddgs_local.client = client
+    return client
+
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the shared ``requests.Session`` used for plain page fetches.
+
+    Keep-alive connections are pooled per host, so repeated fetches to the
+    same site skip the TCP and TLS handshakes. Pool sizes come from
+    ``performance.http_pool_connections`` and ``performance.http_pool_maxsize``.
+
+    Returns:
+        requests.Session: Shared session
+    """
+    global _http_session
+    if _http_session is not None:
+        return _http_session
+    settings = get_performance_config()
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=settings.http_pool_connections, pool_maxsize=settings.http_pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+
+class DriverPool:
+    """
+    Pool of reusable Selenium WebDrivers built by one factory.
+
+    Drivers are checked out for one scrape and returned afterwards; on
+    return they are reset (see ``_reset``) and kept idle for the next scrape,
+    which may belong to another session. Broken drivers, and drivers that
+    cannot be reset over the Chrome DevTools Protocol, are quit instead of
+    returned.
+
+    Example:
+        >>> pool = get_driver_pool("web_scraper", get_chrome_driver)
+        >>> with pool.acquire() as driver:
+        ...     driver.get(url)
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], max_size: int = DEFAULT_DRIVER_POOL_SIZE,
+                 idle_timeout: float = DEFAULT_DRIVER_IDLE_TIMEOUT):
+        """
+        Initialize an empty pool.
+
+        Args:
+            name (str): Pool name, used as the metrics label
+            factory (Callable[[], Any]): Creates a new driver (may return None on failure)
+            max_size (int): Maximum number of idle drivers kept
+            idle_timeout (float): Seconds after which an idle driver is quit
+
+        Raises:
+            ValueError: If max_size is negative
+        """
+        if max_size < 0:
+            raise ValueError("max_size must not be negative")
+        self.name = name
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle: List[Tuple[Any, float]] = []
+        self._lock = threading.Lock()
+
+    def _quit(self, driver: Any) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug("Error quitting pooled driver: %s", e)
+
+    @staticmethod
+    def _reset(driver: Any) -> None:
+        """
+        Clears the state a scrape left in the browser.
+
+        ``delete_all_cookies`` only covers the current page's domain, so
+        cookies are cleared over CDP (``Network.clearBrowserCookies``), and
+        every open tab's origin has its storage cleared
+        (``Storage.clearDataForOrigin``: localStorage, IndexedDB, cache
+        storage, service workers) plus its sessionStorage. Extra tabs are
+        closed and the remaining one is left on a blank page.
+
+        Raises:
+            Exception: If the driver has no CDP support or the browser fails;
+                the caller then quits the driver
+        """
+        if not hasattr(driver, "execute_cdp_cmd"):
+            raise TypeError("Driver cannot be reset without the Chrome DevTools Protocol")
+        origins = set()
+        handles = driver.window_handles
+        for handle in reversed(handles):
+            driver.switch_to.window(handle)
+            origin = driver.execute_script("return window.location.origin")
+            if origin and origin.startswith(("http://", "https://")):
+                origins.add(origin)
+                driver.execute_script("window.sessionStorage.clear()")
+            if handle != handles[0]:
+                driver.close()
+        driver.switch_to.window(handles[0])
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        driver.get("about:blank")
+
+    def _set_idle(self, delta: int) -> None:
+        get_metrics().add_gauge("webdriver_pool_idle", delta, pool=self.name)
+
+    def checkout(self) -> Any:
+        """
+        Takes an idle, healthy driver from the pool or creates a new one.
+
+        Returns:
+            Any: WebDriver, or None if the factory failed
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                driver, idle_since = self._idle.pop()
+            self._set_idle(-1)
+            if time.monotonic() - idle_since > self.idle_timeout:
+                self._quit(driver)
+                continue
+            try:
+                driver.current_url  # Cheap round trip that fails if the browser died
+            except Exception:
+                self._quit(driver)
+                continue
+            get_metrics().increment("webdriver_pool_reuses", pool=self.name)
+            return driver
+        return self.factory()
+
+    def release(self, driver: Any, discard: bool = False) -> None:
+        """
+        Returns a driver to the pool, or quits it.
+
+        Args:
+            driver (Any): Driver obtained from ``checkout`` (None is ignored)
+            discard (bool): Quit the driver instead of keeping it
+        """
+        if driver is None:
+            return
+        if not discard:
+            try:
+                self._reset(driver)
+            except Exception as e:
+                logger.debug("Could not reset pooled driver, quitting it: %s", e)
+                discard = True
+        if not discard:
+            with self._lock:
+                if len(self._idle) < self.max_size:
+                    self._idle.append((driver, time.monotonic()))
+                    driver = None
+            if driver is None:
+                self._set_idle(1)
+                return
+        self._quit(driver)
+
+    @contextlib.contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """
+        Context manager around ``checkout``/``release``.
+
+        Yields:
+            Any: WebDriver, or None if the factory failed
+        """
+        driver = self.checkout()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def resize(self, max_size: int, idle_timeout: Optional[float] = None) -> None:
+        """
+        Changes the pool limits; surplus idle drivers are quit.
+
+        Args:
+            max_size (int): New maximum number of idle drivers
+            idle_timeout (float, optional): New idle expiry in seconds
+        """
+        with self._lock:
+            self.max_size = max(0, max_size)
+            if idle_timeout is not None:
+                self.idle_timeout = idle_timeout
+            surplus = self._idle[self.max_size:]
+            del self._idle[self.max_size:]
+        for driver, _ in surplus:
+            self._set_idle(-1)
+            self._quit(driver)
+
+    def close(self) -> None:
+        """Quits every idle driver."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver, _ in idle:
+            self._set_idle(-1)
+            self._quit(driver)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns pool counters.
+
+        Returns:
+            Dict[str, Any]: Idle driver count and configured size
+        """
+        with self._lock:
+            return {"idle": len(self._idle), "max_size": self.max_size}
+
+
+_driver_pools: Dict[str, DriverPool] = {}
+_driver_pools_lock = threading.Lock()
+
+
+def get_driver_pool(name: str, factory: Callable[[], Any], max_size: Optional[int] = None) -> DriverPool:
+    """
+    Returns the process-wide driver pool with this name.
+
+    Pages pass their own ``get_chrome_driver``; the factory and size are only
+    used when the pool is created, so reruns reuse the existing pool.
+
+    Args:
+        name (str): Pool name (one per driver configuration)
+        factory (Callable[[], Any]): Creates a new driver
+        max_size (int, optional): Maximum number of idle drivers kept; defaults to
+            ``performance.driver_pool_size`` and then follows configuration reloads
+
+    Returns:
+        DriverPool: Shared pool
+    """
+    with _driver_pools_lock:
+        pool = _driver_pools.get(name)
+    if pool is not None:
+        return pool
+    # Read outside the pools lock; the reload callback takes that lock
+    settings = get_performance_config()
+    subscribe(_apply_performance_config, keys=["performance.driver_pool_size", "performance.driver_idle_timeout"])
+    with _driver_pools_lock:
+        pool = _driver_pools.get(name)
+        if pool is None:
+            pool = DriverPool(
+                name,
+                factory,
+                max_size=settings.driver_pool_size if max_size is None else max_size,
+                idle_timeout=settings.driver_idle_timeout,
+            )
+            _driver_pools[name] = pool
+        return pool
+
+
+def _apply_performance_config(config: Any, changed: Dict[str, Any]) -> None:
+    """Config subscriber: resizes the live driver pools."""
+    settings = config.performance
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+    for pool in pools:
+        pool.resize(settings.driver_pool_size, settings.driver_idle_timeout)
+
+
+def close_all_resources() -> None:
+    """
+    Closes every cached resource; called automatically at interpreter exit.
+
+    Later ``get_*`` calls create fresh instances, but objects that kept a
+    reference (such as an LLM gateway's client) are not replaced.
+    """
+    global _http_session
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+        _driver_pools.clear()
+    for pool in pools:
+        pool.close()
+
+    with _http_session_lock:
+        session, _http_session = _http_session, None
+    if session is not None:
+        session.close()
+
+    with _openai_clients_lock:
+        clients = list(_openai_clients.values())
+        _openai_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug("Error closing OpenAI client: %s", e)
+
+
+atexit.register(close_all_resources)
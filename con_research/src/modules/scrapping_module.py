@@ -1,6 +1,14 @@
-from con_research.src.modules.imports import *
+import time
+import urllib.request
+from io import BytesIO, StringIO
+from typing import Any, Optional, Type
 from urllib.parse import urlparse
 
+from pydantic import BaseModel, Field
+
+from con_research.src.modules.html_text import html_to_text, make_soup
+from con_research.src.modules.resources import get_http_session
+
 class ContentScraper:
     @staticmethod
     def scrape_anything(url: str):
@@ -17,10 +25,9 @@ class ContentScraper:
         """Scrapes text from an HTML web page."""
         try:
             user_agent = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/83.0.4103.61 Safari/537.36'
-            response = requests.get(url, headers={'User-Agent': user_agent})
+            response = get_http_session().get(url, headers={'User-Agent': user_agent})
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, "html.parser")
-                page_text = soup.get_text(separator=" ", strip=True)
+                page_text = html_to_text(response.text, separator=" ", strip_tags=(), collapse_blank_lines=False)
                 return page_text
             else:
                 return f"Failed to retrieve the webpage: Status code {response.status_code}"
@@ -35,6 +42,12 @@ class ContentScraper:
             return f"Invalid URL scheme: {parsed.scheme}. Only http and https are supported."
         try:
             user_agent = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/83.0.4103.61 Safari/537.36'
+            # pdfminer is only needed for PDF URLs, so it is not imported with the module
+            from pdfminer.converter import TextConverter
+            from pdfminer.layout import LAParams
+            from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+            from pdfminer.pdfpage import PDFPage
+
             request = urllib.request.Request(url, headers={'User-Agent': user_agent})
             response = urllib.request.urlopen(request).read()
             fb = BytesIO(response)
@@ -68,7 +81,8 @@ class SeleniumScraping():
     description: str = "Its used to read a website content."
     args_schema: Type[BaseModel] = SeleniumScrapingSchema
     website_url: Optional[str] = None
-    driver: Optional[Any] = webdriver.Chrome
+    # WebDriver class; None means selenium's Chrome, imported when the first driver is created
+    driver: Optional[Any] = None
     cookie: Optional[dict] = None
     wait_time: Optional[int] = 10
     css_element: Optional[str] = None
@@ -96,6 +110,8 @@ class SeleniumScraping():
             return ContentScraper._extract_text_from_pdf_url(website_url)
         else:
             try:
+                from selenium.webdriver.common.by import By
+
                 print('Extracting text from the url...')
                 driver = self._create_driver(website_url, self.cookie, self.wait_time)
                 content = []
@@ -112,6 +128,11 @@ class SeleniumScraping():
                 return f"Failed to extract content from the URL: {e}"
 
     def _create_driver(self, url, cookie, wait_time):
+        from selenium import webdriver
+        from selenium.webdriver.firefox.options import Options
+
+        if self.driver is None:
+            self.driver = webdriver.Chrome
         options = Options()
         options.add_argument("--headless")
         driver = self.driver(options=options)
@@ -134,11 +155,11 @@ def scrape_faculty_page(url, interest_keywords):
     Scrapes a university or conference page and returns information on faculty
     members who match the interest areas.
     """
-    response = requests.get(url)
+    response = get_http_session().get(url)
     if response.status_code != 200:
         return f"Failed to retrieve content from {url}. Status code: {response.status_code}"
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = make_soup(response.content)
     faculty_data = []
 
     # Adjust the selectors depending on the page's structure
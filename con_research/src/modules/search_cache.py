@@ -0,0 +1,361 @@
+"""
+Search Result Cache
+===================
+
+Persistent cache of web search results shared by every search provider in
+the Conference Research Application (DuckDuckGo, Serper). Identical queries
+issued on Streamlit reruns, by several pages, or by later batch jobs are
+answered from a local SQLite file instead of the rate-limited search API.
+
+Features:
+- Query normalisation: Unicode, case, whitespace and sentence punctuation
+- Results stored per provider and request parameters, with a TTL per provider
+- ``get_or_fetch`` wrapper for single lookups
+- ``warm`` prefetch API that fetches only the missing queries, concurrently
+- Hit/miss counters for the performance dashboard, updated under the cache lock
+- Live DuckDuckGo calls retried with jitter behind a shared "ddgs" circuit breaker
+
+Dependencies:
+- sqlite3 from the standard library
+- con_research.config.config_manager for the TTL (``performance`` section)
+- con_research.src.modules.local_store for the cache directory
+- con_research.src.modules.resilience for DDGS retries
+- con_research.src.modules.resources for the shared DDGS client
+- con_research.src.modules.tracing for per-search spans
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from con_research.config.config_manager import get_performance_config, subscribe
+from con_research.src.modules.local_store import get_cache_dir
+from con_research.src.modules.resilience import RetryPolicy, call
+from con_research.src.modules.resources import get_ddgs
+from con_research.src.modules.tracing import span
+
+# DDGS throttles aggressively: few retries, long jittered pauses, and a hard
+# deadline so one blocked query cannot hold a worker for minutes
+DDGS_RETRY_POLICY = RetryPolicy(max_retries=2, base_delay=2.0, max_delay=20.0, deadline=45.0)
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+# Providers whose results go stale faster or slower than the default
+PROVIDER_TTLS: Dict[str, float] = {
+    "ddgs": 24 * 3600,
+    "serper": 24 * 3600,
+}
+
+# Punctuation that never changes what a search engine returns
+_IGNORED_PUNCTUATION = re.compile(r"[,;!?¡¿()\[\]{}…“”]+")
+# Full stops at the start or end of a word ("...with Oxford." / ". Course"),
+# but not inside operators such as "site:.ac.uk"
+_EDGE_DOTS = re.compile(r"(?<!\S)\.+|\.+(?!\S)")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Returns the cache identity of a search query.
+
+    Applies NFKC normalisation and case folding, drops sentence punctuation
+    and trailing full stops, and collapses whitespace. Search operators such
+    as ``site:.edu``, quotes and ``-term`` are preserved.
+
+    Args:
+        query (str): Query as sent to the provider
+
+    Returns:
+        str: Normalised query
+    """
+    text = unicodedata.normalize("NFKC", query or "").casefold()
+    text = _IGNORED_PUNCTUATION.sub(" ", text)
+    text = _EDGE_DOTS.sub(" ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class SearchCache:
+    """
+    SQLite-backed search result cache, safe to share between threads.
+
+    Attributes:
+        path (str): SQLite database file (":memory:" for a process-local cache)
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that had to call the provider
+    """
+
+    def __init__(self, path: str, default_ttl: float = DEFAULT_TTL_SECONDS, provider_ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            path (str): Database location
+            default_ttl (float): Seconds a result stays valid for unlisted providers
+            provider_ttls (Dict[str, float], optional): Per-provider TTL overrides
+        """
+        self.path = str(path)
+        self.default_ttl = default_ttl
+        self.provider_ttls = dict(PROVIDER_TTLS if provider_ttls is None else provider_ttls)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_results (
+                provider TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                query TEXT NOT NULL,
+                results TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (provider, cache_key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key for a query and the request parameters that change its results."""
+        return json.dumps([normalize_query(query), params or {}], sort_keys=True, ensure_ascii=False)
+
+    def set_default_ttl(self, seconds: float) -> None:
+        """
+        Changes the default TTL; providers that used the old default follow it.
+
+        Args:
+            seconds (float): New default lifetime of a cached result
+        """
+        with self._lock:
+            for provider, ttl in list(self.provider_ttls.items()):
+                if ttl == self.default_ttl:
+                    self.provider_ttls[provider] = seconds
+            self.default_ttl = seconds
+
+    def record_hit(self) -> None:
+        """Counts a lookup answered from the cache (callers on other threads or the event loop)."""
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        """Counts a lookup that had to call the provider."""
+        with self._lock:
+            self.misses += 1
+
+    def ttl_for(self, provider: str) -> float:
+        """Return the TTL in seconds for a provider."""
+        return self.provider_ttls.get(provider, self.default_ttl)
+
+    def get(self, provider: str, query: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Looks up cached results.
+
+        Args:
+            provider (str): Search provider name, e.g. "ddgs" or "serper"
+            query (str): Search query (normalised for the lookup)
+            params (Dict, optional): Request parameters such as max_results
+
+        Returns:
+            Any: Cached results, or None if missing or expired
+        """
+        key = self.make_key(query, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, created_at FROM search_results WHERE provider = ? AND cache_key = ?",
+                (provider, key),
+            ).fetchone()
+        if row is None or row[1] + self.ttl_for(provider) < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, provider: str, query: str, results: Any, params: Optional[Dict[str, Any]] = None) -> None:
+        """Store results for a query (replacing any previous entry)."""
+        key = self.make_key(query, params)
+        payload = json.dumps(results, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results (provider, cache_key, query, results, created_at) VALUES (?, ?, ?, ?, ?)",
+                (provider, key, query, payload, time.time()),
+            )
+            self._conn.commit()
+
+    def get_or_fetch(
+        self,
+        provider: str,
+        query: str,
+        fetch: Callable[[], Any],
+        params: Optional[Dict[str, Any]] = None,
+        cache_empty: bool = False,
+    ) -> Any:
+        """
+        Returns cached results, calling ``fetch`` only on a miss.
+
+        Args:
+            provider (str): Search provider name
+            query (str): Search query
+            fetch (Callable[[], Any]): Performs the live search
+            params (Dict, optional): Request parameters that change the results
+            cache_empty (bool): Also cache empty results; off by default because
+                an empty DDGS response usually means throttling, not "no results"
+
+        Returns:
+            Any: Search results (cached or fresh)
+
+        Raises:
+            Exception: Whatever ``fetch`` raises; failures are never cached
+        """
+        cached = self.get(provider, query, params)
+        if cached is not None:
+            self.record_hit()
+            return cached
+        self.record_miss()
+        results = fetch()
+        if results or cache_empty:
+            self.set(provider, query, results, params)
+        return results
+
+    def warm(
+        self,
+        provider: str,
+        queries: Iterable[str],
+        fetch: Callable[[str], Any],
+        params: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4,
+    ) -> Dict[str, Any]:
+        """
+        Prefetches results for a batch of queries before a batch job runs.
+
+        Only queries missing from the cache are fetched, concurrently and once
+        per normalised query. Failed fetches are skipped so the job can retry
+        them on demand.
+
+        Args:
+            provider (str): Search provider name
+            queries (Iterable[str]): Queries the job will issue
+            fetch (Callable[[str], Any]): Performs one live search
+            params (Dict, optional): Request parameters shared by the queries
+            max_workers (int): Concurrent live searches
+
+        Returns:
+            Dict[str, Any]: Results per original query (cached or fresh)
+        """
+        queries = list(queries)
+        missing: Dict[str, str] = {}
+        for query in queries:
+            if self.get(provider, query, params) is None:
+                missing.setdefault(normalize_query(query), query)
+
+        if missing:
+            def fetch_one(query: str) -> None:
+                try:
+                    self.get_or_fetch(provider, query, lambda: fetch(query), params)
+                except Exception:
+                    pass
+
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+                list(executor.map(fetch_one, missing.values()))
+
+        return {query: self.get(provider, query, params) for query in queries}
+
+    def purge_expired(self) -> int:
+        """
+        Deletes expired entries.
+
+        Returns:
+            int: Number of rows removed
+        """
+        now = time.time()
+        removed = 0
+        with self._lock:
+            providers = [row[0] for row in self._conn.execute("SELECT DISTINCT provider FROM search_results")]
+            for provider in providers:
+                cursor = self._conn.execute(
+                    "DELETE FROM search_results WHERE provider = ? AND created_at < ?",
+                    (provider, now - self.ttl_for(provider)),
+                )
+                removed += cursor.rowcount
+            self._conn.commit()
+        return removed
+
+    def clear(self, provider: Optional[str] = None) -> None:
+        """Remove all entries, or only those of one provider."""
+        with self._lock:
+            if provider is None:
+                self._conn.execute("DELETE FROM search_results")
+            else:
+                self._conn.execute("DELETE FROM search_results WHERE provider = ?", (provider,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of stored entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """
+    Returns the process-wide search cache, stored under the application cache directory.
+
+    The default TTL comes from ``performance.search_cache_ttl_hours`` and
+    follows configuration reloads.
+
+    Returns:
+        SearchCache: Shared cache instance
+    """
+    global _search_cache
+    if _search_cache is not None:
+        return _search_cache
+    # Read outside the cache lock; the reload callback takes that lock
+    ttl = get_performance_config().search_cache_ttl_hours * 3600
+    subscribe(_apply_performance_config, keys=["performance.search_cache_ttl_hours"])
+    with _search_cache_lock:
+        if _search_cache is None:
+            cache = SearchCache(str(get_cache_dir("search") / "search_cache.sqlite3"))
+            cache.set_default_ttl(ttl)
+            cache.purge_expired()
+            _search_cache = cache
+        return _search_cache
+
+
+def _apply_performance_config(config: Any, changed: Dict[str, Any]) -> None:
+    """Config subscriber: applies a reloaded cache TTL to the live cache."""
+    with _search_cache_lock:
+        cache = _search_cache
+    if cache is not None:
+        cache.set_default_ttl(config.performance.search_cache_ttl_hours * 3600)
+
+
+def ddgs_text_search(query: str, max_results: int = 5, ddgs: Any = None) -> List[Dict[str, Any]]:
+    """
+    DuckDuckGo text search through the shared cache.
+
+    Args:
+        query (str): Search query
+        max_results (int): Number of results requested
+        ddgs (Any, optional): DDGS instance to use; the thread's shared one otherwise
+
+    Returns:
+        List[Dict[str, Any]]: DDGS result dictionaries (href, title, body)
+
+    Raises:
+        CircuitOpenError: If DuckDuckGo has been failing and its breaker is open
+    """
+    with span("search.ddgs", query=query, max_results=max_results) as search_span:
+        search_span.set_attribute("cache.hit", True)
+
+        def fetch() -> List[Dict[str, Any]]:
+            search_span.set_attribute("cache.hit", False)
+            client = ddgs if ddgs is not None else get_ddgs()
+            return list(client.text(query, max_results=max_results) or [])
+
+        results = get_search_cache().get_or_fetch(
+            "ddgs", query, lambda: call(fetch, policy=DDGS_RETRY_POLICY, breaker="ddgs"), params={"max_results": max_results}
+        )
+        search_span.set_attribute("results", len(results))
+        return results
@@ -1,41 +1,42 @@
-from con_research.src.modules.imports import *
+from typing import Any, List, Optional, Type
+
+from pydantic import BaseModel, Field
+
+from con_research.src.modules.serper_client import SerperClient, get_serper_client
+
+
 class SerperDevToolSchema(BaseModel):
     """Input for TXTSearchTool."""
     search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
 
 class SerperDevTool():
-    def __init__(self, api_key):
+    def __init__(self, api_key, n_results: Optional[int] = None):
         self.api_key = api_key
+        self.n_results = n_results
+        # Shared per API key: connection pool and response cache outlive the tool
+        self.client = get_serper_client(api_key)
     name: str = "Search the internet"
     description: str = "A tool that can be used to semantic search a query from a txt's content."
     args_schema: Type[BaseModel] = SerperDevToolSchema
     search_url: str = "https://google.serper.dev/search"
-    n_results: int = None
+    n_results: Optional[int] = None
 
     def _run(
         self,
         search_query: str,
         **kwargs: Any,
     ) -> Any:
-        payload = json.dumps({"q": search_query})
-        headers = {
-            'X-API-KEY': self.api_key,
-            'content-type': 'application/json'
-        }
-        response = requests.request("POST", self.search_url, headers=headers, data=payload)
-        results = response.json()
+        results = self.client.search(search_query, num_results=self.n_results)
         if 'organic' in results:
-            results = results['organic']
-            urls = []
-            for result in results:
-                try:
-                    urls.append(result['link'])  # Only extract the URL
-                except KeyError:
-                    pass
-
-            # Limit to only the first two URLs
-            urls = urls[:1]
-
-            return urls
+            # Only extract the URLs, up to n_results (all returned results if unset)
+            return SerperClient.organic_links(results, self.n_results)
         else:
             return results
+
+    def _run_many(self, search_queries: List[str], **kwargs: Any) -> List[Any]:
+        """Runs several queries concurrently; results are aligned with the input."""
+        responses = self.client.search_many(search_queries, num_results=self.n_results)
+        return [
+            SerperClient.organic_links(results, self.n_results) if 'organic' in results else results
+            for results in responses
+        ]
@@ -0,0 +1,282 @@
+"""
+Serper Search Client
+====================
+
+Asynchronous client for the Serper (Google Search) API shared by BioGen and
+the SerperDevTool search module. One pooled ``httpx.AsyncClient`` per API key
+serves every query, batches of queries run concurrently, and responses are
+cached so repeated queries cost nothing.
+
+Features:
+- Connection reuse across calls and Streamlit reruns (background event loop)
+- Configurable result count (Serper's ``num`` parameter)
+- Concurrent batch search with a concurrency cap and duplicate-query folding
+- Responses cached in the shared search cache (search_cache.py), keyed by
+  normalised query and parameters, so reruns and later sessions reuse them
+- Retries with decorrelated jitter on 429/5xx and transport errors, bounded by
+  a per-query deadline, behind a shared "serper" circuit breaker
+- Synchronous wrappers for use from Streamlit scripts
+
+Dependencies:
+- httpx for async HTTP
+- con_research.config.config_manager for the default concurrency
+- con_research.src.modules.async_utils for the background loop
+- con_research.src.modules.search_cache for persistent result caching
+- con_research.src.modules.resilience for retries and the circuit breaker
+- con_research.src.modules.tracing for per-search spans
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import httpx
+
+from con_research.config.config_manager import get_performance_config
+from con_research.src.modules.async_utils import run_sync
+from con_research.src.modules.resilience import CircuitOpenError, RetryPolicy, acall, get_breaker
+from con_research.src.modules.search_cache import SearchCache, get_search_cache
+from con_research.src.modules.tracing import span
+
+logger = logging.getLogger(__name__)
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class SerperError(Exception):
+    """Raised when a Serper query fails after all retries."""
+
+
+class _RetryableStatus(Exception):
+    """Internal: a 429/5xx response worth retrying."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class SerperClient:
+    """
+    Pooled, caching Serper client with async and sync entry points.
+
+    Example:
+        >>> client = get_serper_client(api_key)
+        >>> results = client.search_many(["Jane Doe Oxford", "John Roe LSE"], num_results=5)
+        >>> SerperClient.organic_links(results[0])
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        num_results: int = 10,
+        max_concurrency: int = 8,
+        timeout: float = 15.0,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        deadline: Optional[float] = 45.0,
+        cache: Optional[SearchCache] = None,
+        use_cache: bool = True,
+        search_url: str = SERPER_SEARCH_URL,
+    ):
+        """
+        Args:
+            api_key (str): Serper API key
+            num_results (int): Default number of organic results per query
+            max_concurrency (int): Maximum queries in flight at once
+            timeout (float): Per-request timeout in seconds
+            max_retries (int): Retries on 429/5xx/transport errors
+            backoff_factor (float): Base delay for the jittered backoff
+            deadline (float, optional): Overall seconds allowed per query, retries included
+            cache (SearchCache, optional): Result cache (defaults to the shared one)
+            use_cache (bool): Set to False to always query Serper
+            search_url (str): Search endpoint
+        """
+        if not api_key:
+            raise ValueError("A Serper API key is required")
+        self.api_key = api_key
+        self.num_results = num_results
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries,
+            base_delay=backoff_factor,
+            max_delay=10.0,
+            deadline=deadline,
+            retry_on=(httpx.TransportError, _RetryableStatus),
+        )
+        self.breaker = get_breaker("serper")
+        self.search_url = search_url
+        self.cache = (cache or get_search_cache()) if use_cache else None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily on the loop that uses it; the background loop is shared
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers={"X-API-KEY": self.api_key, "Content-Type": "application/json"},
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+            )
+        return self._client
+
+    def _params(self, num_results: Optional[int], extra: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        params = dict(extra or {})
+        params["num"] = num_results or self.num_results
+        return params
+
+    async def _post_once(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._get_client().post(self.search_url, json=payload)
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            raise _RetryableStatus(response.status_code)
+        if response.status_code >= 400:
+            raise SerperError(f"Serper returned HTTP {response.status_code} for '{payload.get('q')}'")
+        try:
+            return response.json()
+        except ValueError as e:
+            raise SerperError(f"Serper returned invalid JSON for '{payload.get('q')}'") from e
+
+    async def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return await acall(self._post_once, payload, policy=self.retry_policy, breaker=self.breaker)
+        except CircuitOpenError:
+            raise
+        except (httpx.TransportError, _RetryableStatus, asyncio.TimeoutError) as e:
+            raise SerperError(f"Serper request failed for '{payload.get('q')}': {e}") from e
+
+    async def asearch(
+        self,
+        query: str,
+        num_results: Optional[int] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Runs one search, answering from the cache when possible.
+
+        Args:
+            query (str): Search query
+            num_results (int, optional): Organic results to request (defaults to ``self.num_results``)
+            extra_params (Dict, optional): Additional Serper parameters (gl, hl, tbs, ...)
+
+        Returns:
+            Dict[str, Any]: Raw Serper JSON response
+
+        Raises:
+            SerperError: If the query fails after all retries
+            CircuitOpenError: If Serper has been failing and its breaker is open
+        """
+        params = self._params(num_results, extra_params)
+        with span("search.serper", query=query, num=params["num"]) as search_span:
+            if self.cache is None:
+                result = await self._post({"q": query, **params})
+            else:
+                # SQLite I/O blocks (and waits for the cache lock): keep it off the shared event loop
+                result = await asyncio.to_thread(self.cache.get, "serper", query, params)
+                search_span.set_attribute("cache.hit", result is not None)
+                if result is not None:
+                    self.cache.record_hit()
+                else:
+                    self.cache.record_miss()
+                    result = await self._post({"q": query, **params})
+                    await asyncio.to_thread(self.cache.set, "serper", query, result, params)
+            search_span.set_attribute("results", len(result.get("organic", [])))
+            return result
+
+    async def asearch_many(
+        self,
+        queries: Sequence[str],
+        num_results: Optional[int] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Runs several searches concurrently (at most ``max_concurrency`` at once).
+
+        Args:
+            queries (Sequence[str]): Queries to run; duplicates are sent once
+            num_results (int, optional): Organic results per query
+            extra_params (Dict, optional): Additional Serper parameters
+            return_exceptions (bool): Put failures in the result list instead of raising
+
+        Returns:
+            List: Responses aligned with ``queries``
+
+        Raises:
+            SerperError: The first failure, unless ``return_exceptions`` is set
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        params = self._params(num_results, extra_params)
+        unique: Dict[str, str] = {}
+        for query in queries:
+            unique.setdefault(SearchCache.make_key(query, params), query)
+
+        async def bounded(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.asearch(query, num_results, extra_params)
+
+        keys = list(unique)
+        outcomes = await asyncio.gather(*(bounded(unique[k]) for k in keys), return_exceptions=True)
+        by_key = dict(zip(keys, outcomes))
+        results = [by_key[SearchCache.make_key(query, params)] for query in queries]
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
+
+    def search(self, query: str, num_results: Optional[int] = None, **kwargs: Any) -> Dict[str, Any]:
+        """Synchronous wrapper around ``asearch``."""
+        return run_sync(self.asearch(query, num_results, **kwargs))
+
+    def search_many(self, queries: Sequence[str], num_results: Optional[int] = None, **kwargs: Any) -> List[Any]:
+        """Synchronous wrapper around ``asearch_many``."""
+        return run_sync(self.asearch_many(queries, num_results, **kwargs))
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def close(self) -> None:
+        run_sync(self.aclose())
+
+    @staticmethod
+    def organic_results(response: Dict[str, Any], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the organic results of a response (at most ``limit``)."""
+        organic = response.get("organic", []) if isinstance(response, dict) else []
+        return organic[:limit] if limit else organic
+
+    @staticmethod
+    def organic_links(response: Dict[str, Any], limit: Optional[int] = None) -> List[str]:
+        """Return the result URLs of a response (at most ``limit``)."""
+        links = [r["link"] for r in SerperClient.organic_results(response) if r.get("link")]
+        return links[:limit] if limit else links
+
+
+_clients: Dict[str, SerperClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_serper_client(api_key: str, **kwargs: Any) -> SerperClient:
+    """
+    Returns the process-wide client for an API key, creating it on first use.
+
+    Args:
+        api_key (str): Serper API key
+        **kwargs: SerperClient options, applied only when the client is created;
+            ``max_concurrency`` defaults to ``performance.serper_max_concurrency``
+
+    Returns:
+        SerperClient: Shared client, so its connection pool and cache persist
+    """
+    kwargs.setdefault("max_concurrency", get_performance_config().serper_max_concurrency)
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = SerperClient(api_key, **kwargs)
+            _clients[api_key] = client
+        return client
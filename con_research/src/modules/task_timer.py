@@ -7,25 +7,39 @@ Provides real-time performance monitoring without interfering with user interact
 Follows established coding standards with comprehensive error handling and resource cleanup.
 
 Features:
-- Non-blocking progress indicators with Streamlit integration
+- Non-blocking progress indicators with Streamlit integration; completion
+  banners are handed to a client-side toast instead of sleeping the script thread
 - Multi-task timing support with session persistence
 - Performance analytics dashboard with visual representations
 - Context managers for proper resource management
 - Retry logic integration with exponential backoff
+- Each tracked task also opens a tracing span, so repeated runs and nested calls are kept
+- Dashboard reads the span-fed metrics registry for p50/p90/p99 latency,
+  throughput and error-rate time series, and per-model token/cost counters
+- Spend per page and per job from the usage ledger
 
 Dependencies:
 - streamlit for UI components and session state management
-- time for high-precision timing operations
+- time for monotonic high-resolution timing (perf_counter)
 - functools for decorator implementation
 - contextlib for context manager support
+- con_research.src.modules.tracing for nested spans around tracked tasks
+- con_research.src.modules.metrics for latency histograms and usage counters
+- con_research.src.modules.usage_accounting for spend attributed to pages and jobs
+- pandas for pivoting metric windows into chart series
 """
 
 import streamlit as st
+import pandas as pd
 import time
 import functools
 from typing import Dict, Optional, Any, List
 from contextlib import contextmanager
 
+from con_research.src.modules.metrics import get_metrics
+from con_research.src.modules.tracing import span
+from con_research.src.modules.usage_accounting import get_usage_ledger
+
 
 class TaskPerformanceTimer:
     """
@@ -34,7 +48,7 @@ class TaskPerformanceTimer:
     
     Attributes:
         task_timings (Dict[str, float]): Completed task durations in seconds
-        active_tasks (Dict[str, float]): Currently running task start times
+        active_tasks (Dict[str, float]): Currently running task start times (perf_counter)
         task_progress (Dict[str, int]): Progress percentages for active tasks
         task_metadata (Dict[str, Dict]): Additional task information and context
     """
@@ -69,7 +83,7 @@ class TaskPerformanceTimer:
             st.warning(f"Task '{task_name}' is already active. Stopping previous instance.")
             self.complete_task_timing(task_name)
         
-        self.active_tasks[task_name] = time.time()
+        self.active_tasks[task_name] = time.perf_counter()
         self.task_progress[task_name] = 0
         self.task_metadata[task_name] = metadata or {}
     
@@ -113,7 +127,7 @@ class TaskPerformanceTimer:
             st.warning(f"Cannot complete timing for inactive task: {task_name}")
             return None
         
-        duration = time.time() - self.active_tasks[task_name]
+        duration = time.perf_counter() - self.active_tasks[task_name]
         self.task_timings[task_name] = duration
         del self.active_tasks[task_name]
         self.task_progress[task_name] = 100
@@ -131,7 +145,10 @@ class TaskPerformanceTimer:
                 - average_task_time: Mean duration across tasks
                 - longest_task: Task with maximum duration
                 - shortest_task: Task with minimum duration
+                - operations: Per-operation count, error rate and p50/p90/p99
+                  latencies from the process-wide metrics registry
         """
+        operations = get_metrics().summary()
         if not self.task_timings:
             return {
                 "individual_timings": {},
@@ -139,7 +156,8 @@ class TaskPerformanceTimer:
                 "task_count": 0,
                 "average_task_time": 0.0,
                 "longest_task": None,
-                "shortest_task": None
+                "shortest_task": None,
+                "operations": operations
             }
         
         total_time = sum(self.task_timings.values())
@@ -152,7 +170,8 @@ class TaskPerformanceTimer:
             "task_count": len(self.task_timings),
             "average_task_time": total_time / len(self.task_timings),
             "longest_task": {"name": longest_task[0], "duration": longest_task[1]},
-            "shortest_task": {"name": shortest_task[0], "duration": shortest_task[1]}
+            "shortest_task": {"name": shortest_task[0], "duration": shortest_task[1]},
+            "operations": operations
         }
     
     def clear_all_timings(self) -> None:
@@ -171,6 +190,25 @@ class TaskPerformanceTimer:
         self.task_metadata.clear()
 
 
+def _finish_progress_ui(task_name: str, duration: float, progress_container, status_container) -> None:
+    """
+    Removes a task's progress indicators and reports completion without blocking.
+    
+    The success message is shown as a toast, which the browser dismisses on its
+    own timer, so the script thread continues immediately instead of sleeping
+    while a banner lingers.
+    
+    Args:
+        task_name (str): Name of the completed task
+        duration (float): Task duration in seconds
+        progress_container: Placeholder holding the title and progress bar
+        status_container: Placeholder holding the status banner
+    """
+    progress_container.empty()
+    status_container.empty()
+    st.toast(f"✅ {task_name} completed in {duration:.2f}s")
+
+
 # Global timer instance with session state integration
 def get_performance_timer() -> TaskPerformanceTimer:
     """
@@ -240,7 +278,9 @@ def track_task_performance(task_name: str, show_progress: bool = True, metadata:
                     progress_bar.progress(25)
                     status_container.info(f"Processing {task_name}...")
                 
-                result = func(*args, **kwargs)
+                # The span keeps every run (the timer keeps the latest per name) and nests child spans
+                with span(task_name, **(metadata or {})):
+                    result = func(*args, **kwargs)
                 
                 if show_progress and progress_bar:
                     timer.update_task_progress(task_name, 90)
@@ -257,16 +297,8 @@ def track_task_performance(task_name: str, show_progress: bool = True, metadata:
             finally:
                 duration = timer.complete_task_timing(task_name)
                 
-                if show_progress and duration and progress_bar and status_container:
-                    progress_bar.progress(100)
-                    status_container.success(f"✅ {task_name} completed in {duration:.2f}s")
-                    
-                    # Clean up progress indicators after brief display
-                    time.sleep(0.8)
-                    if progress_container:
-                        progress_container.empty()
-                    if status_container:
-                        status_container.empty()
+                if show_progress and duration is not None and progress_bar and status_container:
+                    _finish_progress_ui(task_name, duration, progress_container, status_container)
         
         return wrapper
     return decorator
@@ -317,7 +349,8 @@ def performance_tracking_context(task_name: str, show_progress: bool = True, met
         
         timer.start_task_timing(task_name, metadata)
         
-        yield timer
+        with span(task_name, **(metadata or {})):
+            yield timer
         
     except Exception as e:
         if show_progress and status_container:
@@ -327,81 +360,143 @@ def performance_tracking_context(task_name: str, show_progress: bool = True, met
     finally:
         duration = timer.complete_task_timing(task_name)
         
-        if show_progress and duration and progress_bar and status_container:
-            progress_bar.progress(100)
-            status_container.success(f"✅ {task_name} completed in {duration:.2f}s")
-            
-            time.sleep(0.8)
-            if progress_container:
-                progress_container.empty()
-            if status_container:
-                status_container.empty()
+        if show_progress and duration is not None and progress_bar and status_container:
+            _finish_progress_ui(task_name, duration, progress_container, status_container)
+
+
+def _metric_chart(series: pd.DataFrame, value: str) -> pd.DataFrame:
+    """Pivots metric windows into one column per operation, indexed by window time."""
+    chart = series.pivot_table(index="window_start", columns="operation", values=value, aggfunc="sum")
+    chart.index = pd.to_datetime(chart.index, unit="s")
+    return chart
+
+
+def _display_metrics_section() -> None:
+    """
+    Renders tail latencies, time series and model usage from the metrics registry,
+    and spend per page and job from the usage ledger.
+    
+    Side Effects:
+        - Renders a percentile table, line charts and per-model, per-page and per-job usage tables
+    """
+    metrics = get_metrics()
+    rows = metrics.summary()
+    if rows:
+        st.markdown("### Latency Percentiles")
+        table = pd.DataFrame(rows).set_index("operation")
+        st.dataframe(
+            table[["count", "errors", "error_rate", "mean_s", "p50_s", "p90_s", "p99_s", "max_s"]].style.format({
+                "error_rate": "{:.1%}",
+                "mean_s": "{:.3f}",
+                "p50_s": "{:.3f}",
+                "p90_s": "{:.3f}",
+                "p99_s": "{:.3f}",
+                "max_s": "{:.3f}",
+            })
+        )
+        
+        series = pd.DataFrame(metrics.timeseries())
+        # A single window is a point, not a trend
+        if series["window_start"].nunique() > 1:
+            st.markdown("### Throughput (requests/min)")
+            st.line_chart(_metric_chart(series, "requests_per_min"))
+            st.markdown("### p90 Latency (s)")
+            st.line_chart(_metric_chart(series, "p90_s"))
+            if series["error_rate"].any():
+                st.markdown("### Error Rate")
+                st.line_chart(_metric_chart(series, "error_rate"))
+    
+    usage = metrics.model_usage()
+    if usage:
+        st.markdown("### Tokens and Cost by Model")
+        st.dataframe(
+            pd.DataFrame(
+                [{"model": model, **vars(counters)} for model, counters in usage.items()]
+            ).set_index("model").style.format({"cost_usd": "${:.4f}"})
+        )
+    
+    ledger = get_usage_ledger()
+    for dimension in ("page", "job"):
+        totals = ledger.totals(dimension)
+        if totals:
+            st.markdown(f"### Spend by {dimension.title()}")
+            st.dataframe(
+                pd.DataFrame(
+                    [{dimension: value, **vars(counters)} for value, counters in totals.items()]
+                ).set_index(dimension).sort_values("cost_usd", ascending=False).style.format({"cost_usd": "${:.4f}"})
+            )
 
 
 def display_performance_dashboard():
     """
     Displays comprehensive performance analytics in an expandable Streamlit component.
     
-    Shows individual task timings, total execution metrics, and performance visualizations
-    for all tracked tasks in the current session. Includes metrics cards and bar charts.
+    Shows individual task timings and total execution metrics for tracked tasks in
+    the current session, then the tail latencies (p50/p90/p99), throughput and
+    error-rate time series, and per-model token/cost counters recorded by spans.
     
     Side Effects:
         - Renders Streamlit UI components for performance data
         - Creates expandable section with detailed analytics
-        - Displays bar chart for visual performance comparison
+        - Displays bar and line charts for visual performance comparison
         
     Note:
-        Only displays if tasks have been completed. Provides both summary metrics
-        and detailed breakdowns for performance analysis.
+        Only displays if tasks or instrumented operations have completed. Averages
+        are kept for continuity, but the percentile table shows the slow tail.
     """
     timer = get_performance_timer()
     performance_data = timer.get_performance_summary()
     
-    if performance_data["task_count"] > 0:
+    if performance_data["task_count"] > 0 or performance_data["operations"]:
         with st.expander("📊 Performance Analytics Dashboard", expanded=False):
-            # Summary metrics in columns
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric(
-                    "Total Tasks", 
-                    performance_data["task_count"]
-                )
-            
-            with col2:
-                st.metric(
-                    "Total Time", 
-                    f"{performance_data['total_execution_time']:.2f}s"
-                )
-            
-            with col3:
-                st.metric(
-                    "Average Time", 
-                    f"{performance_data['average_task_time']:.2f}s"
-                )
-            
-            with col4:
-                longest_task = performance_data.get('longest_task')
-                if longest_task:
+            if performance_data["task_count"] > 0:
+                # Summary metrics in columns
+                col1, col2, col3, col4 = st.columns(4)
+                
+                with col1:
                     st.metric(
-                        "Longest Task",
-                        f"{longest_task['duration']:.2f}s",
-                        delta=longest_task['name']
+                        "Total Tasks", 
+                        performance_data["task_count"]
                     )
+                
+                with col2:
+                    st.metric(
+                        "Total Time", 
+                        f"{performance_data['total_execution_time']:.2f}s"
+                    )
+                
+                with col3:
+                    st.metric(
+                        "Average Time", 
+                        f"{performance_data['average_task_time']:.2f}s"
+                    )
+                
+                with col4:
+                    longest_task = performance_data.get('longest_task')
+                    if longest_task:
+                        st.metric(
+                            "Longest Task",
+                            f"{longest_task['duration']:.2f}s",
+                            delta=longest_task['name']
+                        )
+                
+                st.markdown("### Task Performance Breakdown")
+                
+                # Individual task details
+                for task_name, duration in performance_data["individual_timings"].items():
+                    percentage = (duration / performance_data["total_execution_time"]) * 100
+                    st.markdown(f"**{task_name}:** {duration:.2f}s ({percentage:.1f}% of total)")
+                
+                # Performance visualization
+                if len(performance_data["individual_timings"]) > 1:
+                    st.markdown("### Performance Comparison")
+                    st.bar_chart(performance_data["individual_timings"])
             
-            st.markdown("### Task Performance Breakdown")
-            
-            # Individual task details
-            for task_name, duration in performance_data["individual_timings"].items():
-                percentage = (duration / performance_data["total_execution_time"]) * 100
-                st.markdown(f"**{task_name}:** {duration:.2f}s ({percentage:.1f}% of total)")
-            
-            # Performance visualization
-            if len(performance_data["individual_timings"]) > 1:
-                st.markdown("### Performance Comparison")
-                st.bar_chart(performance_data["individual_timings"])
+            _display_metrics_section()
                 
             # Clear timings button
             if st.button("Clear Performance Data", key="clear_performance_data"):
                 timer.clear_all_timings()
+                get_metrics().reset()
+                get_usage_ledger().reset()
                 st.rerun()
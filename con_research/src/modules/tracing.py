@@ -0,0 +1,471 @@
+"""
+Span Tracing Module
+===================
+
+Hierarchical timing for the bio/search/scrape/LLM pipeline. Each unit of
+work (a bio, a search, a page fetch, an LLM call) is a span with a parent,
+attributes such as URL, model, tokens and bytes, and an OK/ERROR status, so
+the 40 seconds of one bio can be broken down into the calls that made them.
+
+Features:
+- Nested spans with trace and parent IDs (OpenTelemetry-sized hex IDs)
+- Current span held in a ``contextvars.ContextVar``: follows ``await`` and
+  asyncio tasks automatically; ``bind_context`` carries it onto worker threads
+- Per-session ring buffer of finished spans (one tracer per Streamlit session,
+  a process-wide tracer elsewhere); every finished span also feeds the
+  process-wide latency histograms in metrics.py
+- Optional OTLP/JSON file export (one ``ExportTraceServiceRequest`` per line,
+  readable by the OpenTelemetry Collector ``otlpjsonfile`` receiver), enabled
+  with the ``CONFERENCE_RESEARCH_TRACE_FILE`` environment variable
+- ``span`` context manager, ``traced`` decorator (sync and async) and
+  ``format_trace`` for a text waterfall in the UI
+
+Dependencies:
+- Standard library only (streamlit is used, if present, to find the session)
+- con_research.src.modules.metrics, which every finished span feeds
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from con_research.src.modules.local_store import get_cache_dir
+from con_research.src.modules.metrics import record_span
+
+# Path for OTLP/JSON span export; "1"/"true" selects <cache>/traces/spans.jsonl
+TRACE_FILE_ENV_VAR = "CONFERENCE_RESEARCH_TRACE_FILE"
+DEFAULT_BUFFER_SIZE = 2000
+MAX_SESSION_TRACERS = 64
+SERVICE_NAME = "conference-research"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+@dataclass
+class SpanEvent:
+    """A timestamped point inside a span (a retry, a cache hit)."""
+    name: str
+    time_ns: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Span:
+    """
+    One timed unit of work.
+
+    Attributes:
+        name (str): Operation name, e.g. "llm.chat" or "http.fetch"
+        trace_id (str): 32-hex-digit ID shared by every span of a trace
+        span_id (str): 16-hex-digit ID of this span
+        parent_id (str, optional): ``span_id`` of the parent, None for a root span
+        start_time_ns (int): Wall-clock start (epoch nanoseconds, for export)
+        end_time_ns (int, optional): Wall-clock end, None while running
+        attributes (Dict[str, Any]): Key/value details (url, model, tokens, bytes, ...)
+        events (List[SpanEvent]): Points of interest inside the span
+        status (str): "UNSET", "OK" or "ERROR"
+        status_message (str): Error description when status is "ERROR"
+        thread_name (str): Thread the span started on
+    """
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_time_ns: int = 0
+    end_time_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    events: List[SpanEvent] = field(default_factory=list)
+    status: str = "UNSET"
+    status_message: str = ""
+    thread_name: str = ""
+    _start_perf: float = field(default=0.0, repr=False)
+    _duration: Optional[float] = field(default=None, repr=False)
+    _tracer: Optional["Tracer"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def duration(self) -> float:
+        """Seconds elapsed (so far, if the span is still running)."""
+        if self._duration is not None:
+            return self._duration
+        return time.perf_counter() - self._start_perf
+
+    @property
+    def is_root(self) -> bool:
+        return self.parent_id is None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append(SpanEvent(name, time.time_ns(), dict(attributes or {})))
+
+    def record_exception(self, error: BaseException) -> None:
+        """Marks the span failed and records the exception as an event."""
+        self.status = "ERROR"
+        self.status_message = f"{type(error).__name__}: {error}"
+        self.add_event("exception", {"exception.type": type(error).__name__, "exception.message": str(error)})
+
+    def end(self) -> None:
+        """Stops the clock and hands the span to its tracer (idempotent)."""
+        if self.end_time_ns is not None:
+            return
+        self._duration = time.perf_counter() - self._start_perf
+        self.end_time_ns = self.start_time_ns + int(self._duration * 1e9)
+        if self.status == "UNSET":
+            self.status = "OK"
+        if self._tracer is not None:
+            self._tracer._on_end(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON representation of the span."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or time.time_ns()),
+            "attributes": _otlp_attributes({**self.attributes, "thread.name": self.thread_name}),
+            "events": [
+                {"timeUnixNano": str(e.time_ns), "name": e.name, "attributes": _otlp_attributes(e.attributes)}
+                for e in self.events
+            ],
+            "status": {"code": {"UNSET": 0, "OK": 1, "ERROR": 2}[self.status], "message": self.status_message},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class OTLPJsonFileExporter:
+    """
+    Appends finished spans to a file in OTLP/JSON, one export request per line.
+
+    Args:
+        path (str | Path): Output file (parent directories are created)
+        service_name (str): ``service.name`` resource attribute
+    """
+
+    def __init__(self, path, service_name: str = SERVICE_NAME):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        if not spans:
+            return
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "con_research.tracing"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+        line = json.dumps(request, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+
+class Tracer:
+    """
+    Creates spans and keeps the most recent finished ones in a ring buffer.
+
+    Finished spans are queued for the exporter and written when their root span
+    ends, so a trace lands in the file as one line.
+
+    Args:
+        buffer_size (int): Finished spans kept in memory
+        exporter (OTLPJsonFileExporter, optional): Destination for finished traces
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE, exporter: Optional[OTLPJsonFileExporter] = None):
+        self.exporter = exporter
+        self._finished: deque = deque(maxlen=buffer_size)
+        self._pending_export: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None, parent: Optional[Span] = None) -> Span:
+        """
+        Starts a span without making it current (see ``span`` for the usual form).
+
+        Args:
+            name (str): Operation name
+            attributes (Dict[str, Any], optional): Initial attributes
+            parent (Span, optional): Parent span; defaults to the current span
+
+        Returns:
+            Span: The running span; call ``end()`` when done
+        """
+        parent = parent if parent is not None else _current_span.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_time_ns=time.time_ns(),
+            attributes=dict(attributes or {}),
+            thread_name=threading.current_thread().name,
+            _start_perf=time.perf_counter(),
+            _tracer=self,
+        )
+
+    def _on_end(self, span: Span) -> None:
+        record_span(span.name, span.duration, span.status == "ERROR", span.attributes)
+        export_batch: Optional[List[Span]] = None
+        with self._lock:
+            self._finished.append(span)
+            if self.exporter is not None:
+                self._pending_export.setdefault(span.trace_id, []).append(span)
+                if span.is_root:
+                    export_batch = self._pending_export.pop(span.trace_id)
+                elif len(self._pending_export) > self._finished.maxlen:
+                    # Roots that never end (abandoned work) must not hold spans forever
+                    oldest = next(iter(self._pending_export))
+                    export_batch = self._pending_export.pop(oldest)
+        if export_batch:
+            try:
+                self.exporter.export(export_batch)
+            except OSError:
+                # Tracing must never break the traced work
+                pass
+
+    def spans(self) -> List[Span]:
+        """Finished spans, oldest first."""
+        with self._lock:
+            return list(self._finished)
+
+    def traces(self) -> "OrderedDict[str, List[Span]]":
+        """Finished spans grouped by trace ID, oldest trace first."""
+        grouped: "OrderedDict[str, List[Span]]" = OrderedDict()
+        for span in self.spans():
+            grouped.setdefault(span.trace_id, []).append(span)
+        return grouped
+
+    def last_trace(self, root_name: Optional[str] = None) -> List[Span]:
+        """
+        Spans of the most recently finished trace.
+
+        Args:
+            root_name (str, optional): Only consider traces whose root span has this name
+
+        Returns:
+            List[Span]: Spans of the trace (empty if none)
+        """
+        for spans in reversed(list(self.traces().values())):
+            roots = [s for s in spans if s.is_root]
+            if roots and (root_name is None or roots[0].name == root_name):
+                return spans
+        return []
+
+    def clear(self) -> None:
+        with self._lock:
+            self._finished.clear()
+            self._pending_export.clear()
+
+
+def _exporter_from_env() -> Optional[OTLPJsonFileExporter]:
+    setting = os.getenv(TRACE_FILE_ENV_VAR, "").strip()
+    if not setting or setting.lower() in ("0", "false", "no"):
+        return None
+    if setting.lower() in ("1", "true", "yes"):
+        return OTLPJsonFileExporter(get_cache_dir("traces") / "spans.jsonl")
+    return OTLPJsonFileExporter(setting)
+
+
+_tracers: "OrderedDict[str, Tracer]" = OrderedDict()
+_tracers_lock = threading.Lock()
+_shared_exporter: Optional[OTLPJsonFileExporter] = None
+
+
+def _session_id() -> str:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        try:
+            context = get_script_run_ctx(suppress_warning=True)
+        except TypeError:
+            context = get_script_run_ctx()
+        return context.session_id if context is not None else "process"
+    except Exception:
+        return "process"
+
+
+def get_tracer() -> Tracer:
+    """
+    Returns the tracer for the current Streamlit session (or the process).
+
+    Inside a span the span's own tracer is returned, so worker threads without
+    a Streamlit context still record into the right session's buffer.
+
+    Returns:
+        Tracer: Session tracer
+    """
+    current = _current_span.get()
+    if current is not None and current._tracer is not None:
+        return current._tracer
+    global _shared_exporter
+    session = _session_id()
+    with _tracers_lock:
+        tracer = _tracers.get(session)
+        if tracer is None:
+            if _shared_exporter is None:
+                _shared_exporter = _exporter_from_env()
+            tracer = _tracers[session] = Tracer(exporter=_shared_exporter)
+            # Forget the least recently used sessions
+            while len(_tracers) > MAX_SESSION_TRACERS:
+                _tracers.popitem(last=False)
+        else:
+            _tracers.move_to_end(session)
+        return tracer
+
+
+def current_span() -> Optional[Span]:
+    """The span running in this context, or None."""
+    return _current_span.get()
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Sets an attribute on the current span; does nothing outside a span."""
+    active = _current_span.get()
+    if active is not None:
+        active.set_attribute(key, value)
+
+
+def add_event(name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Adds an event to the current span; does nothing outside a span."""
+    active = _current_span.get()
+    if active is not None:
+        active.add_event(name, attributes)
+
+
+@contextmanager
+def span(name: str, /, **attributes: Any) -> Iterator[Span]:
+    """
+    Runs a block inside a new span that is current for its duration.
+
+    Exceptions mark the span as ERROR and propagate.
+
+    Example:
+        >>> with span("search.serper", query="Ada Lovelace") as s:
+        ...     s.set_attribute("results", 10)
+    """
+    active = get_tracer().start_span(name, attributes)
+    token = _current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        active.end()
+
+
+def traced(name: Optional[str] = None, /, **attributes: Any) -> Callable:
+    """
+    Decorator running a function (sync or async) inside a span.
+
+    Args:
+        name (str, optional): Span name (defaults to the function's qualified name)
+        **attributes: Static attributes for every call
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind_context(func: Callable) -> Callable:
+    """
+    Binds ``func`` to a copy of the caller's context (current span included).
+
+    Threads do not inherit context variables; wrap each task submitted to an
+    executor so its spans become children of the submitting span. Bind once
+    per task, since one context cannot run on two threads at once.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+    return wrapper
+
+
+def format_trace(spans: List[Span], min_duration: float = 0.0) -> str:
+    """
+    Renders a trace as an indented waterfall, children under their parents.
+
+    Args:
+        spans (List[Span]): Spans of one trace
+        min_duration (float): Hide spans shorter than this many seconds
+
+    Returns:
+        str: One line per span with offset, duration, status and key attributes
+    """
+    if not spans:
+        return ""
+    children: Dict[Optional[str], List[Span]] = {}
+    ids = {s.span_id for s in spans}
+    for s in sorted(spans, key=lambda s: s.start_time_ns):
+        # Spans whose parent fell out of the buffer are shown at the top level
+        children.setdefault(s.parent_id if s.parent_id in ids else None, []).append(s)
+    origin = min(s.start_time_ns for s in spans)
+    lines: List[str] = []
+
+    def walk(parent_id: Optional[str], depth: int) -> None:
+        for child in children.get(parent_id, []):
+            if child.duration >= min_duration or depth == 0:
+                details = ", ".join(f"{k}={v}" for k, v in child.attributes.items() if v not in (None, ""))
+                marker = " ✗" if child.status == "ERROR" else ""
+                lines.append(
+                    f"{'  ' * depth}{child.name}{marker}  +{(child.start_time_ns - origin) / 1e9:.2f}s  "
+                    f"{child.duration:.2f}s" + (f"  [{details}]" if details else "")
+                )
+            walk(child.span_id, depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
@@ -0,0 +1,463 @@
+"""
+Usage Accounting Module
+=======================
+
+Central ledger for LLM token usage and spend. Every completion's prompt and
+completion tokens are recorded once, priced, attributed to the job, page,
+chunk and row that caused it, and charged against any budgets in scope, so a
+run stops before it overspends instead of after the invoice arrives.
+
+Features:
+- ``usage_scope(job=..., page=..., chunk=..., row=...)`` labels calls through a
+  context variable; labels follow work onto threads bound with
+  ``tracing.bind_context`` (gateway ``map``) and onto the async loop
+- ``Budget`` limits on USD, tokens or requests; ``budget_scope`` activates one
+  for a block of work, nested budgets all apply
+- Pre-call reservations: the gateway reserves the worst-case cost of a call
+  (estimated prompt + completion budget) and settles it with the real usage,
+  so concurrent calls cannot jointly overshoot a limit
+- Configurable price table (defaults from ``metrics``, overrides from the JSON
+  file named by ``CONFERENCE_RESEARCH_PRICES_FILE``)
+- Totals per job / page / chunk / row and a bounded record log for the
+  performance dashboard; per-model counters are forwarded to ``metrics``
+
+Dependencies:
+- Standard library only
+- con_research.src.modules.metrics for default prices and per-model counters
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from con_research.src.modules.metrics import DEFAULT_PRICES_PER_MILLION, estimate_cost, get_metrics
+
+PRICES_FILE_ENV_VAR = "CONFERENCE_RESEARCH_PRICES_FILE"
+RUN_BUDGET_ENV_VAR = "CONFERENCE_RESEARCH_RUN_BUDGET_USD"
+# Attribution dimensions kept as running totals, in display order
+ATTRIBUTION_KEYS = ("job", "page", "chunk", "row")
+MAX_RECORDS = 5000
+
+_labels: contextvars.ContextVar = contextvars.ContextVar("usage_labels", default={})
+_budgets: contextvars.ContextVar = contextvars.ContextVar("usage_budgets", default=())
+
+
+class BudgetExceededError(RuntimeError):
+    """
+    Raised before a call that would take a budget past its limit.
+
+    Attributes:
+        budget (Budget): The budget that refused the call
+        requested_usd (float): Worst-case cost of the refused call
+        limit (str): Which limit refused it, e.g. "$0.50" or "10000 token"
+    """
+
+    def __init__(self, budget: "Budget", requested_usd: float, limit: str = "usd"):
+        super().__init__(f"Budget '{budget.name}' would exceed its {limit} limit; call refused")
+        self.budget = budget
+        self.requested_usd = requested_usd
+        self.limit = limit
+
+
+class Budget:
+    """
+    Spending limit for a block of work (a chunk, a batch, a report).
+
+    Any limit left as None is not enforced. Calls are admitted against what is
+    spent plus what in-flight calls have reserved.
+
+    Args:
+        limit_usd (float, optional): Maximum estimated spend
+        limit_tokens (int, optional): Maximum prompt + completion tokens
+        limit_requests (int, optional): Maximum number of calls
+        name (str): Label used in errors and on the dashboard
+    """
+
+    def __init__(self, limit_usd: Optional[float] = None, limit_tokens: Optional[int] = None,
+                 limit_requests: Optional[int] = None, name: str = "run"):
+        self.limit_usd = limit_usd
+        self.limit_tokens = limit_tokens
+        self.limit_requests = limit_requests
+        self.name = name
+        self.spent_usd = 0.0
+        self.tokens = 0
+        self.requests = 0
+        self.reserved_usd = 0.0
+        self.reserved_tokens = 0
+        self.reserved_requests = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, cost_usd: float, tokens: int) -> None:
+        """
+        Holds capacity for one call.
+
+        Raises:
+            BudgetExceededError: If the call could take any limit past its maximum
+        """
+        with self._lock:
+            if self.limit_usd is not None and self.spent_usd + self.reserved_usd + cost_usd > self.limit_usd:
+                raise BudgetExceededError(self, cost_usd, f"${self.limit_usd:.2f}")
+            if self.limit_tokens is not None and self.tokens + self.reserved_tokens + tokens > self.limit_tokens:
+                raise BudgetExceededError(self, cost_usd, f"{self.limit_tokens} token")
+            if self.limit_requests is not None and self.requests + self.reserved_requests + 1 > self.limit_requests:
+                raise BudgetExceededError(self, cost_usd, f"{self.limit_requests} request")
+            self.reserved_usd += cost_usd
+            self.reserved_tokens += tokens
+            self.reserved_requests += 1
+
+    def release(self, cost_usd: float, tokens: int) -> None:
+        """Returns a reservation unused (the call failed before reporting usage)."""
+        with self._lock:
+            self.reserved_usd = max(0.0, self.reserved_usd - cost_usd)
+            self.reserved_tokens = max(0, self.reserved_tokens - tokens)
+            self.reserved_requests = max(0, self.reserved_requests - 1)
+
+    def charge(self, cost_usd: float, tokens: int) -> None:
+        """Books actual usage (after the call; never refused)."""
+        with self._lock:
+            self.spent_usd += cost_usd
+            self.tokens += tokens
+            self.requests += 1
+
+    @property
+    def remaining_usd(self) -> Optional[float]:
+        if self.limit_usd is None:
+            return None
+        return max(0.0, self.limit_usd - self.spent_usd)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "limit_usd": self.limit_usd,
+                "spent_usd": self.spent_usd,
+                "tokens": self.tokens,
+                "requests": self.requests,
+                "reserved_usd": self.reserved_usd,
+            }
+
+
+@dataclass
+class UsageRecord:
+    """
+    One priced completion.
+
+    Attributes:
+        model (str): Model name reported by the API (or requested)
+        prompt_tokens (int): Input tokens
+        completion_tokens (int): Output tokens
+        cost_usd (float): Estimated cost from the ledger's price table
+        operation (str): What made the call, e.g. "llm.chat"
+        labels (Dict[str, str]): Attribution (job, page, chunk, row) at call time
+        timestamp (float): Epoch seconds
+    """
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    cost_usd: float
+    operation: str = "llm.chat"
+    labels: Dict[str, str] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class UsageTotals:
+    """Running totals for one attribution value."""
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+class Reservation:
+    """
+    Budget capacity held for one in-flight call; settle or release it exactly once.
+
+    Created by ``UsageLedger.reserve``.
+    """
+
+    def __init__(self, ledger: "UsageLedger", model: str, budgets: Tuple[Budget, ...],
+                 cost_usd: float, tokens: int, labels: Dict[str, str]):
+        self._ledger = ledger
+        self.model = model
+        self.budgets = budgets
+        self.cost_usd = cost_usd
+        self.tokens = tokens
+        self.labels = labels
+        self._done = False
+
+    def settle(self, prompt_tokens: int, completion_tokens: int, model: Optional[str] = None,
+               operation: str = "llm.chat") -> UsageRecord:
+        """Replaces the reservation with the call's reported usage and records it."""
+        self.release()
+        return self._ledger.record(
+            model or self.model, prompt_tokens, completion_tokens,
+            operation=operation, labels=self.labels, budgets=self.budgets,
+        )
+
+    def release(self) -> None:
+        """Gives the reserved capacity back without recording usage."""
+        if self._done:
+            return
+        self._done = True
+        for budget in self.budgets:
+            budget.release(self.cost_usd, self.tokens)
+
+
+def load_price_table(path: Optional[str] = None) -> Dict[str, Tuple[float, float]]:
+    """
+    Default prices merged with overrides from a JSON file.
+
+    The file maps model names to ``[input, output]`` USD per million tokens,
+    e.g. ``{"gpt-4o-mini": [0.15, 0.6]}``.
+
+    Args:
+        path (str, optional): Override file (defaults to ``CONFERENCE_RESEARCH_PRICES_FILE``)
+
+    Returns:
+        Dict[str, Tuple[float, float]]: Model name → (input, output) prices
+    """
+    prices = dict(DEFAULT_PRICES_PER_MILLION)
+    path = path or os.environ.get(PRICES_FILE_ENV_VAR)
+    if path:
+        try:
+            with open(path, encoding="utf-8") as handle:
+                overrides = json.load(handle)
+            prices.update({str(model): (float(pair[0]), float(pair[1])) for model, pair in overrides.items()})
+        except (OSError, ValueError, TypeError, IndexError):
+            # A broken override file must not stop the app; defaults still apply
+            pass
+    return prices
+
+
+def default_run_budget_usd() -> Optional[float]:
+    """Per-run USD limit from ``CONFERENCE_RESEARCH_RUN_BUDGET_USD`` (None if unset or invalid)."""
+    try:
+        value = float(os.environ.get(RUN_BUDGET_ENV_VAR, ""))
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+class UsageLedger:
+    """
+    Thread-safe record of every priced completion, with attribution totals.
+
+    Args:
+        prices (Dict[str, Tuple[float, float]], optional): Price table (USD per
+            million input/output tokens); defaults to ``load_price_table()``
+        max_records (int): Individual records kept for inspection
+    """
+
+    def __init__(self, prices: Optional[Dict[str, Tuple[float, float]]] = None, max_records: int = MAX_RECORDS):
+        self.prices = prices or load_price_table()
+        self._records: Deque[UsageRecord] = deque(maxlen=max_records)
+        self._totals: Dict[str, Dict[str, UsageTotals]] = {key: {} for key in ATTRIBUTION_KEYS}
+        self._overall = UsageTotals()
+        self._lock = threading.Lock()
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        return estimate_cost(model, prompt_tokens, completion_tokens, self.prices)
+
+    def reserve(self, model: str, prompt_tokens: int, completion_tokens: int) -> Reservation:
+        """
+        Reserves a call's worst-case usage against every budget in scope.
+
+        Args:
+            model (str): Requested model
+            prompt_tokens (int): Estimated prompt tokens
+            completion_tokens (int): Completion limit (max_tokens or the default budget)
+
+        Returns:
+            Reservation: Settle with the real usage, or release on failure
+
+        Raises:
+            BudgetExceededError: If any active budget cannot cover the call
+        """
+        budgets = _budgets.get()
+        cost = self.cost(model, prompt_tokens, completion_tokens)
+        tokens = prompt_tokens + completion_tokens
+        reserved: List[Budget] = []
+        try:
+            for budget in budgets:
+                budget.reserve(cost, tokens)
+                reserved.append(budget)
+        except BudgetExceededError:
+            for budget in reserved:
+                budget.release(cost, tokens)
+            raise
+        return Reservation(self, model, budgets, cost, tokens, dict(_labels.get()))
+
+    def record(self, model: str, prompt_tokens: int, completion_tokens: int, operation: str = "llm.chat",
+               labels: Optional[Dict[str, str]] = None, budgets: Optional[Tuple[Budget, ...]] = None) -> UsageRecord:
+        """
+        Prices and books one completion.
+
+        Args:
+            model (str): Model name
+            prompt_tokens (int): Input tokens reported by the API
+            completion_tokens (int): Output tokens reported by the API
+            operation (str): Call site label
+            labels (Dict[str, str], optional): Attribution (defaults to the current scope)
+            budgets (Tuple[Budget, ...], optional): Budgets to charge (defaults to those in scope)
+
+        Returns:
+            UsageRecord: The booked record, including its estimated cost
+        """
+        entry = UsageRecord(
+            model=model or "unknown",
+            prompt_tokens=int(prompt_tokens or 0),
+            completion_tokens=int(completion_tokens or 0),
+            cost_usd=self.cost(model or "", int(prompt_tokens or 0), int(completion_tokens or 0)),
+            operation=operation,
+            labels=dict(_labels.get() if labels is None else labels),
+        )
+        for budget in _budgets.get() if budgets is None else budgets:
+            budget.charge(entry.cost_usd, entry.total_tokens)
+        with self._lock:
+            self._records.append(entry)
+            for totals in [self._overall] + [
+                self._totals[key].setdefault(str(entry.labels[key]), UsageTotals())
+                for key in ATTRIBUTION_KEYS if key in entry.labels
+            ]:
+                totals.requests += 1
+                totals.prompt_tokens += entry.prompt_tokens
+                totals.completion_tokens += entry.completion_tokens
+                totals.cost_usd += entry.cost_usd
+        get_metrics().record_usage(entry.model, entry.prompt_tokens, entry.completion_tokens, entry.cost_usd)
+        return entry
+
+    def records(self, **labels: Any) -> List[UsageRecord]:
+        """Kept records whose labels match all of ``labels`` (e.g. ``job="abc"``)."""
+        wanted = {key: str(value) for key, value in labels.items()}
+        with self._lock:
+            return [
+                entry for entry in self._records
+                if all(str(entry.labels.get(key)) == value for key, value in wanted.items())
+            ]
+
+    def totals(self, dimension: Optional[str] = None) -> Dict[str, UsageTotals]:
+        """
+        Running totals for one attribution dimension, or overall.
+
+        Args:
+            dimension (str, optional): One of job, page, chunk, row; None for the overall total
+
+        Returns:
+            Dict[str, UsageTotals]: Value → totals ({"all": totals} when dimension is None)
+        """
+        with self._lock:
+            if dimension is None:
+                return {"all": UsageTotals(**vars(self._overall))}
+            return {value: UsageTotals(**vars(totals)) for value, totals in self._totals[dimension].items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+            for totals in self._totals.values():
+                totals.clear()
+            self._overall = UsageTotals()
+
+
+_ledger: Optional[UsageLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_usage_ledger() -> UsageLedger:
+    """
+    Returns the process-wide usage ledger.
+
+    Returns:
+        UsageLedger: Shared ledger instance
+    """
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UsageLedger()
+        return _ledger
+
+
+def current_labels() -> Dict[str, str]:
+    """Attribution labels of the calling context."""
+    return dict(_labels.get())
+
+
+@contextmanager
+def usage_scope(**labels: Any) -> Iterator[Dict[str, str]]:
+    """
+    Attributes LLM usage inside the block to the given job/page/chunk/row.
+
+    Labels are merged over the enclosing scope's, so a row scope inside a
+    chunk scope keeps the chunk, page and job.
+
+    Example:
+        with usage_scope(page="BioGen", job=run_id, chunk=3):
+            with usage_scope(row=row_index):
+                generate_bio(...)
+    """
+    merged = {**_labels.get(), **{key: str(value) for key, value in labels.items() if value is not None}}
+    token = _labels.set(merged)
+    try:
+        yield merged
+    finally:
+        _labels.reset(token)
+
+
+@contextmanager
+def budget_scope(budget: Optional[Budget]) -> Iterator[Optional[Budget]]:
+    """
+    Enforces ``budget`` on every accounted call inside the block (None is a no-op).
+
+    Args:
+        budget (Budget, optional): Budget to apply in addition to any enclosing ones
+
+    Yields:
+        Optional[Budget]: The same budget, for reading its spend afterwards
+    """
+    if budget is None:
+        yield None
+        return
+    token = _budgets.set(_budgets.get() + (budget,))
+    try:
+        yield budget
+    finally:
+        _budgets.reset(token)
+
+
+def record_completion(completion: Any, operation: str = "llm.chat", model: Optional[str] = None,
+                      **labels: Any) -> Optional[UsageRecord]:
+    """
+    Books the usage of a completion made directly with an OpenAI client.
+
+    Gateway calls are accounted automatically; use this for the few call
+    sites that still hold their own client.
+
+    Args:
+        completion: ChatCompletion (or parsed completion) with a ``usage`` field
+        operation (str): Call site label
+        model (str, optional): Model name when the completion does not report one
+        **labels: Attribution merged over the current scope (e.g. ``page="Web Scraper"``)
+
+    Returns:
+        Optional[UsageRecord]: The booked record, or None if no usage was reported
+    """
+    usage = getattr(completion, "usage", None)
+    if usage is None:
+        return None
+    return get_usage_ledger().record(
+        getattr(completion, "model", None) or model or "unknown",
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+        operation=operation,
+        labels={**_labels.get(), **{key: str(value) for key, value in labels.items() if value is not None}},
+    )
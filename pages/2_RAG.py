@@ -28,9 +28,7 @@ USE CASES:
 
 import streamlit as st
 from openai import OpenAI
-import pandas as pd
 import os
-import tiktoken
 import PyPDF2
 from langchain.embeddings.openai import OpenAIEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -38,6 +36,10 @@ from langchain.vectorstores import FAISS
 from langchain.chat_models import ChatOpenAI
 from langchain.chains import RetrievalQA
 
+from con_research.config.config_manager import get_performance_config
+from con_research.src.modules.ingestion import IngestionError, load_table
+from con_research.src.modules.resources import get_tiktoken_encoding
+
 st.sidebar.title(":streamlit: Conference & Campus Research Assistant")
 st.sidebar.write("""
 A self-service app that automates the generation of biographical content 
@@ -91,7 +93,7 @@ def estimate_tokens(input_text):
         Uses cl100k_base encoding which is standard for GPT-4 and GPT-4-turbo models.
         Essential for managing API costs and staying within model context limits.
     """
-    encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 uses this encoding
+    encoding = get_tiktoken_encoding("cl100k_base")  # GPT-4 uses this encoding; loaded once per process
     tokens = len(encoding.encode(input_text))
     return tokens
 
@@ -120,9 +122,13 @@ if uploaded_file:
             document_content = None
 
     elif uploaded_file.name.endswith('.xlsx'):
-        # Read Excel content
-        excel_dataframe = pd.read_excel(uploaded_file)
-        document_content = excel_dataframe.to_string(index=False)
+        # Read Excel content (streamed, headers normalised)
+        try:
+            excel_dataframe = load_table(uploaded_file, required=(), all_columns=True).dataframe
+            document_content = excel_dataframe.to_string(index=False)
+        except IngestionError as e:
+            st.error(f"Error reading Excel file: {e}")
+            document_content = None
 
     elif uploaded_file.name.endswith('.pdf'):
         # Parse PDF content
@@ -155,8 +161,11 @@ if uploaded_file:
 # Process the uploaded file and question with LangChain-style chunking and retrieval
 if uploaded_file and question and openai_api_key and document_content:
     try:
-        # Step 1: Chunk the article text into manageable pieces
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+        # Step 1: Chunk the article text into manageable pieces (sizes from the performance config)
+        performance = get_performance_config()
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=performance.rag_chunk_size, chunk_overlap=performance.rag_chunk_overlap
+        )
         text_chunks = text_splitter.split_text(document_content)
         st.write(f"Text has been split into {len(text_chunks)} chunks.")
 
@@ -167,7 +176,7 @@ if uploaded_file and question and openai_api_key and document_content:
 
         # Step 3: Set up the retrieval chain using GPT-4 as the language model
         chat_language_model = ChatOpenAI(model_name="gpt-4", openai_api_key=openai_api_key)
-        document_retriever = vector_store.as_retriever(search_kwargs={"k": 3})
+        document_retriever = vector_store.as_retriever(search_kwargs={"k": performance.rag_top_k})
         qa_chain = RetrievalQA.from_chain_type(
             llm=chat_language_model,
             chain_type="stuff",
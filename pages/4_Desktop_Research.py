@@ -7,8 +7,10 @@ AI-generated biographical content. Facilitates academic networking by providing
 researcher information through intelligent data processing.
 
 KEY FEATURES:
-- Local file search (CSV/XLSX) with real-time filtering
+- Local file search (CSV/XLSX) through a per-session people index: fuzzy name and
+  affiliation matching plus Bio keyword search, answered without any LLM call
 - AI-powered biography generation using OpenAI GPT models
+- Batched local-file mode: several people per structured-output request, run concurrently
 - Academic profile synthesis including research/teaching interests
 - Contact information extraction and export capabilities
 
@@ -18,8 +20,8 @@ REQUIREMENTS:
 - Input: CSV/XLSX files with Name, University/Affiliation columns
 
 WORKFLOW:
-1. Upload data files → 2. Search/filter by name/institution/research area
-3. Select individuals → 4. AI generates comprehensive profiles → 5. Export results
+1. Upload data files (indexed once per session) → 2. Search by name/institution/bio keywords
+3. Optionally generate AI bios for every row → 4. Export results
 
 AI BIOGRAPHY INCLUDES:
 - Academic background and current position
@@ -34,7 +36,15 @@ USE CASES:
 import streamlit as st
 import pandas as pd
 import re
-from openai import OpenAI
+import time
+
+from con_research.config.config_manager import get_performance_config
+from con_research.src.modules.llm_client import Priority, get_llm_gateway
+from con_research.src.modules.usage_accounting import BudgetExceededError, usage_scope
+from con_research.src.modules.batched_bios import PersonRecord, generate_bios_batched
+from con_research.src.modules.people_index import PeopleIndex
+from con_research.src.modules.ingestion import IngestionError, load_table
+from con_research.src.modules.exporting import render_download
 
 
 # Sidebar Configuration
@@ -57,13 +67,15 @@ with st.sidebar:
     if not openai_api_key:
         st.warning("OpenAI key is not configured. Some features may be disabled.")
 
-def generate_bio_with_chatgpt(researcher_full_name, university_affiliation):
+def generate_bio_with_chatgpt(researcher_full_name, university_affiliation, priority=Priority.INTERACTIVE):
     """
     Generates a concise academic biography using OpenAI GPT-4o-mini for desktop research purposes.
     
     Args:
         researcher_full_name (str): Complete name of the academic researcher
         university_affiliation (str): Institutional affiliation for context
+        priority (Priority): Gateway scheduling priority; file batches use Priority.BATCH
+            so single interactive searches are served first
         
     Returns:
         str: Brief academic biography (typically 100-200 words) focusing on research areas,
@@ -91,17 +103,147 @@ def generate_bio_with_chatgpt(researcher_full_name, university_affiliation):
         "and contact information such as email."
     )
     try:
-        # Initialize the OpenAI client
-        openai_client = OpenAI(api_key=openai_api_key)
+        # Shared gateway: rate limits, adaptive concurrency and priorities
+        llm_gateway = get_llm_gateway(openai_api_key)
 
         # Generate response
-        chat_response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}]
+        chat_response = llm_gateway.chat_completion(
+            priority=priority, model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}]
         )
         return chat_response.choices[0].message.content
     except Exception as e:
         return f"Error generating bio: {e}"
 
+def generate_file_bios(file_dataframe, people_per_request):
+    """
+    Generates a bio for every row of an uploaded file.
+    
+    Args:
+        file_dataframe (pd.DataFrame): Rows with 'Name' and 'University' columns
+        people_per_request (int): People packed into one structured-output request;
+            1 keeps the original one-request-per-row behaviour
+        
+    Returns:
+        List[str]: Bios aligned with the DataFrame rows (error text for rows that failed)
+        
+    Raises:
+        BudgetExceededError: If a spend limit refused a batched request
+        
+    Note:
+        Batched requests return bios keyed by row ID; IDs missing from a response
+        are retried in smaller groups, so one bad response never loses a whole group.
+    """
+    llm_gateway = get_llm_gateway(openai_api_key)
+    researchers = list(zip(file_dataframe['Name'], file_dataframe['University']))
+    if people_per_request <= 1:
+        # Rows run concurrently under the shared gateway's limits
+        return llm_gateway.map(
+            lambda researcher: generate_bio_with_chatgpt(*researcher, priority=Priority.BATCH),
+            researchers,
+        )
+
+    person_records = [
+        PersonRecord(row_id=str(row_index), name=str(name), university=str(university))
+        for row_index, (name, university) in zip(file_dataframe.index, researchers)
+    ]
+    progress_bar = st.progress(0.0, text=f"Generating bios for {len(person_records)} people...")
+
+    def show_progress(done, total):
+        progress_bar.progress(done / total if total else 1.0, text=f"{done}/{total} bios generated")
+
+    batched_result = generate_bios_batched(
+        llm_gateway, person_records, batch_size=people_per_request, on_progress=show_progress
+    )
+    progress_bar.empty()
+    if batched_result.missing:
+        st.warning(f"{len(batched_result.missing)} rows could not be generated after retries.")
+    return [
+        batched_result.bios[record.row_id].bio if record.row_id in batched_result.bios
+        else f"Error generating bio: {batched_result.missing.get(record.row_id, 'unknown error')}"
+        for record in person_records
+    ]
+
+def load_uploaded_dataset(dataset_file, required=('Name', 'University')):
+    """
+    Streams an uploaded CSV/XLSX file with normalised headers ('Affiliation' → 'University').
+    
+    Args:
+        dataset_file: Streamlit UploadedFile object
+        required (tuple): Columns the file must provide
+        
+    Returns:
+        pd.DataFrame: Name, University and any Bio/Email/Location columns
+        
+    Raises:
+        IngestionError: If the file cannot be read or lacks a required column
+    """
+    ingest_result = load_table(dataset_file, required=required, optional=('University', 'Bio', 'Email', 'Location'))
+    if not ingest_result.ok:
+        raise IngestionError(f"{dataset_file.name} is missing columns: {', '.join(ingest_result.missing)}")
+    return ingest_result.dataframe
+
+def get_session_people_index():
+    """
+    Returns this session's people index.
+
+    Uploaded lists are personal data, so each Streamlit session indexes its
+    own files in memory; nothing is shared with other users or written to disk.
+
+    Returns:
+        PeopleIndex: In-memory index held in session state
+    """
+    if 'people_index' not in st.session_state:
+        st.session_state.people_index = PeopleIndex(":memory:")
+    return st.session_state.people_index
+
+def index_uploaded_datasets(uploaded_datasets):
+    """
+    Adds uploaded files to this session's people index (unchanged files are skipped).
+    
+    Args:
+        uploaded_datasets (list): Streamlit UploadedFile objects
+        
+    Returns:
+        int: Rows newly indexed
+    """
+    people_index = get_session_people_index()
+    newly_indexed = 0
+    for dataset_file in uploaded_datasets or []:
+        try:
+            newly_indexed += people_index.add_dataframe(load_uploaded_dataset(dataset_file, required=('Name',)), dataset_file.name)
+        except ValueError as e:
+            st.error(f"Could not index {dataset_file.name}: {e}")
+    return newly_indexed
+
+def search_local_index(researcher_full_name, university_affiliation, bio_keywords, min_score, uploaded_datasets):
+    """
+    Searches the session's people index and renders the matching rows.
+    
+    Args:
+        researcher_full_name (str): Name to match fuzzily (may be empty)
+        university_affiliation (str): Affiliation to match or filter by (may be empty)
+        bio_keywords (str): Words that must appear in the indexed Bio text (may be empty)
+        min_score (float): Minimum fuzzy match score
+        uploaded_datasets (list): Files currently uploaded; only their rows are searched
+    """
+    search_started = time.perf_counter()
+    matches = get_session_people_index().search(
+        name=researcher_full_name or None,
+        affiliation=university_affiliation or None,
+        text=bio_keywords or None,
+        min_score=min_score,
+        limit=50,
+        sources=[dataset_file.name for dataset_file in uploaded_datasets or []],
+    )
+    elapsed_ms = (time.perf_counter() - search_started) * 1000
+    st.caption(f"{len(matches)} matches in {elapsed_ms:.1f} ms")
+    if not matches:
+        st.info("No matching people in the indexed files.")
+        return
+    st.dataframe(pd.DataFrame(
+        [{"Score": m.score, "Source": m.source, "Row": m.row_id, **m.record} for m in matches]
+    ))
+
 def main():
     """
     Main execution function for the Desktop Research Streamlit application interface.
@@ -130,15 +272,25 @@ def main():
     university_affiliation = st.text_input("University")
     search_scope = st.selectbox("Where would you like to search?", ["Local Files", "Internet", "Both"])
 
+    bio_keywords = st.text_input("Bio keywords (local files, optional)")
+    min_match_score = st.slider("Minimum name match score (local files)", 0.3, 1.0, 0.6, 0.05)
+
     # Optional File Upload
     uploaded_datasets = st.file_uploader("Upload CSV/XLSX files (optional for local search)", type=["csv", "xlsx"], accept_multiple_files=True)
+    if uploaded_datasets:
+        newly_indexed = index_uploaded_datasets(uploaded_datasets)
+        if newly_indexed:
+            st.success(f"Indexed {newly_indexed} people from the uploaded files.")
+    index_stats = get_session_people_index().stats()
+    st.caption(f"Local index: {index_stats['people']} people from {index_stats['sources']} files (this session only)")
 
     if st.button("Search"):
         if search_scope == "Internet":
             # Internet Search with ChatGPT
             if researcher_full_name and university_affiliation:
                 st.write("### Generating Bio with AI...")
-                bio_content = generate_bio_with_chatgpt(researcher_full_name, university_affiliation)
+                with usage_scope(page="Desktop Research", row=researcher_full_name):
+                    bio_content = generate_bio_with_chatgpt(researcher_full_name, university_affiliation)
                 st.write("### Bio Content:")
                 st.write(bio_content)
 
@@ -150,44 +302,56 @@ def main():
                 st.error("Please provide both Full Name and University.")
 
         if search_scope in ["Local Files", "Both"]:
-            # Process Local File Search
-            if uploaded_datasets:
-                st.write("### Searching in Local Files...")
+            # Indexed lookup over this session's current uploads, no LLM call
+            if researcher_full_name or university_affiliation or bio_keywords:
+                st.write("### Matches in Local Files")
+                search_local_index(researcher_full_name, university_affiliation, bio_keywords, min_match_score, uploaded_datasets)
+            else:
+                st.warning("Enter a name, university or bio keywords to search local data.")
+
+    # Bio generation for whole files is a separate, explicit action
+    if uploaded_datasets:
+        with st.expander("Generate AI bios for every row of the uploaded files", expanded=False):
+            people_per_request = st.number_input(
+                "People per AI request", min_value=1, max_value=20, value=get_performance_config().bio_batch_size,
+                help="Several people are described in one structured request; set to 1 for one request per person.",
+            )
+            if st.button("Generate Bios"):
+                # Generated bios are paid for: keep them across reruns (downloads rerun the script)
+                generated_files = st.session_state.setdefault('generated_bio_files', {})
                 for dataset_file in uploaded_datasets:
-                    if dataset_file.name.endswith(".csv"):
-                        file_dataframe = pd.read_csv(dataset_file)
-                    else:
-                        file_dataframe = pd.read_excel(dataset_file)
-
-                    st.write("### File Preview:")
-                    st.write(file_dataframe.head())
-
-                    # If 'University' column is missing but 'Affiliation' exists, rename it
-                    if 'University' not in file_dataframe.columns and 'Affiliation' in file_dataframe.columns:
-                        file_dataframe.rename(columns={'Affiliation': 'University'}, inplace=True)
-                        st.info("'Affiliation' column found and renamed to 'University' for processing.")
-
-                    # Check required columns
-                    if 'Name' in file_dataframe.columns and 'University' in file_dataframe.columns:
-                        st.success("File contains required columns.")
-                        file_dataframe['Bio'] = file_dataframe.apply(
-                            lambda row: generate_bio_with_chatgpt(row['Name'], row['University']), axis=1
-                        )
-                        st.write("### Updated Data:")
-                        st.write(file_dataframe)
-
-                        # Download Option
-                        csv_export = file_dataframe.to_csv(index=False)
-                        st.download_button(
-                            label="Download Updated File",
-                            data=csv_export,
-                            file_name="updated_data_with_bios.csv",
-                            mime="text/csv"
-                        )
+                    try:
+                        file_dataframe = load_uploaded_dataset(dataset_file)
+                    except IngestionError as e:
+                        st.error(f"Could not read {dataset_file.name}: {e}")
+                        continue
+                    if not file_dataframe.empty:
+                        # Token usage is attributed to the file the bios were generated for
+                        try:
+                            with usage_scope(page="Desktop Research", job=dataset_file.name):
+                                file_dataframe['Bio'] = generate_file_bios(file_dataframe, int(people_per_request))
+                        except BudgetExceededError as e:
+                            st.error(f"Stopped generating bios: {e}")
+                            break
+                        generated_files[dataset_file.name] = file_dataframe
                     else:
-                        st.error("Uploaded file must contain 'Name' and 'University' columns.")
-            else:
-                st.warning("Please upload a file to search in local data.")
+                        st.warning(f"{dataset_file.name} has no rows to process.")
+
+            current_file_names = {dataset_file.name for dataset_file in uploaded_datasets}
+            for file_name, file_dataframe in st.session_state.get('generated_bio_files', {}).items():
+                if file_name not in current_file_names:
+                    continue
+                st.write(f"### Updated Data: {file_name}")
+                st.write(file_dataframe)
+
+                # Download Option
+                render_download(
+                    file_dataframe,
+                    label="Download Updated File",
+                    file_stem="updated_data_with_bios",
+                    formats=("csv", "xlsx", "parquet"),
+                    key=f"download_{file_name}",
+                )
 
 # Run the App
 if __name__ == "__main__":
@@ -14,7 +14,7 @@ KEY FEATURES:
 
 REQUIREMENTS:
 - openai_api_key: OpenAI API key
-- Dependencies: streamlit, pandas, pydantic, openai, fitz, pymupdf4llm, concurrent.futures
+- Dependencies: streamlit, pandas, pydantic, openai, fitz, pymupdf4llm, con_research llm_client
 - Input: Text-based PDFs (not image-only scans)
 
 WORKFLOW:
@@ -34,13 +34,15 @@ USE CASES:
 import streamlit as st
 import pandas as pd
 import re
-from io import BytesIO
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from openai import OpenAI
 import fitz  # PyMuPDF
 import pymupdf4llm
-from concurrent.futures import ThreadPoolExecutor
+
+from con_research.src.modules.llm_client import get_llm_gateway
+from con_research.src.modules.usage_accounting import usage_scope
+from con_research.src.modules.entity_resolution import collapse_duplicates
+from con_research.src.modules.exporting import render_download
 
 # Sidebar content
 st.sidebar.title(":streamlit: Conference & Campus Research Assistant")
@@ -120,13 +122,13 @@ def extract_text_from_pdf(pdf_path):
     pdf_document.close()
     return page_texts
 
-def extract_info_with_llm(document_text, openai_client):
+def extract_info_with_llm(document_text, llm_gateway):
     """
     Extracts structured academic information (names, universities, locations) from document text using OpenAI LLM.
     
     Args:
         document_text (str): Raw text content from PDF or document source
-        openai_client (OpenAI): Configured OpenAI client instance with valid API key
+        llm_gateway (LLMGateway): Shared OpenAI gateway (rate limits and adaptive concurrency)
         
     Returns:
         List[Dict]: List of dictionaries containing extracted information with keys:
@@ -143,11 +145,11 @@ def extract_info_with_llm(document_text, openai_client):
         - Pydantic ExtractionResponse model for response validation
         
     Note:
-        Uses structured output with ``response_model`` for consistent JSON responses.
+        Uses structured output (``response_format``) for consistent JSON responses.
         Includes location inference based on university knowledge when location not explicit.
         Designed for academic conference documents and participant lists.
     """
-    response = openai_client.chat.completions.create(
+    response = llm_gateway.parse(
         model="gpt-4o-mini-2024-07-18",
         messages=[
             {
@@ -160,19 +162,19 @@ def extract_info_with_llm(document_text, openai_client):
             },
             {"role": "user", "content": document_text},
         ],
-        response_model=ExtractionResponse,
+        response_format=ExtractionResponse,
     )
-    parsed = response.parse()
-    return parsed.extracted_info
+    parsed = response.choices[0].message.parsed
+    return [item.model_dump() for item in parsed.extracted_info] if parsed else []
 
-def correct_info_with_llm(raw_extracted_data, source_text, openai_client):
+def correct_info_with_llm(raw_extracted_data, source_text, llm_gateway):
     """
     Validates and corrects extracted academic information against source text using OpenAI GPT-4o.
     
     Args:
         raw_extracted_data (List[Dict]): Initial extraction results requiring validation
         source_text (str): Original document text for cross-reference validation
-        openai_client (OpenAI): Configured OpenAI client instance with valid API key
+        llm_gateway (LLMGateway): Shared OpenAI gateway (rate limits and adaptive concurrency)
         
     Returns:
         List[Dict]: Corrected and validated information with cleaned names, verified affiliations,
@@ -230,16 +232,16 @@ def correct_info_with_llm(raw_extracted_data, source_text, openai_client):
                                - Location can be empty if not previously inferred
                             """
     #correction_prompt = f"Correct and clean the following extracted information:\n{extracted_data}\n\nBased on the original text:\n{text}\n\nEnsure the formatting is accurate and the information is complete, correct and gotten rid of weird characters, and verifiable with the source. Note that the locations provided are inferred from general knowledge so no need to verify that, only focus on the name and the university while some names have been constructed because they might have had weird characters.In your output when verifying if something is not mentioned in the text just leave it empty don't fill it with not mentioned in the text."
-    response = openai_client.chat.completions.create(
+    response = llm_gateway.parse(
         model="gpt-4o-2024-08-06",
         messages=[
             {"role": "system", "content": "You are a corrector. Correct and clean the extracted information based on the original text."},
             {"role": "user", "content": correction_prompt},
         ],
-        response_model=CorrectionResponse,
+        response_format=CorrectionResponse,
     )
-    parsed = response.parse()
-    return parsed.corrected_info
+    parsed = response.choices[0].message.parsed
+    return [item.model_dump() for item in parsed.corrected_info] if parsed else []
 
 # Streamlit App UI
 st.title("PDF Extractor - Names, Universities, and Locations")
@@ -253,6 +255,12 @@ if 'extraction_done' not in st.session_state:
 
 # Upload PDF
 uploaded_file = st.file_uploader("Upload a PDF file", type=["pdf"])
+merge_people = st.checkbox(
+    "Merge duplicate people",
+    value=False,
+    help="Collapse rows that name the same person (spelling variants, titles, accents) into one "
+         "and add a 'Duplicates' column."
+)
 
 if uploaded_file is not None and not st.session_state.extraction_done:
     with st.spinner("Processing the PDF..."):
@@ -263,28 +271,32 @@ if uploaded_file is not None and not st.session_state.extraction_done:
                 temp_pdf_file.write(pdf_bytes)
 
             page_texts = extract_text_from_pdf("temp.pdf")
-            openai_client = OpenAI(api_key=openai_api_key)
-
-            all_raw_extractions = []
-
-            # Use ThreadPoolExecutor for parallel processing
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                extraction_futures = [executor.submit(extract_info_with_llm, page_text, openai_client) for page_text in page_texts]
-                for future in extraction_futures:
-                    page_extracted_data = future.result()
+            # The gateway adapts concurrency to the account's rate limits
+            # instead of a fixed pool of 10 threads
+            llm_gateway = get_llm_gateway(openai_api_key)
+
+            def extract_page(numbered_page):
+                page_number, page_text = numbered_page
+                with usage_scope(row=f"page {page_number}"):
+                    return extract_info_with_llm(page_text, llm_gateway)
+
+            # Token usage is attributed to this document, and extraction calls to their page
+            with usage_scope(page="PDF Extractor", job=uploaded_file.name):
+                all_raw_extractions = []
+                for page_extracted_data in llm_gateway.map(extract_page, enumerate(page_texts, start=1)):
                     all_raw_extractions.extend(page_extracted_data)
 
-            # Use ThreadPoolExecutor for parallel processing of correction
-            final_corrected_data = []
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                correction_futures = [executor.submit(correct_info_with_llm, extraction_item, page_texts[0], openai_client) for extraction_item in all_raw_extractions]
-                for future in correction_futures:
-                    corrected_entries = future.result()
+                final_corrected_data = []
+                for corrected_entries in llm_gateway.map(
+                    lambda extraction_item: correct_info_with_llm(extraction_item, page_texts[0], llm_gateway),
+                    all_raw_extractions,
+                ):
                     final_corrected_data.extend(corrected_entries)
 
-            # Convert to DataFrame and remove duplicates
+            # Convert to DataFrame; merging duplicates (spelling variants included) is opt-in
             results_dataframe = pd.DataFrame(final_corrected_data)
-            results_dataframe.drop_duplicates(inplace=True)
+            if merge_people:
+                results_dataframe = collapse_duplicates(results_dataframe, source=uploaded_file.name)
 
             # Store DataFrame in session state
             st.session_state.extracted_dataframe = results_dataframe
@@ -310,26 +322,20 @@ if 'extracted_dataframe' in st.session_state and not st.session_state.extracted_
         st.write("### Filtered DataFrame")
         st.dataframe(location_filtered_dataframe)
 
-        # Download as Excel
-        filtered_excel_output = BytesIO()
-        location_filtered_dataframe.to_excel(filtered_excel_output, index=False, engine='openpyxl')
-        filtered_excel_output.seek(0)
-        st.download_button(
-            label="Download Filtered Data as Excel",
-            data=filtered_excel_output,
-            file_name="filtered_names_and_university_data.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        # Download as Excel (or CSV/Parquet)
+        render_download(
+            location_filtered_dataframe,
+            label="Download Filtered Data",
+            file_stem="filtered_names_and_university_data",
+            key="download-filtered",
         )
     else:
         st.warning("Please select at least one location to filter the data.")
 
-    # Download original DataFrame as Excel
-    original_excel_output = BytesIO()
-    st.session_state.extracted_dataframe.to_excel(original_excel_output, index=False, engine='openpyxl')
-    original_excel_output.seek(0)
-    st.download_button(
-        label="Download Original Data as Excel",
-        data=original_excel_output,
-        file_name="original_names_and_university_data.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    # Download original DataFrame (rebuilt only when the extraction changes)
+    render_download(
+        st.session_state.extracted_dataframe,
+        label="Download Original Data",
+        file_stem="original_names_and_university_data",
+        key="download-original",
     )
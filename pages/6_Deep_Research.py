@@ -40,11 +40,16 @@ import os
 import logging
 from typing import List, Dict, TypedDict, Literal, Annotated, Union
 from pydantic import BaseModel, Field, ValidationError
-from openai import OpenAI
-from ddgs import DDGS
 from openai import LengthFinishReasonError
 import operator
 
+from con_research.config.config_manager import get_performance_config
+from con_research.src.modules.search_cache import DDGS_RETRY_POLICY, get_search_cache
+from con_research.src.modules.resilience import call
+from con_research.src.modules.resources import get_ddgs
+from con_research.src.modules.llm_client import get_llm_gateway
+from con_research.src.modules.usage_accounting import Budget, BudgetExceededError, budget_scope, default_run_budget_usd, usage_scope
+
 # Set up logging configuration
 logging.basicConfig(
     level=logging.INFO,
@@ -53,13 +58,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 openai_api_key = st.secrets.get("openai_api_key")
-# Initialize OpenAI client if available
-client = OpenAI(api_key=openai_api_key) if openai_api_key else None
+# Shared gateway if available: rate limits, retries and usage accounting for every call
+llm_gateway = get_llm_gateway(openai_api_key) if openai_api_key else None
 model = "gpt-4o-mini"
 
-# Initialize DuckDuckGo search
-ddgs = DDGS()
-
 # --------------------------------------------------------------
 # Step 1: Define the data models
 # --------------------------------------------------------------
@@ -380,7 +382,7 @@ class ReportGenerator:
             number_of_queries=number_of_queries,
         )
         try:
-            completion = client.chat.completions.create(
+            completion = llm_gateway.chat_completion(
                 model=model,
                 messages=[{"role": "system", "content": system_instructions_query}],
                 response_format={"type": "json_object"},
@@ -411,7 +413,7 @@ class ReportGenerator:
             feedback=feedback,
         )
         try:
-            completion = client.chat.completions.create(
+            completion = llm_gateway.chat_completion(
                 model=model,
                 messages=[{"role": "system", "content": system_instructions_sections}],
                 response_format={"type": "json_object"},
@@ -439,7 +441,7 @@ class ReportGenerator:
             context=context,
         )
         try:
-            completion = client.chat.completions.create(
+            completion = llm_gateway.chat_completion(
                 model=model,
                 messages=[{"role": "system", "content": system_instructions}],
                 response_format={"type": "json_object"},
@@ -461,7 +463,7 @@ class ReportGenerator:
             section_topic=section_topic, section=section_content
         )
         try:
-            completion = client.chat.completions.create(
+            completion = llm_gateway.chat_completion(
                 model=model,
                 messages=[{"role": "system", "content": system_instructions}],
                 response_format={"type": "json_object"},
@@ -481,7 +483,7 @@ class ReportGenerator:
             section_topic=section_topic, context=context
         )
         try:
-            completion = client.chat.completions.create(
+            completion = llm_gateway.chat_completion(
                 model=model,
                 messages=[{"role": "system", "content": system_instructions}],
                 response_format={"type": "json_object"},
@@ -625,16 +627,31 @@ def web_search(query: str) -> List[Dict]:
         - No API key required
 
     Note:
-        Limited to 3 results per query for performance and API cost management.
-        Includes 2-second delay between requests to respect API rate limits.
+        Limited to ``performance.ddgs_max_results`` results per query (3 by default)
+        for performance and API cost management. Results are cached per normalised
+        query (search_cache.py); the ``performance.ddgs_request_interval`` delay
+        (2 seconds by default) that respects API rate limits only applies to live requests.
+        Live requests are retried with jitter and skipped outright while the shared
+        "ddgs" circuit breaker is open (resilience.py).
         Returns empty list on failure to ensure application continues functioning.
         Designed for academic research and report generation workflows.
     """
+    settings = get_performance_config()
     try:
-        search_results = list(ddgs.text(query, max_results=3))
+        def live_search() -> List[Dict]:
+            results = list(get_ddgs().text(query, max_results=settings.ddgs_max_results))
+            # Only live calls pay the rate-limit pause; cache hits return immediately
+            time.sleep(settings.ddgs_request_interval)
+            return results
+
+        search_results = get_search_cache().get_or_fetch(
+            "ddgs",
+            query,
+            lambda: call(live_search, policy=DDGS_RETRY_POLICY, breaker="ddgs"),
+            params={"max_results": settings.ddgs_max_results},
+        )
         if not search_results:
             raise ValueError("No search results returned")
-        time.sleep(2)
 
         # Convert DuckDuckGo format to expected format
         formatted_results = []
@@ -763,13 +780,20 @@ if start_button:
             # Initialize the report generator
             report_generator = ReportGenerator()
 
-            # Generate the report
-            result = report_generator.generate_report(
-                topic=query,
-                report_organization=DEFAULT_REPORT_STRUCTURE,
-                context="",
-                feedback=None,
-            )
+            # Generate the report; its token spend is attributed to this page and stopped at the run budget
+            report_budget = Budget(limit_usd=default_run_budget_usd(), name="deep research report")
+            try:
+                with usage_scope(page="Deep Research", job=query.strip()[:80]), budget_scope(report_budget):
+                    result = report_generator.generate_report(
+                        topic=query,
+                        report_organization=DEFAULT_REPORT_STRUCTURE,
+                        context="",
+                        feedback=None,
+                    )
+            except BudgetExceededError as e:
+                st.error(f"Research stopped before exceeding its spend limit: {e}")
+                st.stop()
+            st.caption(f"LLM spend for this report: ${report_budget.spent_usd:.4f} ({report_budget.tokens:,} tokens)")
 
             # Output the final report
             final_report = result["final_report"]
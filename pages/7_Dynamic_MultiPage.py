@@ -8,6 +8,9 @@ conference sites with multiple session pages and bulk presenter extraction.
 
 KEY FEATURES:
 - Autonomous multi-page navigation and session link discovery
+- Concurrent session fetching over a pooled session with per-host limits and retries
+- Breadth-first crawl of multi-level programmes (day → track → session) within a page budget
+- Incremental refresh: conditional GETs, re-parse of changed pages only, added/removed diff
 - Pattern-based session page identification and bulk extraction
 - Affiliation parsing with progress tracking for large sites
 - Excel export with session-organized data and error handling
@@ -19,13 +22,16 @@ REQUIREMENTS:
 TECHNICAL ARCHITECTURE:
 - Link Discovery: Scans index pages, pattern matching, URL validation
 - Extraction Pipeline: Parse index → collect links → extract per session → compile data
+- Fetching: ConcurrentFetcher (con_research.src.modules.crawler) parses pages as they arrive
+- Crawling: LinkCrawler with URL normalisation, robots.txt cache and Bloom filter visited set
 
 WORKFLOW:
 1. Input conference URL → 2. Scan for session links → 3. Validate URLs
 4. Process each session → 5. Extract names/affiliations → 6. Compile dataset → 7. Export
 
 EXTRACTION PATTERNS (Configurable):
-- Session links: "session_*.html", Presenter container: <div class="authors">
+- Session links: "session_*.html", Hub pages: "day/track/programme*.html"
+- Presenter container: <div class="authors">
 - Presenter element: <span class="presenter">, Affiliation: Following text
 
 USE CASES:
@@ -35,11 +41,18 @@ USE CASES:
 """
 
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
+import re
 import pandas as pd
-from urllib.parse import urljoin
-from io import BytesIO
+
+from con_research.config.config_manager import get_performance_config
+from con_research.src.modules.crawl_store import FingerprintStore, diff_records
+from con_research.src.modules.crawler import ConcurrentFetcher, LinkCrawler, normalize_url
+from con_research.src.modules.entity_resolution import collapse_duplicates
+from con_research.src.modules.exporting import render_download
+
+# Generic patterns: adjust as required for other conference sites
+DEFAULT_SESSION_PATTERN = r"session_[^/]*\.html$"
+DEFAULT_FOLLOW_PATTERN = r"(browse|day|track|programme|program|schedule)[^/]*\.html$"
 
 # Sidebar content
 st.sidebar.title(":streamlit: Conference & Campus Research Assistant")
@@ -50,24 +63,17 @@ affiliations, and other relevant information while handling dynamic content and
 cookie consents.
 """)
 
-def fetch_soup(url):
-    r = requests.get(url)
-    r.raise_for_status()
-    return BeautifulSoup(r.text, "html.parser")
-
-def get_all_session_links(browse_url):
-    soup = fetch_soup(browse_url)
-    session_links = set()
-    # Collect all links that look like session pages (adjust pattern as needed)
-    for a in soup.find_all("a", href=True):
-        href = a['href']
-        # Generic pattern: adjust 'session_' as required for other sites
-        if "session_" in href and href.endswith('.html'):
-            session_links.add(urljoin(browse_url, href))
-    return session_links
-
-def extract_presenters_from_session(session_url):
-    soup = fetch_soup(session_url)
+def parse_presenters(soup, session_url):
+    """
+    Extracts presenter names and affiliations from an already parsed session page.
+
+    Args:
+        soup (BeautifulSoup): Parsed session page
+        session_url (str): URL of the session page, recorded on every row
+
+    Returns:
+        List[Dict[str, str]]: Rows with 'Name', 'Affiliation' and 'Session Page' keys
+    """
     presenters = []
     # Assumes presenters are within <div class="authors">
     for author_div in soup.find_all("div", class_="authors"):
@@ -90,21 +96,118 @@ def extract_presenters_from_session(session_url):
             })
     return presenters
 
-def scrape_all_presenters(browse_url):
+def scrape_all_presenters(
+    browse_url,
+    session_pattern=DEFAULT_SESSION_PATTERN,
+    follow_pattern=DEFAULT_FOLLOW_PATTERN,
+    max_depth=1,
+    max_pages=500,
+    max_workers=None,
+    per_host_limit=None,
+    store=None,
+):
+    """
+    Crawls a conference programme breadth-first and collects presenters from every session page.
+
+    Pages are fetched concurrently over a pooled session; session pages are
+    parsed with parse_presenters in the worker threads as they arrive, and
+    hub pages matching ``follow_pattern`` (day, track, ...) are explored up to
+    ``max_depth`` links away from the browse page.
+
+    Args:
+        browse_url (str): Conference browse/directory page URL
+        session_pattern (str): Regex identifying session pages to extract presenters from
+        follow_pattern (str): Regex identifying intermediate pages whose links are followed
+        max_depth (int): Maximum link depth from the browse page (1 = direct session links only)
+        max_pages (int): Maximum number of pages fetched during the crawl
+        max_workers (int, optional): Maximum number of pages fetched at once
+            (defaults to ``performance.crawler_max_workers``)
+        per_host_limit (int, optional): Maximum concurrent requests to the conference host
+            (defaults to ``performance.crawler_per_host_limit``)
+        store (FingerprintStore, optional): Fingerprints from earlier crawls; when
+            given, unchanged pages are revalidated with conditional GETs and their
+            stored presenters reused instead of re-parsed
+
+    Returns:
+        Tuple[List[Dict[str, str]], Optional[CrawlStats]]: Presenter rows from all
+        session pages that succeeded, and the crawl's counters (None when the
+        crawl could not start)
+    """
+    performance = get_performance_config()
+    max_workers = max_workers or performance.crawler_max_workers
+    per_host_limit = per_host_limit or performance.crawler_per_host_limit
     all_presenters = []
-    try:
-        session_links = get_all_session_links(browse_url)
-    except Exception as e:
-        st.error(f"Failed to retrieve session links from the page: {e}")
-        return []
-    for i, session_url in enumerate(session_links, 1):
+    failed_sessions = []
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    with ConcurrentFetcher(max_workers=max_workers, per_host_limit=per_host_limit) as fetcher:
         try:
-            presenters = extract_presenters_from_session(session_url)
-            all_presenters.extend(presenters)
-            st.info(f"Scraped {i} / {len(session_links)} session pages…")
+            crawler = LinkCrawler(
+                fetcher,
+                target_patterns=session_pattern,
+                follow_patterns=follow_pattern,
+                max_depth=max_depth,
+                max_pages=max_pages,
+            )
+            for result in crawler.crawl(browse_url, parse_target=parse_presenters, store=store):
+                if result.ok:
+                    all_presenters.extend(result.data)
+                else:
+                    failed_sessions.append((result.url, result.error))
+                stats = crawler.stats
+                progress_bar.progress(min(stats.pages_fetched / max_pages, 1.0))
+                status_text.info(
+                    f"Scraped {stats.targets_parsed} session pages "
+                    f"({stats.pages_fetched} pages fetched, {stats.pages_unchanged} unchanged, "
+                    f"depth {stats.max_depth_reached})…"
+                )
+        except (ValueError, re.error) as e:
+            st.error(f"Invalid crawl settings: {e}")
+            return [], None
         except Exception as e:
-            st.warning(f"Could not scrape session: {session_url}. Error: {e}")
-    return all_presenters
+            st.error(f"Failed to retrieve session links from the page: {e}")
+            return [], None
+
+    progress_bar.progress(1.0)
+    if not crawler.stats.pages_fetched and crawler.stats.skipped_robots:
+        st.warning(f"robots.txt does not allow crawling {browse_url}.")
+    if crawler.stats.skipped_budget:
+        st.warning(
+            f"Page budget reached: {crawler.stats.skipped_budget} queued pages were not fetched. "
+            "Increase 'Max pages' for full coverage."
+        )
+    for session_url, error in failed_sessions:
+        st.warning(f"Could not scrape session: {session_url}. Error: {error}")
+
+    if store is not None:
+        # Only forget pages when the crawl saw the whole programme
+        if not crawler.stats.skipped_budget and not crawler.stats.errors:
+            store.prune(crawler.fetched_urls)
+        store.save()
+        if crawler.stats.pages_unchanged:
+            st.info(f"{crawler.stats.pages_unchanged} unchanged pages were reused from the previous crawl.")
+    return all_presenters, crawler.stats
+
+def display_presenter_diff(diff):
+    """
+    Renders presenters added and removed since the previous crawl.
+
+    Args:
+        diff (RecordDiff): Result of diff_records between two crawls
+    """
+    st.subheader("Changes since last crawl")
+    if not diff.has_changes:
+        st.info(f"No presenter changes ({diff.unchanged_count} presenters unchanged).")
+        return
+    col_added, col_removed = st.columns(2)
+    with col_added:
+        st.metric("Added presenters", len(diff.added))
+        if diff.added:
+            st.dataframe(pd.DataFrame(diff.added))
+    with col_removed:
+        st.metric("Removed presenters", len(diff.removed))
+        if diff.removed:
+            st.dataframe(pd.DataFrame(diff.removed))
 
 def main():
     st.title("Dynamic MultiPage Scraper")
@@ -116,25 +219,73 @@ def main():
     example = "https://coms.events/epsa2025/en/browse.html"
     browse_url = st.text_input("Enter the Browse/Directory URL:", value=example)
 
+    with st.expander("Crawl settings", expanded=False):
+        session_pattern = st.text_input(
+            "Session page pattern (regex)",
+            value=DEFAULT_SESSION_PATTERN,
+            help="URLs matching this pattern are parsed for presenters."
+        )
+        follow_pattern = st.text_input(
+            "Follow pattern (regex)",
+            value=DEFAULT_FOLLOW_PATTERN,
+            help="Intermediate pages (days, tracks, ...) whose links are explored."
+        )
+        max_depth = st.number_input(
+            "Max depth", min_value=1, max_value=6, value=1,
+            help="1 only follows links on the browse page; use 2-3 for day → track → session programmes."
+        )
+        max_pages = st.number_input("Max pages", min_value=1, max_value=20000, value=500)
+        incremental = st.checkbox(
+            "Incremental refresh",
+            value=True,
+            help="Re-validate previously crawled pages with conditional requests, "
+                 "re-parse only changed pages and show added/removed presenters."
+        )
+        merge_people = st.checkbox(
+            "Merge duplicate people",
+            value=False,
+            help="Keep one row per person (spelling variants included) instead of one per session; "
+                 "useful before enriching the list."
+        )
+
     if st.button("Scrape Presenters"):
+        store = None
+        previous_records = []
+        if incremental:
+            source_key = f"{normalize_url(browse_url) or browse_url}|{session_pattern}"
+            store = FingerprintStore.for_source(source_key)
+            previous_records = store.all_records()
         with st.spinner("Scraping in progress..."):
-            data = scrape_all_presenters(browse_url)
+            data, crawl_stats = scrape_all_presenters(
+                browse_url,
+                session_pattern=session_pattern,
+                follow_pattern=follow_pattern,
+                max_depth=int(max_depth),
+                max_pages=int(max_pages),
+                store=store,
+            )
             if not data:
+                st.session_state.pop("dynamic_presenters", None)
                 st.warning("No presenters found. Either the URL is incorrect, or the page structure is unsupported.")
                 return
             df = pd.DataFrame(data)
+            if merge_people:
+                df = collapse_duplicates(df, source=browse_url)
+            # Kept across reruns: clicking a download button reruns the script without this branch
+            st.session_state.dynamic_presenters = df
             st.success(f"Scraping complete. {len(df)} presenter records found.")
-            st.dataframe(df)
-            # Download button
-            output = BytesIO()
-            df.to_excel(output, index=False, engine='openpyxl')
-            output.seek(0)
-            st.download_button(
-                "Download as Excel",
-                output,
-                "conference_presenters.xlsx",
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+            if previous_records:
+                if crawl_stats.errors or crawl_stats.skipped_budget:
+                    # Presenters on pages that failed or were never fetched would show up as removed
+                    st.info("Changes since last crawl are not shown because some pages were not scraped.")
+                else:
+                    display_presenter_diff(diff_records(previous_records, data))
+
+    if "dynamic_presenters" in st.session_state:
+        df = st.session_state.dynamic_presenters
+        st.dataframe(df)
+        # Download buttons (cached per DataFrame version)
+        render_download(df, "Download Presenters", "conference_presenters", key="download-presenters")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
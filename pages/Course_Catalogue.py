@@ -42,7 +42,6 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.os_manager import ChromeType
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import re
@@ -52,7 +51,13 @@ from typing import List, Optional, Dict
 from openai import OpenAI
 import openai
 import requests
-from duckduckgo_search import DDGS
+
+from con_research.config.config_manager import get_performance_config
+from con_research.src.modules.readability import extract_main_content
+from con_research.src.modules.search_cache import ddgs_text_search
+from con_research.src.modules.usage_accounting import record_completion
+from con_research.src.modules.metrics import track_webdriver
+from con_research.src.modules.resources import get_driver_pool, get_http_session, get_openai_client
 
 
 
@@ -131,7 +136,8 @@ def get_chrome_driver():
     try:
         service = Service(ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install())
         driver = webdriver.Chrome(service=service, options=chrome_options)
-        return driver
+        # Live drivers are reported on the metrics endpoint
+        return track_webdriver(driver)
     except Exception as e:
         st.error(f"Failed to initialize Chrome driver: {str(e)}")
         return None
@@ -139,7 +145,9 @@ def get_chrome_driver():
 # Enhanced CourseScraper class with context manager
 class CourseScraper:
     def __init__(self):
-        self.driver = get_chrome_driver()
+        # Drivers are pooled per process; reruns reuse a warm browser instead of launching Chrome
+        self._pool = get_driver_pool("course_catalogue", get_chrome_driver)
+        self.driver = self._pool.checkout()
         if not self.driver:
             st.error("Failed to initialize the scraper")
             st.stop()
@@ -148,18 +156,19 @@ class CourseScraper:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.driver:
-            try:
-                self.driver.quit()
-            except Exception as e:
-                st.error(f"Error closing WebDriver: {str(e)}")
+        self.close()
 
     def __del__(self):
-        if self.driver:
+        self.close()
+
+    def close(self):
+        """Returns the driver to the pool (once)."""
+        driver, self.driver = getattr(self, "driver", None), None
+        if driver:
             try:
-                self.driver.quit()
-            except:
-                pass
+                self._pool.release(driver)
+            except Exception as e:
+                print(f"Error releasing WebDriver: {e}")
 
     def scrape_page(self, url: str, wait_time: int = 7) -> str:
         try:
@@ -172,18 +181,10 @@ class CourseScraper:
 
     def extract_text(self, content: str) -> str:
         """Enhanced text extraction with course content filtering."""
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Remove navigation, footer, and administrative content
-        for element in soup(['nav', 'footer', 'header', 'aside', 'script', 'style']):
-            element.decompose()
-        
-        # Remove common non-course elements by class names
-        for element in soup.find_all(attrs={'class': re.compile(r'navigation|menu|footer|sidebar|banner', re.I)}):
-            element.decompose()
-        
-        text = soup.get_text(separator='\n', strip=True)
-        return re.sub(r'\n\s*\n', '\n\n', text)
+        # Navigation, footer and administrative content is removed and only the
+        # main content block is kept; course indexes are mostly links, so
+        # link-heavy blocks inside the main content are retained
+        return extract_main_content(content, separator='\n', max_link_density=1.0)
 
 def validate_course_names(courses: List[CoursePreview]) -> List[CoursePreview]:
     """
@@ -267,7 +268,7 @@ def validate_url(url: str) -> bool:
         return False
     
     try:
-        response = requests.head(url, timeout=10, allow_redirects=True)
+        response = get_http_session().head(url, timeout=10, allow_redirects=True)
         if response.status_code >= 400:
             st.error(f"URL returned status code: {response.status_code}")
             return False
@@ -324,6 +325,7 @@ def extract_courses(text: str, openai_client: OpenAI) -> List[CoursePreview]:
             response_format=CourseCatalogueResponse,
             timeout=30
         )
+        record_completion(response, operation="course_catalogue.extract_courses", page="Course Catalogue")
         courses_data = response.choices[0].message.content
         courses_parsed = json.loads(courses_data)
         courses_list = courses_parsed.get("courses", [])
@@ -383,6 +385,7 @@ def extract_course_details(course_name: str, text: str, openai_client: OpenAI) -
             response_format=CourseDetailResponse,
             timeout=30
         )
+        record_completion(response, operation="course_catalogue.extract_details", page="Course Catalogue")
         course_detail_data = response.choices[0].message.content
         course_detail_data_parsed = json.loads(course_detail_data)
         course_details = course_detail_data_parsed.get("course_detail", {})
@@ -400,7 +403,8 @@ def extract_course_details(course_name: str, text: str, openai_client: OpenAI) -
 
 # Function to search DuckDuckGo
 def search_duckduckgo(query: str) -> str:
-    results = DDGS().text(query, max_results=5)
+    # Reruns and repeated descriptions are answered from the shared search cache
+    results = ddgs_text_search(query, max_results=get_performance_config().course_search_max_results)
     if results:
         return results[0]['href']  # Return the first URL found
     return ""
@@ -421,7 +425,7 @@ def main():
     if not openai_key:
         st.error("OpenAI API key is not configured. Please add 'openai_api_key' to Streamlit secrets.")
         return
-    openai_client = OpenAI(api_key=openai_key)
+    openai_client = get_openai_client(openai_key)
 
     # URL Input
     st.subheader("Enter Course Catalogue URL")
@@ -38,7 +38,6 @@ USE CASES:
 """
 
 import streamlit as st
-from duckduckgo_search import DDGS
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -48,14 +47,20 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.os_manager import ChromeType
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, WebDriverException
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
-import re
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from openai import OpenAI
 
+from con_research.config.config_manager import get_performance_config
+from con_research.src.modules.html_text import SCRIPT_STYLE_TAGS, html_to_text
+from con_research.src.modules.search_cache import ddgs_text_search
+from con_research.src.modules.exporting import render_download
+from con_research.src.modules.usage_accounting import record_completion
+from con_research.src.modules.metrics import track_webdriver
+from con_research.src.modules.resources import get_driver_pool, get_openai_client
+
 # Sidebar content
 st.sidebar.title(":streamlit: Conference & Campus Research Assistant")
 st.sidebar.write("""
@@ -156,7 +161,8 @@ def get_chrome_driver():
         chrome_service = Service(ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install())
         webdriver_instance = webdriver.Chrome(service=chrome_service, options=chrome_options)
         webdriver_instance.set_page_load_timeout(30)  # Set timeout to prevent hanging
-        return webdriver_instance
+        # Live drivers are reported on the metrics endpoint
+        return track_webdriver(webdriver_instance)
     except WebDriverException as e:
         st.error(f"WebDriver initialization failed: {str(e)}")
         return None
@@ -172,7 +178,7 @@ class WebDriverManager:
         self.driver = None
     
     def __enter__(self):
-        self.driver = get_chrome_driver()
+        self.driver = get_driver_pool("reading_list", get_chrome_driver).checkout()
         if not self.driver:
             raise RuntimeError("Failed to initialize WebDriver")
         return self.driver
@@ -180,7 +186,8 @@ class WebDriverManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.driver:
             try:
-                self.driver.quit()
+                # Reset and keep the browser for the next scrape instead of quitting it
+                get_driver_pool("reading_list", get_chrome_driver).release(self.driver)
             except Exception as e:
                 print(f"Error during WebDriver cleanup: {e}")
             finally:
@@ -192,7 +199,7 @@ class ReadingListScraper:
         self.driver = None
 
     def __enter__(self):
-        self.driver = get_chrome_driver()
+        self.driver = get_driver_pool("reading_list", get_chrome_driver).checkout()
         if not self.driver:
             raise RuntimeError("Failed to initialize the scraper")
         return self
@@ -200,7 +207,7 @@ class ReadingListScraper:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.driver:
             try:
-                self.driver.quit()
+                get_driver_pool("reading_list", get_chrome_driver).release(self.driver)
             except Exception as e:
                 print(f"Error during scraper cleanup: {e}")
             finally:
@@ -226,11 +233,7 @@ class ReadingListScraper:
 
     def extract_text(self, content: str) -> str:
         try:
-            soup = BeautifulSoup(content, 'html.parser')
-            for script in soup(['script', 'style']):
-                script.decompose()
-            text = soup.get_text(separator='\n', strip=True)
-            return re.sub(r'\n\s*\n', '\n\n', text)
+            return html_to_text(content, separator='\n', strip_tags=SCRIPT_STYLE_TAGS)
         except Exception as e:
             st.error(f"Error extracting text: {str(e)}")
             return ""
@@ -253,7 +256,7 @@ def get_reading_list(university: str, course: str):
         
     Workflow:
         1. Constructs targeted search query for university reading lists
-        2. Performs DuckDuckGo search for relevant academic pages
+        2. Performs DuckDuckGo search for relevant academic pages (cached per normalised query)
         3. Scrapes content from discovered reading list URLs
         4. Extracts and cleans text content for LLM processing
         
@@ -267,7 +270,7 @@ def get_reading_list(university: str, course: str):
         Results quality depends on university's web presence and reading list publication practices.
     """
     query = f"The following {course} offered in {university}  reading list  of books available for the university course offered OR site:.edu OR site:.ac.uk OR site:.org"
-    results = DDGS().text(query, max_results=5)
+    results = ddgs_text_search(query, max_results=get_performance_config().course_search_max_results)
 
     if results:
         reading_list = []
@@ -334,6 +337,7 @@ def process_text_with_llm(texts_urls: List[tuple], query: str, openai_client: Op
             ],
             response_model=ReadingListResponse,
         )
+        record_completion(response, operation="reading_list.extract", page="Course Reading List")
         parsed = response.parse()
         reading_list_items.extend(parsed.reading_list)
     return reading_list_items
@@ -379,6 +383,7 @@ def get_fallback_reading_list(course: str, openai_client: OpenAI) -> List[Readin
         ],
         response_model=ReadingListResponse,
     )
+    record_completion(response, operation="reading_list.fallback", page="Course Reading List")
     parsed = response.parse()
     return parsed.reading_list
 def main():
@@ -448,7 +453,7 @@ def main():
                 if not openai_key:
                     st.error("OpenAI API key is not configured. Please add 'openai_api_key' to Streamlit secrets.")
                     return
-                openai_client = OpenAI(api_key=openai_key)
+                openai_client = get_openai_client(openai_key)
                 texts_urls, query = get_reading_list(university, course)
                 if texts_urls:
                     reading_list_items = process_text_with_llm(texts_urls, query, openai_client)
@@ -486,13 +491,13 @@ def main():
     # Display the DataFrame if it exists in the session state
     if not st.session_state.reading_list_df.empty:
         st.dataframe(st.session_state.reading_list_df)
-        # Export the results as a CSV
-        csv = st.session_state.reading_list_df.to_csv(index=False)
-        st.download_button(
-            label="Export the Reading List as CSV",
-            data=csv,
-            file_name="reading_list.csv",
-            mime="text/csv",
+        # Export the results (CSV by default; cached until the list changes)
+        render_download(
+            st.session_state.reading_list_df,
+            label="Export the Reading List",
+            file_stem="reading_list",
+            formats=("csv", "xlsx", "parquet"),
+            key="download-reading-list",
         )
 
 if __name__ == "__main__":
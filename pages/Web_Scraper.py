@@ -11,6 +11,7 @@ KEY FEATURES:
 - AI-powered name/affiliation extraction using OpenAI models
 - Beautiful Soup HTML parsing with Pydantic validation
 - Excel export and intelligent wait strategies for dynamic content
+- Page fingerprints: unchanged pages reuse stored results, changes are shown as a diff
 
 REQUIREMENTS:
 - openai_api_key: OpenAI API key
@@ -47,15 +48,21 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.os_manager import ChromeType
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
-import re
 import json
 from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 from openai import OpenAI
-from io import BytesIO
+
+from con_research.src.modules.crawl_store import FingerprintStore, PageFingerprint, content_hash, diff_records
+from con_research.src.modules.crawler import normalize_url
+from con_research.src.modules.html_text import SCRIPT_STYLE_TAGS, html_to_text
+from con_research.src.modules.entity_resolution import collapse_duplicates
+from con_research.src.modules.exporting import render_download
+from con_research.src.modules.usage_accounting import record_completion
+from con_research.src.modules.metrics import track_webdriver
+from con_research.src.modules.resources import get_driver_pool, get_openai_client
 
 # Sidebar content
 st.sidebar.title(":streamlit: Conference & Campus Research Assistant")
@@ -101,7 +108,8 @@ def get_chrome_driver():
     try:
         service = Service(ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install())
         driver = webdriver.Chrome(service=service, options=chrome_options)
-        return driver
+        # Live drivers are reported on the metrics endpoint
+        return track_webdriver(driver)
     except Exception as e:
         st.error(f"Failed to initialize Chrome driver: {str(e)}")
         return None
@@ -118,18 +126,30 @@ class GenericConferenceScraper:
     """Generic scraper for conference websites with configurable patterns"""
 
     def __init__(self):
-        """Initialize the scraper with cached Selenium WebDriver"""
-        self.driver = get_chrome_driver()
+        """Initialize the scraper with a pooled Selenium WebDriver"""
+        self._pool = get_driver_pool("web_scraper", get_chrome_driver)
+        self.driver = self._pool.checkout()
         if not self.driver:
             st.error("Failed to initialize the scraper")
             st.stop()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def __del__(self):
-        """Clean up the WebDriver"""
-        if hasattr(self, 'driver') and self.driver:
+        """Return the WebDriver to the pool"""
+        self.close()
+
+    def close(self):
+        """Return the WebDriver to the pool for the next scrape (once)"""
+        driver, self.driver = getattr(self, "driver", None), None
+        if driver:
             try:
-                self.driver.quit()
-            except:
+                self._pool.release(driver)
+            except Exception:
                 pass
 
     def handle_cookie_consent(self):
@@ -217,17 +237,8 @@ class GenericConferenceScraper:
 
     def get_readable_text(self, content: str) -> str:
         """Extract readable text from HTML content"""
-        soup = BeautifulSoup(content, 'html.parser')
-
-        # Remove script and style elements
-        for script in soup(['script', 'style']):
-            script.decompose()
-
-        # Get text and clean it up
-        text = soup.get_text(separator='\n', strip=True)
-        # Remove multiple newlines
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        return text
+        # Script/style removal and blank-line collapsing happen in html_to_text
+        return html_to_text(content, separator='\n', strip_tags=SCRIPT_STYLE_TAGS)
 
 def extract_academic_info(text: str, openai_client: OpenAI) -> List[Dict[str, str]]:
     """Extract academic information from text using OpenAI LLM"""
@@ -239,6 +250,7 @@ def extract_academic_info(text: str, openai_client: OpenAI) -> List[Dict[str, st
         ],
         response_format=ParticipantList
     )
+    record_completion(response, operation="web_scraper.extract", page="Web Scraper")
 
     results = response.choices[0].message.content
     return results
@@ -261,6 +273,18 @@ def main():
     st.caption(
         "Increase the wait time if the target page loads slowly or relies on dynamic content."
     )
+    reuse_unchanged = st.checkbox(
+        "Reuse results when the page is unchanged",
+        value=True,
+        help="Fingerprints the page text; if it matches the previous scrape of this URL, "
+             "the stored results are shown without another AI extraction, and changes are "
+             "reported as added/removed academics."
+    )
+    merge_people = st.checkbox(
+        "Merge duplicate people",
+        value=False,
+        help="Collapse rows that name the same person (spelling variants, titles, accents) into one."
+    )
 
     if st.button("Extract Information"):
         if url:
@@ -268,7 +292,7 @@ def main():
                 with st.spinner("Initializing scraper..."):
                     scraper = GenericConferenceScraper()
 
-                with st.spinner("Scraping webpage..."):
+                with scraper, st.spinner("Scraping webpage..."):
                     content = scraper.scrape_webpage(url, wait_time)
 
                 if content:
@@ -279,31 +303,50 @@ def main():
                         with st.expander("Click to view raw text", expanded=False):
                             st.text_area("", readable_text, height=300)
 
-                    with st.spinner("Extracting information..."):
-                        openai_client = OpenAI(api_key=st.secrets["openai_api_key"])
-                        academics = extract_academic_info(readable_text, openai_client)
+                    store = FingerprintStore.for_source("web_scraper", namespace="web_scraper")
+                    page_key = normalize_url(url) or url
+                    page_hash = content_hash(readable_text)
+                    previous = store.get(page_key)
 
-                    if academics:
-                        # Parse the JSON response
-                        academics_dict = json.loads(academics)
-                        academics_list = academics_dict.get("participant_details", [])
+                    academics_list = None
+                    if reuse_unchanged and previous is not None and previous.content_hash == page_hash:
+                        st.info("Page content is unchanged since the last scrape; reusing stored results.")
+                        academics_list = previous.records
+                    else:
+                        with st.spinner("Extracting information..."):
+                            openai_client = get_openai_client(st.secrets["openai_api_key"])
+                            academics = extract_academic_info(readable_text, openai_client)
+                        if academics:
+                            # Parse the JSON response
+                            academics_dict = json.loads(academics)
+                            academics_list = academics_dict.get("participant_details", []) or []
+                            store.put(PageFingerprint(
+                                url=page_key,
+                                content_hash=page_hash,
+                                fetched_at=time.time(),
+                                records=academics_list,
+                            ))
+                            store.save()
+
+                    if academics_list is not None:
                         df = pd.DataFrame(academics_list)
-
-                        st.subheader("Results")
-                        st.dataframe(df)
-
-                        # Save as Excel
-                        output = BytesIO()
-                        df.to_excel(output, index=False, engine='openpyxl')
-                        output.seek(0)
-                        st.download_button(
-                            "Download Results as Excel",
-                            output,
-                            "conference_academics.xlsx",
-                            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            key='download-excel'
-                        )
+                        if previous is not None and previous.content_hash != page_hash:
+                            diff = diff_records(previous.records, academics_list, key_fields=("name", "affiliation"))
+                            st.subheader("Changes since last scrape")
+                            col_added, col_removed = st.columns(2)
+                            col_added.metric("Added", len(diff.added))
+                            col_removed.metric("Removed", len(diff.removed))
+                            if diff.added:
+                                col_added.dataframe(pd.DataFrame(diff.added))
+                            if diff.removed:
+                                col_removed.dataframe(pd.DataFrame(diff.removed))
+
+                        if merge_people and not df.empty:
+                            df = collapse_duplicates(df, source=url)
+                        # Kept across reruns: clicking a download button reruns the script without this branch
+                        st.session_state.web_scraper_results = df
                     else:
+                        st.session_state.pop("web_scraper_results", None)
                         st.warning("No academic information found. Try adjusting the wait time.")
                 else:
                     st.error("Failed to retrieve content from the URL.")
@@ -313,5 +356,11 @@ def main():
         else:
             st.warning("Please enter a URL.")
 
+    if "web_scraper_results" in st.session_state:
+        st.subheader("Results")
+        st.dataframe(st.session_state.web_scraper_results)
+        # Save as Excel (or CSV/Parquet); cached per DataFrame version
+        render_download(st.session_state.web_scraper_results, "Download Results", "conference_academics", key='download-excel')
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -192,6 +192,73 @@ def docs():
         except Exception as e:
             print(f"❌ {md_file}: {e}")
 
+def _parse_importtime(stderr):
+    """Parse `python -X importtime` output into (self_us, cumulative_us, module) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), module.strip()))
+    return rows
+
+def importtime():
+    """Measure cold import time of the shared modules (python -X importtime)."""
+    print("⏱️  Measuring import time (python -X importtime)...")
+    project_root = Path(__file__).resolve().parent.parent
+    targets = sys.argv[2:] or sorted(
+        f"con_research.src.modules.{path.stem}"
+        for path in (project_root / "con_research" / "src" / "modules").glob("*.py")
+        if path.stem != "__init__"
+    )
+    env = {**os.environ, "PYTHONPATH": str(project_root)}
+    # Modules the interpreter loads before running any code (site, encodings, .pth hooks)
+    baseline = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True, cwd=project_root, env=env
+    )
+    startup_modules = {module for _, _, module in _parse_importtime(baseline.stderr)}
+    
+    results = []
+    for target in targets:
+        # A fresh interpreter per module, so nothing is already imported
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+            capture_output=True, text=True, cwd=project_root, env=env,
+        )
+        if result.returncode != 0:
+            error_lines = result.stderr.strip().splitlines()
+            print(f"❌ {target}: {error_lines[-1] if error_lines else 'import failed'}")
+            continue
+        rows = _parse_importtime(result.stderr)
+        total_us = next((cumulative for _, cumulative, module in rows if module == target), 0)
+        heaviest = sorted(
+            ((cumulative, module) for _, cumulative, module in rows
+             if module != target and module not in startup_modules
+             and module.split(".")[0] != "con_research" and "." not in module),
+            reverse=True,
+        )[:3]
+        results.append((total_us, target, heaviest))
+    
+    print()
+    print(f"{'module':<45} {'import (ms)':>11}  heaviest third-party imports")
+    print("-" * 100)
+    for total_us, target, heaviest in sorted(results, reverse=True):
+        heavy = ", ".join(f"{module} {cumulative / 1000:.0f}ms" for cumulative, module in heaviest)
+        print(f"{target:<45} {total_us / 1000:>11.1f}  {heavy}")
+    print("\n💡 Pass module names to measure others, e.g. python scripts/make.py importtime streamlit")
+
+def bench():
+    """Run the offline pipeline benchmarks against local stub services."""
+    print("🏎️  Running pipeline benchmarks (stub OpenAI/Serper, recorded fixtures)...")
+    project_root = Path(__file__).resolve().parent.parent
+    # Arguments after "bench" go to the benchmark, e.g. --rows 100 --baseline FILE
+    result = subprocess.run(
+        [sys.executable, str(project_root / "benchmarks" / "bench_pipelines.py"), *sys.argv[2:]], cwd=project_root
+    )
+    if result.returncode != 0:
+        print(f"❌ Benchmarks failed or regressed (exit code {result.returncode})")
+        sys.exit(result.returncode)
+
 def help_cmd():
     """Show available commands."""
     commands = {
@@ -209,6 +276,8 @@ def help_cmd():
         "validate-env": "Validate development environment setup",
         "deps-update": "Update dependencies to latest versions",
         "docs": "Build/validate documentation",
+        "importtime": "Measure cold import time of the shared modules",
+        "bench": "Run offline pipeline benchmarks (rows/sec, p95, peak RSS)",
         "help": "Show this help message"
     }
     
@@ -249,6 +318,8 @@ def main():
         "validate_env": validate_env,
         "deps_update": deps_update,
         "docs": docs,
+        "importtime": importtime,
+        "bench": bench,
         "help": help_cmd
     }
     
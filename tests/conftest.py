@@ -0,0 +1,30 @@
+"""
+Shared test configuration.
+
+Puts the repository root on ``sys.path`` and points the application's cache
+and configuration at test-safe values before any module is imported.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("CONFERENCE_RESEARCH_TESTING", "true")
+os.environ.setdefault("CONFERENCE_RESEARCH_CONFIG_WATCH_INTERVAL", "0")
+os.environ.setdefault("CONFERENCE_RESEARCH_CACHE_DIR", tempfile.mkdtemp(prefix="conference-research-tests-"))
+os.environ.pop("CONFERENCE_RESEARCH_METRICS_PORT", None)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Isolated cache root for tests that persist data."""
+    monkeypatch.setenv("CONFERENCE_RESEARCH_CACHE_DIR", str(tmp_path))
+    return tmp_path
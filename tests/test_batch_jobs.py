@@ -0,0 +1,135 @@
+"""Tests for offline Batch API runs (con_research.src.modules.batch_jobs)."""
+
+import json
+
+import pytest
+
+from con_research.src.modules.batch_jobs import (
+    BatchError,
+    BatchRequest,
+    BatchRunner,
+    BatchTransport,
+    LocalBatchTransport,
+    parse_batch_output,
+    write_batch_file,
+)
+
+
+def chat_request(row_id, content="Write a bio"):
+    return BatchRequest(custom_id=row_id, body={"model": "gpt-4o-mini", "messages": [{"role": "user", "content": content}]})
+
+
+def bio_responder(body):
+    content = body["messages"][-1]["content"]
+    if "fail" in content:
+        raise RuntimeError("model refused")
+    return f"Bio: {content}"
+
+
+@pytest.mark.unit
+class TestBatchFiles:
+
+    def test_jsonl_lines_match_batch_api_format(self, tmp_path):
+        path = tmp_path / "input.jsonl"
+        assert write_batch_file([chat_request("row-1"), chat_request("row-2", "Zoë Müller")], path) == 2
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert lines[0] == {
+            "custom_id": "row-1",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Write a bio"}]},
+        }
+        assert lines[1]["body"]["messages"][0]["content"] == "Zoë Müller"
+
+    def test_duplicate_custom_id_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_batch_file([chat_request("row-1"), chat_request("row-1")], tmp_path / "input.jsonl")
+
+    def test_parse_error_and_expired_lines(self):
+        output = "\n".join([
+            json.dumps({"custom_id": "ok", "error": None, "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": "Bio text"}}],
+                "usage": {"prompt_tokens": 12, "completion_tokens": 30, "total_tokens": 42},
+            }}}),
+            json.dumps({"custom_id": "rate-limited", "error": None, "response": {"status_code": 429, "body": {
+                "error": {"message": "Rate limit reached"},
+            }}}),
+            json.dumps({"custom_id": "expired", "response": None, "error": {
+                "code": "batch_expired",
+                "message": "This request could not be executed before the completion window expired.",
+            }}),
+            "",
+        ])
+        results = parse_batch_output(output)
+        assert results["ok"].ok and results["ok"].content == "Bio text"
+        assert results["ok"].usage["total_tokens"] == 42
+        assert not results["rate-limited"].ok and results["rate-limited"].error == "Rate limit reached"
+        assert not results["expired"].ok and "completion window expired" in results["expired"].error
+
+
+@pytest.mark.unit
+class TestBatchRunner:
+
+    def test_transport_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            BatchTransport()
+
+    def test_submit_shards_above_request_limit(self, tmp_path):
+        transport = LocalBatchTransport(responder=bio_responder)
+        runner = BatchRunner(transport, work_dir=tmp_path, max_requests_per_batch=2)
+        job = runner.submit([chat_request(f"row-{i}") for i in range(5)], metadata={"source": "attendees.csv"})
+        assert len(job.batch_ids) == 3
+        assert job.total_requests == 5
+        assert len(list(tmp_path.glob(f"{job.job_id}-*.jsonl"))) == 3
+        # Job record survives a rerun
+        assert runner.load_job(job.job_id).batch_ids == job.batch_ids
+
+    def test_submit_shards_above_byte_limit(self, tmp_path):
+        runner = BatchRunner(LocalBatchTransport(), work_dir=tmp_path, max_file_bytes=300)
+        job = runner.submit([chat_request(f"row-{i}", "x" * 100) for i in range(3)])
+        assert len(job.batch_ids) == 3
+
+    def test_poll_does_not_block(self, tmp_path):
+        runner = BatchRunner(LocalBatchTransport(polls_to_complete=3), work_dir=tmp_path)
+        job = runner.submit([chat_request("row-1")])
+        batches = runner.poll(job)
+        assert not job.done
+        assert set(job.statuses.values()) == {"in_progress"}
+        with pytest.raises(BatchError):
+            runner.results(job, batches)
+        runner.poll(job)
+        runner.poll(job)
+        assert job.done and runner.load_job(job.job_id).statuses == job.statuses
+
+    def test_results_keyed_by_row_id_across_shards(self, tmp_path):
+        runner = BatchRunner(LocalBatchTransport(responder=bio_responder), work_dir=tmp_path, max_requests_per_batch=2)
+        job = runner.submit([chat_request("row-1", "Jane Doe"), chat_request("row-2", "fail"), chat_request("row-3", "John Roe")])
+        results = runner.wait(job, poll_interval=0, timeout=5)
+        assert set(results) == {"row-1", "row-2", "row-3"}
+        assert results["row-1"].content == "Bio: Jane Doe"
+        assert results["row-3"].content == "Bio: John Roe"
+        # Responder errors land in the error file
+        assert not results["row-2"].ok and results["row-2"].error == "model refused"
+        assert runner.progress(runner.poll(job)) == {"total": 3, "completed": 2, "failed": 1}
+
+    def test_wait_times_out(self, tmp_path):
+        runner = BatchRunner(LocalBatchTransport(polls_to_complete=100), work_dir=tmp_path)
+        job = runner.submit([chat_request("row-1")])
+        with pytest.raises(TimeoutError):
+            runner.wait(job, poll_interval=0, timeout=0)
+
+    def test_cancelled_batch_has_no_results(self, tmp_path):
+        transport = LocalBatchTransport(polls_to_complete=5)
+        runner = BatchRunner(transport, work_dir=tmp_path)
+        job = runner.submit([chat_request("row-1")])
+        transport.cancel_batch(job.batch_ids[0])
+        runner.poll(job)
+        assert job.done
+        assert runner.results(job) == {}
+
+    def test_submit_rejects_empty_and_duplicate_requests(self, tmp_path):
+        runner = BatchRunner(LocalBatchTransport(), work_dir=tmp_path)
+        with pytest.raises(ValueError):
+            runner.submit([])
+        with pytest.raises(ValueError):
+            runner.submit([chat_request("row-1"), chat_request("row-1")])
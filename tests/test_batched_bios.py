@@ -0,0 +1,70 @@
+"""Tests for batched bio generation (con_research.src.modules.batched_bios)."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from con_research.src.modules.batched_bios import BatchedBioResponse, PersonBio, PersonRecord, generate_bios_batched
+from con_research.src.modules.usage_accounting import Budget, BudgetExceededError
+
+
+class FakeGateway:
+    """Gateway stand-in: answers every group, optionally dropping IDs or refusing calls."""
+
+    def __init__(self, drop=(), refuse_after=None):
+        self.drop = set(drop)
+        self.refuse_after = refuse_after
+        self.calls = 0
+
+    def parse(self, messages, **kwargs):
+        self.calls += 1
+        if self.refuse_after is not None and self.calls > self.refuse_after:
+            raise BudgetExceededError(Budget(limit_usd=0.01, name="test"), 0.02, "$0.01")
+        people = json.loads(messages[1]["content"])
+        bios = [PersonBio(row_id=p["row_id"], bio=f"Bio of {p['name']}") for p in people if p["row_id"] not in self.drop]
+        # Answer dropped IDs only once they are retried alone
+        if len(people) == 1:
+            self.drop.discard(people[0]["row_id"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=BatchedBioResponse(bios=bios)))])
+
+    def map(self, func, items, return_exceptions=False):
+        results = []
+        for item in items:
+            try:
+                results.append(func(item))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+
+def records(count):
+    return [PersonRecord(row_id=str(i), name=f"Person {i}", university="LSE") for i in range(count)]
+
+
+@pytest.mark.unit
+class TestGenerateBiosBatched:
+
+    def test_all_rows_in_few_requests(self):
+        result = generate_bios_batched(FakeGateway(), records(10), batch_size=4)
+        assert sorted(result.bios, key=int) == [str(i) for i in range(10)]
+        assert result.requests == 3
+        assert result.missing == {}
+
+    def test_omitted_rows_are_retried_in_smaller_groups(self):
+        result = generate_bios_batched(FakeGateway(drop={"3"}), records(4), batch_size=4, max_rounds=3)
+        assert result.bios["3"].bio == "Bio of Person 3"
+        assert result.requests > 1
+
+    def test_budget_refusal_stops_the_run(self):
+        gateway = FakeGateway(refuse_after=1)
+        with pytest.raises(BudgetExceededError):
+            generate_bios_batched(gateway, records(8), batch_size=2, max_rounds=3)
+        # One round only: refused groups are not retried
+        assert gateway.calls == 4
+
+    def test_duplicate_row_ids_raise(self):
+        with pytest.raises(ValueError):
+            generate_bios_batched(FakeGateway(), records(2) + records(1))
@@ -0,0 +1,215 @@
+"""Tests for configuration loading, hot reload and performance settings (con_research.config.config_manager)."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+from pydantic import ValidationError
+
+from con_research.config.config_manager import ConfigManager, PerformanceConfig
+
+REPO_CONFIG_DIR = Path(__file__).resolve().parents[1] / "config"
+
+
+def write_yaml(path, data):
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    write_yaml(tmp_path / "base.yaml", {
+        "retry": {"max_attempts": 3},
+        "performance": {"llm_rpm": 500, "llm_initial_concurrency": 4, "llm_max_concurrency": 32},
+    })
+    write_yaml(tmp_path / "testing.yaml", {"performance": {"llm_max_concurrency": 8}})
+    return tmp_path
+
+
+@pytest.fixture
+def manager(config_dir):
+    manager = ConfigManager(environment="testing", config_dir=config_dir)
+    manager.load_config()
+    yield manager
+    manager.stop_watching()
+
+
+def edit_performance(config_dir, **values):
+    write_yaml(config_dir / "testing.yaml", {"performance": values})
+
+
+@pytest.mark.unit
+class TestLookups:
+
+    def test_environment_file_overrides_base(self, manager):
+        assert manager.get("performance.llm_max_concurrency") == 8
+        assert manager.get("performance.llm_rpm") == 500
+        assert manager.get("retry.max_attempts") == 3
+
+    def test_sections_and_missing_keys(self, manager):
+        assert manager.get("performance") is manager.load_config().performance
+        assert manager.get("performance.no_such_setting", "fallback") == "fallback"
+
+
+@pytest.mark.unit
+class TestReload:
+
+    def test_reload_swaps_config_and_reports_changes(self, manager, config_dir):
+        before = manager.load_config()
+        edit_performance(config_dir, llm_max_concurrency=16, llm_rpm=900)
+        assert manager.reload(force=True)
+        after = manager.load_config()
+        assert after is not before
+        # The old snapshot is never mutated in place
+        assert before.performance.llm_max_concurrency == 8
+        assert after.performance.llm_max_concurrency == 16
+        assert manager.get("performance.llm_rpm") == 900
+
+    def test_unchanged_files_are_not_reloaded(self, manager):
+        assert not manager.reload()
+        assert not manager.reload(force=True)
+
+    def test_subscribers_get_only_their_keys(self, manager, config_dir):
+        everything, performance, retry = [], [], []
+        manager.subscribe(lambda config, changed: everything.append(changed))
+        manager.subscribe(lambda config, changed: performance.append(changed), keys=["performance.llm_rpm"])
+        manager.subscribe(lambda config, changed: retry.append(changed), keys=["retry"])
+
+        edit_performance(config_dir, llm_max_concurrency=16, llm_rpm=900)
+        manager.reload(force=True)
+        assert everything == [{
+            "performance.llm_max_concurrency": (8, 16),
+            "performance.llm_rpm": (500, 900),
+        }]
+        assert performance == [{"performance.llm_rpm": (500, 900)}]
+        assert retry == []
+
+    def test_subscribing_twice_and_unsubscribing(self, manager, config_dir):
+        calls = []
+
+        def callback(config, changed):
+            calls.append(changed)
+
+        unsubscribe = manager.subscribe(callback, keys=["performance"])
+        manager.subscribe(callback, keys=["performance"])
+        edit_performance(config_dir, llm_max_concurrency=16)
+        manager.reload(force=True)
+        assert len(calls) == 1
+        unsubscribe()
+        edit_performance(config_dir, llm_max_concurrency=12)
+        manager.reload(force=True)
+        assert len(calls) == 1
+
+    def test_failing_subscriber_does_not_block_others(self, manager, config_dir):
+        calls = []
+
+        def broken(config, changed):
+            raise RuntimeError("subscriber bug")
+
+        manager.subscribe(broken)
+        manager.subscribe(lambda config, changed: calls.append(changed))
+        edit_performance(config_dir, llm_max_concurrency=16)
+        assert manager.reload(force=True)
+        assert len(calls) == 1
+
+    def test_invalid_value_is_rejected(self, manager, config_dir):
+        notified = []
+        manager.subscribe(lambda config, changed: notified.append(changed))
+        before = manager.load_config()
+        # Fails the cross-field check: max below the initial concurrency
+        edit_performance(config_dir, llm_initial_concurrency=16, llm_max_concurrency=8)
+        assert not manager.reload(force=True)
+        assert manager.load_config() is before
+        assert notified == []
+
+    def test_broken_yaml_is_rejected_and_not_retried(self, manager, config_dir):
+        before = manager.load_config()
+        (config_dir / "testing.yaml").write_text("performance: [unclosed", encoding="utf-8")
+        assert not manager.reload()
+        assert manager.load_config() is before
+        # The same broken files are not re-read on the next check
+        assert not manager.reload()
+        edit_performance(config_dir, llm_max_concurrency=12)
+        assert manager.reload()
+        assert manager.get("performance.llm_max_concurrency") == 12
+
+    def test_readers_see_whole_snapshots_during_reloads(self, manager, config_dir):
+        edit_performance(config_dir, llm_initial_concurrency=8, llm_max_concurrency=8)
+        manager.reload(force=True)
+        mixed = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                performance = manager.load_config().performance
+                if performance.llm_initial_concurrency != performance.llm_max_concurrency:
+                    mixed.append(performance)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for value in (2, 16, 4, 32, 8) * 4:
+            edit_performance(config_dir, llm_initial_concurrency=value, llm_max_concurrency=value)
+            manager.reload(force=True)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        assert mixed == []
+
+    def test_watcher_applies_edits(self, manager, config_dir):
+        changes = []
+        manager.subscribe(lambda config, changed: changes.append(changed))
+        assert manager.start_watching(interval=0.01)
+        assert not manager.start_watching(interval=0.01)
+        edit_performance(config_dir, llm_max_concurrency=24)
+        deadline = time.monotonic() + 5
+        while not changes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        manager.stop_watching()
+        assert changes == [{"performance.llm_max_concurrency": (8, 24)}]
+        assert manager.get("performance.llm_max_concurrency") == 24
+
+
+@pytest.mark.unit
+class TestPerformanceConfig:
+
+    @pytest.mark.parametrize("environment, overridden, expected", [
+        ("development", "llm_max_concurrency", 8),
+        ("development", "biogen_chunk_size", 5),
+        ("production", "llm_max_concurrency", 64),
+        ("production", "driver_idle_timeout", 900.0),
+        ("testing", "driver_pool_size", 0),
+        ("testing", "ddgs_request_interval", 0.0),
+    ])
+    def test_environment_overrides(self, environment, overridden, expected):
+        performance = ConfigManager(environment=environment, config_dir=REPO_CONFIG_DIR).load_config().performance
+        assert getattr(performance, overridden) == expected
+
+    @pytest.mark.parametrize("environment", ["development", "production", "testing"])
+    def test_base_values_kept_where_not_overridden(self, environment):
+        performance = ConfigManager(environment=environment, config_dir=REPO_CONFIG_DIR).load_config().performance
+        assert performance.llm_rpm == 500
+        assert performance.rag_chunk_size == 1000
+
+    @pytest.mark.parametrize("environment", ["development", "production", "testing"])
+    def test_shipped_files_validate(self, environment):
+        # load_config falls back to defaults silently; the strict build must not raise
+        manager = ConfigManager(environment=environment, config_dir=REPO_CONFIG_DIR)
+        assert manager._build_config(strict=True).environment.value == environment
+
+    @pytest.mark.parametrize("values", [
+        {"llm_initial_concurrency": 16, "llm_max_concurrency": 8},
+        {"rag_chunk_size": 500, "rag_chunk_overlap": 500},
+        {"llm_rpm": 0},
+        {"bio_batch_size": 21},
+        {"ddgs_request_interval": -1.0},
+    ])
+    def test_invalid_settings_raise(self, values):
+        with pytest.raises(ValidationError):
+            PerformanceConfig(**values)
+
+    def test_environment_variable_override(self, monkeypatch):
+        pytest.importorskip("pydantic_settings")
+        monkeypatch.setenv("CONFERENCE_RESEARCH_PERF_SERPER_MAX_CONCURRENCY", "3")
+        assert PerformanceConfig().serper_max_concurrency == 3
@@ -0,0 +1,116 @@
+"""Tests for crawl fingerprints and record diffs (con_research.src.modules.crawl_store)."""
+
+import json
+
+import pytest
+
+from con_research.src.modules.crawl_store import (
+    STORE_VERSION,
+    FingerprintStore,
+    PageFingerprint,
+    content_hash,
+    diff_records,
+)
+
+SESSION_URL = "https://conference.example/session_12.html"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FingerprintStore(tmp_path / "crawl.json")
+
+
+@pytest.mark.unit
+class TestFingerprintStore:
+
+    def test_conditional_headers(self, store):
+        assert store.conditional_headers(SESSION_URL) == {}
+        store.put(PageFingerprint(url=SESSION_URL, etag='"abc"', last_modified="Wed, 01 May 2024 10:00:00 GMT"))
+        assert store.conditional_headers(SESSION_URL) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 May 2024 10:00:00 GMT",
+        }
+        store.put(PageFingerprint(url=SESSION_URL, etag='"def"'))
+        assert store.conditional_headers(SESSION_URL) == {"If-None-Match": '"def"'}
+
+    def test_save_and_load_round_trip(self, store):
+        fingerprint = PageFingerprint(
+            url=SESSION_URL,
+            etag='"abc"',
+            content_hash=content_hash("<p>Jane Doe</p>"),
+            fetched_at=1714557600.0,
+            records=[{"Name": "Jane Doe", "Affiliation": "LSE", "Session Page": SESSION_URL}],
+            links=["https://conference.example/session_13.html"],
+        )
+        store.put(fingerprint)
+        store.save()
+
+        reloaded = FingerprintStore(store.path)
+        assert len(reloaded) == 1
+        assert reloaded.get(SESSION_URL) == fingerprint
+        assert reloaded.all_records() == fingerprint.records
+
+    def test_version_mismatch_starts_empty(self, tmp_path):
+        path = tmp_path / "crawl.json"
+        path.write_text(json.dumps({"version": STORE_VERSION + 1, "pages": {SESSION_URL: {"url": SESSION_URL}}}))
+        assert len(FingerprintStore(path)) == 0
+
+    def test_entries_with_unknown_fields_are_skipped(self, tmp_path):
+        path = tmp_path / "crawl.json"
+        path.write_text(json.dumps({"version": STORE_VERSION, "pages": {
+            SESSION_URL: {"url": SESSION_URL, "etag": '"abc"'},
+            "https://conference.example/old.html": {"url": "https://conference.example/old.html", "status": 200},
+        }}))
+        store = FingerprintStore(path)
+        assert len(store) == 1 and store.get(SESSION_URL).etag == '"abc"'
+
+    def test_prune_keeps_only_seen_pages(self, store):
+        for name in ("session_1", "session_2", "session_3"):
+            store.put(PageFingerprint(url=f"https://conference.example/{name}.html", records=[{"Name": name}]))
+        removed = store.prune(["https://conference.example/session_2.html"])
+        assert removed == 2
+        assert store.all_records() == [{"Name": "session_2"}]
+
+    def test_touch_updates_fetch_time_only(self, store):
+        store.put(PageFingerprint(url=SESSION_URL, fetched_at=0.0, records=[{"Name": "Jane Doe"}]))
+        store.touch(SESSION_URL)
+        store.touch("https://conference.example/unknown.html")
+        assert store.get(SESSION_URL).fetched_at > 0
+        assert len(store) == 1
+
+    def test_content_hash_ignores_whitespace(self):
+        assert content_hash("<p>Jane  Doe</p>\n") == content_hash(" <p>Jane Doe</p>")
+        assert content_hash("<p>Jane Doe</p>") != content_hash("<p>John Roe</p>")
+
+
+@pytest.mark.unit
+class TestDiffRecords:
+
+    def test_keys_ignore_case_and_whitespace(self):
+        previous = [{"Name": "Jane Doe", "Affiliation": "University of Oxford"}]
+        current = [{"Name": "  jane   DOE ", "Affiliation": "university of oxford\n"}]
+        diff = diff_records(previous, current)
+        assert not diff.has_changes
+        assert diff.unchanged_count == 1
+
+    def test_session_page_is_not_part_of_the_key(self):
+        previous = [{"Name": "Jane Doe", "Affiliation": "LSE", "Session Page": "session_1.html"}]
+        current = [{"Name": "Jane Doe", "Affiliation": "LSE", "Session Page": "session_2.html"}]
+        assert not diff_records(previous, current).has_changes
+
+    def test_added_and_removed(self):
+        previous = [{"Name": "Jane Doe", "Affiliation": "LSE"}, {"Name": "John Roe", "Affiliation": "UCL"}]
+        current = [
+            {"Name": "Jane Doe", "Affiliation": "LSE"},
+            {"Name": "Ann Lee", "Affiliation": "KCL"},
+            {"Name": "ann lee", "Affiliation": "KCL"},
+        ]
+        diff = diff_records(previous, current)
+        # Duplicates within one crawl count once
+        assert diff.added == [{"Name": "Ann Lee", "Affiliation": "KCL"}]
+        assert diff.removed == [{"Name": "John Roe", "Affiliation": "UCL"}]
+        assert diff.unchanged_count == 1
+
+    def test_same_name_different_affiliation_is_a_change(self):
+        diff = diff_records([{"Name": "Wei Zhang", "Affiliation": "Tsinghua"}], [{"Name": "Wei Zhang", "Affiliation": "Peking"}])
+        assert len(diff.added) == 1 and len(diff.removed) == 1
@@ -0,0 +1,155 @@
+"""Tests for URL normalisation, the Bloom filter and LinkCrawler (con_research.src.modules.crawler)."""
+
+import pytest
+import requests
+
+from con_research.src.modules.crawl_store import FingerprintStore
+from con_research.src.modules.crawler import BloomFilter, ConcurrentFetcher, LinkCrawler, normalize_url
+
+
+class FakeSession(requests.Session):
+    """Session serving canned pages; unknown URLs return 404."""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200 if url in self.pages else 404
+        response._content = self.pages.get(url, "").encode("utf-8")
+        response.encoding = "utf-8"
+        return response
+
+
+class ConditionalSession(FakeSession):
+    """FakeSession that sends ETags and answers matching If-None-Match with 304."""
+
+    def get(self, url, headers=None, **kwargs):
+        response = super().get(url, **kwargs)
+        etag = f'"{len(self.pages.get(url, ""))}"'
+        response.headers["ETag"] = etag
+        if response.status_code == 200 and (headers or {}).get("If-None-Match") == etag:
+            response.status_code = 304
+            response._content = b""
+        return response
+
+
+def session_titles(soup, url):
+    return [soup.title.get_text()] if soup.title else []
+
+
+@pytest.mark.unit
+class TestNormalizeUrl:
+
+    @pytest.mark.parametrize("url, expected", [
+        ("HTTP://Example.ORG:80/a//b?utm_source=x&b=2&a=1#top", "http://example.org/a/b?a=1&b=2"),
+        ("https://example.org:443", "https://example.org/"),
+        ("https://example.org:8443/x?fbclid=1", "https://example.org:8443/x"),
+    ])
+    def test_canonical_form(self, url, expected):
+        assert normalize_url(url) == expected
+
+    def test_relative_link_resolved_against_base(self):
+        assert normalize_url("../day_2.html", base_url="https://example.org/prog/day_1/") == "https://example.org/prog/day_2.html"
+
+    @pytest.mark.parametrize("url", [
+        "mailto:someone@example.org",
+        "javascript:void(0)",
+        "http://example.org:abc/",
+        "http://example.org:99999/",
+        "http://[::1/",
+    ])
+    def test_unusable_links_return_none(self, url):
+        assert normalize_url(url, base_url="https://example.org/") is None
+
+
+@pytest.mark.unit
+class TestBloomFilter:
+
+    def test_add_and_contains(self):
+        visited = BloomFilter(capacity=100)
+        assert visited.add("https://example.org/a")
+        assert not visited.add("https://example.org/a")
+        assert "https://example.org/a" in visited
+        assert len(visited) == 1
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        visited = BloomFilter(capacity=2000, error_rate=0.01)
+        urls = [f"https://example.org/session_{i}.html" for i in range(2000)]
+        for url in urls:
+            visited.add(url)
+        assert all(url in visited for url in urls)
+        false_positives = sum(f"https://example.org/other_{i}.html" in visited for i in range(2000))
+        assert false_positives < 100
+
+    def test_invalid_settings_raise(self):
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(error_rate=1.0)
+
+
+@pytest.mark.unit
+class TestLinkCrawler:
+
+    def crawl(self, pages, start, session=None, store=None):
+        session = session or FakeSession(pages)
+        with ConcurrentFetcher(max_workers=2, max_retries=0, session=session) as fetcher:
+            crawler = LinkCrawler(fetcher, target_patterns=r"session_\d+\.html$", max_depth=1)
+            results = list(crawler.crawl(start, parse_target=session_titles, store=store))
+        return crawler, results, session
+
+    def test_malformed_href_does_not_drop_page_links(self):
+        base = "http://crawler-links.test"
+        pages = {
+            f"{base}/robots.txt": "",
+            f"{base}/browse.html": (
+                '<a href="session_1.html">1</a><a href="http://crawler-links.test:bad/">x</a>'
+                '<a href="session_2.html">2</a>'
+            ),
+            f"{base}/session_1.html": "<title>Panel 1</title>",
+            f"{base}/session_2.html": "<title>Panel 2</title>",
+        }
+        crawler, results, _ = self.crawl(pages, f"{base}/browse.html")
+        assert sorted(title for result in results for title in result.data) == ["Panel 1", "Panel 2"]
+        assert crawler.stats.targets_parsed == 2
+
+    def test_start_url_respects_robots(self):
+        base = "http://crawler-robots.test"
+        pages = {
+            f"{base}/robots.txt": "User-agent: *\nDisallow: /",
+            f"{base}/browse.html": '<a href="session_1.html">1</a>',
+        }
+        crawler, results, session = self.crawl(pages, f"{base}/browse.html")
+        assert results == []
+        assert crawler.stats.skipped_robots == 1
+        assert session.requested == [f"{base}/robots.txt"]
+
+    def test_recrawl_reuses_records_of_unchanged_pages(self, tmp_path):
+        base = "http://crawler-incremental.test"
+        pages = {
+            f"{base}/robots.txt": "",
+            f"{base}/browse.html": '<a href="session_1.html">1</a><a href="session_2.html">2</a>',
+            f"{base}/session_1.html": "<title>Panel 1</title>",
+            f"{base}/session_2.html": "<title>Panel 2</title>",
+        }
+        store = FingerprintStore(tmp_path / "crawl.json")
+        self.crawl(pages, f"{base}/browse.html", session=ConditionalSession(pages), store=store)
+        store.save()
+
+        # Second crawl: session 1 answers 304, session 2 changed
+        pages[f"{base}/session_2.html"] = "<title>Panel 2 (updated)</title>"
+        store = FingerprintStore(tmp_path / "crawl.json")
+        crawler, results, _ = self.crawl(pages, f"{base}/browse.html", session=ConditionalSession(pages), store=store)
+        by_url = {result.url: result for result in results}
+        assert by_url[f"{base}/session_1.html"].reused
+        assert by_url[f"{base}/session_1.html"].data == ["Panel 1"]
+        assert not by_url[f"{base}/session_2.html"].reused
+        assert by_url[f"{base}/session_2.html"].data == ["Panel 2 (updated)"]
+        # The unchanged browse page still yields its stored links
+        assert crawler.stats.pages_unchanged == 2
+        assert store.get(f"{base}/session_2.html").records == ["Panel 2 (updated)"]
@@ -0,0 +1,166 @@
+"""Tests for cross-file entity resolution (con_research.src.modules.entity_resolution)."""
+
+import pandas as pd
+import pytest
+
+from con_research.src.modules.entity_resolution import (
+    DisjointSet,
+    EntityResolver,
+    blocking_keys,
+    broadcast,
+    collapse_duplicates,
+    comparison_affiliation,
+    deduplicate_dataframe,
+    given_names_compatible,
+)
+
+
+def people(*rows):
+    return pd.DataFrame(list(rows), columns=["Name", "University"])
+
+
+@pytest.mark.unit
+class TestNameRules:
+    """Given-name and affiliation comparison rules."""
+
+    def test_given_names_must_match_exactly(self):
+        assert given_names_compatible("jose garcia", "jose garcia perez")
+        assert not given_names_compatible("daniel lee", "danielle lee")
+        assert not given_names_compatible("maria garcia", "mario garcia")
+        assert not given_names_compatible("anna ivanova", "anne ivanova")
+
+    def test_initial_matches_given_name(self):
+        assert given_names_compatible("j garcia perez", "jose garcia perez")
+        assert not given_names_compatible("m garcia", "jose garcia")
+
+    def test_comparison_affiliation_drops_university(self):
+        assert comparison_affiliation("university oxford") == "oxford"
+        assert comparison_affiliation("oxford university") == "oxford"
+        assert comparison_affiliation("university") == "university"
+
+    def test_blocking_keys(self):
+        assert blocking_keys("jose garcia perez", "university oxford") == ["p|oxford", "p|~j"]
+        assert blocking_keys("", "university oxford") == []
+
+
+@pytest.mark.unit
+class TestFalseMerges:
+    """Different people must never be collapsed into one entity."""
+
+    @pytest.mark.parametrize("first, second", [
+        (("Daniel Lee", "UCL"), ("Danielle Lee", "UCL")),
+        (("Maria Garcia", "LSE"), ("Mario Garcia", "LSE")),
+        (("Anna Ivanova", "University of Oslo"), ("Anne Ivanova", "University of Oslo")),
+        (("Wei Zhang", "Tsinghua University"), ("Wei Zhang", "Peking University")),
+    ])
+    def test_similar_names_stay_apart(self, first, second):
+        result = collapse_duplicates(people(first, second))
+        assert len(result) == 2
+        assert result["Duplicates"].tolist() == [1, 1]
+
+    def test_blank_affiliation_does_not_bridge(self):
+        result = collapse_duplicates(people(
+            ("Wei Zhang", "Tsinghua University"),
+            ("Wei Zhang", ""),
+            ("Wei Zhang", "Peking University"),
+        ))
+        assert sorted(result["University"]) == sorted(["Tsinghua University", "", "Peking University"])
+
+    def test_blank_affiliation_joins_unambiguous_match(self):
+        result = collapse_duplicates(people(("Jane Doe", ""), ("Jane Doe", "University of Example")))
+        assert len(result) == 1
+        assert result.iloc[0]["University"] == "University of Example"
+        assert result.iloc[0]["Duplicates"] == 2
+
+    def test_cluster_is_checked_pairwise(self):
+        # "J. Garcia Perez" matches both, but Jose and Juan are different people
+        result = collapse_duplicates(people(
+            ("Jose Garcia Perez", "University of Leeds"),
+            ("J. Garcia Perez", "University of Leeds"),
+            ("Juan Garcia Perez", "University of Leeds"),
+        ))
+        assert len(result) == 2
+        assert sorted(result["Duplicates"]) == [1, 2]
+
+    def test_many_distinct_people_are_not_chained(self):
+        given = ["Daniel", "Danielle", "Maria", "Mario", "Anna", "Anne", "Wei", "Jan", "Jana", "Ivan"]
+        surnames = ["Lee", "Garcia", "Ivanova", "Zhang"]
+        affiliations = ["UCL", "LSE", "Tsinghua University", "Peking University", ""]
+        rows = []
+        for i, first in enumerate(given):
+            for j, surname in enumerate(surnames):
+                name = f"{first} {surname}"
+                # Every person appears twice; some rows have no affiliation
+                home = affiliations[(i + j) % 4]
+                rows.append((name, home))
+                rows.append((name, affiliations[4] if (i + j) % 3 == 0 else home))
+        result = collapse_duplicates(people(*rows))
+        assert len(result) == len(given) * len(surnames)
+        assert result["Duplicates"].max() == 2
+
+
+@pytest.mark.unit
+class TestTrueMerges:
+    """Spelling variants of the same person are resolved together."""
+
+    def test_spelling_variants_merge(self):
+        result = collapse_duplicates(people(
+            ("José García-Pérez", "Univ. of Oxford"),
+            ("J. Garcia Perez", "University of Oxford"),
+            ("Jose Garcia Perez", "Oxford University"),
+        ))
+        assert len(result) == 1
+        assert result.iloc[0]["Duplicates"] == 3
+        assert result.iloc[0]["Name"] == "José García-Pérez"
+
+    def test_exact_duplicates_merge_and_fill_blanks(self):
+        dataframe = pd.DataFrame({
+            "Name": ["Jane Doe", "Jane Doe"],
+            "University": ["LSE", "LSE"],
+            "Email": ["", "jane@example.ac.uk"],
+        })
+        result = collapse_duplicates(dataframe)
+        assert len(result) == 1
+        assert result.iloc[0]["Email"] == "jane@example.ac.uk"
+
+    def test_resolver_across_sources_and_broadcast(self):
+        pdf = people(("Jose Garcia Perez", "University of Oxford"), ("Daniel Lee", "UCL"))
+        scraped = people(("J. Garcia-Perez", "Oxford University"))
+        resolver = EntityResolver()
+        resolver.add_dataframe(pdf, "pdf")
+        resolver.add_dataframe(scraped, "web")
+        entities = resolver.resolve()
+        assert len(entities) == 2
+        mapping = EntityResolver.row_mapping(entities)
+        assert mapping[("pdf", "0")] == mapping[("web", "0")]
+        assert mapping[("pdf", "1")] != mapping[("pdf", "0")]
+
+        target = pdf.copy()
+        target["Bio"] = ""
+        written = broadcast(entities, {mapping[("pdf", "1")]: "Bio of Daniel"}, target, "Bio", source="pdf")
+        assert written == 1
+        assert target.loc[1, "Bio"] == "Bio of Daniel"
+        assert target.loc[0, "Bio"] == ""
+
+    def test_deduplicate_dataframe_provenance(self):
+        canonical, entities = deduplicate_dataframe(people(("Jane Doe", "LSE"), ("Jane Doe", "LSE")), source="file.csv")
+        assert len(entities) == 1
+        assert canonical.iloc[0]["Sources"] == "file.csv#0; file.csv#1"
+
+    def test_missing_name_column_raises(self):
+        with pytest.raises(ValueError):
+            EntityResolver().add_dataframe(pd.DataFrame({"Title": ["x"]}), "bad")
+
+    def test_empty_table_is_returned_unchanged(self):
+        empty = pd.DataFrame(columns=["Name", "University"])
+        assert collapse_duplicates(empty) is empty
+
+
+@pytest.mark.unit
+def test_disjoint_set_groups():
+    clusters = DisjointSet(5)
+    clusters.union(0, 1)
+    clusters.union(3, 4)
+    clusters.union(1, 4)
+    groups = sorted(sorted(group) for group in clusters.groups().values())
+    assert groups == [[0, 1, 3, 4], [2]]
@@ -0,0 +1,91 @@
+"""Tests for the cached DataFrame exporter (con_research.src.modules.exporting)."""
+
+import datetime
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from con_research.src.modules.exporting import (
+    EXCEL_MAX_CELL_CHARS,
+    ExportCache,
+    ExportError,
+    dataframe_fingerprint,
+    export_dataframe,
+    to_xlsx_bytes,
+)
+
+
+def read_sheet(data: bytes, sheet_name: str = "Sheet1"):
+    worksheet = openpyxl.load_workbook(io.BytesIO(data))[sheet_name]
+    return [list(row) for row in worksheet.iter_rows(values_only=True)]
+
+
+@pytest.mark.unit
+class TestXlsxExport:
+
+    def test_header_and_typed_cells(self):
+        dataframe = pd.DataFrame({
+            "Name": ["Jane Doe", "John Roe"],
+            "Papers": [3, 5],
+            "Score": [1.5, np.nan],
+            "Active": [True, False],
+            "Seen": pd.to_datetime(["2024-01-02 03:04:05", None]),
+        })
+        rows = read_sheet(to_xlsx_bytes(dataframe))
+        assert rows[0] == ["Name", "Papers", "Score", "Active", "Seen"]
+        assert rows[1] == ["Jane Doe", 3, 1.5, True, datetime.datetime(2024, 1, 2, 3, 4, 5)]
+        # NaN and NaT become blank cells
+        assert rows[2] == ["John Roe", 5, None, False, None]
+
+    def test_formulas_and_urls_stay_text(self):
+        dataframe = pd.DataFrame({"Bio": ["=SUM(A1:A2)", "https://example.ac.uk/~jdoe"]})
+        rows = read_sheet(to_xlsx_bytes(dataframe))
+        assert [row[0] for row in rows[1:]] == ["=SUM(A1:A2)", "https://example.ac.uk/~jdoe"]
+
+    def test_mixed_object_column_and_long_text(self):
+        dataframe = pd.DataFrame({"Value": [1, "two", None, "x" * (EXCEL_MAX_CELL_CHARS + 10)]})
+        rows = read_sheet(to_xlsx_bytes(dataframe))
+        assert [row[0] for row in rows[1:4]] == [1, "two", None]
+        assert len(rows[4][0]) == EXCEL_MAX_CELL_CHARS
+
+    def test_sheet_name_is_truncated(self):
+        data = to_xlsx_bytes(pd.DataFrame({"A": [1]}), sheet_name="S" * 40)
+        assert openpyxl.load_workbook(io.BytesIO(data)).sheetnames == ["S" * 31]
+
+    def test_too_many_rows_raises(self, monkeypatch):
+        from con_research.src.modules import exporting
+        monkeypatch.setattr(exporting, "EXCEL_MAX_ROWS", 3)
+        with pytest.raises(ExportError):
+            to_xlsx_bytes(pd.DataFrame({"A": [1, 2, 3]}))
+
+
+@pytest.mark.unit
+class TestExportCaching:
+
+    def test_fingerprint_tracks_content(self):
+        first = pd.DataFrame({"A": [1, 2]})
+        assert dataframe_fingerprint(first) == dataframe_fingerprint(first.copy())
+        assert dataframe_fingerprint(first) != dataframe_fingerprint(pd.DataFrame({"A": [1, 3]}))
+        assert dataframe_fingerprint(first) != dataframe_fingerprint(first.astype(float))
+
+    def test_export_dataframe_reuses_bytes(self):
+        dataframe = pd.DataFrame({"Name": ["Jane Doe"], "Bio": ["Cached export"]})
+        assert export_dataframe(dataframe, "xlsx") is export_dataframe(dataframe.copy(), "xlsx")
+        assert export_dataframe(dataframe, "csv") == b"Name,Bio\nJane Doe,Cached export\n"
+
+    def test_unknown_format_raises(self):
+        with pytest.raises(ExportError):
+            export_dataframe(pd.DataFrame({"A": [1]}), "ods")
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = ExportCache(max_bytes=10)
+        cache.put(("a", "csv", ""), b"12345")
+        cache.put(("b", "csv", ""), b"12345")
+        assert cache.get(("a", "csv", "")) == b"12345"
+        cache.put(("c", "csv", ""), b"12345")
+        assert cache.get(("b", "csv", "")) is None
+        assert cache.stats() == {"entries": 2, "bytes": 10, "hits": 1, "misses": 1}
@@ -0,0 +1,151 @@
+"""Tests for spreadsheet ingestion and schema sniffing (con_research.src.modules.ingestion)."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from con_research.src.modules.ingestion import (
+    IngestionError,
+    canonical_column,
+    iter_table_chunks,
+    load_table,
+    normalize_header,
+    sniff_schema,
+)
+
+
+def csv_upload(text, encoding="utf-8", name="attendees.csv"):
+    upload = io.BytesIO(text.encode(encoding))
+    upload.name = name
+    return upload
+
+
+def xlsx_upload(rows, name="attendees.xlsx"):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Delegates"
+    for row in rows:
+        worksheet.append(row)
+    upload = io.BytesIO()
+    workbook.save(upload)
+    upload.seek(0)
+    upload.name = name
+    return upload
+
+
+@pytest.mark.unit
+class TestHeaders:
+
+    def test_normalize_header(self):
+        assert normalize_header("  E-Mail_Address ") == "e mail address"
+
+    @pytest.mark.parametrize("header, canonical", [
+        ("Affiliation", "University"),
+        ("Organisation", "University"),
+        ("Full Name", "Name"),
+        ("Delegate", "Name"),
+        ("Surname", "Last Name"),
+        ("Favourite colour", None),
+    ])
+    def test_aliases(self, header, canonical):
+        assert canonical_column(header) == canonical
+
+
+@pytest.mark.unit
+class TestSchemaSniffing:
+
+    def test_semicolon_csv_with_title_rows(self):
+        schema = sniff_schema(csv_upload(
+            "Registration export\n"
+            "Generated 2024-05-01\n"
+            "Full Name;Affiliation;Country\n"
+            "Jane Doe;University of Oxford;UK\n"
+            "John Roe;LSE;UK\n"
+        ))
+        assert schema.file_type == "csv"
+        assert schema.delimiter == ";"
+        assert schema.header_row == 2
+        assert schema.columns == ["Name", "University", "Location"]
+
+    def test_tab_delimited_cp1252(self):
+        schema = sniff_schema(csv_upload("Name\tInstitution\nJosé García\tUniversidad de Sevilla\n", encoding="cp1252"))
+        assert schema.delimiter == "\t"
+        assert schema.encoding == "cp1252"
+
+    def test_utf8_bom(self):
+        schema = sniff_schema(csv_upload("\ufeffName,University\nJane Doe,LSE\n"))
+        assert schema.encoding == "utf-8-sig"
+        assert schema.columns == ["Name", "University"]
+
+    def test_xlsx_header_below_title(self):
+        schema = sniff_schema(xlsx_upload([
+            ["Conference delegates"],
+            [],
+            ["First Name", "Last Name", "Organisation", None],
+            ["Jane", "Doe", "LSE", None],
+        ]))
+        assert schema.file_type == "xlsx"
+        assert schema.sheet_name == "Delegates"
+        assert schema.header_row == 2
+        assert schema.headers == ["First Name", "Last Name", "Organisation"]
+        assert schema.has("Name") and schema.has("University")
+
+    def test_duplicate_and_blank_headers(self):
+        schema = sniff_schema(csv_upload("Name,Notes,Notes,\nJane Doe,a,b,c\n"))
+        assert schema.headers == ["Name", "Notes", "Notes.1", "Column 4"]
+
+    def test_empty_file_raises(self):
+        with pytest.raises(IngestionError):
+            sniff_schema(csv_upload(""))
+
+    def test_unsupported_type_raises(self):
+        with pytest.raises(IngestionError):
+            sniff_schema(csv_upload("Name\nJane Doe\n", name="attendees.pdf"))
+
+
+@pytest.mark.unit
+class TestLoading:
+
+    def test_load_only_needed_columns(self):
+        result = load_table(csv_upload(
+            "Delegate,Affiliation,Email Address,Dietary requirements\n"
+            "Jane Doe , University of Oxford,jane@example.ac.uk,none\n"
+            "John Roe,LSE,,vegan\n"
+        ), optional=("Email",))
+        assert result.ok
+        assert list(result.dataframe.columns) == ["Name", "University", "Email"]
+        assert result.dataframe["Name"].tolist() == ["Jane Doe", "John Roe"]
+        assert pd.isna(result.dataframe.loc[1, "Email"])
+        assert result.renamed["Affiliation"] == "University"
+
+    def test_first_and_last_name_combined(self):
+        result = load_table(xlsx_upload([
+            ["First Name", "Last Name", "Institution"],
+            ["Jane", "Doe", "LSE"],
+            ["John", None, "UCL"],
+        ]))
+        assert result.dataframe["Name"].tolist() == ["Jane Doe", "John"]
+
+    def test_missing_required_column(self):
+        result = load_table(csv_upload("Name,Country\nJane Doe,UK\n"))
+        assert not result.ok
+        assert result.missing == ["University"]
+        assert result.dataframe.empty
+
+    def test_chunks_keep_a_continuous_index(self):
+        rows = "".join(f"Person {i},LSE\n" for i in range(5))
+        chunks = list(iter_table_chunks(csv_upload("Name,University\n" + rows), chunk_size=2))
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert list(pd.concat(chunks).index) == [0, 1, 2, 3, 4]
+
+    def test_repetitive_columns_become_categories(self):
+        rows = "".join(f"Person {i},{'LSE' if i % 2 else 'UCL'}\n" for i in range(60))
+        result = load_table(csv_upload("Name,University\n" + rows))
+        assert isinstance(result.dataframe["University"].dtype, pd.CategoricalDtype)
+        assert not isinstance(result.dataframe["Name"].dtype, pd.CategoricalDtype)
+
+    def test_max_rows(self):
+        rows = "".join(f"Person {i},LSE\n" for i in range(10))
+        assert len(load_table(csv_upload("Name,University\n" + rows), max_rows=3).dataframe) == 3
@@ -0,0 +1,104 @@
+"""Tests for latency histograms and the metrics registry (con_research.src.modules.metrics)."""
+
+import random
+
+import pytest
+
+from con_research.src.modules.metrics import LatencyHistogram, MetricsRegistry, estimate_cost
+
+
+def exact_percentile(values, percent):
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+
+    def test_empty_histogram(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        assert histogram.mean == 0.0
+
+    @pytest.mark.parametrize("percent", [50, 90, 99, 99.9])
+    def test_percentiles_within_relative_error(self, percent):
+        rng = random.Random(7)
+        # Log-normal latencies from milliseconds to tens of seconds
+        values = [rng.lognormvariate(-1.5, 1.2) for _ in range(20000)]
+        histogram = LatencyHistogram(significant_digits=2)
+        for value in values:
+            histogram.record(value)
+        expected = exact_percentile(values, percent)
+        # The bucket's upper edge: never below the true value, at most ~1% above
+        assert expected * 0.999 <= histogram.percentile(percent) <= expected * 1.01 + 1e-6
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for micros in (1, 2, 3, 100):
+            histogram.record(micros / 1_000_000)
+        assert histogram.percentile(50) == pytest.approx(2e-6)
+        assert histogram.percentile(100) == pytest.approx(100e-6)
+
+    def test_percentile_capped_at_max(self):
+        histogram = LatencyHistogram()
+        histogram.record(1.2345)
+        assert histogram.percentile(99) == 1.2345
+        assert histogram.min == histogram.max == 1.2345
+
+    def test_merge_and_cumulative_counts(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        for value in (0.01, 0.02, 0.03):
+            first.record(value)
+        for value in (1.0, 2.0):
+            second.record(value)
+        first.merge(second)
+        assert first.count == 5
+        assert first.min == 0.01 and first.max == 2.0
+        assert first.mean == pytest.approx(3.06 / 5)
+        assert first.count_at_or_below(0.05) == 3
+        assert first.count_at_or_below(10) == 5
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+
+    def test_summary_sorted_by_total_time(self):
+        registry = MetricsRegistry()
+        for _ in range(9):
+            registry.observe("search.serper", 0.1)
+        registry.observe("search.serper", 0.1, error=True)
+        registry.observe("llm.chat", 5.0)
+        rows = registry.summary()
+        assert [row["operation"] for row in rows] == ["llm.chat", "search.serper"]
+        serper = rows[1]
+        assert serper["count"] == 10 and serper["errors"] == 1
+        assert serper["error_rate"] == pytest.approx(0.1)
+        assert serper["p50_s"] == pytest.approx(0.1, rel=0.01)
+
+    def test_timeseries_windows(self):
+        registry = MetricsRegistry(window_seconds=60, max_windows=2)
+        for minute in range(3):
+            registry.observe("http.fetch", 0.2, error=minute == 2, at=1_000_020 + minute * 60)
+        rows = registry.timeseries()
+        # Oldest window dropped; rates per minute
+        assert [row["window_start"] for row in rows] == [1_000_020 // 60 * 60 + 60, 1_000_020 // 60 * 60 + 120]
+        assert rows[-1]["requests_per_min"] == 1.0
+        assert rows[-1]["error_rate"] == 1.0
+        assert registry.histogram("http.fetch").count == 3
+
+    def test_usage_and_counters(self):
+        registry = MetricsRegistry()
+        registry.record_usage("unpriced-model", 1000, 500, cost_usd=0.25)
+        registry.record_usage("unpriced-model", 1000, 500, cost_usd=0.25)
+        usage = registry.model_usage()["unpriced-model"]
+        assert (usage.requests, usage.prompt_tokens, usage.cost_usd) == (2, 2000, 0.5)
+        registry.increment("search.cache", result="hit")
+        registry.increment("search.cache", result="hit")
+        registry.add_gauge("webdriver_live", 1, pool="web")
+        registry.add_gauge("webdriver_live", -1, pool="web")
+        assert registry.counters()[("search.cache", (("result", "hit"),))] == 2
+        assert registry.gauges()[("webdriver_live", (("pool", "web"),))] == 0
+
+    def test_unknown_model_costs_nothing(self):
+        assert estimate_cost("no-such-model", 1000, 1000) == 0.0
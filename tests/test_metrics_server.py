@@ -0,0 +1,104 @@
+"""Tests for the Prometheus metrics endpoint (con_research.src.modules.metrics_server)."""
+
+import socket
+import urllib.error
+import urllib.request
+
+import pytest
+
+from con_research.src.modules import metrics_server
+from con_research.src.modules.metrics import MetricsRegistry
+from con_research.src.modules.metrics_server import (
+    CONTENT_TYPE,
+    render_prometheus,
+    start_metrics_server,
+    stop_metrics_server,
+)
+
+
+@pytest.fixture
+def server_env(monkeypatch):
+    monkeypatch.delenv("CONFERENCE_RESEARCH_METRICS_PORT", raising=False)
+    monkeypatch.delenv("CONFERENCE_RESEARCH_METRICS_HOST", raising=False)
+    stop_metrics_server()
+    yield monkeypatch
+    stop_metrics_server()
+
+
+def samples(text, family):
+    return [line for line in text.splitlines() if line.startswith(f"conference_research_{family}")]
+
+
+@pytest.mark.unit
+class TestServer:
+
+    def test_off_without_a_port(self, server_env):
+        assert start_metrics_server() is None
+        server_env.setenv("CONFERENCE_RESEARCH_METRICS_PORT", "not-a-port")
+        assert start_metrics_server() is None
+
+    def test_binds_to_loopback_by_default(self, server_env):
+        server_env.setenv("CONFERENCE_RESEARCH_METRICS_PORT", "0")
+        port = start_metrics_server()
+        assert port
+        assert metrics_server._server.server_address[0] == "127.0.0.1"
+        # Streamlit reruns call it again: same server, no second bind
+        assert start_metrics_server() == port
+
+    def test_host_from_environment(self, server_env):
+        server_env.setenv("CONFERENCE_RESEARCH_METRICS_HOST", "127.0.0.2")
+        assert start_metrics_server(port=0)
+        assert metrics_server._server.server_address[0] == "127.0.0.2"
+
+    def test_serves_metrics_and_404s_other_paths(self, server_env):
+        port = start_metrics_server(port=0)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert "conference_research_metrics_start_time_seconds" in response.read().decode("utf-8")
+        with pytest.raises(urllib.error.HTTPError) as not_found:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/admin", timeout=5)
+        assert not_found.value.code == 404
+
+    def test_port_in_use_returns_none(self, server_env):
+        with socket.socket() as taken:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            assert start_metrics_server(port=taken.getsockname()[1]) is None
+
+
+@pytest.mark.unit
+class TestExposition:
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        for duration in (0.004, 0.02, 0.3, 7.0):
+            registry.observe("llm.chat", duration)
+        registry.observe("llm.chat", 0.2, error=True)
+        text = render_prometheus(registry)
+
+        buckets = samples(text, 'operation_duration_seconds_bucket{operation="llm.chat"')
+        counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+        assert counts == sorted(counts)
+        assert buckets[-1] == 'conference_research_operation_duration_seconds_bucket{operation="llm.chat",le="+Inf"} 5'
+        assert 'conference_research_operation_duration_seconds_bucket{operation="llm.chat",le="0.005"} 1' in buckets
+        assert 'conference_research_operation_duration_seconds_count{operation="llm.chat"} 5' in text
+        assert 'conference_research_operation_errors_total{operation="llm.chat"} 1' in text
+
+    def test_help_and_type_once_per_family(self):
+        registry = MetricsRegistry()
+        registry.record_usage("gpt-4o-mini", 1000, 500, cost_usd=0.25)
+        registry.record_usage("gpt-4o", 10, 5, cost_usd=0.5)
+        text = render_prometheus(registry)
+        assert text.count("# TYPE conference_research_llm_tokens_total counter") == 1
+        assert text.count("# HELP conference_research_llm_tokens_total ") == 1
+        assert 'conference_research_llm_tokens_total{model="gpt-4o-mini",type="prompt"} 1000' in text
+        assert 'conference_research_llm_cost_usd_total{model="gpt-4o-mini"} 0.25' in text
+
+    def test_counters_gauges_and_label_escaping(self):
+        registry = MetricsRegistry()
+        registry.increment("http_responses", status='5xx "bad"\n')
+        registry.add_gauge("webdriver_live", 2, pool="web")
+        text = render_prometheus(registry)
+        assert 'conference_research_http_responses_total{status="5xx \\"bad\\"\\n"} 1' in text
+        assert "# TYPE conference_research_webdriver_live gauge" in text
+        assert 'conference_research_webdriver_live{pool="web"} 2' in text
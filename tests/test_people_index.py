@@ -0,0 +1,79 @@
+"""Tests for the local people index (con_research.src.modules.people_index)."""
+
+import pandas as pd
+import pytest
+
+from con_research.src.modules import people_index
+from con_research.src.modules.people_index import PeopleIndex, normalize_affiliation, normalize_name
+
+
+@pytest.fixture
+def index():
+    people = PeopleIndex(":memory:")
+    yield people
+
+
+def attendees(*rows):
+    return pd.DataFrame(list(rows), columns=["Name", "University", "Bio"])
+
+
+@pytest.mark.unit
+class TestNormalisation:
+
+    def test_normalize_name(self):
+        assert normalize_name("Prof. José  García-Pérez") == "jose garcia perez"
+
+    def test_normalize_affiliation(self):
+        assert normalize_affiliation("The Univ. of Oxford") == "university oxford"
+
+
+@pytest.mark.unit
+class TestPeopleIndex:
+
+    def test_fuzzy_name_search(self, index):
+        index.add_dataframe(attendees(("Jane Doe", "University of Oxford", ""), ("John Roe", "LSE", "")), "a.csv")
+        matches = index.search(name="dr jane doe")
+        assert [m.name for m in matches] == ["Jane Doe"]
+        assert matches[0].record["University"] == "University of Oxford"
+
+    def test_bio_keyword_search(self, index):
+        index.add_dataframe(attendees(
+            ("Jane Doe", "Oxford", "Works on electoral behaviour in Europe"),
+            ("John Roe", "LSE", "Studies party finance"),
+        ), "a.csv")
+        assert [m.name for m in index.search(text="electoral europe")] == ["Jane Doe"]
+        assert index.search(text="astrophysics") == []
+
+    def test_unchanged_file_is_skipped_and_changed_file_replaced(self, index):
+        first = attendees(("Jane Doe", "Oxford", ""))
+        assert index.add_dataframe(first, "a.csv") == 1
+        assert index.add_dataframe(first, "a.csv") == 0
+        assert index.add_dataframe(attendees(("John Roe", "LSE", "")), "a.csv") == 1
+        assert index.stats() == {"sources": 1, "people": 1}
+        assert index.search(name="jane doe") == []
+
+    def test_search_restricted_to_sources(self, index):
+        index.add_dataframe(attendees(("Jane Doe", "Oxford", "")), "a.csv")
+        index.add_dataframe(attendees(("Jane Doe", "Cambridge", "")), "b.csv")
+        assert {m.source for m in index.search(name="jane doe")} == {"a.csv", "b.csv"}
+        assert [m.source for m in index.search(name="jane doe", sources=["b.csv"])] == ["b.csv"]
+        assert index.search(name="jane doe", sources=[]) == []
+
+    def test_separate_indexes_do_not_share_rows(self):
+        # Each session holds its own index, so uploads with the same file name cannot collide
+        session_a, session_b = PeopleIndex(":memory:"), PeopleIndex(":memory:")
+        session_a.add_dataframe(attendees(("Jane Doe", "Oxford", "")), "attendees.xlsx")
+        session_b.add_dataframe(attendees(("John Roe", "LSE", "")), "attendees.xlsx")
+        assert session_b.search(name="jane doe") == []
+        assert [m.name for m in session_a.search(name="jane doe")] == ["Jane Doe"]
+
+    def test_missing_name_column_raises(self, index):
+        with pytest.raises(ValueError):
+            index.add_dataframe(pd.DataFrame({"Title": ["x"]}), "bad.csv")
+
+
+@pytest.mark.unit
+def test_shared_index_is_in_memory_by_default(monkeypatch):
+    monkeypatch.delenv(people_index.PEOPLE_INDEX_PERSIST_ENV_VAR, raising=False)
+    monkeypatch.setattr(people_index, "_people_index", None)
+    assert people_index.get_people_index().path == ":memory:"
@@ -0,0 +1,176 @@
+"""Tests for the retry and circuit-breaker primitives (con_research.src.modules.resilience)."""
+
+import asyncio
+import time
+
+import pytest
+
+from con_research.src.modules.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    RetryPolicy,
+    acall,
+    call,
+    resilient,
+)
+
+NO_WAIT = RetryPolicy(max_retries=2, base_delay=0.0, max_delay=0.0)
+
+
+class Flaky:
+    """Callable failing ``failures`` times before returning "ok"."""
+
+    def __init__(self, failures, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("boom")
+        return "ok"
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold_and_rejects(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+        breaker.record_failure(ConnectionError("a"))
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure(ConnectionError("b"))
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.metrics.rejections == 1
+        assert breaker.metrics.last_error == "ConnectionError: b"
+
+    def test_half_open_probe_closes_or_reopens(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.state == CircuitState.HALF_OPEN
+        breaker.before_call()
+        # Only one probe at a time
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+        time.sleep(0.02)
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.metrics.times_opened == 2
+
+    def test_release_frees_probe_slot(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.before_call()
+        breaker.release()
+        breaker.before_call()
+        assert breaker.state == CircuitState.HALF_OPEN
+
+    def test_backoff_stays_within_bounds(self):
+        delays = RetryPolicy(base_delay=0.5, max_delay=2.0).backoff()
+        assert all(0.5 <= next(delays) <= 2.0 for _ in range(50))
+
+
+@pytest.mark.unit
+class TestCall:
+
+    def test_retries_until_success(self):
+        breaker = CircuitBreaker("test")
+        flaky = Flaky(2)
+        retries = []
+        assert call(flaky, policy=NO_WAIT, breaker=breaker, on_retry=lambda *a: retries.append(a[0])) == "ok"
+        assert flaky.calls == 3
+        assert retries == [0, 1]
+        assert breaker.metrics.failures == 2 and breaker.metrics.retries == 2
+        assert breaker.metrics.consecutive_failures == 0
+
+    def test_gives_up_after_max_retries(self):
+        flaky = Flaky(5)
+        with pytest.raises(ConnectionError):
+            call(flaky, policy=NO_WAIT)
+        assert flaky.calls == 3
+
+    def test_non_retryable_error_counts_as_success(self):
+        breaker = CircuitBreaker("test")
+        policy = RetryPolicy(max_retries=2, base_delay=0.0, retry_on=(ConnectionError,))
+        with pytest.raises(ValueError):
+            call(Flaky(1, ValueError), policy=policy, breaker=breaker)
+        assert breaker.metrics.successes == 1 and breaker.metrics.failures == 0
+
+    def test_timeout_counts_as_failure(self):
+        breaker = CircuitBreaker("test")
+        policy = RetryPolicy(max_retries=2, base_delay=0.0, retry_on=(ConnectionError,))
+        with pytest.raises(TimeoutError):
+            call(Flaky(1, TimeoutError), policy=policy, breaker=breaker)
+        assert breaker.metrics.failures == 1 and breaker.metrics.successes == 0
+
+    def test_interrupt_records_nothing(self):
+        breaker = CircuitBreaker("test")
+        with pytest.raises(KeyboardInterrupt):
+            call(Flaky(1, KeyboardInterrupt), policy=NO_WAIT, breaker=breaker)
+        assert breaker.metrics.failures == 0 and breaker.metrics.successes == 0
+
+    def test_open_breaker_rejects_without_calling(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+        flaky = Flaky(0)
+        with pytest.raises(CircuitOpenError):
+            call(flaky, policy=NO_WAIT, breaker=breaker)
+        assert flaky.calls == 0
+
+
+@pytest.mark.unit
+class TestAcall:
+
+    def test_async_decorator_retries(self):
+        attempts = []
+
+        @resilient(NO_WAIT)
+        async def fetch():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise ConnectionError("boom")
+            return "ok"
+
+        assert asyncio.run(fetch()) == "ok"
+        assert len(attempts) == 2
+
+    def test_deadline_timeout_counts_as_failure(self):
+        breaker = CircuitBreaker("test")
+        policy = RetryPolicy(max_retries=2, base_delay=0.0, deadline=0.01, retry_on=(ConnectionError,))
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(acall(slow, policy=policy, breaker=breaker))
+        assert breaker.metrics.failures == 1 and breaker.metrics.successes == 0
+
+    def test_cancellation_records_nothing(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        async def run():
+            task = asyncio.ensure_future(acall(slow, policy=NO_WAIT, breaker=breaker))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert breaker.metrics.successes == 0 and breaker.metrics.failures == 1
+        # The probe slot was handed back
+        assert breaker.state == CircuitState.HALF_OPEN
+        breaker.before_call()
@@ -0,0 +1,87 @@
+"""Tests for the WebDriver pool (con_research.src.modules.resources)."""
+
+import pytest
+
+from con_research.src.modules.resources import DriverPool
+
+
+class FakeChromeDriver:
+    """Records the calls a DriverPool makes; one tab per origin."""
+
+    def __init__(self, origins=("https://example.org",)):
+        self.tabs = list(origins)
+        self.current = 0
+        self.commands = []
+        self.scripts = []
+        self.quit_called = False
+        driver = self
+
+        class SwitchTo:
+            def window(self, handle):
+                driver.current = handle
+
+        self.switch_to = SwitchTo()
+
+    @property
+    def window_handles(self):
+        return [index for index, tab in enumerate(self.tabs) if tab is not None]
+
+    @property
+    def current_url(self):
+        return self.tabs[self.current]
+
+    def execute_script(self, script):
+        if script.startswith("return"):
+            return self.tabs[self.current]
+        self.scripts.append((self.tabs[self.current], script))
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+    def close(self):
+        self.tabs[self.current] = None
+
+    def get(self, url):
+        self.tabs[self.current] = url
+
+    def quit(self):
+        self.quit_called = True
+
+
+class PlainDriver(FakeChromeDriver):
+    """Driver without CDP support (e.g. Firefox)."""
+
+    def __getattribute__(self, name):
+        if name == "execute_cdp_cmd":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+
+@pytest.mark.unit
+class TestDriverPool:
+
+    def test_release_clears_cookies_and_storage_of_every_tab(self):
+        driver = FakeChromeDriver(origins=("https://conference.example", "https://auth.example"))
+        pool = DriverPool("test", factory=lambda: None)
+        pool.release(driver)
+
+        assert ("Network.clearBrowserCookies", {}) in driver.commands
+        cleared = {params["origin"] for command, params in driver.commands if command == "Storage.clearDataForOrigin"}
+        assert cleared == {"https://conference.example", "https://auth.example"}
+        assert ("https://auth.example", "window.sessionStorage.clear()") in driver.scripts
+        # Extra tab closed, first tab blank, driver kept for reuse
+        assert driver.window_handles == [0] and driver.current_url == "about:blank"
+        assert pool.checkout() is driver
+
+    def test_driver_without_cdp_is_not_reused(self):
+        driver = PlainDriver()
+        pool = DriverPool("test", factory=lambda: "new driver")
+        pool.release(driver)
+        assert driver.quit_called
+        assert pool.checkout() == "new driver"
+
+    def test_discarded_driver_is_quit(self):
+        driver = FakeChromeDriver()
+        pool = DriverPool("test", factory=lambda: None)
+        pool.release(driver, discard=True)
+        assert driver.quit_called and driver.commands == []
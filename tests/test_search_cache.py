@@ -0,0 +1,52 @@
+"""Tests for the shared search result cache (con_research.src.modules.search_cache)."""
+
+import threading
+
+import pytest
+
+from con_research.src.modules.search_cache import SearchCache, normalize_query
+
+
+@pytest.fixture
+def cache():
+    return SearchCache(":memory:")
+
+
+@pytest.mark.unit
+class TestSearchCache:
+
+    def test_normalize_query_keeps_operators(self):
+        assert normalize_query("  Jane DOE, Oxford. ") == "jane doe oxford"
+        assert normalize_query('"Jane Doe" site:.ac.uk -cv') == '"jane doe" site:.ac.uk -cv'
+
+    def test_get_or_fetch_counts_hits_and_misses(self, cache):
+        calls = []
+        fetch = lambda: calls.append(1) or [{"href": "https://example.org"}]
+        assert cache.get_or_fetch("ddgs", "Jane Doe", fetch) == [{"href": "https://example.org"}]
+        assert cache.get_or_fetch("ddgs", "jane  doe.", fetch) == [{"href": "https://example.org"}]
+        assert len(calls) == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    def test_empty_results_are_not_cached_by_default(self, cache):
+        assert cache.get_or_fetch("ddgs", "nobody", lambda: []) == []
+        assert cache.get("ddgs", "nobody") is None
+
+    def test_expired_entries_are_ignored(self, cache):
+        cache.provider_ttls["serper"] = -1
+        cache.set("serper", "Jane Doe", {"organic": []})
+        assert cache.get("serper", "Jane Doe") is None
+        assert cache.purge_expired() == 1
+
+    def test_counters_are_thread_safe(self, cache):
+        def record():
+            for _ in range(2000):
+                cache.record_hit()
+                cache.record_miss()
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert cache.stats()["hits"] == 16000
+        assert cache.stats()["misses"] == 16000
@@ -0,0 +1,188 @@
+"""Tests for non-blocking task timing (con_research.src.modules.task_timer)."""
+
+import pytest
+
+from con_research.src.modules import task_timer, tracing
+from con_research.src.modules.task_timer import (
+    TaskPerformanceTimer,
+    get_performance_timer,
+    performance_tracking_context,
+    track_task_performance,
+)
+from con_research.src.modules.tracing import Tracer
+
+
+class SessionState(dict):
+    """st.session_state stand-in supporting attribute and key access."""
+
+    def __getattr__(self, key):
+        return self[key]
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+class FakeElement:
+    """Placeholder/progress bar stand-in writing every call to the shared log."""
+
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def container(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, method):
+        return lambda *args, **kwargs: self.log.append((f"{self.name}.{method}", *args))
+
+
+class FakeStreamlit:
+    """Records the UI calls the timer makes; elements are numbered by creation order."""
+
+    def __init__(self):
+        self.log = []
+        self.session_state = SessionState()
+        self.elements = 0
+
+    def empty(self):
+        self.elements += 1
+        return FakeElement(self.log, f"empty{self.elements}")
+
+    def progress(self, value):
+        self.log.append(("progress", value))
+        return FakeElement(self.log, "bar")
+
+    def __getattr__(self, method):
+        return lambda *args, **kwargs: self.log.append((method, *args))
+
+    def calls(self, name):
+        return [entry[1:] for entry in self.log if entry[0] == name]
+
+
+@pytest.fixture
+def fake_st(monkeypatch):
+    fake = FakeStreamlit()
+    monkeypatch.setattr(task_timer, "st", fake)
+
+    def no_sleep(seconds):
+        raise AssertionError(f"task cleanup slept for {seconds}s")
+
+    # Cleanup must hand the banner to a toast rather than block the script thread
+    monkeypatch.setattr(task_timer.time, "sleep", no_sleep)
+    return fake
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    fresh = Tracer()
+    monkeypatch.setattr(tracing, "get_tracer", lambda: fresh)
+    return fresh
+
+
+@pytest.mark.unit
+class TestTaskPerformanceTimer:
+
+    def test_summary_of_completed_tasks(self, fake_st):
+        timer = TaskPerformanceTimer()
+        assert timer.get_performance_summary()["task_count"] == 0
+        timer.task_timings.update({"Scrape": 3.0, "Bios": 1.0})
+        summary = timer.get_performance_summary()
+        assert summary["total_execution_time"] == 4.0
+        assert summary["average_task_time"] == 2.0
+        assert summary["longest_task"] == {"name": "Scrape", "duration": 3.0}
+        assert summary["shortest_task"] == {"name": "Bios", "duration": 1.0}
+
+    def test_restarting_an_active_task_completes_it(self, fake_st):
+        timer = TaskPerformanceTimer()
+        timer.start_task_timing("Scrape")
+        timer.start_task_timing("Scrape")
+        assert "Scrape" in timer.task_timings and "Scrape" in timer.active_tasks
+        assert fake_st.calls("warning")
+
+    def test_progress_validation(self, fake_st):
+        timer = TaskPerformanceTimer()
+        with pytest.raises(ValueError):
+            timer.start_task_timing("  ")
+        with pytest.raises(ValueError):
+            timer.update_task_progress("Scrape", 101)
+        timer.update_task_progress("Scrape", 50)
+        assert timer.complete_task_timing("Scrape") is None
+        assert len(fake_st.calls("warning")) == 2
+
+    def test_timer_persists_in_session_state(self, fake_st):
+        assert get_performance_timer() is get_performance_timer()
+        assert isinstance(fake_st.session_state["performance_timer"], TaskPerformanceTimer)
+
+
+@pytest.mark.unit
+class TestTrackTaskPerformance:
+
+    def test_records_timing_and_toasts_without_sleeping(self, fake_st, tracer):
+        @track_task_performance("Bio Generation", metadata={"rows": 3})
+        def generate(name):
+            return f"bio of {name}"
+
+        assert generate("Jane Doe") == "bio of Jane Doe"
+        timer = get_performance_timer()
+        assert timer.task_timings["Bio Generation"] >= 0
+        assert timer.active_tasks == {}
+        assert timer.task_progress["Bio Generation"] == 100
+        assert fake_st.calls("bar.progress") == [(25,), (90,)]
+        # Both placeholders cleared, completion reported as a toast
+        assert ("empty1.empty",) in fake_st.log and ("empty2.empty",) in fake_st.log
+        [(message,)] = fake_st.calls("toast")
+        assert message.startswith("✅ Bio Generation completed in ")
+        [recorded] = tracer.spans()
+        assert recorded.name == "Bio Generation" and recorded.attributes == {"rows": 3}
+
+    def test_failure_is_reraised_and_timing_completed(self, fake_st, tracer):
+        @track_task_performance("Bio Generation")
+        def generate():
+            raise RuntimeError("quota")
+
+        with pytest.raises(RuntimeError, match="quota"):
+            generate()
+        timer = get_performance_timer()
+        assert "Bio Generation" in timer.task_timings and timer.active_tasks == {}
+        assert fake_st.calls("empty2.error") == [("❌ Bio Generation failed: quota",)]
+        assert tracer.spans()[-1].status == "ERROR"
+
+    def test_without_progress_no_ui_is_drawn(self, fake_st, tracer):
+        @track_task_performance("Export", show_progress=False)
+        def export():
+            return 1
+
+        assert export() == 1
+        assert fake_st.log == []
+        assert "Export" in get_performance_timer().task_timings
+
+    def test_empty_task_name_rejected(self):
+        with pytest.raises(ValueError):
+            track_task_performance(" ")
+
+
+@pytest.mark.unit
+class TestPerformanceTrackingContext:
+
+    def test_yields_timer_and_toasts_without_sleeping(self, fake_st, tracer):
+        with performance_tracking_context("File Processing", metadata={"file": "people.csv"}) as timer:
+            timer.update_task_progress("File Processing", 30)
+            assert timer.task_progress["File Processing"] == 30
+        assert "File Processing" in timer.task_timings
+        assert len(fake_st.calls("toast")) == 1
+        assert tracer.spans()[-1].attributes == {"file": "people.csv"}
+
+    def test_failure_is_reraised_and_timing_completed(self, fake_st, tracer):
+        with pytest.raises(KeyError):
+            with performance_tracking_context("File Processing"):
+                raise KeyError("Name")
+        timer = get_performance_timer()
+        assert "File Processing" in timer.task_timings and timer.active_tasks == {}
+        assert fake_st.calls("empty2.error")
+        assert tracer.spans()[-1].status == "ERROR"
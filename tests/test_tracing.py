@@ -0,0 +1,213 @@
+"""Tests for span tracing and OTLP export (con_research.src.modules.tracing)."""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from con_research.src.modules import tracing
+from con_research.src.modules.metrics import get_metrics
+from con_research.src.modules.tracing import (
+    OTLPJsonFileExporter,
+    Tracer,
+    add_event,
+    bind_context,
+    current_span,
+    format_trace,
+    set_attribute,
+    span,
+    traced,
+)
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    """Fresh tracer used by span()/traced() for the duration of a test."""
+    fresh = Tracer(buffer_size=100)
+    monkeypatch.setattr(tracing, "get_tracer", lambda: current_span()._tracer if current_span() else fresh)
+    return fresh
+
+
+def by_name(spans):
+    return {s.name: s for s in spans}
+
+
+@pytest.mark.unit
+class TestSpans:
+
+    def test_nested_spans_share_trace_and_link_parents(self, tracer):
+        with span("bio.generate", name="Jane Doe") as root:
+            with span("search.serper") as search:
+                set_attribute("results", 10)
+                add_event("cache.miss")
+            with span("llm.chat", model="gpt-4o-mini"):
+                pass
+        spans = by_name(tracer.spans())
+        assert root.is_root and root.parent_id is None
+        assert spans["search.serper"].parent_id == root.span_id
+        assert spans["llm.chat"].parent_id == root.span_id
+        assert {s.trace_id for s in spans.values()} == {root.trace_id}
+        assert len(root.trace_id) == 32 and len(root.span_id) == 16
+        assert search.attributes == {"results": 10}
+        assert [event.name for event in search.events] == ["cache.miss"]
+        assert current_span() is None
+        # Children finish before their parent
+        assert [s.name for s in tracer.spans()] == ["search.serper", "llm.chat", "bio.generate"]
+
+    def test_exception_marks_span_failed_and_propagates(self, tracer):
+        with pytest.raises(ValueError):
+            with span("http.fetch", url="https://example.org"):
+                raise ValueError("boom")
+        failed = tracer.spans()[-1]
+        assert failed.status == "ERROR"
+        assert failed.status_message == "ValueError: boom"
+        assert failed.events[0].attributes["exception.type"] == "ValueError"
+
+    def test_helpers_do_nothing_outside_a_span(self, tracer):
+        set_attribute("ignored", 1)
+        add_event("ignored")
+        assert tracer.spans() == []
+
+    def test_finished_spans_feed_metrics(self, tracer):
+        before = get_metrics().histogram("test.tracing.metrics")
+        count = before.count if before else 0
+        with span("test.tracing.metrics"):
+            pass
+        assert get_metrics().histogram("test.tracing.metrics").count == count + 1
+
+
+@pytest.mark.unit
+class TestContextPropagation:
+
+    def test_bind_context_parents_worker_spans(self, tracer):
+        def work(index):
+            with span("http.fetch", index=index) as child:
+                return child.thread_name
+
+        with span("crawl") as root:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                # Bound on the submitting thread, one context per task
+                futures = [executor.submit(bind_context(work), index) for index in range(3)]
+                threads = [future.result() for future in futures]
+        fetches = [s for s in tracer.spans() if s.name == "http.fetch"]
+        assert len(fetches) == 3
+        assert all(s.parent_id == root.span_id for s in fetches)
+        assert threading.current_thread().name not in threads
+
+    def test_unbound_thread_starts_a_new_trace(self, tracer):
+        spans = []
+        with span("page"):
+            worker = threading.Thread(target=lambda: spans.append(tracer.start_span("orphan")))
+            worker.start()
+            worker.join()
+        assert spans[0].is_root
+
+    def test_async_tasks_keep_their_own_parent(self, tracer):
+        @traced("search.query")
+        async def search(query):
+            await asyncio.sleep(0)
+            return current_span().parent_id
+
+        async def run_row(name):
+            with span("bio.row", name=name) as row:
+                parent_ids = await asyncio.gather(search(f"{name} bio"), search(f"{name} email"))
+                return row.span_id, parent_ids
+
+        async def main():
+            return await asyncio.gather(run_row("Jane Doe"), run_row("John Roe"))
+
+        for row_id, parent_ids in asyncio.run(main()):
+            assert parent_ids == [row_id, row_id]
+
+    def test_traced_sync_function_uses_qualified_name(self, tracer):
+        @traced()
+        def enrich():
+            return current_span().name
+
+        assert enrich().endswith("enrich")
+
+
+@pytest.mark.unit
+class TestTracerBuffer:
+
+    def test_ring_buffer_keeps_latest_spans(self):
+        tracer = Tracer(buffer_size=3)
+        for index in range(5):
+            tracer.start_span(f"span-{index}", parent=None).end()
+        assert [s.name for s in tracer.spans()] == ["span-2", "span-3", "span-4"]
+
+    def test_end_is_idempotent(self):
+        tracer = Tracer()
+        started = tracer.start_span("once")
+        started.end()
+        started.end()
+        assert len(tracer.spans()) == 1 and started.status == "OK"
+
+    def test_last_trace_by_root_name(self, tracer):
+        with span("bio.generate"):
+            with span("llm.chat"):
+                pass
+        with span("crawl"):
+            pass
+        assert [s.name for s in tracer.last_trace()] == ["crawl"]
+        assert {s.name for s in tracer.last_trace("bio.generate")} == {"bio.generate", "llm.chat"}
+        assert tracer.last_trace("missing") == []
+
+    def test_format_trace_indents_children(self, tracer):
+        with span("bio.generate", name="Jane Doe"):
+            with span("llm.chat", model="gpt-4o-mini"):
+                pass
+        lines = format_trace(tracer.last_trace()).splitlines()
+        assert lines[0].startswith("bio.generate  +0.00s")
+        assert "[name=Jane Doe]" in lines[0]
+        assert lines[1].startswith("  llm.chat") and "[model=gpt-4o-mini]" in lines[1]
+        assert format_trace([]) == ""
+
+
+@pytest.mark.unit
+class TestExport:
+
+    def read_requests(self, path):
+        return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    def test_trace_written_as_one_line_when_root_ends(self, tmp_path):
+        path = tmp_path / "traces" / "spans.jsonl"
+        tracer = Tracer(exporter=OTLPJsonFileExporter(path))
+        root = tracer.start_span("bio.generate", {"rows": 2})
+        child = tracer.start_span("llm.chat", {"model": "gpt-4o-mini", "cost_usd": 0.001, "cached": False}, parent=root)
+        child.record_exception(RuntimeError("rate limited"))
+        child.end()
+        assert not path.exists()
+        root.end()
+
+        requests = self.read_requests(path)
+        assert len(requests) == 1
+        resource_spans = requests[0]["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0] == {"key": "service.name", "value": {"stringValue": "conference-research"}}
+        exported = {s["name"]: s for s in resource_spans["scopeSpans"][0]["spans"]}
+        assert exported["llm.chat"]["parentSpanId"] == root.span_id
+        assert "parentSpanId" not in exported["bio.generate"]
+        assert exported["llm.chat"]["status"] == {"code": 2, "message": "RuntimeError: rate limited"}
+        assert exported["bio.generate"]["status"]["code"] == 1
+        attributes = {a["key"]: a["value"] for a in exported["llm.chat"]["attributes"]}
+        assert attributes["cost_usd"] == {"doubleValue": 0.001}
+        assert attributes["cached"] == {"boolValue": False}
+        assert {a["key"]: a["value"] for a in exported["bio.generate"]["attributes"]}["rows"] == {"intValue": "2"}
+
+    def test_abandoned_traces_are_flushed(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        tracer = Tracer(buffer_size=2, exporter=OTLPJsonFileExporter(path))
+        # Children of roots that never end
+        for index in range(4):
+            root = tracer.start_span(f"root-{index}")
+            tracer.start_span("child", parent=root).end()
+        assert len(self.read_requests(path)) >= 1
+        assert len(tracer._pending_export) <= 2
+
+    def test_exporter_from_environment(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("CONFERENCE_RESEARCH_TRACE_FILE", "false")
+        assert tracing._exporter_from_env() is None
+        monkeypatch.setenv("CONFERENCE_RESEARCH_TRACE_FILE", str(tmp_path / "out.jsonl"))
+        assert tracing._exporter_from_env().path == tmp_path / "out.jsonl"
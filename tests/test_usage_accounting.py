@@ -0,0 +1,232 @@
+"""Tests for token/cost accounting and budgets (con_research.src.modules.usage_accounting)."""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from con_research.src.modules import llm_client
+from con_research.src.modules.llm_client import LLMGateway
+from con_research.src.modules.resilience import CircuitBreaker, RetryPolicy
+from con_research.src.modules.usage_accounting import (
+    Budget,
+    BudgetExceededError,
+    UsageLedger,
+    budget_scope,
+    current_labels,
+    default_run_budget_usd,
+    load_price_table,
+    usage_scope,
+)
+
+# USD per million input/output tokens: 1 token in = $1e-6, 1 token out = $2e-6
+PRICES = {"test-model": (1.0, 2.0)}
+
+
+@pytest.fixture
+def ledger():
+    return UsageLedger(prices=PRICES)
+
+
+@pytest.mark.unit
+class TestBudget:
+
+    def test_usd_limit_counts_spend_and_reservations(self):
+        budget = Budget(limit_usd=1.0, name="chunk")
+        budget.charge(0.5, 100)
+        budget.reserve(0.4, 100)
+        with pytest.raises(BudgetExceededError) as refused:
+            budget.reserve(0.2, 100)
+        assert refused.value.budget is budget
+        assert refused.value.requested_usd == 0.2
+        assert "chunk" in str(refused.value) and "$1.00" in str(refused.value)
+        # Releasing the reservation frees the capacity again
+        budget.release(0.4, 100)
+        budget.reserve(0.2, 100)
+
+    def test_token_and_request_limits(self):
+        with pytest.raises(BudgetExceededError, match="token"):
+            Budget(limit_tokens=1000).reserve(0.0, 1001)
+        budget = Budget(limit_requests=2)
+        # A settled call: reservation released, usage charged
+        budget.reserve(0.0, 10)
+        budget.release(0.0, 10)
+        budget.charge(0.0, 10)
+        budget.reserve(0.0, 10)
+        with pytest.raises(BudgetExceededError, match="request"):
+            budget.reserve(0.0, 10)
+
+    def test_unlimited_budget_never_refuses(self):
+        budget = Budget()
+        for _ in range(100):
+            budget.reserve(100.0, 1_000_000)
+        assert budget.remaining_usd is None
+
+    def test_concurrent_reservations_cannot_overshoot(self):
+        # Binary-exact amounts so the sum hits the limit exactly
+        budget = Budget(limit_usd=25.0)
+        admitted, refused = [], []
+
+        def worker():
+            for _ in range(50):
+                try:
+                    budget.reserve(0.25, 1)
+                    admitted.append(1)
+                except BudgetExceededError:
+                    refused.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(admitted) == 100
+        assert len(refused) == 300
+        assert budget.reserved_usd == 25.0
+
+
+@pytest.mark.unit
+class TestUsageLedger:
+
+    def test_reserve_and_settle_charges_actual_usage(self, ledger):
+        budget = Budget(limit_usd=1.0)
+        with budget_scope(budget):
+            reservation = ledger.reserve("test-model", 1000, 500)
+            assert budget.reserved_usd == pytest.approx(0.002)
+            entry = reservation.settle(800, 200)
+        assert entry.cost_usd == pytest.approx(0.0012)
+        assert budget.reserved_usd == 0.0
+        assert budget.spent_usd == pytest.approx(0.0012)
+        assert (budget.tokens, budget.requests) == (1000, 1)
+        # A settled reservation cannot be released a second time
+        reservation.release()
+        assert budget.reserved_usd == 0.0
+
+    def test_refusal_rolls_back_outer_budgets(self, ledger):
+        outer, inner = Budget(limit_usd=10.0, name="run"), Budget(limit_usd=0.001, name="row")
+        with budget_scope(outer), budget_scope(inner):
+            with pytest.raises(BudgetExceededError) as refused:
+                ledger.reserve("test-model", 1000, 500)
+        assert refused.value.budget is inner
+        assert outer.reserved_usd == 0.0 and outer.reserved_requests == 0
+
+    def test_nested_budgets_are_all_charged(self, ledger):
+        outer, inner = Budget(name="run"), Budget(name="chunk")
+        with budget_scope(outer):
+            with budget_scope(inner):
+                ledger.record("test-model", 1000, 0)
+            ledger.record("test-model", 1000, 0)
+        assert outer.requests == 2 and inner.requests == 1
+
+    def test_budget_scope_none_is_a_no_op(self, ledger):
+        with budget_scope(None) as budget:
+            assert budget is None
+            ledger.reserve("test-model", 10**9, 10**9).release()
+
+    def test_usage_is_attributed_to_nested_scopes(self, ledger):
+        with usage_scope(page="BioGen", job="run-1", chunk=0):
+            with usage_scope(row=3):
+                assert current_labels() == {"page": "BioGen", "job": "run-1", "chunk": "0", "row": "3"}
+                ledger.record("test-model", 100, 50)
+            ledger.record("test-model", 100, 50)
+        assert current_labels() == {}
+        assert ledger.totals("job")["run-1"].requests == 2
+        assert ledger.totals("row")["3"].cost_usd == pytest.approx(0.0002)
+        assert ledger.totals()["all"].prompt_tokens == 200
+        assert len(ledger.records(row=3)) == 1
+
+    def test_unknown_model_is_free(self, ledger):
+        assert ledger.record("other-model", 1000, 1000).cost_usd == 0.0
+
+
+@pytest.mark.unit
+class TestConfiguration:
+
+    def test_price_overrides_from_file(self, tmp_path):
+        path = tmp_path / "prices.json"
+        path.write_text(json.dumps({"gpt-4o-mini": [0.2, 0.8], "local-model": [0, 0]}))
+        prices = load_price_table(str(path))
+        assert prices["gpt-4o-mini"] == (0.2, 0.8)
+        assert prices["local-model"] == (0.0, 0.0)
+        assert "gpt-4o" in prices
+
+    def test_broken_price_file_keeps_defaults(self, tmp_path):
+        path = tmp_path / "prices.json"
+        path.write_text("{not json")
+        assert load_price_table(str(path))["gpt-4o-mini"] == (0.15, 0.60)
+
+    @pytest.mark.parametrize("value, expected", [("2.5", 2.5), ("0", None), ("", None), ("lots", None)])
+    def test_run_budget_from_environment(self, monkeypatch, value, expected):
+        monkeypatch.setenv("CONFERENCE_RESEARCH_RUN_BUDGET_USD", value)
+        assert default_run_budget_usd() == expected
+
+
+class FakeCompletions:
+    """chat.completions.with_raw_response stand-in reporting fixed usage."""
+
+    def __init__(self, prompt_tokens=1000, completion_tokens=200, error=None):
+        self.calls = 0
+        self.usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                     total_tokens=prompt_tokens + completion_tokens)
+        self.error = error
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        completion = SimpleNamespace(model=kwargs["model"], usage=self.usage, choices=[])
+        return SimpleNamespace(parse=lambda: completion, headers={})
+
+
+def fake_gateway(completions):
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=completions)))
+    return LLMGateway(
+        client,
+        retry_policy=RetryPolicy(max_retries=0, retry_on=llm_client.RETRYABLE_ERRORS),
+        breaker=CircuitBreaker("test-openai"),
+    )
+
+
+@pytest.mark.unit
+class TestGatewayBudgets:
+
+    @pytest.fixture(autouse=True)
+    def character_token_estimates(self, monkeypatch):
+        # Prompt tokens = characters / 4 + 4 per message, without loading tiktoken
+        monkeypatch.setattr(llm_client, "_get_encoding", lambda: None)
+
+    def messages(self):
+        return [{"role": "user", "content": "x" * 400}]
+
+    def test_call_refused_before_reaching_the_api(self):
+        completions = FakeCompletions()
+        gateway = fake_gateway(completions)
+        # gpt-4o-mini: 104 prompt + 512 completion tokens reserve about $0.00032
+        budget = Budget(limit_usd=0.0003, name="row")
+        with budget_scope(budget):
+            with pytest.raises(BudgetExceededError):
+                gateway.chat_completion(model="gpt-4o-mini", messages=self.messages())
+        assert completions.calls == 0
+        assert budget.reserved_usd == 0.0 and budget.requests == 0
+
+    def test_reservation_settled_with_reported_usage(self):
+        completions = FakeCompletions(prompt_tokens=1000, completion_tokens=200)
+        gateway = fake_gateway(completions)
+        budget = Budget(limit_usd=1.0, limit_requests=2)
+        with budget_scope(budget):
+            gateway.chat_completion(model="gpt-4o-mini", messages=self.messages())
+            gateway.chat_completion(model="gpt-4o-mini", messages=self.messages())
+            with pytest.raises(BudgetExceededError):
+                gateway.chat_completion(model="gpt-4o-mini", messages=self.messages())
+        assert completions.calls == 2
+        assert budget.spent_usd == pytest.approx(2 * (1000 * 0.15 + 200 * 0.60) / 1_000_000)
+        assert budget.tokens == 2400 and budget.reserved_usd == 0.0
+
+    def test_failed_call_releases_its_reservation(self):
+        gateway = fake_gateway(FakeCompletions(error=ValueError("bad request")))
+        budget = Budget(limit_usd=1.0)
+        with budget_scope(budget):
+            with pytest.raises(ValueError):
+                gateway.chat_completion(model="gpt-4o-mini", messages=self.messages())
+        assert budget.reserved_usd == 0.0 and budget.spent_usd == 0.0